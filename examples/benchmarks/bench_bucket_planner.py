@@ -0,0 +1,76 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Padding waste and padded shapes of batches of small graphs, for the pad modes and BucketPlanner."""
+import argparse
+import numpy as np
+from mindspore_gl.graph import BucketPlanner
+
+
+def batch_sizes(rng, args):
+    """node and edge count of batches of graphs with lognormal sizes"""
+    nodes = np.maximum(2, rng.lognormal(np.log(args.mean_nodes), args.sigma, (args.batches, args.batch_size)))
+    nodes = nodes.astype(np.int64)
+    edges = (nodes * rng.uniform(args.degree / 2, args.degree * 3 / 2, nodes.shape)).astype(np.int64)
+    return nodes.sum(axis=1), edges.sum(axis=1)
+
+
+def ladder(count, top):
+    """padded size of the 20/40/60/80/100% ladder of the model_zoo datasets"""
+    for step in (0.2, 0.4, 0.6, 0.8):
+        if count < int(step * top):
+            return int(step * top)
+    return top
+
+
+def waste(counts, padded):
+    return 1 - np.sum(counts) / np.sum(padded)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="bucket planner benchmark")
+    parser.add_argument("--batches", type=int, default=2000, help="batches of an epoch")
+    parser.add_argument("--batch-size", type=int, default=128, help="graphs per batch")
+    parser.add_argument("--mean-nodes", type=float, default=20, help="median nodes of a graph")
+    parser.add_argument("--sigma", type=float, default=0.6, help="spread of the graph sizes")
+    parser.add_argument("--degree", type=float, default=9, help="mean edges per node")
+    parser.add_argument("--buckets", type=int, default=5, help="padded shapes of the planner")
+    parser.add_argument("--scan", type=int, default=64, help="batches scanned to fit the planner")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    nodes, edges = batch_sizes(rng, args)
+    print("{} batches of {} graphs, nodes {}..{}, edges {}..{}".format(
+        args.batches, args.batch_size, nodes.min(), nodes.max(), edges.min(), edges.max()))
+
+    results = {}
+    # worst case bound of CONST, one shape
+    node_top, edge_top = int(nodes.max()) * 2, int(edges.max()) * 2
+    results["CONST 2x max"] = ([node_top] * args.batches, [edge_top] * args.batches)
+    results["AUTO"] = ([1 << int(n).bit_length() for n in nodes], [1 << int(e).bit_length() for e in edges])
+    results["ladder 20%"] = ([ladder(n, node_top) for n in nodes], [ladder(e, edge_top) for e in edges])
+    planner = BucketPlanner(num_buckets=args.buckets)
+    scan_nodes, scan_edges = batch_sizes(np.random.default_rng(1), argparse.Namespace(**{**vars(args),
+                                                                                        "batches": args.scan}))
+    planner.fit(scan_nodes, scan_edges)
+    shapes = [planner.shape(n, e) for n, e in zip(nodes, edges)]
+    results["BucketPlanner"] = ([n for n, _ in shapes], [e for _, e in shapes])
+
+    for name, (padded_nodes, padded_edges) in results.items():
+        print("{:<14s} node waste {:>5.1%}  edge waste {:>5.1%}  shapes {:>3d}".format(
+            name, waste(nodes, padded_nodes), waste(edges, padded_edges),
+            len(set(zip(padded_nodes, padded_edges)))))
+    report = planner.report()
+    print("planner buckets {}, overflow {} of {} batches".format(planner.buckets, report["overflow"],
+                                                                 report["batches"]))
@@ -0,0 +1,69 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmark the forward and backward CSR of a sampled graph, scipy sparse against `coo_to_csr_data`."""
+import argparse
+import time
+import numpy as np
+import scipy.sparse as sp
+from mindspore_gl.graph.csr_convert import coo_to_csr_data
+from bench_utils import measure
+
+
+def scipy_csr(row, col, n_nodes, n_edges, seeds):
+    """the csr_convert path before coo_to_csr_data, without the tensor wrapping"""
+    out_deg = np.bincount(row, minlength=n_nodes)
+    idx_forward = np.argsort(out_deg)[::-1]
+    arg_idx_forward = np.array(np.argsort(idx_forward), np.int32)
+    row, col = arg_idx_forward[row], arg_idx_forward[col]
+    forward = sp.coo_matrix((np.ones(n_edges), (row, col)), shape=(n_nodes, n_nodes)).tocsr()
+    backward = sp.csr_matrix((np.ones(n_edges), (col, row)), shape=(n_nodes, n_nodes)).tocsr()
+    idx_dict = dict(zip(range(n_nodes), arg_idx_forward))
+    seeds = [idx_dict[i] for i in seeds]
+    return (np.asarray(forward.indptr, np.int32), np.asarray(forward.indices, np.int32),
+            np.asarray(backward.indptr, np.int32), np.asarray(backward.indices, np.int32), seeds)
+
+
+def counting_csr(row, col, n_nodes, n_edges, seeds):
+    data = coo_to_csr_data(row, col, n_nodes, rerank=True)
+    return data.indptr, data.indices, data.indptr_backward, data.indices_backward, data.inv_perm[seeds]
+
+
+def run(fn, n_nodes, n_edges, repeat):
+    """best seconds of `repeat` conversions of a random graph"""
+    rng = np.random.default_rng(0)
+    row = rng.integers(0, n_nodes, n_edges, dtype=np.int32)
+    col = rng.integers(0, n_nodes, n_edges, dtype=np.int32)
+    seeds = rng.integers(0, n_nodes, min(n_nodes, 1024))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(row, col, n_nodes, n_edges, seeds)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="csr convert benchmark")
+    parser.add_argument("--edges", type=int, nargs="+", default=[100000, 1000000, 10000000], help="edge counts")
+    parser.add_argument("--degree", type=int, default=10, help="edges per node")
+    parser.add_argument("--repeat", type=int, default=3, help="conversions per case, the best is reported")
+    args = parser.parse_args()
+
+    for n_edges in args.edges:
+        n_nodes = n_edges // args.degree
+        for name, fn in (("scipy", scipy_csr), ("coo_to_csr_data", counting_csr)):
+            elapsed, peak_rss_mb, best = measure(run, fn, n_nodes, n_edges, args.repeat)
+            print("edges {:>9d} nodes {:>8d}  {:<16s} {:>8.1f} ms   peak rss {:>7.1f} MB".format(
+                n_edges, n_nodes, name, best * 1000, peak_rss_mb), flush=True)
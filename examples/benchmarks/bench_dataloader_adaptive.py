@@ -0,0 +1,101 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmark fixed vs adaptive DataLoader workers: consumer wait and worker CPU time."""
+import argparse
+import os
+import time
+import numpy as np
+from mindspore_gl.dataloader.dataset import Dataset
+from mindspore_gl.dataloader.samplers import RandomBatchSampler
+from mindspore_gl.dataloader.dataloader import DataLoader
+
+
+class BusyDataset(Dataset):
+    """Batches burn `produce_ms` of CPU, like sampling and feature gathering."""
+
+    def __init__(self, size, produce_ms):
+        self.size = size
+        self.produce_ms = produce_ms
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, batch):
+        end = time.process_time() + self.produce_ms / 1000
+        while time.process_time() < end:
+            pass
+        return np.asarray(batch, dtype=np.int32)
+
+
+def cpu_seconds(pids):
+    """user + system CPU seconds of processes, from /proc"""
+    ticks = os.sysconf("SC_CLK_TCK")
+    total = 0
+    for pid in pids:
+        with open("/proc/{}/stat".format(pid)) as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+        total += int(fields[11]) + int(fields[12])
+    return total / ticks
+
+
+def run(args, adaptive):
+    """returns batches/s, consumer wait p50 and p99 in ms, worker CPU seconds and the final metrics"""
+    dataset = BusyDataset(args.batches * 4, args.produce_ms)
+    sampler = RandomBatchSampler(list(range(args.batches * 4)), 4)
+    loader = DataLoader(dataset, sampler, num_workers=args.workers, prefetch_factor=args.prefetch_factor,
+                        adaptive=adaptive)
+    waits = []
+    batches = 0
+    cpu_start = None
+    start = time.perf_counter()
+    for _ in range(args.epochs):
+        it = iter(loader)
+        if cpu_start is None:
+            pids = [w.pid for w in it._workers]
+            cpu_start = cpu_seconds(pids)
+        while True:
+            wait_start = time.perf_counter()
+            try:
+                next(it)
+            except StopIteration:
+                break
+            waits.append(time.perf_counter() - wait_start)
+            batches += 1
+            # the device step
+            time.sleep(args.step_ms / 1000)
+    elapsed = time.perf_counter() - start
+    cpu = cpu_seconds(pids) - cpu_start
+    metrics = it.metrics
+    it._shutdown_workers()
+    waits = np.array(waits) * 1000
+    return batches / elapsed, np.percentile(waits, 50), np.percentile(waits, 99), cpu, metrics
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="adaptive DataLoader benchmark")
+    parser.add_argument("--batches", type=int, default=300, help="batches per epoch")
+    parser.add_argument("--epochs", type=int, default=2, help="epochs to time")
+    parser.add_argument("--workers", type=int, default=8, help="worker processes, the bound of the adaptive mode")
+    parser.add_argument("--prefetch-factor", type=int, default=2, help="prefetch factor")
+    parser.add_argument("--produce-ms", type=float, default=4.0, help="CPU time to produce a batch")
+    parser.add_argument("--step-ms", type=float, default=10.0, help="consumer time per batch")
+    args = parser.parse_args()
+
+    for adaptive in (False, True):
+        rate, p50, p99, cpu, metrics = run(args, adaptive)
+        print("adaptive={:<6s} {:>6.1f} batches/s   wait p50 {:>6.2f} ms  p99 {:>6.2f} ms   worker cpu {:>5.2f} s"
+              "   active workers {}  outstanding {}".format(str(adaptive), rate, p50, p99, cpu,
+                                                           metrics["active_workers"],
+                                                           metrics["target_outstanding"]), flush=True)
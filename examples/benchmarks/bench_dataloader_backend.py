@@ -0,0 +1,98 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmark process vs thread DataLoader workers on a large in memory feature matrix."""
+import argparse
+import multiprocessing
+import os
+import time
+import numpy as np
+from mindspore_gl.dataloader.dataset import Dataset
+from mindspore_gl.dataloader.samplers import RandomBatchSampler
+from mindspore_gl.dataloader.dataloader import DataLoader
+
+
+class FeatureDataset(Dataset):
+    """A batch gathers the feature rows of random neighbours, numpy releases the GIL during the gather."""
+
+    def __init__(self, nodes, feat_dim, fanout):
+        rng = np.random.default_rng(0)
+        self.feat = rng.random((nodes, feat_dim), dtype=np.float32)
+        self.nodes = nodes
+        self.fanout = fanout
+
+    def __len__(self):
+        return self.nodes
+
+    def __getitem__(self, batch):
+        rng = np.random.default_rng(int(batch[0]))
+        neighbors = rng.integers(0, self.nodes, len(batch) * self.fanout)
+        return self.feat[np.asarray(batch)], self.feat[neighbors]
+
+
+def pss_mb(pids):
+    """proportional set size of processes in MB, shared pages are split between the processes mapping them"""
+    total = 0
+    for pid in pids:
+        with open("/proc/{}/smaps_rollup".format(pid)) as smaps:
+            for line in smaps:
+                if line.startswith("Pss:"):
+                    total += int(line.split()[1])
+    return total / 1024
+
+
+def run(dataset, args, backend):
+    """returns startup seconds, batches/s and the PSS of the main process and its workers in MB"""
+    start = time.perf_counter()
+    loader = DataLoader(dataset, RandomBatchSampler(list(range(dataset.nodes)), args.batch_size),
+                        num_workers=args.workers, prefetch_factor=args.prefetch_factor, backend=backend)
+    it = iter(loader)
+    next(it)
+    startup = time.perf_counter() - start
+    pids = {os.getpid()} | {w.pid for w in it._workers if backend == "process"}
+    batches = 0
+    start = time.perf_counter()
+    for _ in range(args.batches):
+        try:
+            next(it)
+        except StopIteration:
+            break
+        batches += 1
+    elapsed = time.perf_counter() - start
+    memory = pss_mb(pids)
+    it._shutdown_workers()
+    return startup, batches / elapsed, memory
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DataLoader backend benchmark")
+    parser.add_argument("--nodes", type=int, default=200000, help="rows of the feature matrix")
+    parser.add_argument("--feat-dim", type=int, default=602, help="feature size, 602 is Reddit")
+    parser.add_argument("--fanout", type=int, default=10, help="neighbours gathered per seed node")
+    parser.add_argument("--batch-size", type=int, default=256, help="seed nodes per batch")
+    parser.add_argument("--batches", type=int, default=200, help="batches to time")
+    parser.add_argument("--workers", type=int, default=4, help="workers")
+    parser.add_argument("--prefetch-factor", type=int, default=2, help="prefetch factor")
+    parser.add_argument("--start-method", default="spawn", choices=["fork", "spawn", "forkserver"],
+                        help="how worker processes start, spawn pickles the dataset into every worker")
+    args = parser.parse_args()
+    multiprocessing.set_start_method(args.start_method)
+
+    dataset = FeatureDataset(args.nodes, args.feat_dim, args.fanout)
+    print("features {:.0f} MB, {} workers, start method {}".format(
+        dataset.feat.nbytes / 2 ** 20, args.workers, args.start_method))
+    for backend in ("process", "thread"):
+        startup, rate, memory = run(dataset, args, backend)
+        print("{:<8s} startup {:>6.2f} s   {:>7.1f} batches/s   PSS {:>7.0f} MB".format(
+            backend, startup, rate, memory), flush=True)
@@ -0,0 +1,86 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmark in order vs out of order DataLoader delivery with heavy tailed batch latency."""
+import argparse
+import time
+import numpy as np
+from mindspore_gl.dataloader.dataset import Dataset
+from mindspore_gl.dataloader.samplers import RandomBatchSampler
+from mindspore_gl.dataloader.dataloader import DataLoader
+
+
+class HeavyTailDataset(Dataset):
+    """
+    Batches sleep a Pareto distributed time, like seed sets that hit a hub node of a power law graph.
+    Sleeping does not use CPU, so the result does not depend on the number of cores.
+    """
+
+    def __init__(self, size, base_ms, alpha, seed):
+        self.size = size
+        self.base_ms = base_ms
+        self.alpha = alpha
+        self.seed = seed
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, batch):
+        rng = np.random.default_rng([self.seed, int(batch[0])])
+        time.sleep(self.base_ms * (1 + rng.pareto(self.alpha)) / 1000)
+        return np.asarray(batch, dtype=np.int32)
+
+
+def run(dataset, sampler, num_workers, prefetch_factor, in_order, epochs):
+    """returns batches/s and the consumer wait percentiles in ms"""
+    loader = DataLoader(dataset, sampler, num_workers=num_workers, prefetch_factor=prefetch_factor,
+                        in_order=in_order)
+    waits = []
+    batches = 0
+    start = time.perf_counter()
+    for _ in range(epochs):
+        it = iter(loader)
+        while True:
+            wait_start = time.perf_counter()
+            try:
+                next(it)
+            except StopIteration:
+                break
+            waits.append(time.perf_counter() - wait_start)
+            batches += 1
+    elapsed = time.perf_counter() - start
+    # persistent workers outlive the epoch, stop them before the next configuration
+    loader.iterator._shutdown_workers()
+    waits = np.array(waits) * 1000
+    return batches / elapsed, np.percentile(waits, 50), np.percentile(waits, 99)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DataLoader delivery order benchmark")
+    parser.add_argument("--batches", type=int, default=400, help="batches per epoch")
+    parser.add_argument("--epochs", type=int, default=2, help="epochs to time")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8], help="worker counts")
+    parser.add_argument("--prefetch-factor", type=int, default=2, help="prefetch factor")
+    parser.add_argument("--base-ms", type=float, default=5.0, help="latency of a typical batch in ms")
+    parser.add_argument("--alpha", type=float, default=1.2, help="Pareto shape, smaller is heavier tailed")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    bench_dataset = HeavyTailDataset(args.batches * 4, args.base_ms, args.alpha, args.seed)
+    bench_sampler = RandomBatchSampler(list(range(args.batches * 4)), 4)
+    for workers in args.workers:
+        for order in (True, False):
+            rate, p50, p99 = run(bench_dataset, bench_sampler, workers, args.prefetch_factor, order, args.epochs)
+            print("workers {:<3d} in_order={:<6s} {:>8.1f} batches/s   wait p50 {:>7.2f} ms   p99 {:>8.2f} ms".format(
+                workers, str(order), rate, p50, p99), flush=True)
@@ -0,0 +1,112 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmark DataLoader worker startup and memory with and without `Dataset.shared_arrays`."""
+import argparse
+import multiprocessing
+import os
+import time
+import numpy as np
+from mindspore_gl.dataloader.dataset import Dataset
+from mindspore_gl.dataloader.samplers import RandomBatchSampler
+from mindspore_gl.dataloader.dataloader import DataLoader
+from mindspore_gl.graph import CsrAdj
+
+
+class SageDataset(Dataset):
+    """Reddit sized graph and features, a batch gathers the features of the seeds and of their neighbours."""
+
+    shared_arrays = ("feat", "csr")
+
+    def __init__(self, nodes, feat_dim, degree, fanout, share):
+        rng = np.random.default_rng(0)
+        self.feat = rng.random((nodes, feat_dim), dtype=np.float32)
+        indptr = np.arange(nodes + 1, dtype=np.int64) * degree
+        self.csr = CsrAdj(indptr, rng.integers(0, nodes, nodes * degree, dtype=np.int32))
+        self.fanout = fanout
+        if not share:
+            self.shared_arrays = ()
+
+    def __len__(self):
+        return self.feat.shape[0]
+
+    def __getitem__(self, seeds):
+        seeds = np.asarray(seeds)
+        rng = np.random.default_rng(int(seeds[0]))
+        picks = self.csr.indptr[seeds][:, None] + rng.integers(0, self.csr.indptr[1], (seeds.shape[0], self.fanout))
+        nodes = np.concatenate([seeds, self.csr.indices[picks.reshape(-1)]])
+        return self.feat[nodes]
+
+
+def memory_mb(pid):
+    """RSS and private (unique) memory of a process in MB"""
+    rss = private = 0
+    with open("/proc/{}/smaps_rollup".format(pid)) as smaps:
+        for line in smaps:
+            if line.startswith("Rss:"):
+                rss = int(line.split()[1])
+            elif line.startswith(("Private_Clean:", "Private_Dirty:")):
+                private += int(line.split()[1])
+    return rss / 1024, private / 1024
+
+
+def forever(loader):
+    """batches of the persistent loader epoch after epoch"""
+    while True:
+        yield from loader
+
+
+def run(args, share):
+    """returns the seconds until every worker delivered a batch, and per worker RSS and private MB over time"""
+    dataset = SageDataset(args.nodes, args.feat_dim, args.degree, args.fanout, share)
+    sampler = RandomBatchSampler(list(range(args.nodes)), args.batch_size)
+    start = time.perf_counter()
+    loader = DataLoader(dataset, sampler, num_workers=args.workers, in_order=False, persistent_workers=True)
+    batches = forever(loader)
+    for _ in range(args.workers):
+        next(batches)
+    startup = time.perf_counter() - start
+    pids = [w.pid for w in loader.iterator._workers]
+    samples = [[memory_mb(pid) for pid in pids]]
+    for _ in range(args.checks):
+        for _ in range(args.batches // args.checks):
+            next(batches)
+        samples.append([memory_mb(pid) for pid in pids])
+    loader.iterator._shutdown_workers()
+    return startup, samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="shared dataset arrays benchmark")
+    parser.add_argument("--nodes", type=int, default=232965, help="nodes, 232965 is Reddit")
+    parser.add_argument("--feat-dim", type=int, default=602, help="feature size, 602 is Reddit")
+    parser.add_argument("--degree", type=int, default=492, help="edges per node, Reddit has 114M edges")
+    parser.add_argument("--fanout", type=int, default=25, help="neighbours gathered per seed")
+    parser.add_argument("--batch-size", type=int, default=1024, help="seeds per batch")
+    parser.add_argument("--batches", type=int, default=200, help="batches after startup")
+    parser.add_argument("--checks", type=int, default=4, help="memory samples after startup")
+    parser.add_argument("--workers", type=int, default=8, help="worker processes")
+    parser.add_argument("--start-method", default="spawn", choices=["fork", "spawn", "forkserver"],
+                        help="how worker processes start, spawn pickles the dataset into every worker")
+    args = parser.parse_args()
+    multiprocessing.set_start_method(args.start_method)
+
+    size = args.nodes * args.feat_dim * 4 + args.nodes * args.degree * 4
+    print("dataset {:.0f} MB, {} workers, start method {}".format(size / 2 ** 20, args.workers, args.start_method))
+    for share in (False, True):
+        startup, samples = run(args, share)
+        rss = " ".join("{:>6.0f}".format(np.mean([r for r, _ in sample])) for sample in samples)
+        private = " ".join("{:>6.0f}".format(np.mean([p for _, p in sample])) for sample in samples)
+        print("shared_arrays={:<5s} startup {:>6.2f} s   per worker RSS MB {}   private MB {}".format(
+            str(share), startup, rss, private), flush=True)
@@ -0,0 +1,95 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmark per batch transport from DataLoader workers to the trainer for GraphSAGE sized batches."""
+import argparse
+import time
+import numpy as np
+from mindspore_gl.dataloader.dataset import Dataset
+from mindspore_gl.dataloader.samplers import RandomBatchSampler
+from mindspore_gl.dataloader.dataloader import DataLoader
+from mindspore_gl.dataloader.shared_numpy import SharedNDArray
+
+
+class PrebuiltBatchDataset(Dataset):
+    """
+    Returns the same prebuilt batch, so the time measured is the transport. With `shared=True` every batch is
+    copied into new SharedNDArray, the way datasets sent large arrays before the ring.
+    """
+
+    def __init__(self, size, nodes, feat_dim, edges, shared):
+        rng = np.random.default_rng(0)
+        self.size = size
+        self.feat = rng.random((nodes, feat_dim), dtype=np.float32)
+        self.edges = rng.integers(0, nodes, (2, edges), dtype=np.int32)
+        self.shared = shared
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, batch):
+        if self.shared:
+            return SharedNDArray.from_numpy_array(self.feat), SharedNDArray.from_numpy_array(self.edges)
+        return self.feat, self.edges
+
+
+def run(transport, args):
+    """returns batches/s, MB/s and per batch latency percentiles in ms"""
+    dataset = PrebuiltBatchDataset(args.batches, args.nodes, args.feat_dim, args.edges, transport == "shared")
+    sampler = RandomBatchSampler(list(range(args.batches)), 1)
+    loader = DataLoader(dataset, sampler, num_workers=args.workers, prefetch_factor=args.prefetch_factor,
+                        shared_ring=transport == "ring")
+    nbytes = dataset.feat.nbytes + dataset.edges.nbytes
+    latencies = []
+    batches = 0
+    start = time.perf_counter()
+    for _ in range(args.epochs):
+        it = iter(loader)
+        while True:
+            wait_start = time.perf_counter()
+            try:
+                feat, edges = next(it)
+            except StopIteration:
+                break
+            # touch the batch like a trainer copying it to the device would
+            _ = float(feat[-1, -1]) + float(edges[-1, -1])
+            latencies.append(time.perf_counter() - wait_start)
+            batches += 1
+            del feat, edges
+    elapsed = time.perf_counter() - start
+    loader.iterator._shutdown_workers()
+    latencies = np.array(latencies) * 1000
+    return (batches / elapsed, batches * nbytes / elapsed / 2 ** 20,
+            np.percentile(latencies, 50), np.percentile(latencies, 99))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DataLoader transport benchmark")
+    parser.add_argument("--transports", nargs="+", default=["queue", "shared", "ring"],
+                        choices=["queue", "shared", "ring"], help="pickled numpy, SharedNDArray per batch, ring")
+    parser.add_argument("--batches", type=int, default=100, help="batches per epoch")
+    parser.add_argument("--epochs", type=int, default=2, help="epochs to time")
+    parser.add_argument("--workers", type=int, default=2, help="worker processes")
+    parser.add_argument("--prefetch-factor", type=int, default=2, help="prefetch factor")
+    parser.add_argument("--nodes", type=int, default=25000, help="nodes of a batch")
+    parser.add_argument("--feat-dim", type=int, default=602, help="feature size, 602 is Reddit")
+    parser.add_argument("--edges", type=int, default=250000, help="edges of a batch")
+    args = parser.parse_args()
+
+    print("batch: {}x{} float32 features + 2x{} int32 edges, {:.1f} MB".format(
+        args.nodes, args.feat_dim, args.edges, (args.nodes * args.feat_dim + 2 * args.edges) * 4 / 2 ** 20))
+    for transport in args.transports:
+        rate, bandwidth, p50, p99 = run(transport, args)
+        print("{:<7s} {:>7.1f} batches/s {:>8.0f} MB/s   latency p50 {:>7.2f} ms   p99 {:>7.2f} ms".format(
+            transport, rate, bandwidth, p50, p99), flush=True)
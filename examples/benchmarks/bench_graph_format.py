@@ -0,0 +1,73 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmark COO <-> CSR conversion of MindHomoGraph on a synthetic graph."""
+import argparse
+import numpy as np
+import scipy.sparse as sp
+from mindspore_gl.graph.graph import coo_to_csr, csr_to_coo, CsrAdj
+from bench_utils import measure, report
+
+
+def make_coo(node_count, edge_count, seed):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, node_count, size=(2, edge_count), dtype=np.int32)
+
+
+def run_coo_to_csr(node_count, edge_count, seed, num_threads):
+    coo = make_coo(node_count, edge_count, seed)
+    csr = coo_to_csr(coo, node_count, num_threads=num_threads)
+    return "indices {}".format(csr.indices.shape[0])
+
+
+def run_scipy_coo_to_csr(node_count, edge_count, seed):
+    coo = make_coo(node_count, edge_count, seed)
+    csr = sp.coo_matrix((np.ones(edge_count, dtype=np.int8), (coo[0], coo[1])),
+                        shape=(node_count, node_count)).tocsr()
+    return "indices {}".format(csr.indices.shape[0])
+
+
+def run_csr_to_coo(node_count, edge_count, seed, num_threads):
+    coo = make_coo(node_count, edge_count, seed)
+    csr = coo_to_csr(coo, node_count)
+    del coo
+    csr = CsrAdj(csr.indptr, csr.indices)
+    res = csr_to_coo(csr, num_threads=num_threads)
+    return "coo {}".format(res.shape)
+
+
+def run_generate_only(node_count, edge_count, seed):
+    make_coo(node_count, edge_count, seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="COO/CSR conversion benchmark")
+    parser.add_argument("--nodes", type=int, default=2000000, help="number of nodes")
+    parser.add_argument("--edges", type=int, default=50000000, help="number of edges")
+    parser.add_argument("--threads", type=int, default=8, help="threads for the parallel path")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--scipy", action="store_true", help="also run scipy coo_matrix.tocsr for reference")
+    args = parser.parse_args()
+
+    print("nodes {} edges {}".format(args.nodes, args.edges))
+    report("generate input only", *measure(run_generate_only, args.nodes, args.edges, args.seed))
+    report("coo_to_csr (1 thread)", *measure(run_coo_to_csr, args.nodes, args.edges, args.seed, 1))
+    report("coo_to_csr ({} threads)".format(args.threads),
+           *measure(run_coo_to_csr, args.nodes, args.edges, args.seed, args.threads))
+    if args.scipy:
+        report("scipy coo_matrix.tocsr", *measure(run_scipy_coo_to_csr, args.nodes, args.edges, args.seed))
+    report("csr_to_coo (1 thread, incl. coo_to_csr)",
+           *measure(run_csr_to_coo, args.nodes, args.edges, args.seed, 1))
+    report("csr_to_coo ({} threads, incl. coo_to_csr)".format(args.threads),
+           *measure(run_csr_to_coo, args.nodes, args.edges, args.seed, args.threads))
@@ -0,0 +1,101 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmark cold start and per worker memory of npz files versus mmap graph stores."""
+import argparse
+import tempfile
+import multiprocessing
+from pathlib import Path
+import numpy as np
+from mindspore_gl.dataset.graph_store import load_graph_store, convert_npz
+from bench_utils import measure, report
+
+
+def make_npz(path, node_count, edge_count, feat_size, seed):
+    """write a reddit like npz file"""
+    rng = np.random.default_rng(seed)
+    indptr = np.sort(rng.integers(0, edge_count, size=node_count + 1)).astype(np.int32)
+    indptr[0], indptr[-1] = 0, edge_count
+    indices = rng.integers(0, node_count, size=edge_count, dtype=np.int32)
+    feat = rng.random((node_count, feat_size), dtype=np.float32)
+    label = rng.integers(0, 41, size=node_count)
+    mask = rng.random(node_count) < 0.6
+    np.savez(path, adj_csr_indptr=indptr, adj_csr_indices=indices, feat=feat, label=label,
+             train_mask=mask, val_mask=~mask, test_mask=~mask)
+
+
+def pss_mb():
+    """proportional set size, shared pages are split between the processes mapping them"""
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def open_dataset(path):
+    arrays = load_graph_store(path)
+    indptr = arrays['adj_csr_indptr'].astype(np.int32, copy=False)
+    indices = arrays['adj_csr_indices'].astype(np.int32, copy=False)
+    return indptr, indices, arrays['feat']
+
+
+def run_open(path):
+    indptr, _, _ = open_dataset(path)
+    return "nodes {}".format(indptr.shape[0] - 1)
+
+
+def _worker(path, barrier, conn):
+    indptr, indices, feat = open_dataset(path)
+    # touch everything, like a worker sampling the full graph over an epoch
+    checksum = int(indptr[-1]) + int(indices.sum(dtype=np.int64)) + float(feat[::64].sum())
+    barrier.wait()
+    conn.send((pss_mb(), checksum))
+    barrier.wait()
+
+
+def run_workers(path, num_workers):
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(num_workers)
+    pipes = [ctx.Pipe(duplex=False) for _ in range(num_workers)]
+    procs = [ctx.Process(target=_worker, args=(path, barrier, child)) for _, child in pipes]
+    for proc in procs:
+        proc.start()
+    total = sum(parent.recv()[0] for parent, _ in pipes)
+    for proc in procs:
+        proc.join()
+    return "total pss of {} workers {:.1f} MB".format(num_workers, total)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="npz versus mmap graph store benchmark")
+    parser.add_argument("--nodes", type=int, default=232965, help="number of nodes")
+    parser.add_argument("--edges", type=int, default=114615892, help="number of edges")
+    parser.add_argument("--feat-size", type=int, default=602, help="node feature size")
+    parser.add_argument("--workers", type=int, default=4, help="number of concurrent reader processes")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--dir", default=None, help="directory for the generated files")
+    args = parser.parse_args()
+
+    work_dir = Path(args.dir or tempfile.mkdtemp())
+    npz_path = work_dir / "bench_with_mask.npz"
+    store_path = work_dir / "bench_store" / "bench_with_mask.npz"
+    print("nodes {} edges {} feat {} in {}".format(args.nodes, args.edges, args.feat_size, work_dir))
+    report("write npz", *measure(make_npz, npz_path, args.nodes, args.edges, args.feat_size, args.seed))
+    report("convert npz -> store", *measure(convert_npz, npz_path, store_path.with_suffix("")))
+
+    report("open npz", *measure(run_open, npz_path))
+    report("open store", *measure(run_open, store_path))
+    report("{} workers npz".format(args.workers), *measure(run_workers, npz_path, args.workers))
+    report("{} workers store".format(args.workers), *measure(run_workers, store_path, args.workers))
@@ -0,0 +1,77 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmark memory and time of node id mappings when building a MindHomoGraph."""
+import argparse
+import numpy as np
+from mindspore_gl.graph import MindHomoGraph, CsrAdj, IdentityMapping, SortedIdMapping, DenseIdMapping
+from bench_utils import measure, report
+
+
+def make_csr(node_count, edge_count, seed):
+    rng = np.random.default_rng(seed)
+    indptr = np.sort(rng.integers(0, edge_count, size=node_count + 1, dtype=np.int64))
+    indptr[0] = 0
+    indptr[-1] = edge_count
+    indices = rng.integers(0, node_count, size=edge_count, dtype=np.int32)
+    return CsrAdj(indptr.astype(np.int32 if edge_count < np.iinfo(np.int32).max else np.int64), indices)
+
+
+def run_generate_only(node_count, edge_count, seed):
+    make_csr(node_count, edge_count, seed)
+
+
+def run_dict(node_count, edge_count, seed):
+    """previous dataset __getitem__: identity dict plus an explicit edge id array"""
+    csr = make_csr(node_count, edge_count, seed)
+    graph = MindHomoGraph()
+    node_dict = {idx: idx for idx in range(node_count)}
+    edge_ids = np.array(list(range(edge_count))).astype(np.int32)
+    graph.set_topo(csr, node_dict, edge_ids)
+    return "lookup {}".format(graph.neighbors(node_count // 2).shape[0])
+
+
+def run_mapping(node_count, edge_count, seed, kind):
+    csr = make_csr(node_count, edge_count, seed)
+    if kind == "none":
+        mapping = None
+    elif kind == "identity":
+        mapping = IdentityMapping(node_count)
+    else:
+        # remapped ids, spread 3x over the id space so the mapping is not the identity
+        global_ids = np.arange(node_count, dtype=np.int64) * 3
+        mapping = SortedIdMapping(global_ids) if kind == "sorted" else DenseIdMapping(global_ids)
+    graph = MindHomoGraph()
+    graph.set_topo(csr, mapping)
+    node = node_count // 2 if kind in ("none", "identity") else (node_count // 2) * 3
+    res = "lookup {}".format(graph.neighbors(node).shape[0])
+    if mapping is not None:
+        res += "   mapping {:.1f} MB".format(mapping.nbytes / 2 ** 20)
+    return res
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="node id mapping memory benchmark")
+    parser.add_argument("--nodes", type=int, default=5000000, help="number of nodes")
+    parser.add_argument("--edges", type=int, default=100000000, help="number of edges")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--skip-dict", action="store_true", help="skip the dict based baseline")
+    args = parser.parse_args()
+
+    print("nodes {} edges {}".format(args.nodes, args.edges))
+    report("generate input only", *measure(run_generate_only, args.nodes, args.edges, args.seed))
+    if not args.skip_dict:
+        report("dict node_dict + list edge_ids", *measure(run_dict, args.nodes, args.edges, args.seed))
+    for kind in ("none", "identity", "sorted", "dense"):
+        report("mapping: {}".format(kind), *measure(run_mapping, args.nodes, args.edges, args.seed, kind))
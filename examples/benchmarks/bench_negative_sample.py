@@ -0,0 +1,111 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmark negative edge sampling against the previous isin based implementation."""
+import random
+import argparse
+import time
+from math import ceil
+import numpy as np
+from mindspore_gl.sampling import negative_sample, NegativeSampler
+from mindspore_gl.sampling.negative_sample import edge_index_to_vector, vector_to_edge_index
+from bench_utils import measure, report
+
+
+def legacy_negative_sample(positive, node, num_neg_samples, mode):
+    """previous implementation: random.sample over the edge id space and np.isin rejection, (2, E) input"""
+    row, col = positive
+    size = positive.shape[1]
+    idx, population = edge_index_to_vector(np.array([row, col], dtype=np.int32), (node, node), mode=mode)
+    num_neg = num_neg_samples
+    if mode == 'undirected':
+        num_neg_samples = ceil(num_neg_samples / 2)
+    prob = 1. - size / (node * node - node)
+    sample_size = int(1.1 * num_neg_samples / prob)
+    neg_idx = None
+    for _ in range(3):
+        rnd = np.array(random.sample(range(population), min(sample_size, population)))
+        mask = np.isin(rnd, idx)
+        if neg_idx is not None:
+            mask |= np.isin(rnd, neg_idx)
+        rnd = rnd[~mask]
+        neg_idx = rnd if neg_idx is None else np.concatenate([neg_idx, rnd])
+        if len(neg_idx) >= num_neg_samples:
+            neg_idx = neg_idx[:num_neg_samples]
+            break
+    neg_idx = vector_to_edge_index(neg_idx, (node, node), mode=mode)
+    return np.stack([neg_idx[0][:num_neg], neg_idx[1][:num_neg]])
+
+
+def make_edges(node_count, edge_count, seed):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, node_count, size=(2, edge_count), dtype=np.int64).astype(np.int32)
+
+
+def run_legacy(node_count, edge_count, num_neg, mode, seed):
+    positive = make_edges(node_count, edge_count, seed)
+    start = time.perf_counter()
+    neg = legacy_negative_sample(positive, node_count, num_neg, mode)
+    return "sample {:.3f} s  negatives {}".format(time.perf_counter() - start, neg.shape[1])
+
+
+def run_function(node_count, edge_count, num_neg, mode, seed):
+    positive = make_edges(node_count, edge_count, seed)
+    start = time.perf_counter()
+    neg = negative_sample(positive, node_count, num_neg, mode=mode, re='other')
+    return "sample {:.3f} s  negatives {}".format(time.perf_counter() - start, neg.shape[1])
+
+
+def run_sampler(node_count, edge_count, num_neg, mode, seed, batch_size, batches):
+    """index built once, then a stream of batches and tail corruption of every positive edge"""
+    positive = make_edges(node_count, edge_count, seed)
+    start = time.perf_counter()
+    sampler = NegativeSampler(positive, node_count, mode=mode, random_seed=seed)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    sampler.sample(num_neg)
+    sample = time.perf_counter() - start
+    stream = sampler.batches(batch_size)
+    start = time.perf_counter()
+    for _ in range(batches):
+        next(stream)
+    per_batch = (time.perf_counter() - start) / batches
+    start = time.perf_counter()
+    sampler.corrupt(positive)
+    corrupt = time.perf_counter() - start
+    return "build {:.3f} s  sample {:.3f} s  batch {:.2f} ms  corrupt all {:.3f} s".format(
+        build, sample, per_batch * 1000, corrupt)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="negative sampling benchmark")
+    parser.add_argument("--edges", type=int, nargs="+", default=[1000000, 10000000], help="positive edge counts")
+    parser.add_argument("--avg-degree", type=int, default=10, help="nodes = edges / avg-degree")
+    parser.add_argument("--num-neg", type=int, default=None, help="negatives per call, defaults to the edge count")
+    parser.add_argument("--mode", default="undirected", choices=["undirected", "bipartite", "other"])
+    parser.add_argument("--batch-size", type=int, default=4096, help="batch size of the generator")
+    parser.add_argument("--batches", type=int, default=100, help="batches drawn from the generator")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--skip-legacy", action="store_true", help="skip the previous implementation")
+    args = parser.parse_args()
+
+    for edges in args.edges:
+        nodes = edges // args.avg_degree
+        num_neg = args.num_neg if args.num_neg is not None else edges
+        print("nodes {} edges {} negatives {} mode {}".format(nodes, edges, num_neg, args.mode))
+        if not args.skip_legacy:
+            report("legacy negative_sample", *measure(run_legacy, nodes, edges, num_neg, args.mode, args.seed))
+        report("negative_sample", *measure(run_function, nodes, edges, num_neg, args.mode, args.seed))
+        report("NegativeSampler", *measure(run_sampler, nodes, edges, num_neg, args.mode, args.seed,
+                                           args.batch_size, args.batches))
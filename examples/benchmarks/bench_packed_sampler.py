@@ -0,0 +1,69 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Fill of constant padded batches and steps per epoch, random batches against PackedBatchSampler."""
+import argparse
+import time
+import numpy as np
+from mindspore_gl.dataloader.samplers import RandomBatchSampler, PackedBatchSampler
+
+
+def graph_sizes(rng, args):
+    """offsets of graphs with lognormal node counts and a random degree"""
+    nodes = np.maximum(2, rng.lognormal(np.log(args.mean_nodes), args.sigma, args.graphs)).astype(np.int64)
+    edges = (nodes * rng.uniform(args.degree / 2, args.degree * 3 / 2, args.graphs)).astype(np.int64)
+    return np.concatenate([[0], np.cumsum(nodes)]), np.concatenate([[0], np.cumsum(edges)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="packed batch sampler benchmark")
+    parser.add_argument("--graphs", type=int, default=40000, help="graphs of the dataset")
+    parser.add_argument("--mean-nodes", type=float, default=18, help="median nodes of a graph, 18 is a molecule")
+    parser.add_argument("--sigma", type=float, default=0.5, help="spread of the graph sizes")
+    parser.add_argument("--degree", type=float, default=2.2, help="mean edges per node")
+    parser.add_argument("--batch-size", type=int, default=128, help="graphs per random batch")
+    parser.add_argument("--node-size", type=int, default=50, help="padded nodes per graph of a random batch")
+    parser.add_argument("--edge-size", type=int, default=120, help="padded edges per graph of a random batch")
+    parser.add_argument("--max-graphs", type=int, default=512, help="most graphs of a packed batch")
+    parser.add_argument("--epochs", type=int, default=3, help="epochs")
+    args = parser.parse_args()
+
+    graph_nodes, graph_edges = graph_sizes(np.random.default_rng(0), args)
+    node_counts, edge_counts = np.diff(graph_nodes), np.diff(graph_edges)
+    node_budget, edge_budget = args.node_size * args.batch_size, args.edge_size * args.batch_size
+    print("{} graphs, nodes {}..{} mean {:.1f}, edges {}..{} mean {:.1f}, padded batch {} nodes {} edges".format(
+        args.graphs, node_counts.min(), node_counts.max(), node_counts.mean(), edge_counts.min(),
+        edge_counts.max(), edge_counts.mean(), node_budget, edge_budget))
+
+    graph_ids = list(range(args.graphs))
+    random_sampler = RandomBatchSampler(graph_ids, args.batch_size)
+    for epoch in range(args.epochs):
+        start = time.perf_counter()
+        batches = list(random_sampler)
+        elapsed = time.perf_counter() - start
+        over = sum(node_counts[b].sum() >= node_budget or edge_counts[b].sum() >= edge_budget for b in batches)
+        print("random  epoch {} steps {:>5d}  node fill {:>5.1%}  edge fill {:>5.1%}  over budget {}  {:.3f} s".format(
+            epoch, len(batches), np.mean([node_counts[b].sum() / node_budget for b in batches]),
+            np.mean([edge_counts[b].sum() / edge_budget for b in batches]), over, elapsed))
+
+    packed_sampler = PackedBatchSampler(graph_ids, graph_nodes, graph_edges, node_budget, edge_budget,
+                                        args.max_graphs)
+    for epoch in range(args.epochs):
+        start = time.perf_counter()
+        batches = list(packed_sampler)
+        elapsed = time.perf_counter() - start
+        report = packed_sampler.report(epoch)
+        print("packed  epoch {} steps {:>5d}  node fill {:>5.1%}  edge fill {:>5.1%}  graphs/batch {:.0f}  "
+              "{:.3f} s".format(epoch, len(batches), report["node_fill"], report["edge_fill"], report["graphs"],
+                                elapsed))
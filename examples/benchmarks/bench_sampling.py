@@ -0,0 +1,122 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Benchmark neighbor sampling throughput on a synthetic power law graph."""
+import argparse
+import time
+import numpy as np
+from mindspore_gl import sample_kernel
+from mindspore_gl.graph import MindHomoGraph, CsrAdj
+from mindspore_gl.sampling.neighbor import sage_sampler_on_homo
+from bench_utils import measure, report
+
+
+def make_power_law_csr(node_count, edge_count, exponent, seed):
+    """Chung-Lu style graph, out degrees follow a zipf law and destinations are drawn by degree"""
+    rng = np.random.default_rng(seed)
+    weight = rng.zipf(exponent, size=node_count).astype(np.float64)
+    degree = np.floor(weight / weight.sum() * edge_count).astype(np.int64)
+    degree[rng.integers(0, node_count, size=edge_count - degree.sum())] += 1
+    indptr = np.zeros([node_count + 1], dtype=np.int32)
+    np.cumsum(degree, out=indptr[1:])
+    indices = rng.choice(node_count, size=edge_count, p=weight / weight.sum()).astype(np.int32)
+    return indptr, indices
+
+
+def run_sampling(args, kernel, num_threads, replace=False, weighted=False):
+    indptr, indices = make_power_law_csr(args.nodes, args.edges, args.exponent, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    prob = rng.random(indices.shape[0]) if weighted else None
+    prob_prefix = sample_kernel.csr_row_prefix_sum(indptr, prob, num_threads) if weighted and replace else None
+    batches = [rng.integers(0, args.nodes, size=args.batch_size, dtype=np.int32) for _ in range(args.batches)]
+    sampled = 0
+    start = time.perf_counter()
+    for batch_idx, seeds in enumerate(batches):
+        if kernel == "old":
+            edge_index, _ = sample_kernel.sample_one_hop_unbias(indptr, indices, args.fanout, seeds)
+        else:
+            edge_index, _ = sample_kernel.sample_neighbors(indptr, indices, seeds, args.fanout, replace, prob,
+                                                           prob_prefix, batch_idx, num_threads)
+        sampled += edge_index.shape[1]
+    elapsed = time.perf_counter() - start
+    return "{:>12.0f} seeds/s   {} edges".format(args.batches * args.batch_size / elapsed, sampled)
+
+
+def legacy_sage_sampler(indptr, indices, seeds, neighbor_nums):
+    """sample hop by hop, then reindex through a python dict"""
+    saved_seeds = seeds
+    all_nodes = [seeds]
+    layered_edges = []
+    for neighbor_num in neighbor_nums:
+        edge_index, _ = sample_kernel.sample_one_hop_unbias(indptr, indices, neighbor_num, seeds)
+        layered_edges.append(edge_index)
+        seeds = np.unique(edge_index[1])
+        all_nodes.append(seeds)
+    all_nodes = np.sort(np.unique(np.concatenate(all_nodes, axis=0)))
+    reindex_dict = {all_nodes[index]: index for index in range(all_nodes.shape[0])}
+    layered_edges = [sample_kernel.map_edges(edges, reindex_dict) for edges in layered_edges]
+    seeds_idx = np.zeros(saved_seeds.shape, dtype=np.int32)
+    for idx in range(saved_seeds.shape[0]):
+        seeds_idx[idx] = reindex_dict[saved_seeds[idx]]
+    return all_nodes, seeds_idx, layered_edges
+
+
+def run_sage(args, kernel, num_threads):
+    indptr, indices = make_power_law_csr(args.nodes, args.edges, args.exponent, args.seed)
+    graph = MindHomoGraph()
+    graph.set_topo(CsrAdj(indptr, indices))
+    rng = np.random.default_rng(args.seed + 1)
+    batches = [rng.integers(0, args.nodes, size=args.sage_batch_size, dtype=np.int32) for _ in range(args.batches)]
+    sampled = 0
+    start = time.perf_counter()
+    for batch_idx, seeds in enumerate(batches):
+        if kernel == "old":
+            all_nodes, _, _ = legacy_sage_sampler(indptr, indices, seeds, args.sage_fanouts)
+        else:
+            all_nodes = sage_sampler_on_homo(graph, seeds, args.sage_fanouts, random_seed=batch_idx,
+                                             num_threads=num_threads)['all_nodes']
+        sampled += all_nodes.shape[0]
+    elapsed = time.perf_counter() - start
+    return "{:>8.1f} batches/s   {} nodes".format(args.batches / elapsed, sampled)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="neighbor sampling throughput benchmark")
+    parser.add_argument("--nodes", type=int, default=1000000, help="number of nodes")
+    parser.add_argument("--edges", type=int, default=10000000, help="number of edges")
+    parser.add_argument("--exponent", type=float, default=2.1, help="zipf exponent of the degree distribution")
+    parser.add_argument("--fanout", type=int, default=10, help="neighbors sampled per seed")
+    parser.add_argument("--batch-size", type=int, default=65536, help="seeds per call")
+    parser.add_argument("--batches", type=int, default=20, help="number of calls")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16], help="thread counts to run")
+    parser.add_argument("--sage-fanouts", type=int, nargs="+", default=[25, 10], help="fanouts of the sage runs")
+    parser.add_argument("--sage-batch-size", type=int, default=1024, help="seeds per sage batch")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    print("nodes {} edges {} fanout {} batch {}".format(args.nodes, args.edges, args.fanout, args.batch_size))
+    report("sample_one_hop_unbias", *measure(run_sampling, args, "old", 1))
+    for num_threads in args.threads:
+        report("uniform ({} threads)".format(num_threads), *measure(run_sampling, args, "new", num_threads))
+        report("uniform replace ({} threads)".format(num_threads),
+               *measure(run_sampling, args, "new", num_threads, True))
+        report("weighted ({} threads)".format(num_threads),
+               *measure(run_sampling, args, "new", num_threads, False, True))
+        report("weighted replace ({} threads)".format(num_threads),
+               *measure(run_sampling, args, "new", num_threads, True, True))
+
+    print("sage sampling, fanouts {} batch {}".format(args.sage_fanouts, args.sage_batch_size))
+    report("python reindex pipeline", *measure(run_sage, args, "old", 1))
+    for num_threads in args.threads:
+        report("sample_multi_hop ({} threads)".format(num_threads), *measure(run_sage, args, "new", num_threads))
@@ -0,0 +1,51 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Helpers shared by the micro benchmarks."""
+import time
+import resource
+import multiprocessing
+
+
+def _run_child(fn, args, conn):
+    """run fn in a fresh process so ru_maxrss only covers this case"""
+    start = time.perf_counter()
+    extra = fn(*args)
+    elapsed = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    conn.send((elapsed, peak_rss_mb, extra))
+    conn.close()
+
+
+def measure(fn, *args):
+    """
+    Run fn(*args) in a forked process.
+
+    Returns:
+        (elapsed seconds, peak RSS in MB of the child process, return value of fn)
+    """
+    ctx = multiprocessing.get_context("fork")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run_child, args=(fn, args, child_conn))
+    proc.start()
+    res = parent_conn.recv()
+    proc.join()
+    return res
+
+
+def report(name, elapsed, peak_rss_mb, extra=None):
+    line = "{:<40s} time {:>9.3f} s   peak rss {:>9.1f} MB".format(name, elapsed, peak_rss_mb)
+    if extra:
+        line += "   " + str(extra)
+    print(line, flush=True)
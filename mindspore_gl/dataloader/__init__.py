@@ -14,13 +14,14 @@
 # ============================================================================
 """Dataloader for graph networks."""
 from .split_data import split_data
-from .samplers import RandomBatchSampler
+from .samplers import RandomBatchSampler, PackedBatchSampler
 from .dataset import Dataset
 
 
 __all__ = [
     "split_data",
     "RandomBatchSampler",
+    "PackedBatchSampler",
     "Dataset"
 ]
 __all__.sort()
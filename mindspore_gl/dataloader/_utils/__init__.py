@@ -14,7 +14,7 @@
 # ============================================================================
 """utils"""
 from .fetch import _MapDatasetFetcher, _IterableDatasetFetcher
-from .worker import _worker_loop
+from .worker import _worker_loop, ThreadQueue, WorkerThread
 from .concurrent_fetch import _concurrent_fetch_loop, MP_STATUS_CHECK_INTERVAL
 
 __all__ = [
@@ -22,5 +22,7 @@ __all__ = [
     "MP_STATUS_CHECK_INTERVAL",
     "_concurrent_fetch_loop",
     "_IterableDatasetFetcher",
-    "_worker_loop"
+    "_worker_loop",
+    "ThreadQueue",
+    "WorkerThread"
 ]
@@ -13,6 +13,7 @@
 # limitations under the License.
 # ============================================================================
 """Fetcher"""
+import time
 
 
 class _BaseDatasetFetcher:
@@ -48,3 +49,9 @@ class _MapDatasetFetcher(_BaseDatasetFetcher):
     def fetch(self, possibly_batched_index):
         data = self.dataset[possibly_batched_index]
         return self.collate_fn(data)
+
+    def fetch_timed(self, possibly_batched_index):
+        """fetch, also returning the `time.perf_counter` at which `__getitem__` returned"""
+        data = self.dataset[possibly_batched_index]
+        getitem_end = time.perf_counter()
+        return self.collate_fn(data), getitem_end
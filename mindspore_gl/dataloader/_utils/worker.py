@@ -18,9 +18,15 @@
 #pylint: disable=R1723
 
 import os
+import time
 import queue
+import threading
+import numpy as np
 from .fetch import _MapDatasetFetcher
 from ..utils import ExceptionWrapper
+from ..shared_numpy.ring import SharedRing, slot_nbytes, _map_arrays
+from ..shared_numpy.shared_memory import set_name_scope
+from ..samplers import resolve_index
 
 class _DatasetKind:
     @staticmethod
@@ -30,6 +36,28 @@ class _DatasetKind:
 MP_STATUS_CHECK_INTERVAL = 5.0
 
 
+class ThreadQueue(queue.Queue):
+    """queue.Queue with the methods of the multiprocessing queues the DataLoader calls, for thread workers"""
+
+    def cancel_join_thread(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class WorkerThread(threading.Thread):
+    """thread running `_worker_loop`, with the process API the DataLoader uses"""
+
+    @property
+    def pid(self):
+        # tells the workers apart in the profiler
+        return self.native_id
+
+    def terminate(self):
+        """threads cannot be killed, they exit on the final signal"""
+
+
 class ManagerWatchdog:
     def __init__(self):
         self.manager_pid = os.getppid()
@@ -41,9 +69,31 @@ class ManagerWatchdog:
         return not self.manager_dead
 
 
-def _worker_loop(dataset, index_queue, data_queue, done_event, collate_fn, worker_id):
+def _send_through_ring(ring, ring_spec, data):
+    """write `data` to the worker's ring, created on the first batch, returns the ring and what to send"""
+    if isinstance(data, ExceptionWrapper):
+        return ring, data
+    if ring is None:
+        num_slots, slot_bytes = ring_spec
+        if not slot_bytes:
+            # size the slots from the first batch with some headroom for batches of varying size
+            slot_bytes = slot_nbytes(data) * 5 // 4
+        if slot_bytes == 0:
+            return ring, data
+        ring = SharedRing(num_slots, slot_bytes)
+    ring_slot = ring.write(data)
+    # batches larger than a slot, or produced while every slot is held, go through the queue
+    return ring, data if ring_slot is None else ring_slot
+
+
+def _worker_loop(dataset, index_queue, data_queue, done_event, collate_fn, worker_id, ring_spec=None,
+                 sampler=None, segment_scope=None, copy_arrays=False, taken=None):
     """worker loop"""
 
+    if segment_scope is not None:
+        # name the shared memory of this worker after the run and its pid, for the trainer's registry
+        set_name_scope(segment_scope)
+    ring = None
     try:
 
         init_exception = None
@@ -73,21 +123,39 @@ def _worker_loop(dataset, index_queue, data_queue, done_event, collate_fn, worke
                 # processing steps.
                 continue
             idx, index = r
+            if taken is not None:
+                # the task came from the shared queue, the trainer counts it against this worker
+                taken[worker_id] += 1
+            start = time.perf_counter()
+            getitem_end = None
             data = None
             if init_exception is not None:
                 data = init_exception
                 init_exception = None
             else:
                 try:
-                    data = fetcher.fetch(index)
+                    # samplers yielding BatchIndex send two integers, the batch is rebuilt here
+                    data, getitem_end = fetcher.fetch_timed(resolve_index(sampler, index))
+                    if copy_arrays:
+                        # thread workers hand over the batch itself, datasets padding into a reused buffer
+                        # would overwrite the batches the consumer still holds
+                        data = _map_arrays(data, np.array)
                 except Exception as e: #pylint: disable=W0703
                     print(e)
                     data = ExceptionWrapper(e, where="in DataLoader worker process {}".format(worker_id))
-            data_queue.put((idx, data))
-            del data, idx, index, r  # save memory
+            collate_end = time.perf_counter()
+            if ring_spec is not None:
+                ring, data = _send_through_ring(ring, ring_spec, data)
+            # perf_counter is a system wide clock, the main process places these next to its own timings
+            times = (start, collate_end if getitem_end is None else getitem_end, collate_end, time.perf_counter())
+            data_queue.put((idx, worker_id, data, times))
+            del data, idx, index, r, times  # save memory
     except KeyboardInterrupt:
         # Main process will raise KeyboardInterrupt anyways.
         pass
+    if ring is not None:
+        # the trainer unlinks the ring when it attaches, this covers a ring it never read from
+        ring.unlink()
     if done_event.is_set():
         data_queue.cancel_join_thread()
         data_queue.close()
@@ -15,6 +15,9 @@
 """DataLoader."""
 # pylint:disable=R1705,W0212,C0209,W0703,C1801,C0330,C0326
 import os
+import math
+import weakref
+import time
 import itertools
 import warnings
 import tempfile
@@ -27,13 +30,30 @@ import mindspore.dataset as ds
 from . import _utils
 from .dataset import Dataset
 from .utils import ExceptionWrapper, default_collate
+from .profiler import PipelineProfiler
+from .samplers import resolve_index
 from .shared_numpy import Queue as MultiProcessQueue
+from .shared_numpy import SharedRing, RingSlot, SegmentRegistry, SegmentJanitor
 
 Tco = TypeVar('Tco', covariant=True)
 T = TypeVar('T')
 CollateFn = Callable[[List[T]], Any]
 
 
+# the adaptive mode keeps a fifth more workers busy than the measured rates need, and counts a wait as
+# starving the consumer past 1 ms or a twentieth of its step
+_ADAPTIVE_HEADROOM = 1.2
+_ADAPTIVE_STARVED_SECONDS = 1e-3
+_ADAPTIVE_STARVED_RATIO = 0.05
+_ADAPTIVE_SMOOTHING = 0.2
+
+
+def _moving_average(average, value):
+    if average is None:
+        return value
+    return average + _ADAPTIVE_SMOOTHING * (value - average)
+
+
 class _DatasetKind:
     @staticmethod
     def create_fetcher(dataset, collate_fn):
@@ -45,6 +65,10 @@ class DataLoader(Generic[Tco]):
     Graph data loader. Combines a dataset and a sampler, and provides an iterable over
     the given dataset.
 
+    Shared memory created by the workers is named after the iterator and the worker pid. The blocks of a
+    worker killed mid batch are unlinked within a few seconds, the blocks of every worker at shutdown and at
+    exit, batches already returned stay valid. The iterator's `segments` reports the blocks still linked.
+
     Args:
         dataset (Dataset): dataset from which to load the graph data.
         sampler (Sampler or Iterable, optional): defines the strategy to draw
@@ -62,8 +86,36 @@ class DataLoader(Generic[Tco]):
         persistent_workers (bool, optional): If ``True``, the data loader will not shutdown
             the worker processes after a dataset has been consumed once. This allows to
             maintain the workers `Dataset` instances alive. (default: ``False``)
+        in_order (bool, optional): If ``True``, batches are returned in sampler order and every task is
+            sent to the worker with the fewest outstanding tasks. If ``False``, workers pull tasks from one
+            shared queue and batches are returned as soon as they are ready, so a slow batch does not hold
+            back the ones behind it. (default: ``True``)
+        shared_ring (bool, optional): If ``True``, each worker writes its batches into a preallocated ring of
+            shared memory slots and only sends a small descriptor, the numpy arrays of a batch are returned as
+            views of the slot, which is reused once they are garbage collected. Batches that do not fit in a
+            slot, or are produced while all slots are held, go through the queue. (default: ``False``)
+        slot_bytes (int, optional): bytes of a ring slot, e.g. computed from the padded batch shapes. ``0``
+            sizes the slots from the first batch of each worker with a quarter of headroom. (default: ``0``)
+        adaptive (bool, optional): If ``True``, `num_workers` and `prefetch_factor` become upper bounds. The
+            loader measures the time the consumer spends between batches and the time a worker takes to
+            produce one, keeps just enough workers busy to keep up, parks the others, and raises the number
+            of outstanding tasks when the consumer had to wait and lowers it when batches pile up. The chosen
+            values are reported by the iterator's `metrics`. (default: ``False``)
+        min_workers (int, optional): lower bound of the active workers when `adaptive` is ``True``.
+            (default: ``1``)
+        profile (bool, optional): If ``True``, the iterator records the sampler, `__getitem__`, collate,
+            transport, wait and step time of every batch and the queue depths in its `profiler`, a
+            `PipelineProfiler` exporting them as histograms, JSON or a Chrome trace. (default: ``False``)
+        backend (str, optional): ``"process"`` runs the workers in subprocesses. ``"thread"`` runs them as
+            threads of the main process sharing the dataset, with the same ordering and prefetching: nothing is
+            pickled or sent through shared memory and no process is started. It suits datasets whose sampling
+            and gathering release the GIL, like the sampling and array kernels and numpy fancy indexing, and
+            datasets too large to be held by every worker. The workers call `__getitem__` of the same dataset
+            concurrently, so it must be thread-safe. The numpy arrays of each batch are copied, as the pad
+            operators reuse their buffers. (default: ``"process"``)
 
     Examples:
+        >>> import numpy as np
         >>> from mindspore_gl.dataloader.dataset import Dataset
         >>> from mindspore_gl.dataloader.samplers import RandomBatchSampler
         >>> from mindspore_gl.dataloader.dataloader import DataLoader
@@ -73,7 +125,7 @@ class DataLoader(Generic[Tco]):
             ......self.len = len(data)
             ............
             ...def __getitem__(self, idx):
-            ......if isinstance(idx, list):
+            ......if isinstance(idx, (list, np.ndarray)):
             .........value = []
             .........for id in idx:
             ............value.append(self.data[id])
@@ -98,13 +150,23 @@ class DataLoader(Generic[Tco]):
     timeout: float
     prefetch_factor: int
     persistent_workers: bool
+    in_order: bool
+    shared_ring: bool
+    slot_bytes: int
+    adaptive: bool
+    min_workers: int
+    profile: bool
+    backend: str
     iterator: Optional['_BaseDataLoaderIter']
     initialized = False
 
     def __init__(self, dataset: Dataset[Tco], sampler: ds.Sampler,
                  num_workers: int = 0, collate_fn: Optional[CollateFn] = None,
                  timeout: float = 0.0, prefetch_factor: int = 2,
-                 persistent_workers: bool = True):
+                 persistent_workers: bool = True, in_order: bool = True,
+                 shared_ring: bool = False, slot_bytes: int = 0,
+                 adaptive: bool = False, min_workers: int = 1, profile: bool = False,
+                 backend: str = "process"):
 
         if not isinstance(num_workers, int) or num_workers < 0:
             raise TypeError("num_workers option should be non-negative; "
@@ -123,6 +185,12 @@ class DataLoader(Generic[Tco]):
             raise ValueError('prefetch_factor option could only be specified in multiprocessing.'
                              'let num_workers > 0 to enable multiprocessing.')
 
+        if backend not in ("process", "thread"):
+            raise ValueError("For backend, DataLoader expect 'process' or 'thread', but got {}.".format(backend))
+
+        if backend == "thread" and shared_ring:
+            raise ValueError("shared_ring option could only be specified with backend='process'.")
+
         self.dataset = dataset
         self.num_workers = num_workers
         self.prefetch_factor = prefetch_factor
@@ -133,6 +201,18 @@ class DataLoader(Generic[Tco]):
             collate_fn = default_collate
         self.collate_fn = collate_fn
         self.persistent_workers = persistent_workers
+        self.in_order = in_order
+        self.shared_ring = shared_ring
+        self.slot_bytes = slot_bytes
+        self.adaptive = adaptive
+        self.min_workers = min_workers
+        self.profile = profile
+        self.backend = backend
+        # iterator of the running epoch, batches to skip when a sampler without state is resumed and batches
+        # after the resume point returned before the state was taken
+        self._latest_iterator = None
+        self._skip_batches = 0
+        self._skip_returned = ()
 
         if not isinstance(dataset, Dataset):
             raise TypeError("For dataset, Dataloader expect a Dataset instance, but got {}.".format(dataset))
@@ -146,6 +226,24 @@ class DataLoader(Generic[Tco]):
         if not isinstance(persistent_workers, bool):
             raise TypeError("For persistent_workers, DataLoader expect a bool, but got {}.".format(persistent_workers))
 
+        if not isinstance(in_order, bool):
+            raise TypeError("For in_order, DataLoader expect a bool, but got {}.".format(in_order))
+
+        if not isinstance(shared_ring, bool):
+            raise TypeError("For shared_ring, DataLoader expect a bool, but got {}.".format(shared_ring))
+
+        if not isinstance(slot_bytes, int) or slot_bytes < 0:
+            raise TypeError("For slot_bytes, DataLoader expect a non-negative int, but got {}.".format(slot_bytes))
+
+        if not isinstance(adaptive, bool):
+            raise TypeError("For adaptive, DataLoader expect a bool, but got {}.".format(adaptive))
+
+        if not isinstance(min_workers, int) or min_workers <= 0:
+            raise TypeError("For min_workers, DataLoader expect a positive int, but got {}.".format(min_workers))
+
+        if not isinstance(profile, bool):
+            raise TypeError("For profile, DataLoader expect a bool, but got {}.".format(profile))
+
         self.check_worker_number_rationality()
 
     def _getiterator(self) -> '_BaseDataLoaderIter':
@@ -158,7 +256,9 @@ class DataLoader(Generic[Tco]):
     # pylint: disable=C0209
     def __setattr__(self, attr, val):
         if self.initialized and attr in ('batch_size', 'batch_sampler', 'sampler',
-                                         'drop_last', 'dataset', 'persistent_workers'):
+                                         'drop_last', 'dataset', 'persistent_workers', 'in_order',
+                                         'shared_ring', 'slot_bytes', 'adaptive', 'min_workers',
+                                         'profile'):
             raise ValueError('{} attribute should not be set after {} is '
                              'initialized'.format(attr, self.__class__.__name__))
 
@@ -171,9 +271,47 @@ class DataLoader(Generic[Tco]):
                 self.iterator = self._getiterator()
             else:
                 self.iterator._reset(self)
-            return self.iterator
+            it = self.iterator
         else:
-            return self._getiterator()
+            it = self._getiterator()
+        self._latest_iterator = weakref.ref(it)
+        return it
+
+    def state_dict(self):
+        """
+        Position of the loader: the state of the sampler at the first batch not returned yet, so batches
+        prefetched by workers are not counted. That needs a sampler state with `epoch` and `batch`, the next
+        batch to yield, as `RandomBatchSampler` has. For other samplers with `state_dict`, their state at the
+        start of the running epoch and the batches of the epoch before that batch, for samplers without
+        `state_dict` only those batches. With `in_order=False` later batches may have been returned already,
+        they are listed in `returned` by their offset from that batch and skipped when resuming.
+
+        Returns:
+            dict, `sampler` holding the state of the sampler, `num_yielded` or both. `returned` if it is not
+            empty.
+        """
+        it = self._latest_iterator() if self._latest_iterator is not None else None
+        if it is not None:
+            return it._state_dict()
+        if hasattr(self.sampler, "state_dict"):
+            return {"sampler": self.sampler.state_dict()}
+        return {"num_yielded": self._skip_batches}
+
+    def load_state_dict(self, state_dict):
+        """
+        Continue from a `state_dict` at the next `iter(loader)`. Samplers with `epoch` and `batch` in their
+        state start at the next unconsumed batch directly. Other samplers with `load_state_dict` are restored
+        to the start of the epoch, then they and samplers without it are run and their first `num_yielded`
+        batches skipped. Persistent workers are kept, the tasks still outstanding are received and dropped.
+
+        Args:
+            state_dict(dict): returned by `state_dict`.
+        """
+        if "sampler" in state_dict:
+            self.sampler.load_state_dict(state_dict["sampler"])
+        self._skip_batches = state_dict.get("num_yielded", 0)
+        self._skip_returned = tuple(state_dict.get("returned", ()))
+        self._latest_iterator = None
 
     @property
     def index_sampler(self):
@@ -246,32 +384,111 @@ class _BaseDataLoaderIter:
         self._prefetch_factor = loader.prefetch_factor
         self._timeout = loader.timeout
         self._collate_fn = loader.collate_fn
-        self._sampler_iter = iter(self._index_sampler)
+        self._start_epoch(loader)
         self._persistent_workers = loader.persistent_workers
+        self._in_order = loader.in_order
         self._shutdown = False
-        self._num_yielded = 0
         self._profile_name = "enumerate(DataLoader)#{}.__next__".format(self.__class__.__name__)
+        self._profiler = PipelineProfiler(self._profile_name) if loader.profile else None
+        # time the __next__ calls and the consumer steps between them
+        self._timed = self._profiler is not None
+        self._last_yield = None
 
     def __iter__(self) -> '_BaseDataLoaderIter':
         return self
 
+    @property
+    def profiler(self):
+        """`PipelineProfiler` of a DataLoader created with `profile=True`, else None"""
+        return self._profiler
+
     # pylint: disable=W0613
     def _reset(self, loader, first_iter=False):
+        # __init__ already started the first epoch of the sampler
+        if not first_iter:
+            self._start_epoch(loader)
+        # time between epochs is not consumer step time
+        self._last_yield = None
+
+    def _start_epoch(self, loader):
+        """start an epoch of the sampler, skipping the batches a resumed sampler without state consumed"""
+        # loaded again, the state before iter makes the sampler run this epoch, for samplers stating their
+        # position it is the epoch and batch the iteration starts at
+        self._epoch_start = self._index_sampler.state_dict() if hasattr(self._index_sampler, "state_dict") \
+            else None
         self._sampler_iter = iter(self._index_sampler)
-        self._num_yielded = 0
+        # positions are counted from the epoch start, every batch before `_num_yielded` and the ones in
+        # `_returned` were returned
+        self._num_yielded = loader._skip_batches
+        self._returned = {self._num_yielded + offset for offset in loader._skip_returned}
+        loader._skip_batches = 0
+        loader._skip_returned = ()
+        for _ in range(self._num_yielded):
+            next(self._sampler_iter, None)
+        self._sampler_pos = self._num_yielded
+        self._index_pos = None
+        self._returned_pos = None
+
+    def _state_dict(self):
+        """state of the loader after the batches returned so far"""
+        if self._epoch_start is None:
+            state_dict = {"num_yielded": self._num_yielded}
+        elif "epoch" not in self._epoch_start or "batch" not in self._epoch_start:
+            # the position in the sampler's state is unknown, resuming replays the epoch from its start
+            state_dict = {"sampler": self._epoch_start, "num_yielded": self._num_yielded}
+        else:
+            state = dict(self._epoch_start)
+            state["batch"] += self._num_yielded
+            if state["batch"] >= len(self._index_sampler):
+                state["epoch"], state["batch"] = state["epoch"] + 1, 0
+            state_dict = {"sampler": state}
+        if self._returned:
+            state_dict["returned"] = sorted(pos - self._num_yielded for pos in self._returned)
+        return state_dict
 
     def _next_index(self):
-        return next(self._sampler_iter)  # may raise StopIteration
+        """next index of the sampler not returned before the resume, its position is left in `_index_pos`"""
+        while True:
+            index = next(self._sampler_iter)  # may raise StopIteration
+            self._sampler_pos += 1
+            if self._sampler_pos - 1 not in self._returned:
+                self._index_pos = self._sampler_pos - 1
+                return index
+
+    def _batch_returned(self, pos):
+        """the batch at `pos` was returned, move the low-water mark over the returned batches"""
+        self._returned.add(pos)
+        while self._num_yielded in self._returned:
+            self._returned.remove(self._num_yielded)
+            self._num_yielded += 1
 
     def _next_data(self):
         raise NotImplementedError
 
     def __next__(self) -> Any:
+        if not self._timed:
+            data = self._next_data()
+            self._batch_returned(self._returned_pos)
+            return data
+        start = time.perf_counter()
+        if self._last_yield is not None:
+            self._on_step(self._last_yield, start)
         data = self._next_data()
-        self._num_yielded += 1
-
+        self._batch_returned(self._returned_pos)
+        self._last_yield = time.perf_counter()
+        self._on_next(start, self._last_yield)
         return data
 
+    def _on_step(self, start, end):
+        """the consumer spent `start` to `end` between two batches"""
+        if self._profiler is not None:
+            self._profiler.record("step", start, end, self._num_yielded)
+
+    def _on_next(self, start, end):
+        """a __next__ call ran from `start` to `end`"""
+        if self._profiler is not None:
+            self._profiler.record("next", start, end, self._num_yielded - 1)
+
     next = __next__  # Python 2 compatibility
 
     def __len__(self) -> int:
@@ -291,8 +508,20 @@ class _SingleProcessDataLoaderIter(_BaseDataLoaderIter):
         self._dataset_fetcher = _DatasetKind.create_fetcher(self._dataset, self._collate_fn)
 
     def _next_data(self):
-        index = self._next_index()  # may raise StopIteration
-        data = self._dataset_fetcher.fetch(index)  # may raise StopIteration
+        if self._profiler is None:
+            index = resolve_index(self._index_sampler, self._next_index())  # may raise StopIteration
+            self._returned_pos = self._index_pos
+            data = self._dataset_fetcher.fetch(index)  # may raise StopIteration
+            return data
+        start = time.perf_counter()
+        index = resolve_index(self._index_sampler, self._next_index())  # may raise StopIteration
+        self._returned_pos = self._index_pos
+        sampler_end = time.perf_counter()
+        data, getitem_end = self._dataset_fetcher.fetch_timed(index)  # may raise StopIteration
+        collate_end = time.perf_counter()
+        self._profiler.record("sampler", start, sampler_end, self._num_yielded)
+        self._profiler.record("getitem", sampler_end, getitem_end, self._num_yielded)
+        self._profiler.record("collate", getitem_end, collate_end, self._num_yielded)
         return data
 
     def __getstate__(self):
@@ -309,21 +538,52 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
         assert self._prefetch_factor > 0
 
         self._worker_queue_idx_cycle = itertools.cycle(range(self._num_workers))
-        self._worker_result_queue = MultiProcessQueue()  # type: ignore[var-annotated]
+        # thread workers share the dataset and exchange batches through plain queues
+        self._thread_backend = loader.backend == "thread"
+        if self._thread_backend:
+            make_queue, make_worker = _utils.ThreadQueue, _utils.WorkerThread
+            self._workers_done_event = threading.Event()
+        else:
+            make_queue, make_worker = MultiProcessQueue, multiprocessing.Process
+            self._workers_done_event = multiprocessing.Event()
+        if not self._thread_backend:
+            # declared read-only arrays are attached by name in the workers instead of copied
+            self._dataset.share_memory()
+        self._worker_result_queue = make_queue()  # type: ignore[var-annotated]
         self._worker_pids_set = False
         self._shutdown = False
-        self._workers_done_event = multiprocessing.Event()
 
         self._index_queues = []
         self._workers = []
+        # shared memory of the workers is named after this run, found and unlinked by the registry
+        self._segments = SegmentRegistry()
+        self._janitor = None
+        # a worker keeps at most prefetch_factor batches in flight, plus the one being trained on
+        ring_spec = (self._prefetch_factor + 2, loader.slot_bytes) if loader.shared_ring else None
+        self._rings = {}
+        # out of order delivery: idle workers pull from one shared task queue
+        shared_index_queue = None
+        # tasks each worker took from the shared queue and the ones received from it, since the start
+        self._worker_taken = None
+        self._worker_received = [0] * self._num_workers
+        if not self._in_order:
+            shared_index_queue = make_queue()
+            shared_index_queue.cancel_join_thread()
+            self._worker_taken = [0] * self._num_workers if self._thread_backend \
+                else multiprocessing.Array("q", self._num_workers, lock=False)
+        # a name scope is per process, thread workers keep the one of the main process
+        segment_scope = None if self._thread_backend else self._segments.run
         for i in range(self._num_workers):
-            index_queue = MultiProcessQueue()
-            index_queue.cancel_join_thread()
-            w = multiprocessing.Process(
+            index_queue = shared_index_queue
+            if index_queue is None:
+                index_queue = make_queue()
+                index_queue.cancel_join_thread()
+            w = make_worker(
                 target=_utils.worker._worker_loop,
                 args=(self._dataset, index_queue,
                       self._worker_result_queue, self._workers_done_event,
-                      self._collate_fn, i)
+                      self._collate_fn, i, ring_spec, self._index_sampler, segment_scope, self._thread_backend,
+                      self._worker_taken)
             )
             w.daemon = True
             w.start()
@@ -331,59 +591,247 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
             self._workers.append(w)
 
         self._fetch_thread_done_event = threading.Event()
+        if not self._thread_backend:
+            # unlinks the shared memory of workers killed while the run goes on
+            self._janitor = SegmentJanitor(self._segments, interval=_utils.MP_STATUS_CHECK_INTERVAL)
+            self._janitor.start()
+
+        if ring_spec is not None or self._thread_backend:
+            # descriptors are tiny and thread workers put batches as they are, read them straight from the
+            # workers without the relay thread
+            self._data_queue = self._worker_result_queue
+            self._concurrent_fetch_thread = None
+        else:
+            # Queue is not type-annotated
+            self._data_queue = queue.Queue()  # type: ignore[var-annotated]
+            fetch_thread = threading.Thread(
+                target=_utils.concurrent_fetch._concurrent_fetch_loop,
+                args=(self._worker_result_queue, self._data_queue,
+                      self._fetch_thread_done_event))
+            fetch_thread.daemon = True
+            fetch_thread.start()
 
-        # Queue is not type-annotated
-        self._data_queue = queue.Queue()  # type: ignore[var-annotated]
-        fetch_thread = threading.Thread(
-            target=_utils.concurrent_fetch._concurrent_fetch_loop,
-            args=(self._worker_result_queue, self._data_queue,
-                  self._fetch_thread_done_event))
-        fetch_thread.daemon = True
-        fetch_thread.start()
-
-        self._concurrent_fetch_thread = fetch_thread
-
-        self._data_queue = self._data_queue
+            self._concurrent_fetch_thread = fetch_thread
 
         # .pid can be None only before process is spawned (not the case, so ignore)
         self._worker_pids_set = True
+
+        self._adaptive = loader.adaptive
+        self._timed = self._timed or self._adaptive
+        self._next_wait = 0.0
+        self._min_workers = min(loader.min_workers, self._num_workers)
+        # start from the upper bounds so the first batches are not starved, then shrink
+        self._active_workers = self._num_workers
+        self._target_outstanding = self._prefetch_factor * self._num_workers
+        self._step_time = None
+        self._fetch_time = None
+        self._wait_time = 0.0
+        self._calm_steps = 0
         self._reset(loader, first_iter=True)
 
     def _reset(self, loader, first_iter=False):
+        # tasks of an epoch left early would be mistaken for tasks of the new one
+        while not first_iter and self._tasks_outstanding > 0:
+            self._receive()
         super()._reset(loader, first_iter)
         self._send_idx = 0
         self._rcvd_idx = 0
 
         self._task_info = {}
+        # position in the epoch of each task not returned yet
+        self._task_pos = {}
         self._tasks_outstanding = 0
+        self._worker_outstanding = [0] * self._num_workers
+        self._worker_completed = [0] * self._num_workers
 
         self._workers_status = [True for _ in range(self._num_workers)]
 
-        for _ in range(self._prefetch_factor * self._num_workers):
-            self._try_put_index()
+        self._fill_tasks()
+
+    def _fill_tasks(self):
+        """send tasks until the outstanding target is reached or the sampler is exhausted"""
+        target = self._prefetch_factor * self._num_workers
+        if self._adaptive:
+            target = self._target_outstanding
+        while self._tasks_outstanding < target and self._try_put_index():
+            pass
 
     def _try_put_index(self):
         """try to assign tasks to workers"""
         assert self._tasks_outstanding < self._prefetch_factor * self._num_workers
 
+        # checked first, an index taken from the sampler with no worker left to send it to would be lost
+        if not any(self._workers_status):
+            return False
+        sampler_start = time.perf_counter() if self._profiler is not None else None
         try:
             index = self._next_index()
         except StopIteration:
-            return
-        for _ in range(self._num_workers):  # find the next active worker, if any
-            worker_queue_idx = next(self._worker_queue_idx_cycle)
-            if self._workers_status[worker_queue_idx]:
-                break
-        else:
-            # not found (i.e., didn't break)
-            return
+            return False
+        if sampler_start is not None:
+            self._profiler.record("sampler", sampler_start, time.perf_counter(), self._send_idx)
+        if not self._in_order:
+            # the shared queue, whichever worker is idle first takes the task
+            self._index_queues[0].put((self._send_idx, index))
+            self._task_pos[self._send_idx] = self._index_pos
+            self._tasks_outstanding += 1
+            self._send_idx += 1
+            return True
+
+        # the unparked worker with the fewest outstanding tasks, ties go round-robin
+        worker_queue_idx = None
+        for _ in range(self._num_workers):
+            worker_id = next(self._worker_queue_idx_cycle)
+            if self._workers_status[worker_id] and worker_id < self._active_workers and (
+                    worker_queue_idx is None
+                    or self._worker_outstanding[worker_id] < self._worker_outstanding[worker_queue_idx]):
+                worker_queue_idx = worker_id
+        if worker_queue_idx is None:
+            # every unparked worker is gone, use any worker left
+            worker_queue_idx = next(i for i, status in enumerate(self._workers_status) if status)
+        next(self._worker_queue_idx_cycle)
 
         self._index_queues[worker_queue_idx].put((self._send_idx, index))
         self._task_info[self._send_idx] = (worker_queue_idx,)
+        self._task_pos[self._send_idx] = self._index_pos
+        self._worker_outstanding[worker_queue_idx] += 1
         self._tasks_outstanding += 1
         self._send_idx += 1
+        return True
+
+    @property
+    def worker_outstanding(self):
+        """tasks sent to each worker and not received yet, on the shared queue the ones a worker took"""
+        if self._worker_taken is not None:
+            return [taken - received for taken, received in zip(self._worker_taken, self._worker_received)]
+        return list(self._worker_outstanding)
+
+    @property
+    def worker_completed(self):
+        """batches each worker produced since the epoch started"""
+        return list(self._worker_completed)
+
+    @property
+    def segments(self):
+        """
+        Shared memory blocks the workers created that are still linked.
+
+        Returns:
+            dict, number of `segments`, their `bytes`, and both per worker pid in `owners`.
+        """
+        return self._segments.report()
+
+    @property
+    def metrics(self):
+        """
+        Values chosen by the adaptive mode and queue depths.
+
+        - **active_workers** (int) - workers tasks are sent to, the others are parked.
+        - **target_outstanding** (int) - tasks kept in flight.
+        - **tasks_outstanding** (int) - tasks sent and not received yet.
+        - **ready_batches** (int) - batches received and not returned yet, because an earlier one is missing.
+        - **step_time** (float) - moving average of the seconds the consumer spends between two batches.
+        - **fetch_time** (float) - moving average of the seconds a worker takes to produce a batch.
+        - **wait_time** (float) - seconds the consumer waited for the last batch.
+        """
+        return {
+            "active_workers": self._active_workers,
+            "target_outstanding": self._target_outstanding,
+            "tasks_outstanding": self._tasks_outstanding,
+            "ready_batches": sum(len(info) == 2 for info in self._task_info.values()),
+            "step_time": self._step_time,
+            "fetch_time": self._fetch_time,
+            "wait_time": self._wait_time,
+        }
+
+    def _on_step(self, start, end):
+        super()._on_step(start, end)
+        self._step_time = _moving_average(self._step_time, end - start)
+
+    def _on_next(self, start, end):
+        super()._on_next(start, end)
+        if self._adaptive:
+            self._adapt(self._next_wait)
+        self._next_wait = 0.0
+
+    def _adapt(self, wait_time):
+        """resize the active workers and the outstanding tasks after the consumer waited `wait_time`"""
+        self._wait_time = wait_time
+        if self._step_time is None or self._fetch_time is None:
+            return
+        # a worker produces 1 / fetch_time batches per second, the consumer takes 1 / step_time
+        needed = math.ceil(_ADAPTIVE_HEADROOM * self._fetch_time / max(self._step_time, 1e-6))
+        self._active_workers = min(max(needed, self._min_workers), self._num_workers)
+        if wait_time > max(_ADAPTIVE_STARVED_SECONDS, _ADAPTIVE_STARVED_RATIO * self._step_time):
+            self._target_outstanding += 1
+            self._calm_steps = 0
+        else:
+            self._calm_steps += 1
+            if self._calm_steps >= self._prefetch_factor * self._num_workers:
+                self._target_outstanding -= 1
+                self._calm_steps = 0
+        # every active worker has a task, none has more than prefetch_factor. On the shared task queue of
+        # out of order delivery the parked workers are the ones left idle by the lower outstanding target.
+        self._target_outstanding = min(max(self._target_outstanding, self._active_workers),
+                                       self._prefetch_factor * self._active_workers)
+
+    def _receive(self):
+        """receive one result and update the task accounting"""
+        wait_start = time.perf_counter()
+        idx, worker_id, data, times = self._get_data()
+        received = time.perf_counter()
+        self._next_wait += received - wait_start
+        # times are the worker's start, end of __getitem__, end of collate and send
+        self._fetch_time = _moving_average(self._fetch_time, times[3] - times[0])
+        if isinstance(data, RingSlot):
+            data = self._read_ring(data)
+        self._tasks_outstanding -= 1
+        self._worker_completed[worker_id] += 1
+        self._worker_received[worker_id] += 1
+        if self._in_order:
+            self._worker_outstanding[worker_id] -= 1
+        if self._profiler is not None:
+            self._profile_batch(idx, worker_id, times, wait_start, received)
+        return idx, data
+
+    def _profile_batch(self, idx, worker_id, times, wait_start, received):
+        """record the stages of a received batch and the queue depths"""
+        now = time.perf_counter()
+        pid = self._workers[worker_id].pid
+        self._profiler.record("getitem", times[0], times[1], idx, pid)
+        self._profiler.record("collate", times[1], times[2], idx, pid)
+        self._profiler.record("transport", times[3], now, idx)
+        self._profiler.record("wait", wait_start, received, idx)
+        try:
+            queued = self._data_queue.qsize()
+        except NotImplementedError:
+            # multiprocessing queues do not implement qsize on macOS
+            queued = 0
+        self._profiler.record_depth(now, self._tasks_outstanding,
+                                    sum(len(info) == 2 for info in self._task_info.values()), queued)
+
+    def _read_ring(self, ring_slot):
+        """arrays of a batch a worker wrote to its ring, the ring is mapped on its first batch"""
+        ring = self._rings.get(ring_slot.name)
+        if ring is None:
+            ring = SharedRing(name=ring_slot.name)
+            # both processes have it mapped, the name is no longer needed
+            ring.unlink()
+            self._rings[ring_slot.name] = ring
+        return ring.read(ring_slot)
+
+    def _next_data_unordered(self):
+        if self._tasks_outstanding == 0:
+            if not self._persistent_workers:
+                self._shutdown_workers()
+            raise StopIteration
+        assert not self._shutdown
+        idx, data = self._receive()
+        return self._process_data(data, idx)
 
     def _next_data(self):
+        if not self._in_order:
+            return self._next_data_unordered()
         while True:
 
             while self._rcvd_idx < self._send_idx:
@@ -392,6 +840,7 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
                 if len(info) == 2 or self._workers_status[worker_id]:  # has data or is still active
                     break
                 del self._task_info[self._rcvd_idx]
+                del self._task_pos[self._rcvd_idx]
                 self._rcvd_idx += 1
             else:
                 # no valid `self._rcvd_idx` is found (i.e., didn't break)
@@ -404,18 +853,17 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
             # Check if the next sample has already been generated
             if len(self._task_info[self._rcvd_idx]) == 2:
                 data = self._task_info.pop(self._rcvd_idx)[1]
-                return self._process_data(data)
+                return self._process_data(data, self._rcvd_idx)
 
             assert not self._shutdown and self._tasks_outstanding > 0
-            idx, data = self._get_data()
-            self._tasks_outstanding -= 1
+            idx, data = self._receive()
 
             if idx != self._rcvd_idx:
                 # store out-of-order samples
                 self._task_info[idx] += (data,)
             else:
                 del self._task_info[idx]
-                return self._process_data(data)
+                return self._process_data(data, idx)
 
     def _get_data(self):
         """get data from result queue"""
@@ -445,6 +893,7 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
                     self._mark_worker_as_unavailable(worker_id)
 
             if len(failed_workers) > 0:
+                self._segments.sweep()
                 pids_str = ', '.join(str(w.pid) for w in failed_workers)
                 raise RuntimeError('DataLoader worker (pid(s) {}) exited unexpectedly'.format(pids_str)) from e
             if isinstance(e, queue.Empty):
@@ -469,9 +918,10 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
                         " at the beginning of your code") from None
             raise
 
-    def _process_data(self, data):
+    def _process_data(self, data, idx):
         self._rcvd_idx += 1
-        self._try_put_index()
+        self._returned_pos = self._task_pos.pop(idx)
+        self._fill_tasks()
         if isinstance(data, ExceptionWrapper):
             data.reraise()
         return data
@@ -481,10 +931,12 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
 
         assert self._workers_status[worker_id] or (self._persistent_workers and shutdown)
 
-        # Signal termination to that specific worker.
-        q = self._index_queues[worker_id]
-        # Indicate that no more data will be put on this queue by the current process.
-        q.put(None)
+        # Signal termination to that specific worker. On the shared task queue any worker may take the
+        # signal, so it is only sent on shutdown, once per worker.
+        if self._in_order or shutdown:
+            q = self._index_queues[worker_id]
+            # Indicate that no more data will be put on this queue by the current process.
+            q.put(None)
 
         self._workers_status[worker_id] = False
 
@@ -498,8 +950,9 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
             try:
 
                 self._fetch_thread_done_event.set()
-                self._worker_result_queue.put((None, None))
-                self._concurrent_fetch_thread.join()
+                if self._concurrent_fetch_thread is not None:
+                    self._worker_result_queue.put((None, None))
+                    self._concurrent_fetch_thread.join()
                 self._worker_result_queue.cancel_join_thread()
                 self._worker_result_queue.close()
 
@@ -523,6 +976,10 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
                 for w in self._workers:
                     if w.is_alive():
                         w.terminate()
+                if self._janitor is not None:
+                    self._janitor.stop()
+                # batches already received stay mapped, only the names go
+                self._segments.unlink_all()
 
     def __del__(self):
         self._shutdown_workers()
@@ -15,13 +15,31 @@
 """
 Mappable dataset.
 """
+import atexit
+import os
 from typing import (
     Generic,
+    Tuple,
     TypeVar,
 )
+from .shared_numpy import SharedNDArray
+from .shared_numpy.ring import _map_arrays
+from .shared_numpy.shared_memory import name_scope
+from .shared_numpy.registry import unlink_owned
 
 Tco = TypeVar('Tco', covariant=True)
 
+# name scope of the shared memory of datasets, `unlink_orphans` removes it once the process that created it died
+_DATASET_SCOPE = "dataset"
+# processes unlinking the dataset blocks they created when they exit
+_exit_owners = set()
+
+
+def _unlink_dataset_blocks(pid):
+    # forked children inherit the handler, only the process that created the blocks unlinks them
+    if os.getpid() == pid:
+        unlink_owned(_DATASET_SCOPE, pid)
+
 
 class Dataset(Generic[Tco]):
     r"""
@@ -29,15 +47,60 @@ class Dataset(Generic[Tco]):
     All datasets should subclass it which represent a map relation from key to sample.
     All subclass should overwrite `__getitem__`, which implement fetch a sample given a key.
 
+    Large read-only arrays, like the graph and the node features, can be declared in `shared_arrays`, a tuple
+    of attribute paths. `DataLoader` moves them into shared memory once before starting its worker
+    processes, which then attach to them by name: the dataset is not copied into each worker with spawn, and
+    its pages are not duplicated by copy-on-write with fork.
+
     Supported Platforms:
         ``Ascend`` ``GPU``
 
     Examples:
         >>> from mindspore_gl.dataloader import Dataset
         >>> class MyDataset(Dataset):
+        >>>    shared_arrays = ("feat", "graph._adj_csr")
         >>>    def __init__(self, *args, **kwargs):
         >>>         ...
         >>> my_dataset = MyDataset()
     """
+    shared_arrays: Tuple[str, ...] = ()
+
     def __getitem__(self, index):
         raise NotImplementedError
+
+    def share_memory(self):
+        """
+        Replace the arrays of `shared_arrays` by SharedNDArray of the same content, in place. A path may lead
+        to an array or to tuples, lists and dicts of arrays, e.g. a `CsrAdj`. An array reached by several
+        paths is moved once, arrays already in shared memory are kept. The blocks are unlinked when they are
+        no longer referenced, at the latest when this process exits.
+
+        Returns:
+            int, bytes moved into shared memory.
+
+        Raises:
+            AttributeError: If a path of `shared_arrays` does not exist.
+        """
+        moved = {}
+        # spawned workers attach by name and exit without releasing their reference, the blocks are unlinked when
+        # this process exits instead of when the last reference goes
+        if os.getpid() not in _exit_owners:
+            _exit_owners.add(os.getpid())
+            atexit.register(_unlink_dataset_blocks, os.getpid())
+
+        def to_shared(arr):
+            if isinstance(arr, SharedNDArray) or arr.nbytes == 0:
+                return arr
+            if id(arr) not in moved:
+                with name_scope(_DATASET_SCOPE):
+                    # the source is kept until the end so its id is not reused by another array
+                    moved[id(arr)] = (arr, SharedNDArray.from_numpy_array(arr))
+            return moved[id(arr)][1]
+
+        for path in self.shared_arrays:
+            *parents, name = path.split(".")
+            owner = self
+            for parent in parents:
+                owner = getattr(owner, parent)
+            setattr(owner, name, _map_arrays(getattr(owner, name), to_shared))
+        return sum(shared.nbytes for _, shared in moved.values())
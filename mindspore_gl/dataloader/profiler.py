@@ -0,0 +1,244 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Per stage timing of the DataLoader pipeline."""
+import json
+import math
+import os
+from collections import deque
+import numpy as np
+
+__all__ = ["PipelineProfiler"]
+
+# histogram bucket edges in ms, powers of two from 1 us to about 17 minutes
+_HISTOGRAM_EDGES_MS = 2.0 ** np.arange(-10, 21)
+# durations are counted in buckets of an eighth of those, the percentiles are interpolated from them
+_SUB_BUCKETS = 8
+_FINE_EDGES_MS = 2.0 ** (np.arange(-10 * _SUB_BUCKETS, 20 * _SUB_BUCKETS + 1) / _SUB_BUCKETS)
+
+
+class _StageStats:
+    """count, total, extremes and the histogram of the durations of a stage, updated per record"""
+
+    __slots__ = ("count", "total_ms", "min_ms", "max_ms", "counts")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+        self.counts = [0] * (_FINE_EDGES_MS.shape[0] - 1)
+
+    def add(self, duration_ms):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.min_ms = min(self.min_ms, duration_ms)
+        self.max_ms = max(self.max_ms, duration_ms)
+        bucket = math.floor(math.log2(duration_ms) * _SUB_BUCKETS) if duration_ms > 0 else -math.inf
+        self.counts[min(max(bucket + 10 * _SUB_BUCKETS, 0), len(self.counts) - 1)] += 1
+
+    def percentile(self, q):
+        """`q` percentile, geometric interpolation in the bucket holding it, within the recorded range"""
+        rank = max(q / 100 * self.count, 1e-9)
+        cumulative = np.cumsum(self.counts)
+        bucket = int(np.searchsorted(cumulative, rank))
+        below = cumulative[bucket] - self.counts[bucket]
+        lo, hi = _FINE_EDGES_MS[bucket], _FINE_EDGES_MS[bucket + 1]
+        value = lo * (hi / lo) ** ((rank - below) / self.counts[bucket])
+        return float(min(max(value, self.min_ms), self.max_ms))
+
+
+class _DepthStats:
+    """count, total, maximum and the histogram of a queue depth, updated per sample"""
+
+    __slots__ = ("count", "total", "max", "counts")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.counts = []
+
+    def add(self, depth):
+        self.count += 1
+        self.total += depth
+        self.max = max(self.max, depth)
+        if depth >= len(self.counts):
+            self.counts.extend([0] * (depth + 1 - len(self.counts)))
+        self.counts[depth] += 1
+
+
+class PipelineProfiler:
+    """
+    Records the stages of every batch of a DataLoader created with `profile=True`.
+
+    Stages, all timestamps are `time.perf_counter` seconds, which is shared by the processes of a machine:
+
+    - **sampler** - the sampler producing the indices of a batch, in the main process.
+    - **getitem** - `dataset.__getitem__` in the worker.
+    - **collate** - `collate_fn` in the worker.
+    - **transport** - from the worker sending the batch to the main process holding it, queueing and
+      unpickling or reading the ring slot included.
+    - **wait** - the consumer blocked on the result queue in `__next__`.
+    - **next** - the whole `__next__` call.
+    - **step** - the consumer between two `__next__` calls.
+
+    Queue depths are sampled each time a batch is received: tasks sent and not received, batches received
+    and not returned, batches waiting in the result queue.
+
+    The summary is aggregated as the stages are recorded, its memory does not grow with the batches. The raw
+    events of the Chrome trace are kept for the last `max_events` stages and depth samples.
+
+    Args:
+        name(str, optional): name of the `next` events in the Chrome trace. Default: "next".
+        main_pid(int, optional): pid of the process iterating the DataLoader, None is the current one.
+            Default: None.
+        max_events(int, optional): stages and depth samples kept each for the Chrome trace, the oldest are
+            dropped. Default: 100000.
+
+    Examples:
+        >>> loader = DataLoader(dataset, sampler, num_workers=2, profile=True)
+        >>> it = iter(loader)
+        >>> for batch in it:
+        ...     train(batch)
+        >>> print(it.profiler.summary()["wait"]["p99_ms"])
+        >>> it.profiler.to_chrome_trace("dataloader_trace.json")
+    """
+
+    STAGES = ("sampler", "getitem", "collate", "transport", "wait", "next", "step")
+    DEPTHS = ("tasks_outstanding", "ready_batches", "queued_batches")
+
+    def __init__(self, name="next", main_pid=None, max_events=100000):
+        self.name = name
+        self.main_pid = os.getpid() if main_pid is None else main_pid
+        self.max_events = max_events
+        self.reset()
+
+    def reset(self):
+        """drop everything recorded"""
+        self._stages = {}
+        self._depth_stats = [_DepthStats() for _ in self.DEPTHS]
+        # (stage, batch, pid, start, end) of the trace
+        self._events = deque(maxlen=self.max_events)
+        # (time, tasks_outstanding, ready_batches, queued_batches) of the trace
+        self._depths = deque(maxlen=self.max_events)
+
+    def record(self, stage, start, end, batch=None, pid=None):
+        """
+        Record one stage.
+
+        Args:
+            stage(str): one of `STAGES`.
+            start(float): `time.perf_counter` at the start.
+            end(float): `time.perf_counter` at the end.
+            batch(int, optional): index of the batch in the epoch. Default: None.
+            pid(int, optional): process the stage ran in, None is the main process. Default: None.
+        """
+        stats = self._stages.get(stage)
+        if stats is None:
+            stats = self._stages[stage] = _StageStats()
+        stats.add((end - start) * 1000)
+        self._events.append((stage, batch, self.main_pid if pid is None else pid, start, end))
+
+    def record_depth(self, timestamp, tasks_outstanding, ready_batches, queued_batches):
+        """sample the queue depths"""
+        for stats, depth in zip(self._depth_stats, (tasks_outstanding, ready_batches, queued_batches)):
+            stats.add(depth)
+        self._depths.append((timestamp, tasks_outstanding, ready_batches, queued_batches))
+
+    def durations(self, stage):
+        """durations of a stage in seconds of the events kept for the trace, in the order they were recorded"""
+        return np.array([end - start for name, _, _, start, end in self._events if name == stage])
+
+    def summary(self):
+        """
+        Aggregated stages and queue depths.
+
+        Returns:
+            dict, for every stage recorded, `count`, `total_s`, `mean_ms`, `p50_ms`, `p90_ms`, `p99_ms`,
+            `max_ms` and a `histogram` of `edges_ms` and `counts` over power of two buckets. The percentiles are
+            interpolated from buckets of an eighth of a power of two, within 9% of the recorded durations. For
+            every queue depth, `mean`, `max` and the `histogram` of the depths seen.
+        """
+        res = {}
+        for stage in self.STAGES:
+            stats = self._stages.get(stage)
+            if stats is None:
+                continue
+            counts = np.array(stats.counts).reshape(-1, _SUB_BUCKETS).sum(axis=1)
+            used = np.flatnonzero(counts)
+            lo, hi = used[0], used[-1] + 1
+            res[stage] = {
+                "count": stats.count,
+                "total_s": float(stats.total_ms / 1000),
+                "mean_ms": float(stats.total_ms / stats.count),
+                "p50_ms": stats.percentile(50),
+                "p90_ms": stats.percentile(90),
+                "p99_ms": stats.percentile(99),
+                "max_ms": float(stats.max_ms),
+                "histogram": {"edges_ms": _HISTOGRAM_EDGES_MS[lo:hi + 1].tolist(),
+                              "counts": counts[lo:hi].tolist()},
+            }
+        for name, stats in zip(self.DEPTHS, self._depth_stats):
+            if stats.count:
+                res[name] = {
+                    "mean": stats.total / stats.count,
+                    "max": stats.max,
+                    "histogram": list(stats.counts),
+                }
+        return res
+
+    def to_json(self, path=None):
+        """
+        `summary` as JSON.
+
+        Args:
+            path(str, optional): file to write, None returns the string. Default: None.
+        """
+        text = json.dumps(self.summary(), indent=2)
+        if path is None:
+            return text
+        with open(path, "w") as f:
+            f.write(text)
+        return None
+
+    def to_chrome_trace(self, path=None):
+        """
+        Stages as complete events and queue depths as counters of the Chrome trace format, for
+        chrome://tracing or Perfetto. Each process of the pipeline is a row. Only the last `max_events` of each
+        are in the trace.
+
+        Args:
+            path(str, optional): file to write, None returns the trace as a dict. Default: None.
+        """
+        events = []
+        pids = dict.fromkeys(pid for _, _, pid, _, _ in self._events)
+        pids.setdefault(self.main_pid)
+        for pid in pids:
+            name = "DataLoader main" if pid == self.main_pid else "DataLoader worker {}".format(pid)
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}})
+        for stage, batch, pid, start, end in self._events:
+            events.append({"name": self.name if stage == "next" else stage, "cat": "dataloader", "ph": "X",
+                           "pid": pid, "tid": 0, "ts": start * 1e6, "dur": (end - start) * 1e6,
+                           "args": {"batch": batch}})
+        for timestamp, outstanding, ready, queued in self._depths:
+            events.append({"name": "queue depth", "ph": "C", "pid": self.main_pid, "tid": 0, "ts": timestamp * 1e6,
+                           "args": {"tasks_outstanding": outstanding, "ready_batches": ready,
+                                    "queued_batches": queued}})
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if path is None:
+            return trace
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        return None
@@ -13,17 +13,57 @@
 # limitations under the License.
 # ============================================================================
 """Implement various data sampler."""
-import random
+from typing import NamedTuple
+import numpy as np
 import mindspore.dataset as ds
 
 
+class BatchIndex(NamedTuple):
+    """
+    Index of a batch in the shuffled order of an epoch, what samplers created with `batch_ids=True` yield.
+    The DataLoader sends it to workers, which rebuild the batch with `sampler.batch(epoch, batch)`.
+    """
+    epoch: int
+    batch: int
+
+
+def resolve_index(sampler, index):
+    """the indices of a batch, rebuilt from the sampler when the sampler yielded a `BatchIndex`"""
+    if isinstance(index, BatchIndex):
+        return sampler.batch(index.epoch, index.batch)
+    return index
+
+
+def _as_index_array(data_source):
+    """data source as a numpy array, integer ids as int32 when they fit"""
+    if data_source is None:
+        data_source = []
+    source = np.asarray(data_source)
+    if source.ndim == 0:
+        source = source.reshape(1)
+    if np.issubdtype(source.dtype, np.integer) and source.dtype != np.int32:
+        info = np.iinfo(np.int32)
+        if source.shape[0] == 0 or (source.min() >= info.min and source.max() <= info.max):
+            source = source.astype(np.int32)
+    return source
+
+
 class RandomBatchSampler(ds.Sampler):
     """
-    Random Batched Node Sampler, random sample nodes form graph. The remained sample will be dropped.
+    Random Batched Node Sampler, random sample nodes form graph.
+
+    Each epoch shuffles the data source with a permutation drawn from a numpy Generator seeded with
+    `(seed, epoch)` and yields consecutive slices of it, so an epoch is the same in every process and on every
+    run. Integer ids are yielded as int32 arrays.
 
     Args:
         data_source(Union[List, Tuple, Iterable]): data source sample from.
         batch_size(int): number of sampling subgraphs per batch.
+        drop_last(bool, optional): drop the last batch when it is smaller than `batch_size`. Default: True.
+        seed(int, optional): seed of the shuffling. Default: 0.
+        batch_ids(bool, optional): yield `BatchIndex(epoch, batch)` instead of the indices, the DataLoader
+            workers rebuild the slice from the permutation of the epoch, so only two integers are sent per
+            batch. Default: False.
 
     Raises:
         TypeError: If `batch_size` is not a positive integer.
@@ -37,50 +77,126 @@ class RandomBatchSampler(ds.Sampler):
         >>> sampler = RandomBatchSampler(ds, 3)
         >>> print(list(sampler))
         # results will be random for suffle
-        [[5, 9, 3], [4, 6, 7], [2, 8, 1]]
+        [array([5, 9, 3], dtype=int32), array([4, 6, 7], dtype=int32), array([2, 8, 1], dtype=int32)]
 
     """
-    def __init__(self, data_source, batch_size):
+    def __init__(self, data_source, batch_size, drop_last=True, seed=0, batch_ids=False):
         super().__init__()
-        self.data_source = data_source
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise TypeError("batch_size should be a positive integer value,"
+                            "but got batch_size = {}.".format(batch_size))
+        self.data_source = _as_index_array(data_source)
         self.batch_size = batch_size
-        if self.data_source is None:
-            self.data_source = []
-        if isinstance(self.data_source, tuple):
-            self.data_source = list(self.data_source)
+        self.drop_last = drop_last
+        self.seed = seed
+        self.batch_ids = batch_ids
+        # epoch of the next __iter__ and the batch it starts from
+        self.epoch = 0
+        self.start_batch = 0
+        # epoch and next batch of the last iteration started
+        self._position = None
+        # (epoch, shuffled data source), one attribute so thread workers never see the order of another epoch
+        self._shuffled = None
 
-        if not isinstance(self.batch_size, int) or self.batch_size < 0:
-            raise TypeError("batch_size should be a positive integer value,"
-                            "but got batch_size = {}.".format(self.batch_size))
-        self.epoch = 1
+    def _shuffled_source(self, epoch):
+        """data source in the order of `epoch`, cached for the last epoch asked"""
+        shuffled = self._shuffled
+        if shuffled is None or shuffled[0] != epoch:
+            rng = np.random.default_rng([self.seed, epoch])
+            shuffled = (epoch, self.data_source[rng.permutation(self.data_source.shape[0])])
+            self._shuffled = shuffled
+        return shuffled[1]
+
+    def batch(self, epoch, batch):
+        """
+        Indices of one batch.
+
+        Args:
+            epoch(int): epoch.
+            batch(int): position of the batch in the epoch.
 
-    def _node_iter(self):
-        data_length = len(self.data_source)
-        for i in range(0, data_length, self.batch_size):
-            # Drop reminder
-            if i + self.batch_size <= data_length:
-                yield self.data_source[i: i + self.batch_size]
+        Returns:
+            numpy.ndarray, a slice of the shuffled data source.
+        """
+        begin = batch * self.batch_size
+        return self._shuffled_source(epoch)[begin:begin + self.batch_size]
+
+    def resume(self, epoch, batch=0):
+        """
+        Make the next iteration the given epoch, starting from the given batch.
+
+        Args:
+            epoch(int): epoch to run next.
+            batch(int, optional): first batch of it. Default: 0.
+        """
+        self.epoch = epoch
+        self.start_batch = batch
+        self._position = None
+
+    def state_dict(self):
+        """
+        Seed, epoch and next batch. While an iteration runs, the batch after the last one it yielded, else
+        the start of the next iteration. The shuffling only depends on the seed and the epoch, so they are the
+        whole random state.
+
+        Returns:
+            dict, `seed`, `epoch` and `batch`.
+        """
+        epoch, batch = self.epoch, self.start_batch
+        if self._position is not None:
+            epoch, batch = self._position
+            if batch >= len(self):
+                epoch, batch = epoch + 1, 0
+        return {"seed": self.seed, "epoch": epoch, "batch": batch}
+
+    def load_state_dict(self, state_dict):
+        """
+        Continue from a `state_dict`, the next iteration starts at its batch.
+
+        Args:
+            state_dict(dict): returned by `state_dict`.
+
+        Raises:
+            KeyError: If `state_dict` misses `seed`, `epoch` or `batch`.
+        """
+        self.seed = state_dict["seed"]
+        self._shuffled = None
+        self.resume(state_dict["epoch"], state_dict["batch"])
 
     def __iter__(self):
-        # Reset random seed here if necessary
+        epoch, start = self.epoch, self.start_batch
         self.epoch += 1
-        random.seed(self.epoch)
-        random.shuffle(self.data_source)
-        return self._node_iter()
+        self.start_batch = 0
+        self._position = (epoch, start)
+        return self._batch_iter(epoch, start)
+
+    def _batch_iter(self, epoch, start):
+        for batch in range(start, len(self)):
+            self._position = (epoch, batch + 1)
+            if self.batch_ids:
+                yield BatchIndex(epoch, batch)
+            else:
+                yield self.batch(epoch, batch)
 
     def __len__(self):
-        return len(self.data_source) // self.batch_size
+        if self.drop_last:
+            return self.data_source.shape[0] // self.batch_size
+        return (self.data_source.shape[0] + self.batch_size - 1) // self.batch_size
 
 
-class DistributeRandomBatchSampler(ds.Sampler):
+class DistributeRandomBatchSampler(RandomBatchSampler):
     """
-    Distribute Random Batch Sampler
+    Distribute Random Batch Sampler, the random batch sampler over the every `world_size` th sample starting
+    at `rank`.
 
     Args:
         rank(int): Rank of the current process within distributed group, less than `world_size`
         world_size(int): Number of processes in distributed computing
         data_source(Union[List, Tuple, Iterable]): data source sample from
         batch_size(int): number of sampling subgraphs per batch
+        drop_last(bool, optional): drop the last batch when it is smaller than `batch_size`. Default: True.
+        seed(int, optional): seed of the shuffling. Default: 0.
+        batch_ids(bool, optional): yield `BatchIndex(epoch, batch)` instead of the indices. Default: False.
 
     Raises:
         TypeError: If `batch_size` is not a positive integer.
@@ -96,44 +212,152 @@ class DistributeRandomBatchSampler(ds.Sampler):
         >>> sampler = DistributeRandomBatchSampler(rank_id, world_size, ds, 3)
         >>> print(list(sampler))
         # results will be random for suffle
-        [[10, 18, 6], [8, 12, 14], [4, 16, 2]]
+        [array([10, 18, 6], dtype=int32), array([8, 12, 14], dtype=int32), array([4, 16, 2], dtype=int32)]
 
     """
-    def __init__(self, rank, world_size, data_source, batch_size):
-        super().__init__()
-        if data_source is None:
-            data_source = []
-        if isinstance(data_source, tuple):
-            data_source = list(data_source)
-
-        self.data_source_rank = data_source[rank::world_size]
-        self.batch_size = batch_size
-        self.epoch = 1
-        self.rank = rank
-        self.world_size = world_size
-        if not isinstance(self.batch_size, int) or self.batch_size < 0:
-            raise TypeError("batch_size should be a positive integer value,"
-                            "but got batch_size = {}.".format(self.batch_size))
-        if not isinstance(self.world_size, int) or self.world_size < 0:
+    def __init__(self, rank, world_size, data_source, batch_size, drop_last=True, seed=0, batch_ids=False):
+        if not isinstance(world_size, int) or world_size <= 0:
             raise TypeError("world_size should be a positive integer value,"
-                            "but got world_size = {}.".format(self.world_size))
-        if not isinstance(self.rank, int) or self.rank < 0 or self.rank >= self.world_size:
+                            "but got world_size = {}.".format(world_size))
+        if not isinstance(rank, int) or rank < 0 or rank >= world_size:
             raise TypeError("rank should be a positive integer value less than work_size,"
-                            "but got rank = {}.".format(self.rank))
+                            "but got rank = {}.".format(rank))
+        super().__init__(_as_index_array(data_source)[rank::world_size], batch_size, drop_last, seed, batch_ids)
+        self.rank = rank
+        self.world_size = world_size
 
-    def node_iter(self):
-        data_length = len(self.data_source_rank)
-        for i in range(0, data_length, self.batch_size):
-            # Drop reminder
-            if i + self.batch_size <= data_length:
-                yield self.data_source_rank[i: i + self.batch_size]
+    @property
+    def data_source_rank(self):
+        return self.data_source
 
-    def __iter__(self):
-        # Reset random seed here if necessary
-        self.epoch += 1
-        random.seed(self.epoch)
-        random.shuffle(self.data_source_rank)
-        return self.node_iter()
+
+class PackedBatchSampler(RandomBatchSampler):
+    """
+    Packed Batch Sampler, batches of whole graphs filling node and edge budgets, for graph classification
+    padded to constant shapes.
+
+    Each epoch shuffles the graphs and packs them first fit into batches of at most `max_graphs` graphs and
+    `node_budget - 1` nodes and `edge_budget - 1` edges, leaving a node and an edge for the padding graph, then
+    shuffles the batches. Shuffled graphs mix node and edge heavy graphs in every batch, so both budgets fill,
+    where sorting them from the largest fills the first batches on one budget only. The random state is seeded
+    with `(seed, epoch)` like RandomBatchSampler, the number of batches of an epoch varies with the packing.
+
+    Args:
+        data_source(Union[List, Tuple, Iterable]): graph ids sample from.
+        graph_nodes(Union[numpy.ndarray, List[int]]): accumulative node count of the graphs of the dataset.
+        graph_edges(Union[numpy.ndarray, List[int]]): accumulative edge count of the graphs of the dataset.
+        node_budget(int): padded node count of a batch.
+        edge_budget(int): padded edge count of a batch.
+        max_graphs(int): most graphs per batch.
+        seed(int, optional): seed of the shuffling. Default: 0.
+        batch_ids(bool, optional): yield `BatchIndex(epoch, batch)` instead of the indices. Default: False.
+
+    Raises:
+        TypeError: If `max_graphs` is not a positive integer.
+        ValueError: If a graph does not fit in the budgets.
+
+    Supported Platforms:
+        ``Ascend`` ``GPU``
+
+    Examples:
+        >>> from mindspore_gl.dataloader.samplers import PackedBatchSampler
+        >>> graph_nodes = [0, 6, 9, 11, 15]
+        >>> graph_edges = [0, 10, 14, 16, 22]
+        >>> sampler = PackedBatchSampler(list(range(4)), graph_nodes, graph_edges, 9, 20, 3)
+        >>> print(len(sampler), sampler.report()["node_fill"])
+        2 0.8333333333333334
+    """
+    def __init__(self, data_source, graph_nodes, graph_edges, node_budget, edge_budget, max_graphs, seed=0,
+                 batch_ids=False):
+        super().__init__(data_source, max_graphs, False, seed, batch_ids)
+        self.node_budget = node_budget
+        self.edge_budget = edge_budget
+        self.node_counts = np.diff(np.asarray(graph_nodes, dtype=np.int64))[self.data_source]
+        self.edge_counts = np.diff(np.asarray(graph_edges, dtype=np.int64))[self.data_source]
+        if self.data_source.shape[0] and (self.node_counts.max() >= node_budget or
+                                          self.edge_counts.max() >= edge_budget):
+            raise ValueError("graphs of up to {} nodes and {} edges do not fit in the budgets of {} nodes and {} "
+                             "edges.".format(self.node_counts.max(), self.edge_counts.max(), node_budget,
+                                             edge_budget))
+        # (epoch, batch offsets, graph ids in batch order), one attribute so thread workers never see another epoch
+        self._packed = None
+
+    def _pack(self, epoch):
+        """batch offsets and graph ids of `epoch`, cached for the last epoch asked"""
+        packed = self._packed
+        if packed is not None and packed[0] == epoch:
+            return packed
+        rng = np.random.default_rng([self.seed, epoch])
+        count = self.data_source.shape[0]
+        order = rng.permutation(count)
+        # first fit, batches before `first` can not take any graph
+        room_nodes = np.full(count, self.node_budget - 1, dtype=np.int64)
+        room_edges = np.full(count, self.edge_budget - 1, dtype=np.int64)
+        graphs = np.zeros(count, dtype=np.int64)
+        assigned = np.empty(count, dtype=np.int64)
+        min_nodes, min_edges = (self.node_counts.min(), self.edge_counts.min()) if count else (0, 0)
+        first = opened = 0
+        for pos in order:
+            nodes, edges = self.node_counts[pos], self.edge_counts[pos]
+            fits = np.flatnonzero((room_nodes[first:opened] >= nodes) & (room_edges[first:opened] >= edges) &
+                                  (graphs[first:opened] < self.batch_size))
+            target = first + fits[0] if fits.shape[0] else opened
+            opened = max(opened, target + 1)
+            room_nodes[target] -= nodes
+            room_edges[target] -= edges
+            graphs[target] += 1
+            assigned[pos] = target
+            while first < opened and (graphs[first] == self.batch_size or room_nodes[first] < min_nodes or
+                                      room_edges[first] < min_edges):
+                first += 1
+        # batches in random order, graphs in their batch in random order
+        batch_order = np.empty(opened, dtype=np.int64)
+        batch_order[rng.permutation(opened)] = np.arange(opened)
+        ids = np.lexsort((rng.random(count), batch_order[assigned]))
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(batch_order[assigned], minlength=opened))])
+        packed = (epoch, offsets, self.data_source[ids])
+        self._packed = packed
+        return packed
+
+    def batch(self, epoch, batch):
+        """
+        Indices of one batch.
+
+        Args:
+            epoch(int): epoch.
+            batch(int): position of the batch in the epoch.
+
+        Returns:
+            numpy.ndarray, graph ids of the batch.
+        """
+        _, offsets, ids = self._pack(epoch)
+        return ids[offsets[batch]:offsets[batch + 1]]
+
+    def report(self, epoch=None):
+        """
+        Fill of the padded batches of an epoch.
+
+        Args:
+            epoch(int, optional): epoch, None is the epoch `__len__` counts. Default: None.
+
+        Returns:
+            dict, the `batches` of the epoch, the mean share of the budgets the graphs fill as `node_fill` and
+            `edge_fill`, and the mean `graphs` per batch.
+        """
+        if epoch is None:
+            epoch = self._position[0] if self._position is not None else self.epoch
+        _, offsets, ids = self._pack(epoch)
+        batches = offsets.shape[0] - 1
+        if batches == 0:
+            return {"batches": 0, "node_fill": 0.0, "edge_fill": 0.0, "graphs": 0.0}
+        total = self.data_source.shape[0]
+        return {
+            "batches": batches,
+            "node_fill": float(self.node_counts.sum() / (batches * self.node_budget)),
+            "edge_fill": float(self.edge_counts.sum() / (batches * self.edge_budget)),
+            "graphs": total / batches,
+        }
 
     def __len__(self):
-        return (len(self.data_source_rank) + self.batch_size - 1) // self.batch_size
+        epoch = self._position[0] if self._position is not None else self.epoch
+        return self._pack(epoch)[1].shape[0] - 1
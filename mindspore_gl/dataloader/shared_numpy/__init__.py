@@ -17,7 +17,10 @@ from .reduction import init_reduction
 from .shared_numpy import SharedNDArray
 from .queue import Queue
 from .shared_memory import SharedMemory
+from .ring import SharedRing, RingSlot
+from .registry import SegmentRegistry, SegmentJanitor, segment_report, unlink_orphans, unlink_owned
 
-__all__ = ["Queue", "SharedNDArray", "SharedMemory"]
+__all__ = ["Queue", "SharedNDArray", "SharedMemory", "SharedRing", "RingSlot", "SegmentRegistry", "SegmentJanitor",
+           "segment_report", "unlink_orphans", "unlink_owned"]
 
 init_reduction()
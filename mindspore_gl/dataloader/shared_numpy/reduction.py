@@ -14,6 +14,7 @@
 # ============================================================================
 """reduction method for SharedNDArray"""
 from multiprocessing.reduction import ForkingPickler
+import numpy as np
 import mindspore_gl.memory_kernel as memory_kernel # pylint:disable=R0402
 from .shared_memory import SharedMemory
 from .shared_numpy import SharedNDArray
@@ -28,6 +29,9 @@ def rebuild_shared_ndarray(shm, shape, dtype) -> SharedNDArray:
 
 
 def reduce_shared_ndarray(arr: SharedNDArray):
+    if not hasattr(arr, "_shm") and not hasattr(arr, "_block"):
+        # results of indexing or computing on a SharedNDArray are SharedNDArray without a block, send them by value
+        return np.asarray(arr).__reduce__()
     if arr.shared:
         raise Exception("An Already Shared Array Cannot Be Shared Again")
     memory_kernel.py_inc_ref(arr.shm.buf)
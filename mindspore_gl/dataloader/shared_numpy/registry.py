@@ -0,0 +1,228 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Registry of the shared memory blocks of a run, and cleanup of the blocks of dead processes."""
+import atexit
+import os
+import secrets
+import threading
+import weakref
+
+import mindspore_gl.dataloader.shared_numpy._posixshmem as _posixshmem  # pylint:disable=R0402
+from .shared_memory import _SHM_NAME_PREFIX
+
+__all__ = ["SegmentRegistry", "SegmentJanitor", "segment_report", "unlink_orphans", "unlink_owned"]
+
+_SHM_DIR = "/dev/shm"
+
+
+def _owner(name):
+    """pid in a `psm_<scope>_<pid>_<random>` name, None for names without a scope"""
+    parts = name.split("_")
+    if len(parts) == 4 and parts[2].isdigit():
+        return int(parts[2])
+    return None
+
+
+def _pid_alive(pid):
+    """whether a process runs, zombies of exited children count as dead"""
+    try:
+        with open("/proc/{}/stat".format(pid)) as stat:
+            return stat.read().rsplit(")", 1)[1].split()[0] not in ("Z", "X")
+    except (FileNotFoundError, ProcessLookupError):
+        return False
+    except OSError:
+        # no procfs, only tell whether the pid exists
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+
+def _scan(prefix):
+    """(name, owner pid, bytes) of the blocks whose name starts with `prefix`"""
+    if not os.path.isdir(_SHM_DIR):
+        return []
+    res = []
+    with os.scandir(_SHM_DIR) as entries:
+        for entry in entries:
+            if not entry.name.startswith(prefix):
+                continue
+            try:
+                nbytes = entry.stat().st_size
+            except FileNotFoundError:
+                continue
+            res.append((entry.name, _owner(entry.name), nbytes))
+    return res
+
+
+def _unlink(names):
+    for name in names:
+        try:
+            _posixshmem.shm_unlink(name)
+        except FileNotFoundError:
+            pass
+
+
+def _report(blocks):
+    owners = {}
+    for _, pid, nbytes in blocks:
+        count, total = owners.get(pid, (0, 0))
+        owners[pid] = (count + 1, total + nbytes)
+    return {
+        "segments": len(blocks),
+        "bytes": sum(nbytes for _, _, nbytes in blocks),
+        "owners": {pid: {"segments": count, "bytes": total} for pid, (count, total) in owners.items()},
+    }
+
+
+def segment_report(prefix=_SHM_NAME_PREFIX):
+    """
+    Shared memory blocks of this machine.
+
+    Args:
+        prefix(str, optional): only count the blocks whose name starts with it. Default: "psm_".
+
+    Returns:
+        dict, number of `segments`, their `bytes`, and both per owner pid in `owners`, None for blocks
+        created outside a DataLoader worker.
+    """
+    return _report(_scan(prefix))
+
+
+def unlink_orphans(prefix=_SHM_NAME_PREFIX):
+    """
+    Unlink the blocks of DataLoader workers that no longer run, left by workers or trainers that were killed.
+    Processes that mapped a block keep using it.
+
+    Args:
+        prefix(str, optional): only consider the blocks whose name starts with it. Default: "psm_".
+
+    Returns:
+        int, number of blocks unlinked.
+    """
+    names = [name for name, pid, _ in _scan(prefix) if pid is not None and not _pid_alive(pid)]
+    _unlink(names)
+    return len(names)
+
+
+def unlink_owned(scope, pid=None):
+    """
+    Unlink the blocks a process created in a name scope. Processes that mapped a block keep using it.
+
+    Args:
+        scope(str): name scope the blocks were created in, see `shared_memory.name_scope`.
+        pid(int, optional): the process that created them, None is this process. Default: None.
+
+    Returns:
+        int, number of blocks unlinked.
+    """
+    pid = os.getpid() if pid is None else pid
+    names = [name for name, _, _ in _scan("{}{}_{}_".format(_SHM_NAME_PREFIX, scope, pid))]
+    _unlink(names)
+    return len(names)
+
+
+class SegmentRegistry:
+    """
+    The shared memory blocks created by the processes of a run. The processes call
+    `shared_memory.set_name_scope(registry.run)`, the registry then finds their blocks and owners by name,
+    so nothing is sent per block. Blocks of the run still there at interpreter exit are unlinked.
+
+    Args:
+        run(str, optional): name of the run, without '_'. None is a random one. Default: None.
+
+    Examples:
+        >>> from mindspore_gl.dataloader.shared_numpy import SegmentRegistry
+        >>> registry = SegmentRegistry()
+        >>> print(registry.report())
+        {'segments': 0, 'bytes': 0, 'owners': {}}
+    """
+
+    def __init__(self, run=None):
+        self.run = secrets.token_hex(4) if run is None else run
+        self.prefix = "{}{}_".format(_SHM_NAME_PREFIX, self.run)
+        _live_registries.add(self)
+
+    def segments(self):
+        """(name, owner pid, bytes) of the live blocks of the run"""
+        return _scan(self.prefix)
+
+    def report(self):
+        """
+        Live blocks of the run.
+
+        Returns:
+            dict, number of `segments`, their `bytes`, and both per owner pid in `owners`.
+        """
+        return _report(self.segments())
+
+    def sweep(self):
+        """
+        Unlink the blocks of the processes of the run that no longer run.
+
+        Returns:
+            int, number of blocks unlinked.
+        """
+        names = [name for name, pid, _ in self.segments() if pid != os.getpid() and not _pid_alive(pid)]
+        _unlink(names)
+        return len(names)
+
+    def unlink_all(self):
+        """
+        Unlink every block of the run, processes that mapped a block keep using it.
+
+        Returns:
+            int, number of blocks unlinked.
+        """
+        names = [name for name, _, _ in self.segments()]
+        _unlink(names)
+        return len(names)
+
+
+class SegmentJanitor(threading.Thread):
+    """
+    Daemon thread sweeping a `SegmentRegistry` every `interval` seconds, so the blocks of a process killed
+    mid batch are unlinked while the run goes on.
+
+    Args:
+        registry(SegmentRegistry): the run to sweep.
+        interval(float, optional): seconds between two sweeps. Default: 5.0.
+    """
+
+    def __init__(self, registry, interval=5.0):
+        super().__init__(daemon=True)
+        self.registry = registry
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.registry.sweep()
+
+    def stop(self):
+        """stop sweeping, without waiting for a sweep in progress"""
+        self._stop_event.set()
+
+
+_live_registries = weakref.WeakSet()
+
+
+@atexit.register
+def _unlink_live_registries():
+    for registry in list(_live_registries):
+        registry.unlink_all()
@@ -0,0 +1,233 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Shared memory ring of batch slots."""
+import mmap
+import os
+import weakref
+from typing import Any, NamedTuple, Tuple
+import numpy as np
+
+import mindspore_gl.dataloader.shared_numpy._posixshmem as _posixshmem  # pylint:disable=R0402
+from .shared_memory import _make_filename, _O_CREX
+
+__all__ = ["SharedRing", "RingSlot"]
+
+_ALIGNMENT = 64
+_PAGE = 4096
+# int64 num_slots and slot_bytes, then one state byte per slot
+_META_BYTES = 16
+
+
+def _align(size, alignment=_ALIGNMENT):
+    return (size + alignment - 1) // alignment * alignment
+
+
+class ArraySpec(NamedTuple):
+    """place of one array in the ring"""
+    offset: int
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class RingSlot(NamedTuple):
+    """sent through the queue instead of a batch written to a ring, arrays are replaced by ArraySpec"""
+    name: str
+    slot: int
+    data: Any
+
+
+def _is_plain_array(data):
+    return isinstance(data, np.ndarray) and not data.dtype.hasobject
+
+
+def _map_arrays(data, fn):
+    """apply `fn` to the arrays of nested tuples, lists and dicts, other objects are kept as they are"""
+    if _is_plain_array(data) or isinstance(data, ArraySpec):
+        return fn(data)
+    if isinstance(data, tuple):
+        items = [_map_arrays(item, fn) for item in data]
+        return type(data)(*items) if hasattr(data, "_fields") else tuple(items)
+    if isinstance(data, list):
+        return [_map_arrays(item, fn) for item in data]
+    if type(data) is dict:  # pylint:disable=C0123
+        return {key: _map_arrays(value, fn) for key, value in data.items()}
+    return data
+
+
+def slot_nbytes(data):
+    """bytes a batch takes in a slot"""
+    nbytes = [0]
+
+    def count(arr):
+        nbytes[0] += _align(arr.nbytes)
+        return arr
+
+    _map_arrays(data, count)
+    return nbytes[0]
+
+
+class _SlotLease:
+    """exports the bytes of one slot, the slot is freed once no array viewing it is left"""
+
+    def __init__(self, ring, slot):
+        start = ring.slot_offset(slot)
+        self.ring = ring
+        self.__array_interface__ = {
+            "data": (ring.address + start, False),
+            "shape": (ring.slot_bytes,),
+            "typestr": "|u1",
+            "version": 3,
+        }
+
+
+class SharedRing:
+    """
+    Fixed size slots in one shared memory block, written by one process and read in place by another.
+
+    The writer copies the arrays of a batch into a free slot and sends the small `RingSlot` it gets back
+    instead of the batch, so no shared memory is created, no array is pickled and the pages of the slots are
+    reused from batch to batch. The reader attaches to the block once by name and returns arrays viewing
+    the slot, the slot is free again when every array of its batch is garbage collected.
+
+    Args:
+        num_slots(int, optional): number of slots, used when creating the ring. Default: 0.
+        slot_bytes(int, optional): bytes per slot, rounded up to a page, used when creating the ring.
+            Default: 0.
+        name(str, optional): attach to the ring of this name instead of creating one. Default: None.
+
+    Examples:
+        >>> import numpy as np
+        >>> from mindspore_gl.dataloader.shared_numpy import SharedRing
+        >>> writer = SharedRing(num_slots=2, slot_bytes=1 << 20)
+        >>> ring_slot = writer.write((np.ones([4, 3], np.float32), np.arange(5)))
+        >>> reader = SharedRing(name=writer.name)
+        >>> feat, ids = reader.read(ring_slot)
+        >>> print(feat.shape, ids)
+        (4, 3) [0 1 2 3 4]
+    """
+
+    def __init__(self, num_slots=0, slot_bytes=0, name=None):
+        create = name is None
+        if create:
+            if not isinstance(num_slots, int) or num_slots <= 0:
+                raise TypeError("'num_slots' must be a positive integer, but got {}.".format(num_slots))
+            if not isinstance(slot_bytes, int) or slot_bytes <= 0:
+                raise TypeError("'slot_bytes' must be a positive integer, but got {}.".format(slot_bytes))
+            slot_bytes = _align(slot_bytes, _PAGE)
+            while True:
+                name = _make_filename()
+                try:
+                    fd = _posixshmem.shm_open(name, _O_CREX | os.O_RDWR, mode=0o600)
+                except FileExistsError:
+                    continue
+                break
+            try:
+                os.ftruncate(fd, _align(_META_BYTES + num_slots, _PAGE) + num_slots * slot_bytes)
+            except OSError:
+                os.close(fd)
+                _posixshmem.shm_unlink(name)
+                raise
+        else:
+            fd = _posixshmem.shm_open(name, os.O_RDWR, mode=0o600)
+        # the mapping lives as long as an array viewing it, it is never closed explicitly
+        try:
+            self._memory = np.frombuffer(mmap.mmap(fd, os.fstat(fd).st_size), np.uint8)
+        finally:
+            os.close(fd)
+        self._name = name
+        if create:
+            self._memory[:_META_BYTES].view(np.int64)[:] = (num_slots, slot_bytes)
+        self.num_slots, self.slot_bytes = (int(v) for v in self._memory[:_META_BYTES].view(np.int64))
+        self._states = self._memory[_META_BYTES:_META_BYTES + self.num_slots]
+        self._data_offset = _align(_META_BYTES + self.num_slots, _PAGE)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def address(self):
+        """address of the ring in this process"""
+        return self._memory.ctypes.data
+
+    @property
+    def free_slots(self):
+        return int(np.count_nonzero(self._states == 0))
+
+    def slot_offset(self, slot):
+        return self._data_offset + slot * self.slot_bytes
+
+    def write(self, data):
+        """
+        Copy the arrays of `data` into a free slot.
+
+        Args:
+            data(Any): numpy arrays in nested tuples, lists and dicts, other objects are sent as they are.
+
+        Returns:
+            RingSlot, describing the batch, None when it does not fit in a slot or no slot is free.
+        """
+        if slot_nbytes(data) > self.slot_bytes:
+            return None
+        free = np.flatnonzero(self._states == 0)
+        if free.shape[0] == 0:
+            return None
+        slot = int(free[0])
+        offset = [self.slot_offset(slot)]
+
+        def put(arr):
+            dst = self._memory[offset[0]:offset[0] + arr.nbytes].view(arr.dtype).reshape(arr.shape)
+            np.copyto(dst, arr)
+            spec = ArraySpec(offset[0], arr.shape, arr.dtype.str)
+            offset[0] += _align(arr.nbytes)
+            return spec
+
+        packed = _map_arrays(data, put)
+        self._states[slot] = 1
+        return RingSlot(self.name, slot, packed)
+
+    def read(self, ring_slot):
+        """
+        Arrays of a batch written by `write`, viewing the slot in place.
+
+        Args:
+            ring_slot(RingSlot): descriptor returned by `write`.
+
+        Returns:
+            Any, `data` passed to `write`.
+        """
+        lease = _SlotLease(self, ring_slot.slot)
+        weakref.finalize(lease, self._release, ring_slot.slot)
+        start = self.slot_offset(ring_slot.slot)
+        slot_memory = np.asarray(lease)
+        del lease
+
+        def get(spec):
+            dtype = np.dtype(spec.dtype)
+            begin = spec.offset - start
+            nbytes = dtype.itemsize * int(np.prod(spec.shape))
+            return slot_memory[begin:begin + nbytes].view(dtype).reshape(spec.shape)
+
+        return _map_arrays(ring_slot.data, get)
+
+    def _release(self, slot):
+        self._states[slot] = 0
+
+    def unlink(self):
+        """remove the name of the ring, processes that mapped it keep using it"""
+        try:
+            _posixshmem.shm_unlink(self._name)
+        except FileNotFoundError:
+            pass
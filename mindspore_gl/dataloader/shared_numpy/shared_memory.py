@@ -20,6 +20,7 @@ documentation for details.
 
 __all__ = ['SharedMemory']
 
+import contextlib
 import mmap
 import os
 import secrets
@@ -34,9 +35,36 @@ _SHM_SAFE_NAME_LENGTH = 14
 # Shared memory block name prefix
 _SHM_NAME_PREFIX = 'psm_'
 
+# run of the blocks created by this process, set in DataLoader workers so blocks are traced to their owner
+_name_scope = None
+
+
+def set_name_scope(scope):
+    """
+    Name the blocks created by this process `psm_<scope>_<pid>_<random>`, None restores short random names.
+
+    Args:
+        scope(str): run the blocks belong to, without '_'.
+    """
+    global _name_scope
+    _name_scope = scope
+
+
+@contextlib.contextmanager
+def name_scope(scope):
+    """`set_name_scope` for the blocks created in a `with` block"""
+    previous = _name_scope
+    set_name_scope(scope)
+    try:
+        yield
+    finally:
+        set_name_scope(previous)
+
 
 def _make_filename():
     "Create a random filename for the shared memory object."
+    if _name_scope is not None:
+        return "{}{}_{}_{}".format(_SHM_NAME_PREFIX, _name_scope, os.getpid(), secrets.token_hex(4))
     # number of random bytes to use for name
     nbytes = (_SHM_SAFE_NAME_LENGTH - len(_SHM_NAME_PREFIX)) // 2
     assert nbytes >= 2, '_SHM_NAME_PREFIX too long'
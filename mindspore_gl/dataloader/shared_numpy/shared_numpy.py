@@ -23,6 +23,8 @@ class SharedNDArray(np.ndarray):
 
     @property
     def shm(self) -> SharedMemory:
+        if hasattr(self, "_block"):
+            return self._block.shm
         return self._shm
 
     @shm.setter
@@ -40,10 +42,33 @@ class SharedNDArray(np.ndarray):
         self._shared = shared
 
     def close(self):
-        self._shm.close()
+        self.shm.close()
 
     def unlink(self):
-        self._shm.unlink()
+        self.shm.unlink()
+
+    def view_as(self, shape: Union[List[int], Tuple, Iterable], dtype: np.dtype):
+        """
+        SharedNDArray of another shape and dtype over the start of this block. It is sent between processes
+        like the block and keeps the block alive, but holds no reference count of its own.
+
+        Args:
+            shape(Union[List, Tuple]): shape of the view.
+            dtype(numpy.dtype): data type of the view.
+
+        Outputs:
+            SharedNDArray, the view.
+
+        Raises:
+            ValueError: If the view is larger than the block.
+        """
+        dtype = np.dtype(dtype)
+        if prod(shape) * dtype.itemsize > self.nbytes:
+            raise ValueError("a view of shape {} and dtype {} does not fit in {} bytes.".format(
+                shape, dtype, self.nbytes))
+        arr = SharedNDArray(shape, dtype=dtype, buffer=self.shm.array_buf)
+        arr._block = self  # pylint:disable=W0212
+        return arr
 
     def __del__(self):
         if hasattr(self, "_shm"):
@@ -59,7 +84,11 @@ class SharedNDArray(np.ndarray):
             if ref_count > 0:
                 self.close()
             else:
-                self.unlink()
+                try:
+                    self.unlink()
+                except FileNotFoundError:
+                    # already unlinked by the SegmentRegistry of the DataLoader that created it
+                    pass
 
     @classmethod
     def from_numpy_array(cls, arr: np.ndarray):
@@ -16,7 +16,32 @@
 import numpy as np
 import scipy.sparse as sp
 
-def split_data(x, val_ratio=0.05, test_ratio=0.1, graph_type='undirected'):
+def _first_and_rank(keys):
+    """
+    For every key, the position of the first equal key and the number of equal keys before it.
+    """
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    is_start = np.ones([keys.shape[0]], dtype=bool)
+    is_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    starts = np.flatnonzero(is_start)
+    group = np.cumsum(is_start) - 1
+    first = np.empty_like(order)
+    first[order] = order[starts[group]]
+    rank = np.empty_like(order)
+    rank[order] = np.arange(keys.shape[0]) - starts[group]
+    return first, rank
+
+
+def _unique_counts(sorted_keys):
+    """distinct keys of a sorted array and the number of occurrences of each"""
+    is_start = np.ones([sorted_keys.shape[0]], dtype=bool)
+    is_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    starts = np.flatnonzero(is_start)
+    return sorted_keys[starts], np.diff(np.append(starts, sorted_keys.shape[0]))
+
+
+def split_data(x, val_ratio=0.05, test_ratio=0.1, graph_type='undirected', negative=False):
     r"""
     Cut the training set into training set, validation set and test set according to the proportion of user input,
     and perform graph reconstruction on the training set, and then return.
@@ -27,11 +52,16 @@ def split_data(x, val_ratio=0.05, test_ratio=0.1, graph_type='undirected'):
         test_ratio(float, optional): Test set proportion. Default: 0.1.
         graph_type(str, optional): The type of graph.'undirected': undirected graph, 'directed': directed graph.
             Default: 'undirected'.
+        negative(bool, optional): also sample negative edges for each split, as many as its positive edges.
+            Negative edges are not edges of the graph and distinct across the splits. Default: False.
 
     Returns:
+        - **adj_train** (scipy.sparse.coo_matrix) - Adjacency matrix rebuilt from the train set.
         - **train** (numpy.ndarray) - Train set positive examples, shape :math:`(train\_len, 2)` .
         - **val** (numpy.ndarray) - Validation set positive example, shape :math:`(val\_len, 2)` .
         - **test** (numpy.ndarray) - Test set positive examples, shape :math:`(test\_len, 2)` .
+        - **negatives** (tuple[numpy.ndarray]) - train, validation and test set negative examples with the
+          shapes of the positive ones, only returned if `negative` is True.
 
     Supported Platforms:
         ``Ascend`` ``GPU``
@@ -44,47 +74,64 @@ def split_data(x, val_ratio=0.05, test_ratio=0.1, graph_type='undirected'):
         >>> print(train.shape, val.shape, test.shape)
         (11684, 2) (263, 2) (527, 2)
     """
-    col = x.adj_coo.col
-    row = x.adj_coo.row
-
-    # Construct an adjacency matrix
-    adj = []
-    for i in range(len(col)):
-        idx = []
-        idx.append(col[i])
-        idx.append(row[i])
-        adj.append(idx)
+    # Construct an adjacency matrix, edge i is (col[i], row[i])
+    adj = np.stack([np.asarray(x.adj_coo.col), np.asarray(x.adj_coo.row)], axis=1)
+    node_count = int(max(x.adj_coo.shape[0], x.adj_coo.shape[1], adj.max(initial=-1) + 1))
+    src = adj[:, 0].astype(np.int64)
+    dst = adj[:, 1].astype(np.int64)
+    keys = src * node_count + dst
 
-    # Take the upper triangular matrix
-    adj_c = [i for i in adj if i[0] != i[1]]
+    # Drop self loops, an undirected edge keeps every occurrence with the orientation it is first seen with
+    candidate = np.flatnonzero(src != dst)
     if graph_type == 'undirected':
-        adj_cc = []
-        for i in adj_c:
-            if [i[1], i[0]] not in adj_cc:
-                adj_cc.append(i)
-    else:
-        adj_cc = adj_c
-
+        low = np.minimum(src[candidate], dst[candidate])
+        high = np.maximum(src[candidate], dst[candidate])
+        first, _ = _first_and_rank(low * node_count + high)
+        forward = src[candidate] < dst[candidate]
+        candidate = candidate[forward == forward[first]]
+    adj_cc = adj[candidate]
 
     # Shuffle the subscript order, split the validation set and the test set
-    np.random.shuffle(adj_cc)
-    s = len(adj_cc)
+    perm = np.arange(adj_cc.shape[0])
+    np.random.shuffle(perm)
+    adj_cc = adj_cc[perm]
+    s = adj_cc.shape[0]
     val_l = int(s*val_ratio)
     test_l = int(s*test_ratio)
     idx = np.random.randint(val_l+test_l, s-val_l-test_l)
     val = adj_cc[idx:idx+val_l]
     test = adj_cc[idx+val_l:idx+val_l+test_l]
 
-    # Remove the validation and test sets from the training set
-    for i in val+test:
-        if i in adj:
-            adj.remove([i[1], i[0]])
-            adj.remove([i[0], i[1]])
-    train = adj
-    adj, val, test, train = np.array(adj), np.array(val), np.array(test), np.array(train)
+    # Remove the validation and test sets from the training set: every held out edge removes the first
+    # remaining occurrence of itself and of its reverse
+    held_out = np.concatenate([val, test]).astype(np.int64)
+    held_keys, held_counts = _unique_counts(np.sort(held_out[:, 0] * node_count + held_out[:, 1]))
+    sorted_keys = np.sort(keys)
+    held_counts = np.minimum(held_counts, np.searchsorted(sorted_keys, held_keys, side='right')
+                             - np.searchsorted(sorted_keys, held_keys, side='left'))
+    remove_keys = np.concatenate([held_keys, (held_keys % node_count) * node_count + held_keys // node_count])
+    remove_counts = np.concatenate([held_counts, held_counts])
+    remove_order = np.argsort(remove_keys, kind='stable')
+    remove_keys = remove_keys[remove_order]
+    remove_counts = np.concatenate([[0], np.cumsum(remove_counts[remove_order])])
+    # a key can be held out in both directions on directed graphs, its counts add up
+    count = remove_counts[np.searchsorted(remove_keys, keys, side='right')] - \
+        remove_counts[np.searchsorted(remove_keys, keys, side='left')]
+    _, rank = _first_and_rank(keys)
+    train = adj[rank >= count]
 
     # Refactored graph
     data = np.ones(train.shape[0])
     adj_train = sp.csr_matrix((data, (train[:, 0], train[:, 1])), shape=x.adj_coo.shape).tocoo(copy=False)
 
-    return adj_train, (train, val, test)
+    if not negative:
+        return adj_train, (train, val, test)
+    # imported here, mindspore_gl.sampling imports mindspore_gl.graph which imports this package
+    from mindspore_gl.sampling.negative_sample import NegativeSampler
+    sampler = NegativeSampler(np.stack([src, dst]), node_count,
+                              mode='undirected' if graph_type == 'undirected' else 'other',
+                              random_seed=np.random.randint(np.iinfo(np.int32).max))
+    neg = sampler.sample(train.shape[0] + val.shape[0] + test.shape[0]).T
+    negatives = np.split(neg, [train.shape[0], train.shape[0] + val.shape[0]])
+    return adj_train, (train, val, test), tuple(negatives)
+
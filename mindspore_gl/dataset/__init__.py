@@ -22,6 +22,7 @@ from .enzymes import Enzymes
 from .reddit import Reddit
 from .imdb_binary import IMDBBinary
 from .base_dataset import BaseDataSet
+from .graph_store import GraphStore, convert_npz
 
 __all__ = [
     "BaseDataSet",
@@ -32,6 +33,8 @@ __all__ = [
     "Alchemy",
     "Enzymes",
     "Reddit",
-    "IMDBBinary"
+    "IMDBBinary",
+    "GraphStore",
+    "convert_npz"
 ]
 __all__.sort()
@@ -17,13 +17,14 @@ from typing import Union
 import pathlib
 from collections import defaultdict
 import numpy as np
-from mindspore_gl.graph import MindHomoGraph
+from mindspore_gl.graph import MindHomoGraph, BatchHomoGraph
 from rdkit import Chem
 from rdkit.Chem import ChemicalFeatures
 from rdkit import RDConfig
 import pandas as pd
 from tqdm import tqdm
 from .base_dataset import BaseDataSet
+from .graph_store import graph_store_exists, load_graph_store, save_graph_store
 
 
 #pylint: disable=W0223
@@ -108,7 +109,7 @@ class Alchemy(BaseDataSet):
         self._val_mask = None
         self._datasize = datasize
 
-        if self._root.is_dir() and self._path.is_file():
+        if self._root.is_dir() and graph_store_exists(self._path):
             self._load()
         elif self._root.is_dir():
             self._preprocess()
@@ -179,9 +180,9 @@ class Alchemy(BaseDataSet):
             pbar.close()
             print("loaded!")
         edge_array_list = np.array([adj_coo_row, adj_coo_col])
-        np.savez(self._path, edge_array=edge_array_list, train_mask=train_mask, val_mask=val_mask,
-                 node_feat=node_feat_array, edge_feat=edges_feat_array, graph_label=graph_label_array,
-                 graph_edges=graph_edges_list, graph_nodes=graph_nodes_list)
+        save_graph_store(self._path, edge_array=edge_array_list, train_mask=train_mask, val_mask=val_mask,
+                         node_feat=node_feat_array, edge_feat=edges_feat_array, graph_label=graph_label_array,
+                         graph_edges=graph_edges_list, graph_nodes=graph_nodes_list)
 
     def _file_to_graph(self, sdf_file):
         """
@@ -269,9 +270,9 @@ class Alchemy(BaseDataSet):
 
     def _load(self):
         """Load the saved npz dataset from files."""
-        self._npz_file = np.load(self._path, allow_pickle=True)
-        self._edge_array = self._npz_file['edge_array'].astype(np.int64)
-        self._graph_edges = self._npz_file['graph_edges'].astype(np.int64)
+        self._npz_file = load_graph_store(self._path, allow_pickle=True)
+        self._edge_array = self._npz_file['edge_array'].astype(np.int64, copy=False)
+        self._graph_edges = self._npz_file['graph_edges'].astype(np.int64, copy=False)
         self._graphs = np.array(list(range(len(self._graph_edges))))
 
     @property
@@ -505,6 +506,23 @@ class Alchemy(BaseDataSet):
         return self._graph_label
 
 
+    def batch_graphs(self, graph_idx) -> MindHomoGraph:
+        """
+        Batch graphs with a few vectorized gathers, without building a MindHomoGraph per graph.
+
+        Args:
+            graph_idx(Union[numpy.ndarray, List[int]]): graphs to batch.
+
+        Returns:
+            MindHomoGraph, the batched graph, same as `BatchHomoGraph` over the graphs.
+
+        Examples:
+            >>> #dataset is an instance object of Dataset
+            >>> batch_graph = dataset.batch_graphs([0, 1])
+        """
+        return BatchHomoGraph().gather(self._edge_array, self.graph_nodes, self.graph_edges, graph_idx,
+                                       node_base=0)
+
     def __getitem__(self, idx) -> Union[MindHomoGraph, np.ndarray]:
         assert idx < self.graph_count, "Index out of range"
         res = MindHomoGraph()
@@ -119,3 +119,6 @@ class BaseDataSet:
 
     def graph_edge_feat(self, graph_idx):
         raise NotImplementedError()
+
+    def batch_graphs(self, graph_idx):
+        raise NotImplementedError()
@@ -21,6 +21,7 @@ from scipy.sparse import coo_matrix
 from scipy.sparse import csr_matrix
 from mindspore_gl.graph import MindHomoGraph, CsrAdj
 from .base_dataset import BaseDataSet
+from .graph_store import graph_store_exists, load_graph_store, save_graph_store
 
 #pylint: disable=W0223
 class BlogCatalog(BaseDataSet):
@@ -80,7 +81,7 @@ class BlogCatalog(BaseDataSet):
 
         self._npz_file = None
 
-        if os.path.exists(self._path) and os.path.isfile(self._path):
+        if graph_store_exists(self._path):
             self._load()
         elif os.path.exists(self._root):
             self._preprocess()
@@ -110,15 +111,15 @@ class BlogCatalog(BaseDataSet):
         crs = coo.tocsr()
         indptr = crs.indptr
         indces = crs.indices
-        np.savez(self._path, num_classes=len(groups), adj_csr_indptr=indptr,
-                 adj_csr_indices=indces, label=label, vocab=vocab)
+        save_graph_store(self._path, num_classes=len(groups), adj_csr_indptr=indptr,
+                         adj_csr_indices=indces, label=label, vocab=vocab)
 
     def _load(self):
         """Load the saved npz dataset from files."""
-        self._npz_file = np.load(self._path)
-        self._csr_row = self._npz_file['adj_csr_indptr'].astype(np.int32)
-        self._csr_col = self._npz_file['adj_csr_indices'].astype(np.int32)
-        self._nodes = np.array(list(range(len(self._csr_row) - 1)))
+        self._npz_file = load_graph_store(self._path)
+        self._csr_row = self._npz_file['adj_csr_indptr'].astype(np.int32, copy=False)
+        self._csr_col = self._npz_file['adj_csr_indices'].astype(np.int32, copy=False)
+        self._nodes = np.arange(len(self._csr_row) - 1)
 
     @property
     def num_classes(self):
@@ -225,7 +226,5 @@ class BlogCatalog(BaseDataSet):
     def __getitem__(self, idx):
         assert idx == 0, "Blog Catalog only has one graph"
         graph = MindHomoGraph()
-        node_dict = {idx: idx for idx in range(self.node_count)}
-        edge_ids = np.array(list(range(self.edge_count))).astype(np.int32)
-        graph.set_topo(CsrAdj(self._csr_row, self._csr_col), node_dict=node_dict, edge_ids=edge_ids)
+        graph.set_topo(CsrAdj(self._csr_row, self._csr_col), node_dict=None, edge_ids=None)
         return graph
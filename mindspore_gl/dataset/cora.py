@@ -21,6 +21,7 @@ import scipy.sparse as sp
 from scipy.sparse import coo_matrix, csr_matrix
 from mindspore_gl.graph import MindHomoGraph, CsrAdj
 from .base_dataset import BaseDataSet
+from .graph_store import graph_store_exists, load_graph_store, save_graph_store
 
 
 #pylint: disable=W0223
@@ -107,7 +108,7 @@ class CoraV2(BaseDataSet):
         self._test_mask = None
         self._npz_file = None
 
-        if os.path.exists(self._path) and os.path.isfile(self._path):
+        if graph_store_exists(self._path):
             self._load()
         elif os.path.exists(self._root):
             self._preprocess()
@@ -182,19 +183,19 @@ class CoraV2(BaseDataSet):
         in_degrees = np.ravel(in_degrees)
         adj_csr_matrix = adj_coo_matrix.tocsr()
         features = np.array(features, np.float32)
-        np.savez(self._path, feat=features, label=labels, test_mask=test_mask,
-                 train_mask=train_mask, val_mask=val_mask, adj_coo_row=adj_coo_row, adj_coo_col=adj_coo_col,
-                 adj_csr_indptr=adj_csr_matrix.indptr, adj_csr_indices=adj_csr_matrix.indices, in_degrees=in_degrees,
-                 out_degrees=out_degrees, adj_csr_data=adj_csr_matrix.data,
-                 n_edges=num_edges, n_nodes=num_nodes, n_classes=onehot_labels.shape[1])
+        save_graph_store(self._path, feat=features, label=labels, test_mask=test_mask,
+                         train_mask=train_mask, val_mask=val_mask, adj_coo_row=adj_coo_row, adj_coo_col=adj_coo_col,
+                         adj_csr_indptr=adj_csr_matrix.indptr, adj_csr_indices=adj_csr_matrix.indices,
+                         in_degrees=in_degrees, out_degrees=out_degrees, adj_csr_data=adj_csr_matrix.data,
+                         n_edges=num_edges, n_nodes=num_nodes, n_classes=onehot_labels.shape[1])
 
     def _load(self):
         """Load the saved npz dataset from files."""
-        self._npz_file = np.load(self._path)
-        self._csr_row = self._npz_file['adj_csr_indptr'].astype(np.int32)
-        self._csr_col = self._npz_file['adj_csr_indices'].astype(np.int32)
+        self._npz_file = load_graph_store(self._path)
+        self._csr_row = self._npz_file['adj_csr_indptr'].astype(np.int32, copy=False)
+        self._csr_col = self._npz_file['adj_csr_indices'].astype(np.int32, copy=False)
 
-        self._nodes = np.array(list(range(len(self._csr_row) - 1)))
+        self._nodes = np.arange(len(self._csr_row) - 1)
 
     @property
     def node_feat_size(self):
@@ -378,9 +379,7 @@ class CoraV2(BaseDataSet):
     def __getitem__(self, idx):
         assert idx == 0, "Cora only has one graph"
         graph = MindHomoGraph()
-        node_dict = {idx: idx for idx in range(self.node_count)}
-        edge_ids = np.array(list(range(self.edge_count))).astype(np.int32)
-        graph.set_topo(CsrAdj(self._csr_row, self._csr_col), node_dict=node_dict, edge_ids=edge_ids)
+        graph.set_topo(CsrAdj(self._csr_row, self._csr_col), node_dict=None, edge_ids=None)
         return graph
 
 
@@ -18,8 +18,9 @@ import re
 from typing import Union
 import pathlib
 import numpy as np
-from mindspore_gl.graph import MindHomoGraph
+from mindspore_gl.graph import MindHomoGraph, BatchHomoGraph
 from .base_dataset import BaseDataSet
+from .graph_store import graph_store_exists, load_graph_store, save_graph_store
 
 
 #pylint: disable=W0223
@@ -91,7 +92,7 @@ class Enzymes(BaseDataSet):
         self._val_mask = None
         self._test_mask = None
 
-        if self._root.is_dir() and self._path.is_file():
+        if self._root.is_dir() and graph_store_exists(self._path):
             self._load()
         elif self._root.is_dir():
             self._preprocess()
@@ -137,9 +138,10 @@ class Enzymes(BaseDataSet):
                 val_mask.append(0)
 
         edge_array = np.array([adj_coo_row, adj_coo_col])
-        np.savez(self._path, edge_array=edge_array, train_mask=train_mask, val_mask=val_mask,
-                 test_mask=test_mask, node_feat=node_attrs, graph_label=graph_labels, max_num_node=max_node_nums,
-                 graph_edges=graph_edges, graph_nodes=graph_nodes, label_dim=label_dim)
+        save_graph_store(self._path, edge_array=edge_array, train_mask=train_mask, val_mask=val_mask,
+                         test_mask=test_mask, node_feat=node_attrs, graph_label=graph_labels,
+                         max_num_node=max_node_nums, graph_edges=graph_edges, graph_nodes=graph_nodes,
+                         label_dim=label_dim)
 
     def _get_info(self):
         """get graphs info"""
@@ -192,7 +194,7 @@ class Enzymes(BaseDataSet):
 
     def _load(self):
         """Load the saved npz dataset from files."""
-        self._npz_file = np.load(self._path)
+        self._npz_file = load_graph_store(self._path)
         self._edge_array = self._npz_file['edge_array']
         self._graph_edges = self._npz_file['graph_edges']
         self._graphs = np.array(list(range(len(self._graph_edges))))
@@ -428,6 +430,23 @@ class Enzymes(BaseDataSet):
         return self._graph_label
 
 
+    def batch_graphs(self, graph_idx) -> MindHomoGraph:
+        """
+        Batch graphs with a few vectorized gathers, without building a MindHomoGraph per graph.
+
+        Args:
+            graph_idx(Union[numpy.ndarray, List[int]]): graphs to batch.
+
+        Returns:
+            MindHomoGraph, the batched graph, same as `BatchHomoGraph` over the graphs.
+
+        Examples:
+            >>> #dataset is an instance object of Dataset
+            >>> batch_graph = dataset.batch_graphs([0, 1])
+        """
+        return BatchHomoGraph().gather(self._edge_array, self.graph_nodes, self.graph_edges, graph_idx,
+                                       node_base=self.graph_nodes + 1)
+
     def __getitem__(self, idx) -> Union[MindHomoGraph, np.ndarray]:
         assert idx < self.graph_count, "Index out of range"
         res = MindHomoGraph()
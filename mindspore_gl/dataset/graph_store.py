@@ -0,0 +1,176 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Directory based graph store, every array is a raw .npy file opened with mmap."""
+import os
+import json
+import argparse
+from pathlib import Path
+import numpy as np
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+
+def store_dir(path):
+    """Directory of the graph store that replaces the npz file at `path`."""
+    path = Path(path)
+    return path.with_suffix("") if path.suffix == ".npz" else path
+
+
+class GraphStore:
+    """
+    Read only, dict like view of a graph store directory.
+
+    The store holds one `.npy` file per array and a `manifest.json` describing them. Arrays are opened
+    lazily with `numpy.load(mmap_mode=...)`, so processes reading the same store share the page cache
+    instead of each holding a private copy. Object arrays and scalars are read into memory.
+
+    Args:
+        path(Union[str, pathlib.Path]): store directory, or the path of the npz file it replaces.
+        mmap_mode(str, optional): mode passed to `numpy.load`. The default copy-on-write mode shares pages
+            like 'r' while still handing out writable arrays, which the Cython kernels require. Default: 'c'.
+
+    Raises:
+        FileNotFoundError: if `path` does not contain a manifest.
+
+    Examples:
+        >>> from mindspore_gl.dataset import GraphStore
+        >>> store = GraphStore("path/to/reddit/reddit_with_mask")
+        >>> indptr = store["adj_csr_indptr"]
+    """
+
+    def __init__(self, path, mmap_mode='c'):
+        self._dir = store_dir(path)
+        manifest_path = self._dir / MANIFEST
+        if not manifest_path.is_file():
+            raise FileNotFoundError(f"graph store manifest {manifest_path} does not exist")
+        with open(manifest_path, "r") as f:
+            self._manifest = json.load(f)
+        self._mmap_mode = mmap_mode
+        self._cache = {}
+
+    @property
+    def files(self):
+        """array names, same as `numpy.lib.npyio.NpzFile.files`"""
+        return list(self._manifest["arrays"].keys())
+
+    def keys(self):
+        return self.files
+
+    def __contains__(self, key):
+        return key in self._manifest["arrays"]
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __len__(self):
+        return len(self._manifest["arrays"])
+
+    def __getitem__(self, key):
+        if key not in self._cache:
+            meta = self._manifest["arrays"][key]
+            file = self._dir / meta["file"]
+            if meta["dtype"] == "object":
+                self._cache[key] = np.load(file, allow_pickle=True)
+            elif not meta["shape"]:
+                self._cache[key] = np.load(file)
+            else:
+                self._cache[key] = np.load(file, mmap_mode=self._mmap_mode)
+        return self._cache[key]
+
+    def close(self):
+        self._cache.clear()
+
+
+def save_graph_store(path, **arrays):
+    """
+    Write arrays into a graph store directory, one `.npy` file per array plus a manifest.
+
+    Args:
+        path(Union[str, pathlib.Path]): store directory, or the path of the npz file it replaces.
+        arrays(numpy.ndarray): arrays to save, keyed by name.
+
+    Returns:
+        - pathlib.Path, the store directory.
+    """
+    directory = store_dir(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {"format_version": FORMAT_VERSION, "arrays": {}}
+    for name, value in arrays.items():
+        value = np.asanyarray(value)
+        file = name + ".npy"
+        np.save(directory / file, value, allow_pickle=value.dtype == object)
+        manifest["arrays"][name] = {"file": file, "dtype": str(value.dtype), "shape": list(value.shape)}
+    # write the manifest last, a store without it is treated as missing
+    tmp_path = directory / (MANIFEST + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, directory / MANIFEST)
+    return directory
+
+
+def graph_store_exists(path):
+    """Whether a graph store or the legacy npz file exists for `path`."""
+    return (store_dir(path) / MANIFEST).is_file() or Path(path).is_file()
+
+
+def load_graph_store(path, allow_pickle=False, mmap_mode='c'):
+    """
+    Open the graph store for `path`, falling back to the legacy npz file when no store was written.
+
+    Args:
+        path(Union[str, pathlib.Path]): path of the dataset npz file.
+        allow_pickle(bool, optional): allow object arrays when reading a legacy npz file. Default: False.
+        mmap_mode(str, optional): mode used to map the store arrays. Default: 'c'.
+
+    Returns:
+        - Union[GraphStore, numpy.lib.npyio.NpzFile], mapping from array name to array.
+    """
+    if (store_dir(path) / MANIFEST).is_file():
+        return GraphStore(path, mmap_mode=mmap_mode)
+    return np.load(path, allow_pickle=allow_pickle)
+
+
+def convert_npz(npz_path, out_dir=None):
+    """
+    Convert a dataset npz file into a graph store directory.
+
+    Args:
+        npz_path(Union[str, pathlib.Path]): npz file to convert.
+        out_dir(Union[str, pathlib.Path], optional): target directory, defaults to the npz path without
+            its suffix, which is where the datasets look for it. Default: None.
+
+    Returns:
+        - pathlib.Path, the store directory.
+    """
+    with np.load(npz_path, allow_pickle=True) as npz_file:
+        arrays = {name: npz_file[name] for name in npz_file.files}
+    return save_graph_store(out_dir if out_dir is not None else npz_path, **arrays)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="convert dataset npz files into mmap graph stores")
+    parser.add_argument("npz", nargs="+", help="npz files to convert")
+    parser.add_argument("--out", default=None, help="output directory, only valid with a single npz file")
+    args = parser.parse_args(argv)
+    if args.out is not None and len(args.npz) > 1:
+        parser.error("--out only supports a single npz file")
+    for npz_path in args.npz:
+        directory = convert_npz(npz_path, args.out)
+        print(f"{npz_path} -> {directory}")
+
+
+if __name__ == "__main__":
+    main()
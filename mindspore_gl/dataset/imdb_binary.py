@@ -21,7 +21,7 @@ import os.path as osp
 import urllib.request
 import zipfile
 import numpy as np
-from mindspore_gl.graph import MindHomoGraph
+from mindspore_gl.graph import MindHomoGraph, BatchHomoGraph
 from .base_dataset import BaseDataSet
 
 
@@ -378,6 +378,22 @@ class IMDBBinary(BaseDataSet):
         return self._graph_label.astype(np.int32)
 
 
+    def batch_graphs(self, graph_idx) -> MindHomoGraph:
+        """
+        Batch graphs with a few vectorized gathers, without building a MindHomoGraph per graph.
+
+        Args:
+            graph_idx(Union[numpy.ndarray, List[int]]): graphs to batch.
+
+        Returns:
+            MindHomoGraph, the batched graph, same as `BatchHomoGraph` over the graphs.
+
+        Examples:
+            >>> #dataset is an instance object of Dataset
+            >>> batch_graph = dataset.batch_graphs([0, 1])
+        """
+        return BatchHomoGraph().gather(self._edge_array, self.graph_nodes, self.graph_edges, graph_idx)
+
     def __getitem__(self, idx) -> Union[MindHomoGraph, np.ndarray]:
         assert idx < self.graph_count, "Index out of range"
         res = MindHomoGraph()
@@ -21,8 +21,9 @@ import json
 import numpy as np
 import networkx as nx
 from networkx.readwrite import json_graph
-from mindspore_gl.graph import MindHomoGraph
+from mindspore_gl.graph import MindHomoGraph, BatchHomoGraph
 from .base_dataset import BaseDataSet
+from .graph_store import graph_store_exists, load_graph_store, save_graph_store
 
 
 #pylint: disable=W0223
@@ -103,7 +104,7 @@ class PPI(BaseDataSet):
         self._test_mask = None
         self._graph_label = None
 
-        if os.path.exists(self._path) and os.path.isfile(self._path):
+        if graph_store_exists(self._path):
             self._load()
         elif os.path.exists(self._root):
             self._preprocess()
@@ -176,15 +177,15 @@ class PPI(BaseDataSet):
         train_mask = [1] * 20 + [0] * 4
         val_mask = [0] * 20 + [1] * 2 + [0] * 2
         test_mask = [0] * 22 + [1] * 2
-        np.savez(save_path, edge_array=edge_array, train_mask=train_mask, val_mask=val_mask,
-                 test_mask=test_mask, node_feat=node_feat, node_label=node_label, node_nums=node_nums,
-                 graph_edges=graph_edge, graph_nodes=graph_node)
+        save_graph_store(save_path, edge_array=edge_array, train_mask=train_mask, val_mask=val_mask,
+                         test_mask=test_mask, node_feat=node_feat, node_label=node_label, node_nums=node_nums,
+                         graph_edges=graph_edge, graph_nodes=graph_node)
 
     def _load(self):
         """Load the saved npz dataset from files."""
-        self._npz_file = np.load(self._path, allow_pickle=True)
-        self._edge_array = self._npz_file['edge_array'].astype(np.int32)
-        self._graph_edges = self._npz_file['graph_edges'].astype(np.int32)
+        self._npz_file = load_graph_store(self._path, allow_pickle=True)
+        self._edge_array = self._npz_file['edge_array'].astype(np.int32, copy=False)
+        self._graph_edges = self._npz_file['graph_edges'].astype(np.int32, copy=False)
 
         self._train_mask = self._npz_file['train_mask']
         self._test_mask = self._npz_file['test_mask']
@@ -428,6 +429,22 @@ class PPI(BaseDataSet):
         """
         return self.node_label[self.graph_nodes[graph_idx]: self.graph_nodes[graph_idx + 1]]
 
+    def batch_graphs(self, graph_idx) -> MindHomoGraph:
+        """
+        Batch graphs with a few vectorized gathers, without building a MindHomoGraph per graph.
+
+        Args:
+            graph_idx(Union[numpy.ndarray, List[int]]): graphs to batch.
+
+        Returns:
+            MindHomoGraph, the batched graph, same as `BatchHomoGraph` over the graphs.
+
+        Examples:
+            >>> #dataset is an instance object of Dataset
+            >>> batch_graph = dataset.batch_graphs([0, 1])
+        """
+        return BatchHomoGraph().gather(self._edge_array, self.graph_nodes, self.graph_edges, graph_idx)
+
     def __getitem__(self, idx) -> Union[MindHomoGraph, np.ndarray]:
         assert idx < self.graph_count, "Index out of range"
         res = MindHomoGraph()
@@ -20,6 +20,7 @@ import scipy.sparse as sp
 from scipy.sparse import csr_matrix
 from mindspore_gl.graph import MindHomoGraph, CsrAdj
 from .base_dataset import BaseDataSet
+from .graph_store import graph_store_exists, load_graph_store, save_graph_store
 
 
 #pylint: disable=W0223
@@ -83,7 +84,7 @@ class Reddit(BaseDataSet):
         self._test_mask = None
         self._npz_file = None
 
-        if self._path.is_file():
+        if graph_store_exists(self._path):
             self._load()
         elif self._root.is_dir():
             self._preprocess()
@@ -104,16 +105,16 @@ class Reddit(BaseDataSet):
         train_mask = (node_types == 1)
         val_mask = (node_types == 2)
         test_mask = (node_types == 3)
-        np.savez(self._path, adj_csr_indptr=indptr, adj_csr_indices=indices, feat=features, label=labels,
-                 train_mask=train_mask, val_mask=val_mask, test_mask=test_mask)
+        save_graph_store(self._path, adj_csr_indptr=indptr, adj_csr_indices=indices, feat=features, label=labels,
+                         train_mask=train_mask, val_mask=val_mask, test_mask=test_mask)
 
     def _load(self):
         """Load the saved npz dataset from files."""
-        self._npz_file = np.load(self._path)
-        self._csr_row = self._npz_file['adj_csr_indptr'].astype(np.int32)
-        self._csr_col = self._npz_file['adj_csr_indices'].astype(np.int32)
+        self._npz_file = load_graph_store(self._path)
+        self._csr_row = self._npz_file['adj_csr_indptr'].astype(np.int32, copy=False)
+        self._csr_col = self._npz_file['adj_csr_indices'].astype(np.int32, copy=False)
 
-        self._nodes = np.array(list(range(len(self._csr_row) - 1)))
+        self._nodes = np.arange(len(self._csr_row) - 1)
 
     @property
     def node_feat_size(self):
@@ -325,7 +326,5 @@ class Reddit(BaseDataSet):
     def __getitem__(self, idx):
         assert idx == 0, "reddit only has one graph"
         graph = MindHomoGraph()
-        node_dict = {idx: idx for idx in range(self.node_count)}
-        edge_ids = np.array(list(range(self.edge_count))).astype(np.int32)
-        graph.set_topo(CsrAdj(self._csr_row, self._csr_col), node_dict=node_dict, edge_ids=edge_ids)
+        graph.set_topo(CsrAdj(self._csr_row, self._csr_col), node_dict=None, edge_ids=None)
         return graph
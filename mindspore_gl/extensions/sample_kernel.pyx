@@ -21,15 +21,21 @@ from libcpp.set cimport set
 from libcpp.unordered_set cimport unordered_set
 from libcpp.unordered_map cimport unordered_map
 from libcpp.vector cimport vector
+from libcpp.algorithm cimport sort
 from libc.stdlib cimport rand, RAND_MAX
+from libc.stdint cimport uint32_t, uint64_t
+from libc.math cimport log, INFINITY
 from libcpp cimport bool
 from cython.parallel import prange
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def map_edges(np.ndarray[np.int32_t, ndim=2] edges, reindex):
-    """Mapping edges by given map dictionary
+    """Mapping edges by given map dictionary or IdMapping
     """
+    if hasattr(reindex, "to_local"):
+        edges[...] = reindex.to_local(edges)
+        return edges
     cdef unordered_map[int, int] map_dict = reindex
     cdef int i = 0
     cdef int num_edges = edges.shape[1]
@@ -44,8 +50,10 @@ def map_edges(np.ndarray[np.int32_t, ndim=2] edges, reindex):
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def map_nodes(nodes, reindex):
-    """Mapping node id by given map dictionary
+    """Mapping node id by given map dictionary or IdMapping
     """
+    if hasattr(reindex, "to_local"):
+        return np.asarray(reindex.to_local(np.asarray(nodes, dtype=np.int32)), dtype=np.int32)
     cdef np.ndarray[np.int32_t, ndim=1] t_nodes = np.array(nodes, dtype=np.int32)
     cdef unordered_map[int, int] map_dict = reindex
     cdef int i = 0
@@ -105,6 +113,560 @@ def sample_one_hop_unbias(np.ndarray[np.int32_t, ndim=1] csr_row, np.ndarray[np.
     return res_edge_index, edge_ids
 
 
+ctypedef fused index_t:
+    np.int32_t
+    np.int64_t
+
+ctypedef fused offset_t:
+    np.int32_t
+    np.int64_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def coo_scatter_to_csr(index_t[::1] row, index_t[::1] col, offset_t[::1] indptr,
+                       index_t[::1] indices, offset_t[::1] perm):
+    """Counting sort scatter of COO edges into CSR slots given a precomputed indptr.
+    Edge order inside a row is kept, perm[pos] records the COO position of CSR slot pos.
+    """
+    cdef Py_ssize_t node_count = indptr.shape[0] - 1
+    cdef Py_ssize_t edge_count = row.shape[0]
+    cdef Py_ssize_t e
+    cdef offset_t pos
+    cdef offset_t[::1] cursor = np.array(indptr[:node_count])
+    with nogil:
+        for e in range(edge_count):
+            pos = cursor[row[e]]
+            cursor[row[e]] = pos + 1
+            indices[pos] = col[e]
+            perm[pos] = <offset_t> e
+    return perm
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def coo_block_count(index_t[::1] row, offset_t[:, ::1] counts):
+    """Per edge block row histogram, block t covers edges [t * E / T, (t + 1) * E / T)."""
+    cdef Py_ssize_t num_blocks = counts.shape[0]
+    cdef Py_ssize_t edge_count = row.shape[0]
+    cdef Py_ssize_t t, e, start, end
+    with nogil:
+        for t in prange(num_blocks, schedule="static", num_threads=num_blocks):
+            start = t * edge_count // num_blocks
+            end = (t + 1) * edge_count // num_blocks
+            for e in range(start, end):
+                counts[t, row[e]] += 1
+    return counts
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def coo_block_scatter_to_csr(index_t[::1] row, index_t[::1] col, offset_t[:, ::1] cursors,
+                             index_t[::1] indices, offset_t[::1] perm):
+    """Parallel counterpart of coo_scatter_to_csr, cursors[t, r] is the first CSR slot of row r
+    owned by edge block t, so the result is identical to the serial scatter.
+    """
+    cdef Py_ssize_t num_blocks = cursors.shape[0]
+    cdef Py_ssize_t edge_count = row.shape[0]
+    cdef Py_ssize_t t, e, start, end
+    cdef offset_t pos
+    with nogil:
+        for t in prange(num_blocks, schedule="static", num_threads=num_blocks):
+            start = t * edge_count // num_blocks
+            end = (t + 1) * edge_count // num_blocks
+            for e in range(start, end):
+                pos = cursors[t, row[e]]
+                cursors[t, row[e]] = pos + 1
+                indices[pos] = col[e]
+                perm[pos] = <offset_t> e
+    return perm
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def coo_scatter_indices(index_t[::1] row, index_t[::1] col, offset_t[::1] indptr, index_t[::1] indices):
+    """coo_scatter_to_csr without the COO positions, for callers that only need the CSR."""
+    cdef Py_ssize_t node_count = indptr.shape[0] - 1
+    cdef Py_ssize_t edge_count = row.shape[0]
+    cdef Py_ssize_t e
+    cdef offset_t pos
+    cdef offset_t[::1] cursor = np.array(indptr[:node_count])
+    with nogil:
+        for e in range(edge_count):
+            pos = cursor[row[e]]
+            cursor[row[e]] = pos + 1
+            indices[pos] = col[e]
+    return indices
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def csr_sort_unique_rows(offset_t[::1] indptr, index_t[::1] indices):
+    """Sort the indices of every row and drop repeated ones, in place. indptr is rewritten for the kept
+    indices, which are compacted at the front of indices, their count is returned.
+    """
+    cdef Py_ssize_t node_count = indptr.shape[0] - 1
+    cdef Py_ssize_t i, j, k
+    cdef offset_t start, end, kept = 0
+    cdef index_t value
+    with nogil:
+        start = indptr[0]
+        for i in range(node_count):
+            end = indptr[i + 1]
+            if end - start > 32:
+                sort(&indices[start], &indices[start] + (end - start))
+            else:
+                # insertion sort, rows of sampled and batched graphs are short
+                for j in range(start + 1, end):
+                    value = indices[j]
+                    k = j - 1
+                    while k >= start and indices[k] > value:
+                        indices[k + 1] = indices[k]
+                        k -= 1
+                    indices[k + 1] = value
+            for j in range(start, end):
+                if j == start or indices[j] != indices[j - 1]:
+                    indices[kept] = indices[j]
+                    kept += 1
+            start = end
+            indptr[i + 1] = kept
+    return kept
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def csr_expand_rows(offset_t[::1] indptr, index_t[::1] out_row, int num_threads=1):
+    """Write the row id of every CSR slot into out_row, parallel over row blocks."""
+    cdef Py_ssize_t node_count = indptr.shape[0] - 1
+    cdef Py_ssize_t i
+    cdef offset_t j
+    with nogil:
+        for i in prange(node_count, schedule="guided", num_threads=num_threads):
+            for j in range(indptr[i], indptr[i + 1]):
+                out_row[j] = <index_t> i
+    return out_row
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def csr_gather_rows(offset_t[::1] indptr, index_t[::1] indices, index_t[::1] rows,
+                    offset_t[::1] out_indptr, index_t[::1] out_indices, int num_threads=1):
+    """Copy the CSR rows listed in rows into a ragged result, out_indptr must already hold
+    the exclusive prefix sum of the selected row lengths.
+    """
+    cdef Py_ssize_t row_count = rows.shape[0]
+    cdef Py_ssize_t i
+    cdef offset_t j, start, out_start
+    with nogil:
+        for i in prange(row_count, schedule="guided", num_threads=num_threads):
+            start = indptr[rows[i]]
+            out_start = out_indptr[i]
+            for j in range(indptr[rows[i] + 1] - start):
+                out_indices[out_start + j] = indices[start + j]
+    return out_indices
+
+
+cdef inline uint64_t _mix64(uint64_t z) noexcept nogil:
+    """splitmix64 finalizer"""
+    z = (z ^ (z >> 30)) * <uint64_t> 0xbf58476d1ce4e5b9ULL
+    z = (z ^ (z >> 27)) * <uint64_t> 0x94d049bb133111ebULL
+    return z ^ (z >> 31)
+
+
+cdef inline uint64_t _rng_key(uint64_t random_seed, uint64_t stream) noexcept nogil:
+    """key of a counter based stream, the draws only depend on (random_seed, stream, counter)"""
+    return _mix64(random_seed * <uint64_t> 0x9e3779b97f4a7c15ULL + _mix64(stream + 1))
+
+
+cdef inline uint64_t _rng_next(uint64_t key, uint64_t* counter) noexcept nogil:
+    counter[0] += 1
+    return _mix64(key + counter[0] * <uint64_t> 0x9e3779b97f4a7c15ULL)
+
+
+cdef inline uint64_t _rng_below(uint64_t key, uint64_t* counter, uint64_t n) noexcept nogil:
+    """uniform integer in [0, n), n < 2^32, Lemire's multiply-shift with rejection so there is no modulo bias"""
+    cdef uint64_t m = (_rng_next(key, counter) >> 32) * n
+    cdef uint32_t low = <uint32_t> m
+    cdef uint32_t threshold
+    if low < n:
+        threshold = <uint32_t> ((<uint32_t> -(<uint32_t> n)) % <uint32_t> n)
+        while low < threshold:
+            m = (_rng_next(key, counter) >> 32) * n
+            low = <uint32_t> m
+    return m >> 32
+
+
+cdef inline double _rng_uniform(uint64_t key, uint64_t* counter) noexcept nogil:
+    """uniform double in (0, 1)"""
+    return ((_rng_next(key, counter) >> 11) + 0.5) * (1.0 / 9007199254740992.0)
+
+
+cdef inline void _heap_sift_down(double* keys, offset_t* vals, Py_ssize_t n, Py_ssize_t i) noexcept nogil:
+    """restore the min heap property of keys[0:n] below position i"""
+    cdef Py_ssize_t child
+    cdef double key = keys[i]
+    cdef offset_t val = vals[i]
+    while True:
+        child = 2 * i + 1
+        if child >= n:
+            break
+        if child + 1 < n and keys[child + 1] < keys[child]:
+            child += 1
+        if keys[child] >= key:
+            break
+        keys[i] = keys[child]
+        vals[i] = vals[child]
+        i = child
+    keys[i] = key
+    vals[i] = val
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def csr_row_prefix_sum(offset_t[::1] indptr, double[::1] prob, int num_threads=1):
+    """Inclusive prefix sum of edge weights restarted at every CSR row."""
+    cdef Py_ssize_t node_count = indptr.shape[0] - 1
+    cdef Py_ssize_t i
+    cdef offset_t j
+    cdef double acc
+    cdef double[::1] prefix = np.empty([prob.shape[0]], dtype=np.float64)
+    with nogil:
+        for i in prange(node_count, schedule="guided", num_threads=num_threads):
+            acc = 0
+            for j in range(indptr[i], indptr[i + 1]):
+                acc = acc + prob[j]
+                prefix[j] = acc
+    return np.asarray(prefix)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _count_samples(offset_t[::1] indptr, index_t[::1] seeds, int neighbor_num, bool replace,
+                         double[::1] prob, bool weighted, offset_t[::1] out_offset, int num_threads) noexcept nogil:
+    """out_offset[i + 1] = number of edges seed i samples, the caller turns it into offsets"""
+    cdef Py_ssize_t i
+    cdef offset_t j, start, degree, count
+    cdef index_t node
+    out_offset[0] = 0
+    for i in prange(seeds.shape[0], schedule="guided", num_threads=num_threads):
+        node = seeds[i]
+        start = indptr[node]
+        degree = indptr[node + 1] - start
+        if weighted:
+            count = 0
+            for j in range(start, start + degree):
+                if prob[j] > 0:
+                    count = count + 1
+            degree = count
+        if degree == 0:
+            out_offset[i + 1] = 0
+        elif replace or degree > neighbor_num:
+            out_offset[i + 1] = neighbor_num
+        else:
+            out_offset[i + 1] = degree
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _fill_samples(offset_t[::1] indptr, index_t[::1] indices, index_t[::1] seeds, bool replace,
+                        double[::1] prob, double[::1] prob_prefix, bool weighted, uint64_t random_seed,
+                        offset_t[::1] out_offset, index_t[:, ::1] edge_index, offset_t[::1] edge_ids,
+                        double[::1] heap_keys, int num_threads) noexcept nogil:
+    """draw the edges of every seed into its own output slice out_offset[i]: out_offset[i + 1]"""
+    cdef Py_ssize_t i
+    cdef offset_t j, start, degree, count, pos, lo, hi, mid
+    cdef index_t node
+    cdef double total, target, key
+    cdef uint64_t rng_key, rng_counter
+    for i in prange(seeds.shape[0], schedule="guided", num_threads=num_threads):
+        node = seeds[i]
+        start = indptr[node]
+        degree = indptr[node + 1] - start
+        pos = out_offset[i]
+        count = out_offset[i + 1] - pos
+        if count == 0:
+            continue
+        rng_key = _rng_key(random_seed, <uint64_t> i)
+        rng_counter = 0
+        if weighted and replace:
+            total = prob_prefix[start + degree - 1]
+            for j in range(count):
+                # first slot whose inclusive prefix exceeds target, zero weight slots never qualify
+                target = _rng_uniform(rng_key, &rng_counter) * total
+                lo = start
+                hi = start + degree - 1
+                while lo < hi:
+                    mid = lo + (hi - lo) // 2
+                    if prob_prefix[mid] > target:
+                        hi = mid
+                    else:
+                        lo = mid + 1
+                edge_ids[pos + j] = lo
+        elif weighted:
+            # keep the count largest keys log(u) / w in a min heap
+            hi = 0
+            for j in range(start, start + degree):
+                if prob[j] <= 0:
+                    continue
+                key = log(_rng_uniform(rng_key, &rng_counter)) / prob[j]
+                if hi < count:
+                    heap_keys[pos + hi] = key
+                    edge_ids[pos + hi] = j
+                    hi = hi + 1
+                    if hi == count:
+                        for lo in range(count // 2 - 1, -1, -1):
+                            _heap_sift_down(&heap_keys[pos], &edge_ids[pos], count, lo)
+                elif key > heap_keys[pos]:
+                    heap_keys[pos] = key
+                    edge_ids[pos] = j
+                    _heap_sift_down(&heap_keys[pos], &edge_ids[pos], count, 0)
+        elif replace:
+            for j in range(count):
+                edge_ids[pos + j] = start + <offset_t> _rng_below(rng_key, &rng_counter, <uint64_t> degree)
+        elif count == degree:
+            for j in range(count):
+                edge_ids[pos + j] = start + j
+        elif count * count <= 4 * degree:
+            # Robert Floyd's algorithm, membership is a scan of the few slots drawn so far
+            for j in range(degree - count, degree):
+                mid = <offset_t> _rng_below(rng_key, &rng_counter, <uint64_t> (j + 1))
+                for lo in range(pos, pos + j - (degree - count)):
+                    if edge_ids[lo] == start + mid:
+                        mid = j
+                        break
+                edge_ids[pos + j - (degree - count)] = start + mid
+        else:
+            # reservoir sampling, linear in the degree
+            for j in range(count):
+                edge_ids[pos + j] = start + j
+            for j in range(count, degree):
+                mid = <offset_t> _rng_below(rng_key, &rng_counter, <uint64_t> (j + 1))
+                if mid < count:
+                    edge_ids[pos + mid] = start + j
+        for j in range(pos, pos + count):
+            edge_index[0, j] = node
+            edge_index[1, j] = indices[edge_ids[j]]
+
+
+def _sample_one_hop(offset_t[::1] indptr, index_t[::1] indices, index_t[::1] seeds, int neighbor_num,
+                    bool replace, double[::1] prob, double[::1] prob_prefix, uint64_t random_seed,
+                    int num_threads):
+    cdef bool weighted = prob is not None
+    cdef offset_t[::1] out_offset = np.empty([seeds.shape[0] + 1], dtype=np.asarray(indptr).dtype)
+    with nogil:
+        _count_samples(indptr, seeds, neighbor_num, replace, prob, weighted, out_offset, num_threads)
+    np.cumsum(np.asarray(out_offset), out=np.asarray(out_offset))
+    cdef offset_t total_edge_num = out_offset[seeds.shape[0]]
+    cdef index_t[:, ::1] edge_index = np.empty([2, total_edge_num], dtype=np.asarray(indices).dtype)
+    cdef offset_t[::1] edge_ids = np.empty([total_edge_num], dtype=np.asarray(indptr).dtype)
+    cdef double[::1] heap_keys = np.empty([total_edge_num if weighted and not replace else 0], dtype=np.float64)
+    with nogil:
+        _fill_samples(indptr, indices, seeds, replace, prob, prob_prefix, weighted, random_seed, out_offset,
+                      edge_index, edge_ids, heap_keys, num_threads)
+    return np.asarray(edge_index), np.asarray(edge_ids)
+
+
+def sample_neighbors(offset_t[::1] indptr, index_t[::1] indices, index_t[::1] seeds, int neighbor_num,
+                     bool replace=False, double[::1] prob=None, double[::1] prob_prefix=None,
+                     uint64_t random_seed=0, int num_threads=1):
+    """Sample up to neighbor_num out edges of every seed, in parallel over seeds.
+
+    Every seed draws from its own counter based random stream keyed by (random_seed, seed position), so the
+    result only depends on random_seed, not on the number of threads. Without replacement a seed keeps
+    min(neighbor_num, degree) edges, with replacement neighbor_num edges (none for isolated nodes).
+    When prob is given, edges are drawn proportionally to it and zero weight edges are never drawn:
+    with replacement by binary search in prob_prefix (see csr_row_prefix_sum), without replacement by
+    weighted reservoir sampling (Efraimidis-Spirakis). Raises ValueError on a negative neighbor_num or a
+    seed that is not a row of the CSR.
+
+    Returns:
+        (edge_index, edge_ids), edge_index[0] is the seed and edge_index[1] the sampled neighbor,
+        edge_ids is the CSR position of each sampled edge.
+    """
+    # the kernels are not bound checked
+    cdef Py_ssize_t node_count = indptr.shape[0] - 1
+    if neighbor_num < 0:
+        raise ValueError("neighbor_num should be non negative, but got {}.".format(neighbor_num))
+    if seeds.shape[0] > 0 and (np.min(seeds) < 0 or np.max(seeds) >= node_count):
+        raise ValueError("seeds should be node ids in [0, {}), but got {}..{}.".format(
+            node_count, np.min(seeds), np.max(seeds)))
+    if prob is not None and replace and prob_prefix is None:
+        prob_prefix = csr_row_prefix_sum(indptr, prob, num_threads)
+    return _sample_one_hop(indptr, indices, seeds, neighbor_num, replace, prob, prob_prefix, random_seed,
+                           num_threads)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def sample_multi_hop(offset_t[::1] indptr, index_t[::1] indices, index_t[::1] seeds, neighbor_nums,
+                     index_t[::1] relabel, bool replace=False, double[::1] prob=None, double[::1] prob_prefix=None,
+                     np.uint64_t[::1] hop_seeds=None, int num_threads=1, bool cumulative=False):
+    """Sample every hop with sample_neighbors and relabel the result in the same call.
+
+    The seeds of hop h + 1 are the distinct neighbors drawn in hop h, or with cumulative every node met so
+    far, which is what message flow graphs need. Nodes get local ids in the order they are first met, so
+    all_nodes starts with the distinct seeds and seeds_idx is a prefix of it.
+    relabel is a global -> local table over all nodes filled with -1, it is used as scratch and restored
+    before returning or raising, so one table can serve every call of a thread. Raises ValueError on a
+    negative neighbor num or a seed that is not a node, before the table is touched.
+
+    Returns:
+        (all_nodes, seeds_idx, layered_edges, layered_eids, node_nums), layered_edges[h] holds the local
+        (seed, neighbor) ids of hop h, layered_eids[h] the CSR position of each of its edges and
+        node_nums[h] the number of nodes met before hop h, node_nums[-1] the total.
+    """
+    if prob is not None and replace and prob_prefix is None:
+        prob_prefix = csr_row_prefix_sum(indptr, prob, num_threads)
+    index_dtype = np.asarray(indices).dtype
+    cdef Py_ssize_t hop, i, j
+    cdef Py_ssize_t seeds_length = seeds.shape[0]
+    cdef Py_ssize_t node_num = 0
+    cdef Py_ssize_t frontier_num
+    cdef index_t node
+    cdef index_t[:, ::1] edge_index
+    cdef index_t[:, ::1] local_edges
+    cdef index_t[::1] all_nodes = np.empty([seeds_length], dtype=index_dtype)
+    cdef index_t[::1] seeds_idx = np.empty([seeds_length], dtype=index_dtype)
+    cdef index_t[::1] frontier
+    cdef np.uint8_t[::1] in_frontier
+
+    # the table and the kernels are not bound checked, nothing is written before the input is known to fit
+    cdef Py_ssize_t node_count = indptr.shape[0] - 1
+    if relabel.shape[0] < node_count:
+        raise ValueError("relabel should hold the {} nodes, but got {} entries.".format(
+            node_count, relabel.shape[0]))
+    for neighbor_num in neighbor_nums:
+        if neighbor_num < 0:
+            raise ValueError("neighbor_nums should be non negative, but got {}.".format(list(neighbor_nums)))
+    if seeds_length > 0 and (np.min(seeds) < 0 or np.max(seeds) >= node_count):
+        raise ValueError("seeds should be node ids in [0, {}), but got {}..{}.".format(
+            node_count, np.min(seeds), np.max(seeds)))
+
+    try:
+        with nogil:
+            for i in range(seeds_length):
+                node = seeds[i]
+                if relabel[node] < 0:
+                    relabel[node] = <index_t> node_num
+                    all_nodes[node_num] = node
+                    node_num += 1
+                seeds_idx[i] = relabel[node]
+
+        layered_edges = []
+        layered_eids = []
+        node_nums = [node_num]
+        frontier = np.asarray(all_nodes[:node_num]).copy() if cumulative else seeds
+        for hop, neighbor_num in enumerate(neighbor_nums):
+            random_seed = hop_seeds[hop] if hop_seeds is not None else hop
+            edges, edge_ids = _sample_one_hop(indptr, indices, frontier, neighbor_num, replace, prob, prob_prefix,
+                                              random_seed, num_threads)
+            edge_index = edges
+            local_edges = np.empty_like(edges)
+            all_nodes = np.concatenate([np.asarray(all_nodes[:node_num]),
+                                        np.empty([edge_index.shape[1]], dtype=index_dtype)])
+            in_frontier = np.zeros([all_nodes.shape[0]], dtype=np.uint8)
+            frontier = np.empty([edge_index.shape[1]], dtype=index_dtype)
+            frontier_num = 0
+            with nogil:
+                for j in range(edge_index.shape[1]):
+                    node = edge_index[1, j]
+                    if relabel[node] < 0:
+                        relabel[node] = <index_t> node_num
+                        all_nodes[node_num] = node
+                        node_num += 1
+                    local_edges[0, j] = relabel[edge_index[0, j]]
+                    local_edges[1, j] = relabel[node]
+                    if not in_frontier[relabel[node]]:
+                        in_frontier[relabel[node]] = 1
+                        frontier[frontier_num] = node
+                        frontier_num += 1
+            frontier = np.asarray(all_nodes[:node_num]).copy() if cumulative else frontier[:frontier_num]
+            layered_edges.append(np.asarray(local_edges))
+            layered_eids.append(edge_ids)
+            node_nums.append(node_num)
+    finally:
+        # restored on errors too, a table left dirty would relabel every later call of the thread wrongly
+        with nogil:
+            for i in range(node_num):
+                relabel[all_nodes[i]] = -1
+    return np.asarray(all_nodes[:node_num]).copy(), np.asarray(seeds_idx), layered_edges, layered_eids, node_nums
+
+
+cdef inline Py_ssize_t _key_table_capacity(Py_ssize_t key_count) noexcept nogil:
+    """smallest power of two holding key_count keys at a load factor of at most 1/2"""
+    cdef Py_ssize_t capacity = 16
+    while capacity < 2 * key_count:
+        capacity <<= 1
+    return capacity
+
+
+cdef inline bool _key_table_insert(np.int64_t* slots, uint64_t mask, np.int64_t key) noexcept nogil:
+    """insert a non negative key with linear probing, returns whether it was absent"""
+    cdef uint64_t slot = _mix64(<uint64_t> key) & mask
+    while slots[slot] != -1:
+        if slots[slot] == key:
+            return False
+        slot = (slot + 1) & mask
+    slots[slot] = key
+    return True
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def edge_key_table(np.int64_t[::1] keys):
+    """Open addressing hash set of non negative edge keys, -1 marks an empty slot.
+
+    Returns:
+        (table, distinct key count)
+    """
+    cdef Py_ssize_t capacity = _key_table_capacity(keys.shape[0])
+    table = np.full([capacity], -1, dtype=np.int64)
+    cdef np.int64_t[::1] slots = table
+    cdef uint64_t mask = capacity - 1
+    cdef Py_ssize_t i
+    cdef Py_ssize_t distinct = 0
+    with nogil:
+        for i in range(keys.shape[0]):
+            if _key_table_insert(&slots[0], mask, keys[i]):
+                distinct += 1
+    return table, distinct
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def edge_key_first(np.int64_t[::1] keys):
+    """Mask of the first occurrence of every non negative key, negative keys are never kept."""
+    cdef Py_ssize_t capacity = _key_table_capacity(keys.shape[0])
+    cdef np.int64_t[::1] slots = np.full([capacity], -1, dtype=np.int64)
+    cdef uint64_t mask = capacity - 1
+    cdef Py_ssize_t i
+    cdef np.uint8_t[::1] first = np.zeros([keys.shape[0]], dtype=np.uint8)
+    with nogil:
+        for i in range(keys.shape[0]):
+            if keys[i] >= 0 and _key_table_insert(&slots[0], mask, keys[i]):
+                first[i] = 1
+    return np.asarray(first).view(np.bool_)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def edge_key_contains(np.int64_t[::1] table, np.int64_t[::1] keys, int num_threads=1):
+    """Membership of every key in a table built by edge_key_table."""
+    cdef uint64_t mask = table.shape[0] - 1
+    cdef uint64_t slot
+    cdef Py_ssize_t i
+    cdef np.uint8_t[::1] found = np.zeros([keys.shape[0]], dtype=np.uint8)
+    with nogil:
+        for i in prange(keys.shape[0], schedule="static", num_threads=num_threads):
+            slot = _mix64(<uint64_t> keys[i]) & mask
+            while table[slot] != -1:
+                if table[slot] == keys[i]:
+                    found[i] = 1
+                    break
+                slot = (slot + 1) & mask
+    return np.asarray(found).view(np.bool_)
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def set_node_map_idx(np.ndarray[ndim=1, dtype=np.int32_t] node_map_idx, np.ndarray[ndim=1, dtype=np.int32_t] graph_nodes):
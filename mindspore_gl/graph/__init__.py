@@ -16,8 +16,10 @@
 from .self_loop import add_self_loop, remove_self_loop
 from .get_laplacian import get_laplacian
 from .norm import norm
-from .graph import MindHomoGraph, CsrAdj, BatchMeta
+from .graph import MindHomoGraph, MindRelationGraph, MindHeteroGraph, CsrAdj, BatchMeta
+from .id_mapping import IdMapping, IdentityMapping, SortedIdMapping, DenseIdMapping, as_id_mapping
 from .ops import BatchHomoGraph, PadArray2d, PadHomoGraph, PadMode, PadDirection, UnBatchHomoGraph, PadCsrEdge
+from .bucket import BucketPlanner
 from .gcn_norm import gcn_norm
 from .csr_convert import graph_csr_data, sampling_csr_data, batch_graph_csr_data
 
@@ -28,6 +30,8 @@ __all__ = [
     "get_laplacian",
     "norm",
     "MindHomoGraph",
+    "MindRelationGraph",
+    "MindHeteroGraph",
     "BatchHomoGraph",
     "PadArray2d",
     "PadHomoGraph",
@@ -39,6 +43,12 @@ __all__ = [
     "graph_csr_data",
     "sampling_csr_data",
     "batch_graph_csr_data",
-    "PadCsrEdge"
+    "PadCsrEdge",
+    "BucketPlanner",
+    "IdMapping",
+    "IdentityMapping",
+    "SortedIdMapping",
+    "DenseIdMapping",
+    "as_id_mapping"
 ]
 __all__.sort()
@@ -0,0 +1,236 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Plan the padded shapes of graph batches."""
+import numpy as np
+
+# batches are grouped into that many runs of similar size before planning
+_MAX_GROUPS = 1024
+
+
+def _next_power_of_two(count, multiple):
+    """smallest power of two larger than `count`, at least `multiple`"""
+    return max(multiple, 1 << int(count).bit_length())
+
+
+def _plan(node_counts, edge_counts, num_buckets, multiple, node_weight):
+    """
+    at most `num_buckets` (nodes, edges) shapes growing in both, each larger than the batches it pads,
+    minimizing the padded nodes times `node_weight` plus the padded edges over the batches
+    """
+    node_counts = np.asarray(node_counts, dtype=np.int64).reshape(-1)
+    edge_counts = np.asarray(edge_counts, dtype=np.int64).reshape(-1)
+    # sizes larger than the counts, batches sorted by their size relative to the mean batch
+    nodes = (node_counts // multiple + 1) * multiple
+    edges = (edge_counts // multiple + 1) * multiple
+    order = np.argsort(nodes / nodes.mean() + edges / edges.mean(), kind="stable")
+    nodes, edges = nodes[order], edges[order]
+    # runs of batches, each padded to its largest nodes and edges
+    ends = np.unique(np.linspace(0, nodes.shape[0], min(nodes.shape[0], _MAX_GROUPS) + 1).astype(np.int64))
+    run_nodes = np.maximum.reduceat(nodes, ends[:-1])
+    run_edges = np.maximum.reduceat(edges, ends[:-1])
+    total = ends.astype(np.float64)
+    runs = run_nodes.shape[0]
+
+    def padded(first, last):
+        """padded cost of the runs first..last in one bucket, for every first up to last"""
+        bucket_nodes = np.maximum.accumulate(run_nodes[first:last + 1][::-1])[::-1]
+        bucket_edges = np.maximum.accumulate(run_edges[first:last + 1][::-1])[::-1]
+        return (total[last + 1] - total[first:last + 1]) * (bucket_nodes * node_weight + bucket_edges)
+
+    # cost[j], least padded cost of the runs up to j with a bucket ending at run j
+    cost = np.array([padded(0, j)[0] for j in range(runs)])
+    choices = []
+    for stage in range(1, min(num_buckets, runs)):
+        new_cost = np.full(runs, np.inf)
+        choice = np.zeros(runs, dtype=np.int64)
+        for j in range(stage, runs):
+            # previous bucket ends at run i, runs i + 1..j share a bucket
+            candidates = cost[:j] + padded(1, j)
+            choice[j] = np.argmin(candidates)
+            new_cost[j] = candidates[choice[j]]
+        cost = new_cost
+        choices.append(choice)
+    ends = [runs - 1]
+    for choice in reversed(choices):
+        ends.append(choice[ends[-1]])
+    ends = ends[::-1]
+    firsts = [0] + [end + 1 for end in ends[:-1]]
+    shapes = [(int(run_nodes[first:end + 1].max()), int(run_edges[first:end + 1].max()))
+              for first, end in zip(firsts, ends)]
+    # grow in both, a batch then pads to the first bucket holding it
+    bucket_nodes = np.maximum.accumulate(np.array([shape[0] for shape in shapes]))
+    bucket_edges = np.maximum.accumulate(np.array([shape[1] for shape in shapes]))
+    return sorted(set(zip(bucket_nodes.tolist(), bucket_edges.tolist())))
+
+
+class BucketPlanner:
+    """
+    Padded shapes of graph batches. Every distinct padded shape compiles the network again, padding all
+    batches to the largest one wastes memory and time, and powers of two waste up to half of it. The planner
+    chooses at most `num_buckets` (node count, edge count) shapes minimizing the padding of the batches it saw,
+    from a dataset scan with `fit` or from the first `warmup` batches.
+
+    The pad operators created with `PadMode.BUCKET` pad to the bucket given as `bucket=(n_node, n_edge)`,
+    `shape` of the batch, so the graph, node and edge arrays of a batch have the same counts. Without it
+    PadHomoGraph asks `shape` and the array pads ask `size` for their own length.
+
+    A bucket is larger than the batches it pads, so a padded batch always has a padding node and edge. Batches
+    past the largest bucket are padded to the next powers of two and counted as overflow.
+
+    With DataLoader workers, every worker pads with its own copy of the planner, fit it before creating the
+    DataLoader so the workers share the buckets, and read the reports in the workers.
+
+    Args:
+        num_buckets(int, optional): number of padded shapes, the compile budget. Default: 4.
+        multiple(int, optional): padded counts are multiples of it. Default: 8.
+        warmup(int, optional): plan the buckets after that many batches, they are padded to the next powers of
+            two until then. 0 only plans in `fit`. Default: 0.
+        node_weight(float, optional): cost of a padded node relative to a padded edge. Default: 1.0.
+
+    Raises:
+        TypeError: If `num_buckets` or `multiple` is not a positive integer.
+        TypeError: If `warmup` is not a non negative integer.
+
+    Supported Platforms:
+        ``Ascend`` ``GPU``
+
+    Examples:
+        >>> from mindspore_gl.graph import BucketPlanner
+        >>> planner = BucketPlanner(num_buckets=2)
+        >>> planner.fit([10, 12, 30, 31], [40, 50, 100, 120])
+        >>> print(planner.buckets)
+        [(16, 56), (32, 128)]
+        >>> print(planner.shape(11, 45))
+        (16, 56)
+    """
+
+    def __init__(self, num_buckets=4, multiple=8, warmup=0, node_weight=1.0):
+        if not isinstance(num_buckets, int) or num_buckets <= 0:
+            raise TypeError("num_buckets should be a positive integer value, but got num_buckets = {}."
+                            .format(num_buckets))
+        if not isinstance(multiple, int) or multiple <= 0:
+            raise TypeError("multiple should be a positive integer value, but got multiple = {}.".format(multiple))
+        if not isinstance(warmup, int) or warmup < 0:
+            raise TypeError("warmup should be a non negative integer value, but got warmup = {}.".format(warmup))
+        self.num_buckets = num_buckets
+        self.multiple = multiple
+        self.warmup = warmup
+        self.node_weight = node_weight
+        self._nodes = None
+        self._edges = None
+        self._observed = []
+        # batches, overflow, node and edge count sums, padded node and edge sums
+        self._stats = np.zeros(6, dtype=np.int64)
+        self._shapes = set()
+
+    @property
+    def buckets(self):
+        """
+        Planned shapes.
+
+        Returns:
+            list[tuple], (n_node, n_edge) of the buckets from the smallest, empty before planning.
+        """
+        if self._nodes is None:
+            return []
+        return list(zip(self._nodes.tolist(), self._edges.tolist()))
+
+    def fit(self, node_counts=None, edge_counts=None):
+        """
+        Plan the buckets, from a scan of the dataset or the batches seen during warmup.
+
+        Args:
+            node_counts(Union[numpy.ndarray, List[int]], optional): node count of each batch, None plans from the
+                batches seen so far. Default: None.
+            edge_counts(Union[numpy.ndarray, List[int]], optional): edge count of each batch. Default: None.
+        """
+        if node_counts is None:
+            if not self._observed:
+                return
+            node_counts, edge_counts = zip(*self._observed)
+        shapes = _plan(node_counts, edge_counts, self.num_buckets, self.multiple, self.node_weight)
+        self._nodes = np.array([shape[0] for shape in shapes], dtype=np.int64)
+        self._edges = np.array([shape[1] for shape in shapes], dtype=np.int64)
+        self._observed = []
+
+    def shape(self, node_count, edge_count):
+        """
+        Bucket of a batch, counted in `report`.
+
+        Args:
+            node_count(int): nodes of the batch.
+            edge_count(int): edges of the batch.
+
+        Returns:
+            (int, int), padded node and edge count.
+        """
+        node_count, edge_count = int(node_count), int(edge_count)
+        overflow = 0
+        if self._nodes is None:
+            res = (_next_power_of_two(node_count, self.multiple), _next_power_of_two(edge_count, self.multiple))
+            if self.warmup > 0:
+                self._observed.append((node_count, edge_count))
+                if len(self._observed) >= self.warmup:
+                    self.fit()
+        else:
+            pos = max(np.searchsorted(self._nodes, node_count, side="right"),
+                      np.searchsorted(self._edges, edge_count, side="right"))
+            if pos < self._nodes.shape[0]:
+                res = (int(self._nodes[pos]), int(self._edges[pos]))
+            else:
+                res = (max(_next_power_of_two(node_count, self.multiple), int(self._nodes[-1])),
+                       max(_next_power_of_two(edge_count, self.multiple), int(self._edges[-1])))
+                overflow = 1
+        self._stats += [1, overflow, node_count, edge_count, res[0], res[1]]
+        self._shapes.add(res)
+        return res
+
+    def size(self, dim, count):
+        """
+        Smallest bucket count of one dimension larger than `count`, for arrays padded without the bucket of
+        their batch. It is not counted in `report`.
+
+        Args:
+            dim(str): "node" or "edge".
+            count(int): count to pad.
+
+        Returns:
+            int, padded count.
+        """
+        counts = self._nodes if dim == "node" else self._edges
+        if counts is not None:
+            pos = np.searchsorted(counts, count, side="right")
+            if pos < counts.shape[0]:
+                return int(counts[pos])
+        return _next_power_of_two(count, self.multiple)
+
+    def report(self):
+        """
+        Padding waste and compiled shapes so far.
+
+        Returns:
+            dict, the `buckets`, the padded `batches`, the distinct padded `shapes`, each is a compilation,
+            the `overflow` batches past the largest bucket, and the share of padding in the padded nodes and
+            edges as `node_waste` and `edge_waste`.
+        """
+        batches, overflow, nodes, edges, padded_nodes, padded_edges = self._stats.tolist()
+        return {
+            "buckets": self.buckets,
+            "batches": batches,
+            "shapes": len(self._shapes),
+            "overflow": overflow,
+            "node_waste": 1 - nodes / padded_nodes if padded_nodes else 0.0,
+            "edge_waste": 1 - edges / padded_edges if padded_edges else 0.0,
+        }
@@ -13,25 +13,93 @@
 # limitations under the License.
 # ============================================================================
 """Convert the coo graph to the csr graph."""
+from typing import NamedTuple
 import numpy as np
 import mindspore as ms
-import scipy
+import mindspore_gl.sample_kernel as kernel
+
+
+class CsrData(NamedTuple):
+    """
+    Forward and backward CSR of a graph in numpy, what `coo_to_csr_data` builds.
+
+    `indptr`/`indices` group the source nodes of the edges by destination node, `indptr_backward`/
+    `indices_backward` the destination nodes by source node, both sorted within a row and without duplicated
+    edges. With rerank, node `i` of the CSR is node `perm[i]` of the COO and node `j` of the COO is node
+    `inv_perm[j]` of the CSR.
+    """
+    indices: np.ndarray
+    indptr: np.ndarray
+    indices_backward: np.ndarray
+    indptr_backward: np.ndarray
+    in_deg: np.ndarray
+    out_deg: np.ndarray
+    perm: np.ndarray = None
+    inv_perm: np.ndarray = None
+
+    def to_tensor(self, n_nodes, n_edges):
+        """csr graph tuple of mindspore tensors as taken by `GNNCell` with csr"""
+        return (ms.Tensor(self.indices, ms.int32), ms.Tensor(self.indptr, ms.int32), n_nodes, n_edges,
+                ms.Tensor(self.indices_backward, ms.int32), ms.Tensor(self.indptr_backward, ms.int32))
+
+
+def coo_to_csr_data(row_indices, col_indices, n_nodes, rerank=False):
+    r"""
+    Forward and backward CSR of a COO graph with int32 counting sorts, in numpy.
+
+    A counting sort by row then sorting the rows in place gives the forward CSR, a stable counting sort of it
+    by column the backward CSR sorted within columns, without the float value arrays of a scipy sparse matrix.
+    Duplicated edges are dropped, like the sum of a sparse matrix, the degrees count them.
+
+    Args:
+        row_indices (numpy.ndarray): destination node of each edge, the CSR row.
+        col_indices (numpy.ndarray): source node of each edge, the CSR column.
+        n_nodes (int): integer, represent the nodes count of the graph.
+        rerank (bool, optional): relabel the nodes by decreasing out degree. Default: False.
+
+    Returns:
+        CsrData, the CSR arrays, the degrees by the CSR node ids, and the rerank permutations.
+
+    Examples:
+        >>> import numpy as np
+        >>> from mindspore_gl.graph.csr_convert import coo_to_csr_data
+        >>> data = coo_to_csr_data(np.array([1, 0, 1, 1]), np.array([2, 2, 0, 2]), 3)
+        >>> print(data.indptr, data.indices, data.indptr_backward, data.indices_backward)
+        [0 1 3 3] [2 0 2] [0 1 1 3] [1 0 1]
+    """
+    row_indices = np.ascontiguousarray(row_indices, np.int32)
+    col_indices = np.ascontiguousarray(col_indices, np.int32)
+    out_deg = np.bincount(row_indices, minlength=n_nodes)
+    in_deg = np.bincount(col_indices, minlength=n_nodes)
+    perm = inv_perm = None
+    if rerank:
+        perm = np.argsort(out_deg)[::-1]
+        inv_perm = np.empty(n_nodes, np.int32)
+        inv_perm[perm] = np.arange(n_nodes, dtype=np.int32)
+        row_indices = inv_perm[row_indices]
+        col_indices = inv_perm[col_indices]
+        out_deg = out_deg[perm]
+        in_deg = in_deg[perm]
+    indptr = np.zeros(n_nodes + 1, np.int32)
+    np.cumsum(out_deg, out=indptr[1:])
+    indices = np.empty(row_indices.shape[0], np.int32)
+    kernel.coo_scatter_indices(row_indices, col_indices, indptr, indices)
+    indices = indices[:kernel.csr_sort_unique_rows(indptr, indices)]
+    # stable by column of the row sorted edges, rows sorted within the columns
+    by_row = np.empty(indices.shape[0], np.int32)
+    kernel.csr_expand_rows(indptr, by_row)
+    indptr_backward = np.zeros(n_nodes + 1, np.int32)
+    np.cumsum(np.bincount(indices, minlength=n_nodes), out=indptr_backward[1:])
+    indices_backward = np.empty(indices.shape[0], np.int32)
+    kernel.coo_scatter_indices(indices, by_row, indptr_backward, indices_backward)
+    return CsrData(indices, indptr, indices_backward, indptr_backward, in_deg.astype(np.int32),
+                   out_deg.astype(np.int32), perm, inv_perm)
 
 
 def csr_data(row_indices, col_indices, n_nodes, n_edges):
     """Convert the COO format to the CSR format."""
-    coo_tensor_forward = scipy.sparse.coo_matrix(
-        (np.ones(n_edges), (row_indices, col_indices)), shape=(n_nodes, n_nodes))
-    csr_tensor_forward = coo_tensor_forward.tocsr()
-    indptr = np.asarray(csr_tensor_forward.indptr, np.int32)
-    indices = np.asarray(csr_tensor_forward.indices, np.int32)
-    coo_tensor_backward = scipy.sparse.csr_matrix(
-        (np.ones(n_edges), (col_indices, row_indices)), shape=(n_nodes, n_nodes))
-    csr_tensor_backward = coo_tensor_backward.tocsr()
-    indptr_backward = ms.Tensor(np.asarray(csr_tensor_backward.indptr), dtype=ms.int32)
-    indices_backward = ms.Tensor(np.asarray(csr_tensor_backward.indices), dtype=ms.int32)
-    indices = ms.Tensor(indices, ms.int32)
-    indptr = ms.Tensor(indptr, ms.int32)
+    data = coo_to_csr_data(row_indices, col_indices, n_nodes)
+    indices, indptr, _, _, indices_backward, indptr_backward = data.to_tensor(n_nodes, n_edges)
     return indices, indptr, indices_backward, indptr_backward
 
 def rerank_index(out_deg, row_indices, col_indices):
@@ -44,7 +112,7 @@ def rerank_index(out_deg, row_indices, col_indices):
     return row_indices_forward, col_indices_forward, idx_forward, arg_idx_forward
 
 def graph_csr_data(src_idx, dst_idx, n_nodes, n_edges, node_feat=None, node_label=None, train_mask=None, val_mask=None,
-                   test_mask=None, rerank=False):
+                   test_mask=None, rerank=False, as_tensor=True):
     r"""
     Convert the entire graph in the COO format to the CSR format.
 
@@ -61,6 +129,8 @@ def graph_csr_data(src_idx, dst_idx, n_nodes, n_edges, node_feat=None, node_labe
         val_mask (Union[Tensor, numpy.ndarray, optional]): msk of train index.
         test_mask (Union[Tensor, numpy.ndarray, optional]): mask of train index.
         rerank (bool, optional): whether to reorder node features, node labels, and masks.
+        as_tensor (bool, optional): csr graph and degrees as mindspore tensors, else int32 numpy arrays.
+            Default: True.
 
     Returns:
         - **csr_g** (tuple) - info of csr graph, it contains indices of csr graph, indptr of csr graph,
@@ -110,33 +180,25 @@ def graph_csr_data(src_idx, dst_idx, n_nodes, n_edges, node_feat=None, node_labe
         dst_idx = dst_idx.asnumpy()
     if isinstance(src_idx, ms.Tensor):
         src_idx = src_idx.asnumpy()
-    row_indices = np.array(dst_idx, np.int32)
-    col_indices = np.array(src_idx, np.int32)
-    out_deg = np.bincount(row_indices, minlength=n_nodes)
-    in_deg = np.bincount(col_indices, minlength=n_nodes)
-    if not rerank:
-        indices, indptr, indices_backward, indptr_backward = csr_data(row_indices, col_indices, n_nodes, n_edges)
-    else:
-        row_indices_forward, col_indices_forward, idx_forward, _ = rerank_index(out_deg, row_indices, col_indices)
-        indices, indptr, indices_backward, indptr_backward = csr_data(row_indices_forward, col_indices_forward,
-                                                                      n_nodes, n_edges)
-        idx_forward = idx_forward.tolist()
-        in_deg = in_deg[idx_forward]
-        out_deg = out_deg[idx_forward]
-        node_feat = node_feat[idx_forward]
-        node_label = node_label[idx_forward]
+    data = coo_to_csr_data(dst_idx, src_idx, n_nodes, rerank)
+    if rerank:
+        node_feat = node_feat[data.perm]
+        node_label = node_label[data.perm]
         if train_mask is not None:
-            train_mask = train_mask[idx_forward]
+            train_mask = train_mask[data.perm]
         if val_mask is not None:
-            val_mask = val_mask[idx_forward]
+            val_mask = val_mask[data.perm]
         if test_mask is not None:
-            test_mask = test_mask[idx_forward]
-    in_deg = ms.Tensor(in_deg, ms.int32)
-    out_deg = ms.Tensor(out_deg, ms.int32)
-    csr_g = (indices, indptr, n_nodes, n_edges, indices_backward, indptr_backward)
-    return csr_g, in_deg, out_deg, node_feat, node_label, train_mask, val_mask, test_mask
+            test_mask = test_mask[data.perm]
+    if not as_tensor:
+        csr_g = (data.indices, data.indptr, n_nodes, n_edges, data.indices_backward, data.indptr_backward)
+        return csr_g, data.in_deg, data.out_deg, node_feat, node_label, train_mask, val_mask, test_mask
+    in_deg = ms.Tensor(data.in_deg, ms.int32)
+    out_deg = ms.Tensor(data.out_deg, ms.int32)
+    return data.to_tensor(n_nodes, n_edges), in_deg, out_deg, node_feat, node_label, train_mask, val_mask, test_mask
 
-def sampling_csr_data(src_idx, dst_idx, n_nodes, n_edges, seeds_idx=None, node_feat=None, rerank=False):
+def sampling_csr_data(src_idx, dst_idx, n_nodes, n_edges, seeds_idx=None, node_feat=None, rerank=False,
+                      as_tensor=True):
     r"""
     Convert the sampling graph in the COO format to the CSR format.
 
@@ -150,6 +212,7 @@ def sampling_csr_data(src_idx, dst_idx, n_nodes, n_edges, seeds_idx=None, node_f
         seeds_idx (numpy.ndarray): start nodes for neighbor sampling.
         node_feat (Union[Tensor, numpy.ndarray], optional): node feature.
         rerank (bool, optional): whether to reorder node features, node labels, and masks.
+        as_tensor (bool, optional): csr graph as mindspore tensors, else int32 numpy arrays. Default: True.
 
     Returns:
         - **csr_g** (tuple) - info of csr graph, it contains indices of csr graph, indptr of csr graph,
@@ -175,7 +238,7 @@ def sampling_csr_data(src_idx, dst_idx, n_nodes, n_edges, seeds_idx=None, node_f
         >>> g, seeds_idx, node_feat = sampling_csr_data(src_idx, dst_idx, n_nodes, n_edges,\
         ...                                             seeds_idx, node_feat, rerank=True)
         >>> print(g[0], g[1], seeds_idx)
-        [2 3 5 6 3 4 0 6] [0 2 4 5 6 7 8 8] [5, 4, 3]
+        [2 3 5 6 3 4 0 6] [0 2 4 5 6 7 8 8] [5 4 3]
         >>> print(node_feat)
         [[8. 7. 6. 5.]
          [2. 4. 1. 3.]
@@ -189,25 +252,17 @@ def sampling_csr_data(src_idx, dst_idx, n_nodes, n_edges, seeds_idx=None, node_f
         dst_idx = dst_idx.asnumpy()
     if isinstance(src_idx, ms.Tensor):
         src_idx = src_idx.asnumpy()
-    row_indices = np.array(dst_idx, np.int32)
-    col_indices = np.array(src_idx, np.int32)
-    out_deg = np.bincount(row_indices, minlength=n_nodes)
-    if not rerank:
-        indices, indptr, indices_backward, indptr_backward = csr_data(row_indices, col_indices, n_nodes, n_edges)
-    else:
-        row_indices_forward, col_indices_forward, idx_forward, arg_idx_forward = rerank_index(out_deg, row_indices,
-                                                                                              col_indices)
-        indices, indptr, indices_backward, indptr_backward = csr_data(row_indices_forward, col_indices_forward,
-                                                                      n_nodes, n_edges)
-        idx_forward = idx_forward.tolist()
-        origin_idx = list(range(len(arg_idx_forward)))
-        idx_dict = dict(zip(origin_idx, arg_idx_forward))
-        seeds_idx = [idx_dict[i] for i in seeds_idx]
-        node_feat = node_feat[idx_forward, :]
-    csr_g = (indices, indptr, n_nodes, n_edges, indices_backward, indptr_backward)
-    return csr_g, seeds_idx, node_feat
+    data = coo_to_csr_data(dst_idx, src_idx, n_nodes, rerank)
+    if rerank:
+        seeds_idx = data.inv_perm[seeds_idx]
+        node_feat = node_feat[data.perm, :]
+    if not as_tensor:
+        return (data.indices, data.indptr, n_nodes, n_edges, data.indices_backward, data.indptr_backward), \
+               seeds_idx, node_feat
+    return data.to_tensor(n_nodes, n_edges), seeds_idx, node_feat
 
-def batch_graph_csr_data(src_idx, dst_idx, n_nodes, n_edges, node_map_idx, node_feat=None, rerank=False):
+def batch_graph_csr_data(src_idx, dst_idx, n_nodes, n_edges, node_map_idx, node_feat=None, rerank=False,
+                         as_tensor=True):
     r"""
     Convert the batched graph in the COO format to the CSR format.
 
@@ -221,6 +276,7 @@ def batch_graph_csr_data(src_idx, dst_idx, n_nodes, n_edges, node_map_idx, node_
         node_map_idx (numpy.ndarray): ID of the subgraph to each node belongs to.
         node_feat (Union[Tensor, numpy.ndarray, optional]): node feature.
         rerank (bool, optional): whether to reorder node features, node labels, and masks.
+        as_tensor (bool, optional): csr graph as mindspore tensors, else int32 numpy arrays. Default: True.
 
     Returns:
         - **csr_g** (tuple) - info of csr graph, it contains indices of csr graph, indptr of csr graph,
@@ -260,18 +316,11 @@ def batch_graph_csr_data(src_idx, dst_idx, n_nodes, n_edges, node_map_idx, node_
         dst_idx = dst_idx.asnumpy()
     if isinstance(src_idx, ms.Tensor):
         src_idx = src_idx.asnumpy()
-    row_indices = np.array(dst_idx, np.int32)
-    col_indices = np.array(src_idx, np.int32)
-    out_deg = np.bincount(row_indices, minlength=n_nodes)
-    if not rerank:
-        indices, indptr, indices_backward, indptr_backward = csr_data(row_indices, col_indices, n_nodes, n_edges)
-    else:
-        row_indices_forward, col_indices_forward, idx_forward, _ = rerank_index(out_deg, row_indices,
-                                                                                col_indices)
-        indices, indptr, indices_backward, indptr_backward = csr_data(row_indices_forward, col_indices_forward, n_nodes,
-                                                                      n_edges)
-        idx_forward = idx_forward.tolist()
-        node_feat = node_feat[idx_forward]
-        node_map_idx = node_map_idx[idx_forward]
-    csr_g = (indices, indptr, n_nodes, n_edges, indices_backward, indptr_backward)
-    return csr_g, node_map_idx, node_feat
+    data = coo_to_csr_data(dst_idx, src_idx, n_nodes, rerank)
+    if rerank:
+        node_feat = node_feat[data.perm]
+        node_map_idx = node_map_idx[data.perm]
+    if not as_tensor:
+        return (data.indices, data.indptr, n_nodes, n_edges, data.indices_backward, data.indptr_backward), \
+               node_map_idx, node_feat
+    return data.to_tensor(n_nodes, n_edges), node_map_idx, node_feat
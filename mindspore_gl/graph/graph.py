@@ -17,6 +17,7 @@ from typing import Dict
 from collections import namedtuple
 import numpy as np
 import mindspore_gl.sample_kernel as kernel
+from .id_mapping import IdMapping, as_id_mapping, index_dtype as _index_dtype
 
 CsrAdjNameTuple = namedtuple("csr_adj", ['indptr', 'indices'])
 
@@ -56,22 +57,195 @@ class CsrAdj(CsrAdjNameTuple):
             raise TypeError("'indices' shape must 1 dimesion, but get {}.".format(indices.shape))
         super(CsrAdj, self).__init__()
 
-def coo_to_csr():
-    raise NotImplementedError()
+def coo_to_csr(adj_coo, node_count=None, return_perm=False, num_threads=1):
+    """
+    Convert COO adjacency to CSR with a counting sort, edges in the same row keep their COO order.
+
+    Args:
+        adj_coo(Union[numpy.ndarray, List]): COO edges, shape :math:`(2, N\_EDGES)`.
+        node_count(int, optional): number of nodes, inferred from the largest node id if not given. Default: None.
+        return_perm(bool, optional): also return the COO position of each CSR slot. Default: False.
+        num_threads(int, optional): scatter edges in `num_threads` parallel blocks. Default: 1.
+
+    Returns:
+        - CsrAdj, CSR adjacency, indices are int32 unless node ids need int64,
+          indptr is int32 unless the edge count needs int64.
+        - numpy.ndarray, COO position of each CSR slot, only returned if `return_perm` is True.
+
+    Raises:
+        ValueError: If a node id is negative or not less than `node_count`.
+
+    Examples:
+        >>> import numpy as np
+        >>> from mindspore_gl.graph.graph import coo_to_csr
+        >>> csr = coo_to_csr(np.array([[2, 0, 0, 1], [0, 1, 2, 2]]))
+        >>> print(csr.indptr, csr.indices)
+        [0 2 3 4] [1 2 2 0]
+    """
+    adj_coo = np.asarray(adj_coo)
+    edge_count = adj_coo.shape[1]
+    if node_count is None:
+        node_count = int(adj_coo.max()) + 1 if edge_count > 0 else 0
+    # the kernels index the counts and the CSR by node id without bounds checks
+    if edge_count > 0 and (adj_coo.min() < 0 or adj_coo.max() >= node_count):
+        raise ValueError("node ids of 'adj_coo' must be in [0, {}), but got [{}, {}].".format(
+            node_count, adj_coo.min(), adj_coo.max()))
+    index_dtype = _index_dtype(node_count)
+    offset_dtype = _index_dtype(edge_count)
+    row = np.ascontiguousarray(adj_coo[0], dtype=index_dtype)
+    col = np.ascontiguousarray(adj_coo[1], dtype=index_dtype)
+
+    indptr = np.zeros([node_count + 1], dtype=offset_dtype)
+    if edge_count > 0 and np.all(row[:-1] <= row[1:]):
+        # Already grouped by row, nothing to scatter.
+        np.cumsum(np.bincount(row, minlength=node_count), out=indptr[1:])
+        csr = CsrAdj(indptr, col.copy())
+        return (csr, np.arange(edge_count, dtype=offset_dtype)) if return_perm else csr
+
+    indices = np.empty([edge_count], dtype=index_dtype)
+    perm = np.empty([edge_count], dtype=offset_dtype)
+    if num_threads > 1 and num_threads * node_count <= edge_count:
+        counts = np.zeros([num_threads, node_count], dtype=offset_dtype)
+        kernel.coo_block_count(row, counts)
+        np.cumsum(counts.sum(axis=0), out=indptr[1:])
+        # Exclusive prefix over blocks: first CSR slot of row r owned by block t.
+        cursors = np.cumsum(counts, axis=0, dtype=offset_dtype) - counts
+        cursors += indptr[:-1]
+        kernel.coo_block_scatter_to_csr(row, col, cursors, indices, perm)
+    else:
+        np.cumsum(np.bincount(row, minlength=node_count), out=indptr[1:])
+        kernel.coo_scatter_to_csr(row, col, indptr, indices, perm)
+    csr = CsrAdj(indptr, indices)
+    return (csr, perm) if return_perm else csr
+
+
+def csr_to_coo(csr: CsrAdj, num_threads=1):
+    """
+    Convert CSR adjacency to COO, rows are expanded in parallel over row blocks.
 
+    Args:
+        csr(CsrAdj): CSR adjacency.
+        num_threads(int, optional): number of threads expanding rows. Default: 1.
 
-def csr_to_coo(csr: CsrAdj):
-    coo_adj = [[], []]
-    j = 0
-    for i in range(len(csr.indptr) - 1):
-        while j < csr.indptr[i + 1]:
-            coo_adj[0].append(i)
-            coo_adj[1].append(csr.indices[j])
-            j += 1
-    return coo_adj
+    Returns:
+        - numpy.ndarray, COO edges with shape :math:`(2, N\_EDGES)`, same dtype as `csr.indices`.
+
+    Examples:
+        >>> import numpy as np
+        >>> from mindspore_gl.graph.graph import CsrAdj, csr_to_coo
+        >>> print(csr_to_coo(CsrAdj(np.array([0, 2, 3, 4]), np.array([1, 2, 2, 0]))))
+        [[0 0 1 2]
+         [1 2 2 0]]
+    """
+    indptr = np.ascontiguousarray(csr.indptr)
+    if indptr.dtype not in (np.int32, np.int64):
+        indptr = indptr.astype(np.int64)
+    index_dtype = csr.indices.dtype if csr.indices.dtype in (np.int32, np.int64) else np.int64
+    coo = np.empty([2, csr.indices.shape[0]], dtype=index_dtype)
+    kernel.csr_expand_rows(indptr, coo[0], num_threads)
+    coo[1] = csr.indices
+    return coo
 
 
-class MindRelationGraph:
+def gather_csr_rows(csr: CsrAdj, rows, num_threads=1):
+    """
+    Gather several CSR rows at once into a ragged result.
+
+    Args:
+        csr(CsrAdj): CSR adjacency.
+        rows(numpy.ndarray): local row ids to gather.
+        num_threads(int, optional): number of threads copying rows. Default: 1.
+
+    Returns:
+        - CsrAdj, `indices[indptr[i]: indptr[i + 1]]` holds the columns of `rows[i]`.
+
+    Examples:
+        >>> import numpy as np
+        >>> from mindspore_gl.graph.graph import CsrAdj, gather_csr_rows
+        >>> csr = CsrAdj(np.array([0, 2, 3, 4]), np.array([1, 2, 2, 0]))
+        >>> print(gather_csr_rows(csr, np.array([2, 0])))
+        CsrAdj(indptr=array([0, 1, 3]), indices=array([0, 1, 2]))
+    """
+    indptr = np.ascontiguousarray(csr.indptr)
+    indices = np.ascontiguousarray(csr.indices)
+    rows = np.ascontiguousarray(rows, dtype=indices.dtype)
+    out_indptr = np.zeros([rows.shape[0] + 1], dtype=indptr.dtype)
+    np.cumsum(indptr[rows + 1] - indptr[rows], out=out_indptr[1:])
+    out_indices = np.empty([out_indptr[-1]], dtype=indices.dtype)
+    kernel.csr_gather_rows(indptr, indices, rows, out_indptr, out_indices, num_threads)
+    return CsrAdj(out_indptr, out_indices)
+
+
+def reverse_csr(csr: CsrAdj, node_count=None, return_perm=False):
+    """
+    Build the CSR of the transposed adjacency, i.e. incoming edges grouped by destination.
+
+    Args:
+        csr(CsrAdj): CSR adjacency.
+        node_count(int, optional): number of destination nodes, inferred from `csr.indices` if not given.
+            Default: None.
+        return_perm(bool, optional): also return the slot in `csr` of each reversed edge. Default: False.
+
+    Returns:
+        - CsrAdj, reversed adjacency.
+        - numpy.ndarray, slot in `csr` of each slot of the reversed CSR, only returned if `return_perm` is True.
+    """
+    if node_count is None:
+        node_count = int(csr.indices.max()) + 1 if csr.indices.shape[0] > 0 else 0
+    coo = csr_to_coo(csr)
+    return coo_to_csr(coo[::-1], node_count, return_perm)
+
+
+class _AdjQueryMixin:
+    """
+    Batched adjacency queries shared by MindHomoGraph and MindRelationGraph.
+
+    A scalar node returns the same result as before, an array of nodes is answered with
+    vectorized lookups and a single kernel call, neighbor lists come back as a ragged CsrAdj.
+    """
+
+    def _query_csr(self) -> CsrAdj:
+        return self._adj_csr
+
+    def _reverse_node_count(self):
+        """rows of the reversed CSR, every row of the CSR and every destination in it"""
+        csr = self._query_csr()
+        node_count = csr.indptr.shape[0] - 1
+        if csr.indices.shape[0] > 0:
+            node_count = max(node_count, int(csr.indices.max()) + 1)
+        return node_count
+
+    def _query_reverse_csr(self) -> CsrAdj:
+        """lazily build and cache the CSR of incoming edges and the slot in the CSR of each of them"""
+        if self._reverse_adj_csr is None:
+            self._reverse_adj_csr, self._reverse_perm = reverse_csr(self._query_csr(), self._reverse_node_count(),
+                                                                    return_perm=True)
+        return self._reverse_adj_csr
+
+    def _local_nodes(self, nodes):
+        """global node id(s) -> local row id(s)"""
+        if self._node_map is None:
+            return nodes if np.ndim(nodes) == 0 else np.asarray(nodes)
+        return self._node_map.to_local(nodes)
+
+    def _global_nodes(self, local_nodes):
+        return local_nodes if self._node_map is None else self._node_map.to_global(local_nodes)
+
+    def _query_neighbors(self, csr: CsrAdj, nodes):
+        mapped_idx = self._local_nodes(nodes)
+        if np.ndim(mapped_idx) == 0:
+            neighbor_start = csr.indptr[mapped_idx]
+            neighbor_end = csr.indptr[mapped_idx + 1]
+            return self._global_nodes(csr.indices[neighbor_start: neighbor_end])
+        res = gather_csr_rows(csr, mapped_idx)
+        return CsrAdj(res.indptr, self._global_nodes(res.indices))
+
+    def _query_degrees(self, csr: CsrAdj, nodes):
+        mapped_idx = self._local_nodes(nodes)
+        return csr.indptr[mapped_idx + 1] - csr.indptr[mapped_idx]
+
+
+class MindRelationGraph(_AdjQueryMixin):
     """
     Relation Graph, a simple implementation of relation graph structure in mindspore-gl.
 
@@ -92,8 +266,8 @@ class MindRelationGraph:
         self._adj_csr = None
         self._adj_coo = None
         self._reverse_adj_csr = None
-        self._node_dict = None
-        self._node_ids = None
+        self._reverse_perm = None
+        self._node_map: IdMapping = None
         self._edge_ids = None
 
     ################################
@@ -106,12 +280,15 @@ class MindRelationGraph:
 
         Args:
             adj_csr(CsrAdj): csr format description of adjacent matrix.
-            node_dict(dict, optional): edge ids for each edge.
-            edge_ids(Unumpy.ndarray, optional): global->local node id.
+            node_dict(Union[IdMapping, numpy.ndarray, dict], optional): global->local node id, given as an
+                IdMapping, the global id of each local node or a legacy dict. None means global id equals
+                local id. Default: None.
+            edge_ids(numpy.ndarray, optional): edge ids for each edge. Default: None.
         """
         self._adj_csr = adj_csr
-        self._node_dict = node_dict
-        self._node_ids = None if node_dict is None else np.array(list(node_dict.keys()))
+        self._reverse_adj_csr = None
+        self._reverse_perm = None
+        self._node_map = None if node_dict is None else as_id_mapping(node_dict)
         self._edge_ids = edge_ids
 
 
@@ -130,35 +307,120 @@ class MindRelationGraph:
 
         """
         return node < self._adj_csr.indptr.shape[0] \
-               if self._node_dict is None else self._node_dict.get(node) is not None
+               if self._node_map is None else bool(self._node_map.contains(node))
 
     def successors(self, src_node):
-        mapped_idx = self._node_dict.get(src_node, None)
-        assert mapped_idx is not None
-        neighbor_start = self._adj_csr.indptr[mapped_idx]
-        neighbor_end = self._adj_csr.indptr[mapped_idx + 1]
-        neighbors = self._adj_csr.indices[neighbor_start: neighbor_end]
-        node_ids = neighbors if self._node_ids is None else self._node_ids[neighbors]
-        return node_ids
+        """
+        Successors of a source node, or of an array of source nodes.
+
+        Args:
+            src_node(Union[int, numpy.ndarray]): global source node id(s).
+
+        Returns:
+            - numpy.ndarray for a single node, CsrAdj holding one neighbor list per node for an array.
+        """
+        return self._query_neighbors(self._adj_csr, src_node)
 
     def predecessors(self, dst_node):
-        pass
+        """
+        Predecessors of a destination node, or of an array of destination nodes.
+        The reversed CSR is built on first use and cached.
+
+        Args:
+            dst_node(Union[int, numpy.ndarray]): global destination node id(s).
+
+        Returns:
+            - numpy.ndarray for a single node, CsrAdj holding one neighbor list per node for an array.
+        """
+        return self._query_neighbors(self._query_reverse_csr(), dst_node)
 
     def out_degree(self, src_node):
-        mapped_idx = src_node if self._node_dict is None else self._node_dict.get(src_node, None)
-        assert mapped_idx is not None
-        neighbor_start = self._adj_csr.indptr[mapped_idx]
-        neighbor_end = self._adj_csr.indptr[mapped_idx + 1]
-        return neighbor_end - neighbor_start
+        return self._query_degrees(self._adj_csr, src_node)
 
     def out_degrees(self, src_nodes):
-        pass
+        """
+        Out degrees of an array of source nodes.
+
+        Args:
+            src_nodes(numpy.ndarray): global source node ids.
+
+        Returns:
+            - numpy.ndarray, out degree of each node.
+        """
+        return self._query_degrees(self._adj_csr, np.asarray(src_nodes))
 
     def in_degree(self, dst_node):
-        pass
+        return self._query_degrees(self._query_reverse_csr(), dst_node)
 
     def in_degrees(self, dst_nodes):
-        pass
+        """
+        In degrees of an array of destination nodes.
+
+        Args:
+            dst_nodes(numpy.ndarray): global destination node ids.
+
+        Returns:
+            - numpy.ndarray, in degree of each node.
+        """
+        return self._query_degrees(self._query_reverse_csr(), np.asarray(dst_nodes))
+
+    def sample_successors(self, src_nodes, neighbor_num, replace=False, random_seed=0, num_threads=1):
+        """
+        Sample up to `neighbor_num` out edges of every source node.
+
+        Args:
+            src_nodes(numpy.ndarray): global source node ids.
+            neighbor_num(int): edges to sample per node.
+            replace(bool, optional): sample with replacement. Default: False.
+            random_seed(int, optional): seed of the sampling. Default: 0.
+            num_threads(int, optional): threads sampling the nodes in parallel. Default: 1.
+
+        Returns:
+            - numpy.ndarray, sampled edges of shape :math:`(2, N\_EDGES)`, global (src, dst) ids.
+            - numpy.ndarray, edge id of each sampled edge.
+
+        Raises:
+            ValueError: If a node id is negative.
+        """
+        return self._sample_edges(self._adj_csr, None, src_nodes, neighbor_num, replace, random_seed,
+                                  num_threads)
+
+    def sample_predecessors(self, dst_nodes, neighbor_num, replace=False, random_seed=0, num_threads=1):
+        """
+        Sample up to `neighbor_num` in edges of every destination node.
+        The reversed CSR is built on first use and cached.
+
+        Args:
+            dst_nodes(numpy.ndarray): global destination node ids.
+            neighbor_num(int): edges to sample per node.
+            replace(bool, optional): sample with replacement. Default: False.
+            random_seed(int, optional): seed of the sampling. Default: 0.
+            num_threads(int, optional): threads sampling the nodes in parallel. Default: 1.
+
+        Returns:
+            - numpy.ndarray, sampled edges of shape :math:`(2, N\_EDGES)`, global (src, dst) ids.
+            - numpy.ndarray, edge id of each sampled edge.
+
+        Raises:
+            ValueError: If a node id is negative.
+        """
+        reverse_adj_csr = self._query_reverse_csr()
+        edge_index, eids = self._sample_edges(reverse_adj_csr, self._reverse_perm, dst_nodes,
+                                              neighbor_num, replace, random_seed, num_threads)
+        return edge_index[::-1], eids
+
+    def _sample_edges(self, csr: CsrAdj, perm, nodes, neighbor_num, replace, random_seed, num_threads):
+        """sample the rows of `csr` with the sample kernel, rows past the last one have no edges"""
+        local_nodes = np.ascontiguousarray(self._local_nodes(np.asarray(nodes)), dtype=csr.indices.dtype)
+        if local_nodes.shape[0] > 0 and local_nodes.min() < 0:
+            raise ValueError("nodes should be non negative, but got {}.".format(local_nodes.min()))
+        local_nodes = local_nodes[local_nodes < csr.indptr.shape[0] - 1]
+        edge_index, positions = kernel.sample_neighbors(csr.indptr, csr.indices, local_nodes, neighbor_num,
+                                                        replace, None, None, random_seed, num_threads)
+        if perm is not None:
+            positions = perm[positions]
+        eids = positions if self._edge_ids is None else self._edge_ids[positions]
+        return self._global_nodes(np.asarray(edge_index)), eids
 
     def format(self, out_format):
         pass
@@ -167,6 +429,18 @@ class MindRelationGraph:
     #########################
     # properties
     #########################
+    @property
+    def src_node_type(self):
+        return self._u_type
+
+    @property
+    def dst_node_type(self):
+        return self._v_type
+
+    @property
+    def edge_type(self):
+        return self._e_type
+
     @property
     def node_num(self):
         return self._adj_csr.indptr.shape[0]
@@ -181,7 +455,7 @@ class MindRelationGraph:
 
     @property
     def nodes(self):
-        return np.arange(self.node_num) if self._node_ids is None else self._node_ids
+        return np.arange(self.node_num) if self._node_map is None else self._node_map.global_ids
 
     @property
     def edges(self):
@@ -203,6 +477,10 @@ class BatchMeta:
     Args:
         graph_nodes(numpy.array): array of accumulated node sum for graphs in batched graph (first element is 0).
         graph_edges(numpy.array): array of accumulated edge sum for graphs in batched graph (first element is 0).
+        node_map_idx(numpy.array, optional): graph index of each node, computed on first use when None.
+            Default: None.
+        edge_map_idx(numpy.array, optional): graph index of each edge, computed on first use when None.
+            Default: None.
 
     Supported Platforms:
         ``Ascend`` ``GPU``
@@ -216,12 +494,12 @@ class BatchMeta:
         (20, 100)
 
     """
-    def __init__(self, graph_nodes, graph_edges):
+    def __init__(self, graph_nodes, graph_edges, node_map_idx=None, edge_map_idx=None):
         self._graph_nodes = graph_nodes
         self._graph_edges = graph_edges
         # For Lazy Computation
-        self._node_map_idx = None
-        self._edge_map_idx = None
+        self._node_map_idx = node_map_idx
+        self._edge_map_idx = edge_map_idx
 
     @property
     def graph_nodes(self):
@@ -299,7 +577,7 @@ class BatchMeta:
                 self.graph_edges[graph_idx + 1] - self.graph_edges[graph_idx])
 
 
-class MindHomoGraph:
+class MindHomoGraph(_AdjQueryMixin):
     """
     Build homo graph.
 
@@ -320,11 +598,7 @@ class MindHomoGraph:
         >>> data = np.ones(row.shape)
         >>> csr_mat = csr_matrix((data, (row, col)), shape=(node_count, node_count))
         >>> generated_graph = MindHomoGraph()
-        >>> node_dict = {idx: idx for idx in range(node_count)}
-        >>> edge_count = col.shape[0]
-        >>> edge_ids = np.array(list(range(edge_count))).astype(np.int32)
-        >>> generated_graph.set_topo(CsrAdj(csr_mat.indptr.astype(np.int32), csr_mat.indices.astype(np.int32)),
-        ... node_dict, edge_ids)
+        >>> generated_graph.set_topo(CsrAdj(csr_mat.indptr.astype(np.int32), csr_mat.indices.astype(np.int32)))
         >>> print(generated_graph.neighbors(0))
         # results will be random for suffle
         [10 14]
@@ -332,12 +606,15 @@ class MindHomoGraph:
     """
     def __init__(self):
 
-        self._node_dict = None
-        self._node_ids = None
+        self._node_map: IdMapping = None
         self._edge_ids = None
 
         self._adj_csr: CsrAdj = None
         self._adj_coo = None
+        self._reverse_adj_csr = None
+        self._reverse_perm = None
+        self._csr_perm = None
+        self._csr_from_coo = False
 
         self._node_count = 0
         self._edge_count = 0
@@ -345,19 +622,26 @@ class MindHomoGraph:
         "Batch Meta Info"
         self._batch_meta = None
 
-    def set_topo(self, adj_csr: CsrAdj, node_dict, edge_ids: np.ndarray):
+    def set_topo(self, adj_csr: CsrAdj, node_dict=None, edge_ids: np.ndarray = None):
         """
         Initialize CSR Graph.
 
         Args:
             adj_csr(CsrAdj): adjacency matrix of graph, CSR type.
-            node_dict(dict): node ID dict.
-            edge_ids(numpy.ndarray): array of edges.
+            node_dict(Union[IdMapping, numpy.ndarray, dict], optional): node ID mapping, given as an IdMapping,
+                the global id of each local node or a legacy global->local dict. None means global id equals
+                local id and costs no memory. Default: None.
+            edge_ids(numpy.ndarray, optional): array of edges, None means edge id equals CSR position.
+                Default: None.
         """
         self._adj_csr = adj_csr
-        self._node_dict = node_dict
+        self._adj_coo = None
+        self._reverse_adj_csr = None
+        self._reverse_perm = None
+        self._csr_perm = None
+        self._csr_from_coo = False
+        self._node_map = None if node_dict is None else as_id_mapping(node_dict)
         self._edge_ids = edge_ids
-        self._node_ids = np.array(list(node_dict.keys()))
 
     def set_topo_coo(self, adj_coo, node_dict=None, edge_ids: np.ndarray = None):
         """
@@ -365,12 +649,16 @@ class MindHomoGraph:
 
         Args:
             adj_coo(numpy.ndarray): adjacency matrix of graph, COO type.
-            node_dict(dict, optional): node ID dict. Default: None.
+            node_dict(Union[IdMapping, numpy.ndarray, dict], optional): node ID mapping, see `set_topo`.
+                Default: None.
             edge_ids(numpy.ndarray, optional): array of edges. Default: None.
         """
         self._adj_coo = adj_coo
-        self._node_dict = node_dict
-        self._node_ids = None if node_dict is None else np.array(list(node_dict.keys()))
+        self._adj_csr = None
+        self._reverse_adj_csr = None
+        self._reverse_perm = None
+        self._csr_perm = None
+        self._node_map = None if node_dict is None else as_id_mapping(node_dict)
         self._edge_ids = edge_ids
 
     def neighbors(self, node):
@@ -378,36 +666,89 @@ class MindHomoGraph:
         Query neighbors nodes.
 
         Args:
-            node(int): node index.
+            node(Union[int, numpy.ndarray]): node index, or an array of node indexes.
 
         Returns:
-            - numpy.ndarray, sampled node.
+            - numpy.ndarray for a single node, sampled node.
+            - CsrAdj for an array of nodes, neighbors of `node[i]` are `indices[indptr[i]: indptr[i + 1]]`.
         """
         self._check_csr()
-        mapped_idx = self._node_dict.get(node, None)
-        assert mapped_idx is not None
-        neighbor_start = self._adj_csr.indptr[mapped_idx]
-        neighbor_end = self._adj_csr.indptr[mapped_idx + 1]
-        neighbors = self._adj_csr.indices[neighbor_start: neighbor_end]
-        node_ids = self._node_ids[neighbors]
-        return node_ids
+        return self._query_neighbors(self._adj_csr, node)
 
     def degree(self, node):
         """
         Query With node degree.
 
         Args:
-            node(int): node index.
+            node(Union[int, numpy.ndarray]): node index, or an array of node indexes.
 
         Returns:
-            - int, degree of node.
+            - Union[int, numpy.ndarray], degree of node.
         """
         self._check_csr()
-        mapped_idx = self._node_dict.get(node, None)
-        assert mapped_idx is not None
-        neighbor_start = self._adj_csr.indptr[mapped_idx]
-        neighbor_end = self._adj_csr.indptr[mapped_idx + 1]
-        return neighbor_end - neighbor_start
+        return self._query_degrees(self._adj_csr, node)
+
+    def out_degrees(self, nodes):
+        """
+        Query out degrees of an array of nodes.
+
+        Args:
+            nodes(numpy.ndarray): node indexes.
+
+        Returns:
+            - numpy.ndarray, out degree of each node.
+        """
+        return self.degree(np.asarray(nodes))
+
+    def in_degrees(self, nodes):
+        """
+        Query in degrees of an array of nodes, the reversed CSR is built on first use and cached.
+
+        Args:
+            nodes(numpy.ndarray): node indexes.
+
+        Returns:
+            - numpy.ndarray, in degree of each node.
+        """
+        return self._query_degrees(self._query_reverse_csr(), np.asarray(nodes))
+
+    def predecessors(self, nodes):
+        """
+        Query predecessors of a node or an array of nodes, the reversed CSR is built on first use and cached.
+
+        Args:
+            nodes(Union[int, numpy.ndarray]): node index, or an array of node indexes.
+
+        Returns:
+            - numpy.ndarray for a single node, CsrAdj for an array of nodes.
+        """
+        return self._query_neighbors(self._query_reverse_csr(), nodes)
+
+    def csr_edge_ids(self, positions):
+        """
+        Edge ids of CSR edge slots, as returned by the samplers.
+
+        Args:
+            positions(numpy.ndarray): positions in `adj_csr.indices`.
+
+        Returns:
+            - numpy.ndarray, the id of each edge, i.e. its column in the COO adjacency or its entry in the
+              `edge_ids` given to `set_topo`/`set_topo_coo`.
+        """
+        self._check_csr()
+        if self._csr_from_coo:
+            if self._csr_perm is None:
+                node_count = self._node_count if self._node_count > 0 else None
+                self._csr_perm = coo_to_csr(self._adj_coo, node_count, return_perm=True)[1]
+            positions = self._csr_perm[positions]
+        return positions if self._edge_ids is None else self._edge_ids[positions]
+
+    def _query_csr(self) -> CsrAdj:
+        self._check_csr()
+        return self._adj_csr
+
+    def _reverse_node_count(self):
+        return self._adj_csr.indptr.shape[0] - 1
 
     @property
     def adj_csr(self):
@@ -443,6 +784,9 @@ class MindHomoGraph:
     def adj_coo(self, adj_coo):
         del self._adj_csr
         self._adj_csr = None
+        self._reverse_adj_csr = None
+        self._reverse_perm = None
+        self._csr_perm = None
         self._adj_coo = adj_coo
 
     @property
@@ -534,9 +878,9 @@ class MindHomoGraph:
             return self
         res = MindHomoGraph()
         node_count, edge_count = self.batch_meta[graph_idx]
-        res.adj_coo = self.adj_coo[:, self.batch_meta.graph_edges[graph_idx]:
-                                   self.batch_meta.graph_edges[graph_idx + 1]]
-        res.adj_coo -= - self.batch_meta.graph_nodes[graph_idx]
+        edge_begin, edge_end = self.batch_meta.graph_edges[graph_idx], self.batch_meta.graph_edges[graph_idx + 1]
+        # subtract into a new array, the slice is a view of the batched graph
+        res.adj_coo = self.adj_coo[:, edge_begin:edge_end] - self.batch_meta.graph_nodes[graph_idx]
         res.node_count = node_count
         res.edge_count = edge_count
         return res
@@ -546,7 +890,9 @@ class MindHomoGraph:
         assert self._adj_csr is not None or self._adj_coo is not None
         if self._adj_csr is not None:
             return
-        self._adj_csr = coo_to_csr()
+        node_count = self._node_count if self._node_count > 0 else None
+        self._adj_csr = coo_to_csr(self._adj_coo, node_count)
+        self._csr_from_coo = True
         return
 
     def _check_coo(self):
@@ -579,20 +925,20 @@ class MindHeteroGraph:
 
         return self._rel_graphs[relation_type].successors(src_node)
 
-    def predecessors(self, dst_node):
-        pass
+    def predecessors(self, relation_type, dst_node):
+        return self._rel_graphs[relation_type].predecessors(dst_node)
 
     def out_degree(self, relation_type, src_node):
         return self._rel_graphs[relation_type].out_degree(src_node)
 
     def out_degrees(self, relation_type, src_nodes):
-        pass
+        return self._rel_graphs[relation_type].out_degrees(src_nodes)
 
     def in_degree(self, relation_type, dst_node):
-        pass
+        return self._rel_graphs[relation_type].in_degree(dst_node)
 
     def in_degrees(self, relation_type, dst_nodes):
-        pass
+        return self._rel_graphs[relation_type].in_degrees(dst_nodes)
 
     def format(self, relation_type, out_format):
         pass
@@ -603,5 +949,30 @@ class MindHeteroGraph:
     def edges(self, relation_type):
         return self._rel_graphs[relation_type].edges
 
-    def sample_succeessors(self, relation_type, src_node, neighbor_num):
-        return self._rel_graphs[relation_type].sample_successors(src_node, neighbor_num)
+    def sample_successors(self, relation_type, src_nodes, neighbor_num, replace=False, random_seed=0, num_threads=1):
+        return self._rel_graphs[relation_type].sample_successors(src_nodes, neighbor_num, replace, random_seed,
+                                                                 num_threads)
+
+    def sample_predecessors(self, relation_type, dst_nodes, neighbor_num, replace=False, random_seed=0,
+                            num_threads=1):
+        return self._rel_graphs[relation_type].sample_predecessors(dst_nodes, neighbor_num, replace, random_seed,
+                                                                   num_threads)
+
+    # kept for callers of the original misspelled name
+    sample_succeessors = sample_successors
+
+    def relation_graph(self, relation_type) -> MindRelationGraph:
+        return self._rel_graphs[relation_type]
+
+    @property
+    def relation_types(self):
+        return list(self._rel_graphs.keys())
+
+    @property
+    def node_types(self):
+        """node types in the order they first appear in the relations"""
+        node_types = {}
+        for rel_graph in self._rel_graphs.values():
+            node_types[rel_graph.src_node_type] = None
+            node_types[rel_graph.dst_node_type] = None
+        return list(node_types)
@@ -0,0 +1,238 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Array backed mapping between global node ids and local node ids."""
+import numpy as np
+
+
+def index_dtype(max_value):
+    """Smallest of int32/int64 able to hold max_value."""
+    return np.int32 if max_value < np.iinfo(np.int32).max else np.int64
+
+
+class IdMapping:
+    """
+    Bidirectional mapping between global ids and local ids :math:`0 .. N-1`,
+    local id i stands for global id `global_ids[i]`.
+
+    All queries take either a scalar or a numpy array and are answered with vectorized lookups.
+    """
+
+    def __len__(self):
+        raise NotImplementedError
+
+    @property
+    def global_ids(self) -> np.ndarray:
+        """global id of every local id"""
+        raise NotImplementedError
+
+    @property
+    def is_identity(self) -> bool:
+        return False
+
+    @property
+    def nbytes(self) -> int:
+        """memory held by the mapping"""
+        raise NotImplementedError
+
+    def to_global(self, local_ids):
+        """local id(s) -> global id(s)"""
+        raise NotImplementedError
+
+    def to_local(self, global_ids):
+        """global id(s) -> local id(s), every id must be contained in the mapping"""
+        local_ids, found = self._lookup(global_ids)
+        assert np.all(found), "node not in graph"
+        return local_ids
+
+    def contains(self, global_ids):
+        """whether global id(s) are contained in the mapping"""
+        return self._lookup(global_ids)[1]
+
+    def _lookup(self, global_ids):
+        """return (local ids, found mask), local ids are undefined where not found"""
+        raise NotImplementedError
+
+
+class IdentityMapping(IdMapping):
+    """
+    Global id equals local id, holds no memory.
+
+    Args:
+        count(int): number of ids.
+
+    Examples:
+        >>> from mindspore_gl.graph import IdentityMapping
+        >>> mapping = IdentityMapping(10)
+        >>> print(mapping.to_local(np.array([3, 7])), mapping.nbytes)
+        [3 7] 0
+    """
+
+    def __init__(self, count):
+        self._count = int(count)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def global_ids(self):
+        return np.arange(self._count, dtype=index_dtype(self._count))
+
+    @property
+    def is_identity(self):
+        return True
+
+    @property
+    def nbytes(self):
+        return 0
+
+    def to_global(self, local_ids):
+        return local_ids
+
+    def to_local(self, global_ids):
+        assert np.all(self.contains(global_ids)), "node not in graph"
+        return global_ids
+
+    def _lookup(self, global_ids):
+        return global_ids, (np.asarray(global_ids) >= 0) & (np.asarray(global_ids) < self._count)
+
+
+class SortedIdMapping(IdMapping):
+    """
+    Mapping backed by the array of global ids, global -> local is a binary search.
+    Costs 4-8 bytes per id when `global_ids` is sorted, twice that otherwise.
+
+    Args:
+        global_ids(numpy.ndarray): unique global id of each local id.
+        assume_sorted(bool, optional): skip the sortedness check. Default: False.
+
+    Examples:
+        >>> from mindspore_gl.graph import SortedIdMapping
+        >>> mapping = SortedIdMapping(np.array([4, 9, 20]))
+        >>> print(mapping.to_local(np.array([20, 4])), mapping.to_global(1))
+        [2 0] 9
+    """
+
+    def __init__(self, global_ids, assume_sorted=False):
+        global_ids = np.asarray(global_ids)
+        self._global_ids = global_ids
+        self._order = None
+        if not assume_sorted and global_ids.shape[0] > 1 and not np.all(global_ids[:-1] < global_ids[1:]):
+            self._order = np.argsort(global_ids, kind='stable').astype(index_dtype(global_ids.shape[0]))
+            self._sorted_ids = global_ids[self._order]
+        else:
+            self._sorted_ids = global_ids
+
+    def __len__(self):
+        return self._global_ids.shape[0]
+
+    @property
+    def global_ids(self):
+        return self._global_ids
+
+    @property
+    def nbytes(self):
+        if self._order is None:
+            return self._global_ids.nbytes
+        return self._global_ids.nbytes + self._order.nbytes + self._sorted_ids.nbytes
+
+    def to_global(self, local_ids):
+        return self._global_ids[local_ids]
+
+    def _lookup(self, global_ids):
+        pos = np.searchsorted(self._sorted_ids, global_ids)
+        if self._sorted_ids.shape[0] == 0:
+            return pos, np.zeros(np.shape(pos), dtype=bool)
+        pos = np.minimum(pos, self._sorted_ids.shape[0] - 1)
+        found = self._sorted_ids[pos] == global_ids
+        return (pos if self._order is None else self._order[pos]), found
+
+
+class DenseIdMapping(IdMapping):
+    """
+    Mapping backed by a lookup table indexed by global id, global -> local is a single gather.
+    Suited for ids drawn from a compact range, costs 4-8 bytes per possible global id.
+
+    Args:
+        global_ids(numpy.ndarray): unique global id of each local id.
+        max_id(int, optional): largest possible global id, defaults to `global_ids.max()`. Default: None.
+
+    Examples:
+        >>> from mindspore_gl.graph import DenseIdMapping
+        >>> mapping = DenseIdMapping(np.array([9, 4, 20]))
+        >>> print(mapping.to_local(np.array([20, 4])), mapping.contains(5))
+        [2 1] False
+    """
+
+    def __init__(self, global_ids, max_id=None):
+        global_ids = np.asarray(global_ids)
+        if max_id is None:
+            max_id = int(global_ids.max()) if global_ids.shape[0] > 0 else -1
+        self._global_ids = global_ids
+        self._table = np.full([max_id + 1], -1, dtype=index_dtype(global_ids.shape[0]))
+        self._table[global_ids] = np.arange(global_ids.shape[0], dtype=self._table.dtype)
+
+    def __len__(self):
+        return self._global_ids.shape[0]
+
+    @property
+    def global_ids(self):
+        return self._global_ids
+
+    @property
+    def nbytes(self):
+        return self._global_ids.nbytes + self._table.nbytes
+
+    def to_global(self, local_ids):
+        return self._global_ids[local_ids]
+
+    def _lookup(self, global_ids):
+        global_ids = np.asarray(global_ids)
+        in_range = (global_ids >= 0) & (global_ids < self._table.shape[0])
+        local_ids = self._table[np.where(in_range, global_ids, 0)]
+        return local_ids, in_range & (local_ids >= 0)
+
+
+def as_id_mapping(nodes, count=None) -> IdMapping:
+    """
+    Build an IdMapping from the node description accepted by the graph classes.
+
+    Args:
+        nodes(Union[None, IdMapping, dict, numpy.ndarray]): None means identity over `count` ids,
+            a dict maps global id -> local id, an array gives the global id of each local id.
+        count(int, optional): number of ids, only needed when `nodes` is None. Default: None.
+
+    Returns:
+        - IdMapping, IdentityMapping when the ids are 0..N-1 in order, DenseIdMapping when they come from a
+          compact range and SortedIdMapping otherwise.
+    """
+    if isinstance(nodes, IdMapping):
+        return nodes
+    if nodes is None:
+        return IdentityMapping(count or 0)
+    if isinstance(nodes, dict):
+        global_ids = np.empty([len(nodes)], dtype=np.int64)
+        local_ids = np.fromiter(nodes.values(), dtype=np.int64, count=len(nodes))
+        global_ids[local_ids] = np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes))
+    else:
+        global_ids = np.asarray(nodes)
+    n = global_ids.shape[0]
+    if n == 0:
+        return IdentityMapping(0)
+    global_ids = global_ids.astype(index_dtype(int(global_ids.max()) + 1), copy=False)
+    if global_ids[0] == 0 and global_ids[-1] == n - 1 and np.all(global_ids[1:] - global_ids[:-1] == 1):
+        return IdentityMapping(n)
+    if int(global_ids.max()) < 2 * n:
+        return DenseIdMapping(global_ids)
+    return SortedIdMapping(global_ids)
@@ -19,11 +19,17 @@ from enum import Enum
 import numpy as np
 
 import mindspore_gl.array_kernel as array_kernel
-import mindspore_gl.dataloader.shared_numpy as shared_numpy
 from .graph import BatchMeta, MindHomoGraph
 from .utils import SharedArrayPool, ArrayPool
 
 
+def _offsets(counts):
+    """accumulated sum of `counts` as int32, first element is 0"""
+    res = np.zeros([counts.shape[0] + 1], dtype=np.int32)
+    np.cumsum(counts, out=res[1:])
+    return res
+
+
 class BatchHomoGraph:
     """
     BatchHomoGraph, batch list of MindHomoGraph into a single MindHomoGraph with some batch_meta information.
@@ -52,37 +58,66 @@ class BatchHomoGraph:
         40
     """
 
-    def __init__(self):
-        self.res_coo = None
-
     def __call__(self, graph_list: List[MindHomoGraph], **kwargs) -> MindHomoGraph:
-        """determine coo_length"""
-        total_edge_count = 0
-        total_node_count = 0
-        graph_nodes = np.zeros([len(graph_list) + 1], dtype=np.int32)
-        graph_edges = np.zeros([len(graph_list) + 1], dtype=np.int32)
-        for idx, graph in enumerate(graph_list):
-            total_edge_count += graph.edge_count
-            total_node_count += graph.node_count
-            graph_edges[idx + 1] = total_edge_count
-            graph_nodes[idx + 1] = total_node_count
-
-        if self.res_coo is None or self.res_coo.shape[1] < total_edge_count:
-            del self.res_coo
-            self.res_coo = np.zeros([2, total_edge_count], dtype=np.int32)
-        # copy edge array
-        node_offset = 0
-        edge_offset = 0
-        for graph in graph_list:
-            self.res_coo[:, edge_offset: graph.edge_count + edge_offset] = graph.adj_coo + node_offset
-            node_offset += graph.node_count
-            edge_offset += graph.edge_count
-        # Pack Result
+        node_counts = np.fromiter((graph.node_count for graph in graph_list), np.int64, len(graph_list))
+        edge_counts = np.fromiter((graph.edge_count for graph in graph_list), np.int64, len(graph_list))
+        graph_nodes = _offsets(node_counts)
+        graph_edges = _offsets(edge_counts)
+        res_coo = np.empty([2, graph_edges[-1]], dtype=np.int32)
+        if graph_list:
+            np.concatenate([graph.adj_coo for graph in graph_list], axis=1, out=res_coo)
+        res_coo += np.repeat(graph_nodes[:-1], edge_counts)
+        return self._pack(res_coo, BatchMeta(graph_nodes=graph_nodes, graph_edges=graph_edges))
+
+    def gather(self, edge_array, graph_nodes, graph_edges, graph_idx, node_base=None) -> MindHomoGraph:
+        """
+        Batch graphs of a multi graph dataset straight from its arrays, with a few vectorized gathers and
+        no MindHomoGraph per graph. The batched graph already has its `node_map_idx` and `edge_map_idx`.
+
+        Args:
+            edge_array(numpy.ndarray): COO edges of all graphs of the dataset, shape :math:`(2, N\_EDGES)`.
+            graph_nodes(numpy.ndarray): accumulated node count of the graphs of the dataset (first element is 0).
+            graph_edges(numpy.ndarray): accumulated edge count of the graphs of the dataset (first element is 0).
+            graph_idx(Union[numpy.ndarray, List[int]]): graphs to batch, in batch order.
+            node_base(Union[int, numpy.ndarray], optional): id of the first node of each graph in `edge_array`,
+                an int when every graph numbers its nodes from it. None means `graph_nodes`, edges use dataset
+                wide node ids. Default: None.
+
+        Returns:
+            MindHomoGraph, the batched graph, same as batching the graphs with `__call__`.
+        """
+        graph_idx = np.asarray(graph_idx, dtype=np.int64).reshape(-1)
+        graph_nodes = np.asarray(graph_nodes)
+        graph_edges = np.asarray(graph_edges)
+        node_begin = graph_nodes[graph_idx]
+        edge_begin = graph_edges[graph_idx]
+        node_counts = graph_nodes[graph_idx + 1] - node_begin
+        edge_counts = graph_edges[graph_idx + 1] - edge_begin
+        batch_nodes = _offsets(node_counts)
+        batch_edges = _offsets(edge_counts)
+        graph_ids = np.arange(graph_idx.shape[0], dtype=np.int32)
+        node_map_idx = np.repeat(graph_ids, node_counts)
+        edge_map_idx = np.repeat(graph_ids, edge_counts)
+        # position of each batched edge in edge_array, and how much its node ids move
+        positions = np.arange(batch_edges[-1], dtype=np.int64)
+        positions += np.repeat(edge_begin - batch_edges[:-1], edge_counts)
+        if node_base is None:
+            node_base = node_begin
+        elif np.ndim(node_base) > 0:
+            node_base = np.asarray(node_base)[graph_idx]
+        # take is several times faster than fancy indexing over the second axis
+        res_coo = np.take(edge_array, positions, axis=1)
+        res_coo += np.repeat(batch_nodes[:-1] - node_base, edge_counts).astype(res_coo.dtype, copy=False)
+        batch_meta = BatchMeta(graph_nodes=batch_nodes, graph_edges=batch_edges, node_map_idx=node_map_idx,
+                               edge_map_idx=edge_map_idx)
+        return self._pack(res_coo.astype(np.int32, copy=False), batch_meta)
+
+    @staticmethod
+    def _pack(res_coo, batch_meta):
         res_graph = MindHomoGraph()
-        res_graph.set_topo_coo(np.copy(self.res_coo[:, :total_edge_count]))
-        res_graph.node_count = total_node_count
-        res_graph.edge_count = total_edge_count
-        batch_meta = BatchMeta(graph_nodes=graph_nodes, graph_edges=graph_edges)
+        res_graph.set_topo_coo(res_coo)
+        res_graph.node_count = int(batch_meta.graph_nodes[-1])
+        res_graph.edge_count = int(batch_meta.graph_edges[-1])
         res_graph.batch_meta = batch_meta
         return res_graph
 
@@ -119,9 +154,19 @@ class UnBatchHomoGraph:
 
     def __call__(self, graph: MindHomoGraph, **kwargs) -> List[MindHomoGraph]:
         assert graph.is_batched, "UnBatchHomoGraph can only be operated on batched_graph"
+        batch_meta = graph.batch_meta
+        # reindex every graph to 0 at once, each graph then gets a view of it
+        local_coo = graph.adj_coo[:, :batch_meta.graph_edges[-1]] - batch_meta.graph_nodes[batch_meta.edge_map_idx]
+        node_counts = np.diff(batch_meta.graph_nodes).tolist()
+        edge_counts = np.diff(batch_meta.graph_edges).tolist()
         res: List[MindHomoGraph] = []
-        for idx in range(graph.batch_meta.graph_count):
-            res.append(graph[idx])
+        for adj_coo, node_count, edge_count in zip(np.split(local_coo, batch_meta.graph_edges[1:-1], axis=1),
+                                                   node_counts, edge_counts):
+            res_graph = MindHomoGraph()
+            res_graph.set_topo_coo(adj_coo)
+            res_graph.node_count = node_count
+            res_graph.edge_count = edge_count
+            res.append(res_graph)
         return res
 
 
@@ -131,6 +176,7 @@ class PadMode(Enum):
 
     - PadMode.CONST: padding the array into user specified shape.
     - PadMode.AUTO: auto generate the padding shape.
+    - PadMode.BUCKET: padding into the shapes planned by a `BucketPlanner`.
 
     Supported Platforms:
         ``Ascend`` ``GPU``
@@ -143,10 +189,14 @@ class PadMode(Enum):
         >>> auto = PadMode.AUTO
         >>> print(auto.name, auto.value)
         AUTO 2
+        >>> bucket = PadMode.BUCKET
+        >>> print(bucket.name, bucket.value)
+        BUCKET 3
     """
 
     CONST = 1
     AUTO = 2
+    BUCKET = 3
 
 
 class PadDirection(Enum):
@@ -191,17 +241,25 @@ class PadArray2d:
             size. If PadMode.AUTO, this will choose padded result length according to input's length.
             The expected length can be calculated as
             :math:`length=2^{ceil\left ( \log_{2}{input\_length}  \right ) }`
+            If PadMode.BUCKET, the length is the `bucket_dim` count of the `bucket` of the batch, or the smallest
+            bucket of `planner` without it.
             Default: mindspore_gl.graph.PadMode.AUTO.
         size(Union[List, Tuple, optional]): User specific size for padding result. Default: None.
         use_shared_numpy(bool, optional): If we use SharedNDArray for speeding up inter process communication.
             This is recommended if you do feature collection and feature padding in child process and
             need inter process communication for graph feature. Default: False.
+        planner(BucketPlanner, optional): padded lengths of PadMode.BUCKET. Default: None.
+        bucket_dim(str, optional): dimension of `planner` the padded axis follows. None is "edge" for
+            PadDirection.ROW and "node" for PadDirection.COL. Default: None.
 
     Inputs:
         - **input_array** (numpy.array) - input numpy array for pad.
+        - **bucket** (tuple, optional) - (n_node, n_edge) of the batch with PadMode.BUCKET, from
+          `BucketPlanner.shape`.
 
     Raises:
         ValueError: pad size should be provided when padding mode is PadMode.CONST.
+        ValueError: planner should be provided when padding mode is PadMode.BUCKET.
 
     Supported Platforms:
         ``Ascend`` ``GPU``
@@ -219,10 +277,16 @@ class PadArray2d:
     """
 
     def __init__(self, dtype, direction, fill_value=None, reset_with_fill_value=True, mode=PadMode.AUTO, size=None,
-                 use_shared_numpy=False):
+                 use_shared_numpy=False, planner=None, bucket_dim=None):
         if mode == PadMode.CONST:
             assert size is not None and dtype is not None and fill_value is not None, \
                 "pad size should be provided when padding mode is PadMode.CONST"
+        if mode == PadMode.BUCKET:
+            assert planner is not None, "planner should be provided when padding mode is PadMode.BUCKET"
+        if bucket_dim is None:
+            bucket_dim = "edge" if direction == PadDirection.ROW else "node"
+        self.planner = planner
+        self.bucket_dim = bucket_dim
         self.pad_mode = mode
         self.pad_direction = direction
         self.fill_value = fill_value
@@ -237,12 +301,8 @@ class PadArray2d:
             self.array_pool = ArrayPool()
 
         if mode == PadMode.CONST:
-            if self.use_shared_numpy:
-                memory_buffer = shared_numpy.SharedNDArray.from_shape(size, dtype=dtype)
-                self.array_pool.put(size, memory_buffer)
-            else:
-                memory_buffer = np.zeros(size, dtype=dtype)
-                self.array_pool.put(size, memory_buffer)
+            # allocate the buffer of the constant size upfront
+            self.array_pool.get(size, dtype)
 
     def __call__(self, input_array, **kwargs):
         """
@@ -250,11 +310,7 @@ class PadArray2d:
         """
         fill_value = kwargs.get("fill_value", None)
         if self.pad_mode == PadMode.CONST:
-            memory_buffer = self.array_pool.pop(self.size)
-            # If Memory Buffer Is None, It's Definitely SharedNDArray
-            if memory_buffer is None:
-                memory_buffer = shared_numpy.SharedNDArray.from_shape(self.size, dtype=self.dtype)
-                self.array_pool.put(self.size, memory_buffer)
+            memory_buffer = self.array_pool.get(self.size, self.dtype)
 
             if self.pad_direction == PadDirection.ROW:
                 memory_buffer[:, :input_array.shape[1]] = input_array
@@ -267,44 +323,43 @@ class PadArray2d:
                     memory_buffer[:input_array.shape[0]] = input_array
                 if self.reset_with_fill_value:
                     memory_buffer[input_array.shape[0]:] = self.fill_value
-            # Put Back To Memory Buffer
-            self.array_pool.put(self.size, memory_buffer)
             return memory_buffer
         memory_buffer = None
         target_size = None
         if self.pad_direction == PadDirection.ROW:
-            bucket_length = math.ceil(math.log2(input_array.shape[1]))
-            target_size = [input_array.shape[0], 1 << bucket_length]
+            length = self._padded_length(input_array.shape[1], kwargs.get("bucket"))
+            target_size = [input_array.shape[0], length]
             if fill_value is None:
-                fill_value = self.fill_value or (1 << bucket_length) - 1
+                fill_value = self.fill_value or length - 1
 
-            memory_buffer = self.array_pool.pop(target_size)
-            if memory_buffer is None:
-                memory_buffer = shared_numpy.SharedNDArray.from_shape(target_size, self.dtype)
-                self.array_pool.put(target_size, memory_buffer)
+            memory_buffer = self.array_pool.get(target_size, self.dtype)
 
             memory_buffer[:, :input_array.shape[1]] = input_array
             if self.reset_with_fill_value:
                 memory_buffer[:, input_array.shape[1]:] = fill_value
         else:
-            bucket_length = math.ceil(math.log2(input_array.shape[0]))
-            target_size = [1 << bucket_length, input_array.shape[1]]
+            length = self._padded_length(input_array.shape[0], kwargs.get("bucket"))
+            target_size = [length, input_array.shape[1]]
 
             if fill_value is None:
-                fill_value = self.fill_value or (1 << bucket_length) - 1
-            memory_buffer = self.array_pool.pop(target_size)
-
-            if memory_buffer is None:
-                memory_buffer = shared_numpy.SharedNDArray.from_shape(target_size, self.dtype)
-                self.array_pool.put(target_size, memory_buffer)
+                fill_value = self.fill_value or length - 1
+            memory_buffer = self.array_pool.get(target_size, self.dtype)
 
             memory_buffer[:input_array.shape[0]] = input_array
             if self.reset_with_fill_value:
                 memory_buffer[input_array.shape[0]:] = fill_value
-        # Put Back To Memory Buffer
-        self.array_pool.put(target_size, memory_buffer)
         return memory_buffer
 
+    def _padded_length(self, length, bucket=None):
+        """padded length of the padded axis in PadMode.AUTO or PadMode.BUCKET"""
+        if self.pad_mode == PadMode.BUCKET:
+            if bucket is None:
+                return self.planner.size(self.bucket_dim, length)
+            padded = bucket[0] if self.bucket_dim == "node" else bucket[1]
+            assert length <= padded, "Given array is too large for the given bucket"
+            return padded
+        return 1 << math.ceil(math.log2(length))
+
     def lazy(self, shape: Union[List, Tuple], **kwargs):
         """
         Lazy Array Pad, this will just determine padded result shape and return an empty array with target shape.
@@ -321,10 +376,7 @@ class PadArray2d:
         """
         fill_value = kwargs.get("fill_value", None)
         if self.pad_mode == PadMode.CONST:
-            memory_buffer = self.array_pool.pop(self.size)
-            # If Memory Buffer Is None, It's Definitely SharedNDArray
-            if memory_buffer is None:
-                memory_buffer = shared_numpy.SharedNDArray.from_shape(self.size, dtype=self.dtype)
+            memory_buffer = self.array_pool.get(self.size, self.dtype)
 
             if self.reset_with_fill_value:
 
@@ -332,38 +384,29 @@ class PadArray2d:
                     memory_buffer[:, shape[1]:] = self.fill_value
                 else:
                     memory_buffer[shape[0]:] = self.fill_value
-            # Put Back To Memory Buffer
-            self.array_pool.put(self.size, memory_buffer)
             return memory_buffer
         memory_buffer = None
         target_size = None
         if self.pad_direction == PadDirection.ROW:
-            bucket_length = math.ceil(math.log2(shape[1]))
-            target_size = [shape[0], 1 << bucket_length]
+            length = self._padded_length(shape[1], kwargs.get("bucket"))
+            target_size = [shape[0], length]
             if fill_value is None:
-                fill_value = self.fill_value or (1 << bucket_length) - 1
+                fill_value = self.fill_value or length - 1
 
-            memory_buffer = self.array_pool.pop(target_size)
-            if memory_buffer is None:
-                memory_buffer = shared_numpy.SharedNDArray.from_shape(target_size, self.dtype)
+            memory_buffer = self.array_pool.get(target_size, self.dtype)
 
             if self.reset_with_fill_value:
                 memory_buffer[:, shape[1]:] = fill_value
         else:
-            bucket_length = math.ceil(math.log2(shape[0]))
-            target_size = [1 << bucket_length, shape[1]]
+            length = self._padded_length(shape[0], kwargs.get("bucket"))
+            target_size = [length, shape[1]]
 
             if fill_value is None:
-                fill_value = self.fill_value or (1 << bucket_length) - 1
-            memory_buffer = self.array_pool.pop(target_size)
-
-            if memory_buffer is None:
-                memory_buffer = shared_numpy.SharedNDArray.from_shape(target_size, self.dtype)
+                fill_value = self.fill_value or length - 1
+            memory_buffer = self.array_pool.get(target_size, self.dtype)
 
             if self.reset_with_fill_value:
                 memory_buffer[shape[0]:] = fill_value
-        # Put Back To Memory Buffer
-        self.array_pool.put(target_size, memory_buffer)
         return memory_buffer
 
 
@@ -380,11 +423,20 @@ class PadHomoGraph:
             If PadMode.AUTO
             target graph's node_count and edge_count is calculated according to input graph's size by
             :math:`n\_node = 2^{ceil(log2(input\_graph.node\_count))}` ,
-            :math:`n\_edge = 2^{ceil(log2(input\_graph.edge\_count))}` . Default: PadMode.AUTO.
+            :math:`n\_edge = 2^{ceil(log2(input\_graph.edge\_count))}` . If PadMode.BUCKET, n_node and n_edge
+            are the `bucket` of the batch, or `planner.shape` of the input graph without it. Default: PadMode.AUTO.
         csr(bool, optional): Is the csr graph. Default: False.
+        use_shared_numpy(bool, optional): allocate the coo of padded batched graphs from a `SharedArrayPool`,
+            the coo is then sent to the main process through shared memory and its block reused once dropped
+            there. Default: False.
+        max_pool_bytes(int, optional): bound of the bytes of the pool with `use_shared_numpy`, None is
+            unbounded. Default: None.
+        planner(BucketPlanner, optional): padded shapes of PadMode.BUCKET. Default: None.
 
     Inputs:
         - **graph** (MindHomoGraph) - input graph.
+        - **bucket** (tuple, optional) - (n_node, n_edge) of the batch with PadMode.BUCKET, from
+          `BucketPlanner.shape`.
 
     Outputs:
         - MindHomoGraph, padded graph.
@@ -416,50 +468,45 @@ class PadHomoGraph:
         7   1
     """
 
-    def __init__(self, n_node=None, mode=PadMode.AUTO, n_edge=None, csr=False):
+    def __init__(self, n_node=None, mode=PadMode.AUTO, n_edge=None, csr=False, use_shared_numpy=False,
+                 max_pool_bytes=None, planner=None):
         if mode == PadMode.CONST:
             assert n_edge is not None and n_node is not None, \
                 "n_node and n_edge should be given when padding with CONST Mode"
+        if mode == PadMode.BUCKET:
+            assert planner is not None, "planner should be given when padding with BUCKET Mode"
+        self.planner = planner
 
         self.n_node = n_node
         self.mode = mode
         self.n_edge = n_edge
         self.batch_op = BatchHomoGraph()
         self.csr = csr
+        self.use_shared_numpy = use_shared_numpy
+        self.array_pool = SharedArrayPool(max_bytes=max_pool_bytes) if use_shared_numpy else None
+
+    def _pad_coo(self, adj_coo, n_edge, pad_coo):
+        """coo of `n_edge` edges, `adj_coo` followed by `pad_coo`"""
+        if self.array_pool is None:
+            if np.isscalar(pad_coo):
+                pad_coo = np.full([2, n_edge - adj_coo.shape[1]], pad_coo, dtype=np.int32)
+            return np.concatenate([adj_coo, pad_coo], axis=1)
+        memory_buffer = self.array_pool.get([2, n_edge], np.int32)
+        memory_buffer[:, :adj_coo.shape[1]] = adj_coo
+        memory_buffer[:, adj_coo.shape[1]:] = pad_coo
+        return memory_buffer
 
     def __call__(self, graph: MindHomoGraph, **kwargs) -> MindHomoGraph:
         """
         Do pad operation.
         """
-        # Check Input Graph is Valid To Pad
+        if self.mode == PadMode.CONST:
+            return self._pad_const(graph, self.n_node, self.n_edge)
+        if self.mode == PadMode.BUCKET:
+            n_node, n_edge = kwargs.get("bucket") or self.planner.shape(graph.node_count, graph.edge_count)
+            return self._pad_const(graph, n_node, n_edge)
         res_graph = MindHomoGraph()
-        if self.mode is PadMode.CONST:
-            assert graph.edge_count < self.n_edge, \
-                "Given graph is too large for the given padding"
         if graph.is_batched:
-            if self.mode == PadMode.CONST:
-                # No Need To Pad
-                if graph.edge_count == self.n_edge:
-                    return graph
-                # Determine Padded Graph
-                if self.csr:
-                    pad_graph_coo = generate_fill_array(graph.adj_coo, (2, self.n_edge), self.n_node - 1)
-                else:
-                    pad_graph_coo = np.full([2, self.n_edge - graph.edge_count], self.n_node - 1, dtype=np.int32)
-                pad_graph = MindHomoGraph()
-                pad_graph.adj_coo = pad_graph_coo
-                pad_graph.node_count = self.n_node - graph.node_count
-                pad_graph.edge_count = self.n_edge - graph.edge_count
-                # Pad Graph
-                res_graph.adj_coo = np.concatenate([graph.adj_coo, pad_graph.adj_coo], axis=1)
-                res_graph_graph_nodes = np.concatenate([graph.batch_meta.graph_nodes, np.array([self.n_node],
-                                                                                               dtype=np.int32)])
-                res_graph_graph_edges = np.concatenate([graph.batch_meta.graph_edges, np.array([self.n_edge],
-                                                                                               dtype=np.int32)])
-                res_graph.batch_meta = BatchMeta(graph_nodes=res_graph_graph_nodes, graph_edges=res_graph_graph_edges)
-                res_graph.edge_count = self.n_edge
-                res_graph.node_count = self.n_node
-                return res_graph
             # No Need To Pad
             if graph.edge_count == 1 << math.ceil(math.log2(graph.edge_count)):
                 return graph
@@ -467,35 +514,20 @@ class PadHomoGraph:
             edge_bucket_length = math.ceil(math.log2(graph.edge_count))
             padded_graph_edge_count = (1 << edge_bucket_length) - graph.edge_count
             padded_graph_node_count = (1 << math.ceil(math.log2(graph.node_count))) - graph.node_count
-            pad_graph = MindHomoGraph()
             pad_value = (1 << math.ceil(math.log2(graph.node_count))) - 1
-            pad_graph.adj_coo = np.full([2, padded_graph_edge_count], pad_value, dtype=np.int32)
-            pad_graph.node_count = padded_graph_node_count
-            pad_graph.edge_count = padded_graph_edge_count
 
             # Pad Graph
-            res_graph.adj_coo = np.concatenate([graph.adj_coo, pad_graph.adj_coo], axis=1)
+            res_graph.adj_coo = self._pad_coo(graph.adj_coo, 1 << edge_bucket_length, pad_value)
             res_graph_graph_nodes = np.concatenate([graph.batch_meta.graph_nodes,
                                                     np.array([1 << math.ceil(math.log2(graph.node_count))],
                                                              dtype=np.int32)])
             res_graph_graph_edges = np.concatenate([graph.batch_meta.graph_edges,
                                                     np.array([1 << edge_bucket_length], dtype=np.int32)])
             res_graph.batch_meta = BatchMeta(graph_nodes=res_graph_graph_nodes, graph_edges=res_graph_graph_edges)
-            res_graph.edge_count = graph.edge_count + pad_graph.edge_count
-            res_graph.node_count = graph.node_count + pad_graph.node_count
+            res_graph.edge_count = graph.edge_count + padded_graph_edge_count
+            res_graph.node_count = graph.node_count + padded_graph_node_count
 
             return res_graph
-        if self.mode == PadMode.CONST:
-            # No Need To Pad
-            if graph.edge_count == self.n_edge:
-                return graph
-            # Determine Pad Graph
-            pad_graph_coo = np.full([2, self.n_edge - graph.edge_count], self.n_node - 1, dtype=np.int32)
-            pad_graph = MindHomoGraph()
-            pad_graph.adj_coo = pad_graph_coo
-            pad_graph.node_count = self.n_node - graph.node_count
-            pad_graph.edge_count = self.n_edge - graph.edge_count
-            return self.batch_op([graph, pad_graph])
         # No Need To Pad
         if graph.edge_count == 1 << math.ceil(math.log2(graph.edge_count)):
             return graph
@@ -510,6 +542,42 @@ class PadHomoGraph:
         pad_graph.edge_count = padded_graph_edge_count
         return self.batch_op([graph, pad_graph])
 
+    def _pad_const(self, graph, n_node, n_edge):
+        """pad to `n_node` nodes and `n_edge` edges"""
+        # Check Input Graph is Valid To Pad
+        assert graph.edge_count < n_edge, \
+            "Given graph is too large for the given padding"
+        if graph.is_batched:
+            # No Need To Pad
+            if graph.edge_count == n_edge:
+                return graph
+            # Determine Padded Graph
+            if self.csr:
+                pad_graph_coo = generate_fill_array(graph.adj_coo, (2, n_edge), n_node - 1)
+            else:
+                pad_graph_coo = n_node - 1
+            # Pad Graph
+            res_graph = MindHomoGraph()
+            res_graph.adj_coo = self._pad_coo(graph.adj_coo, n_edge, pad_graph_coo)
+            res_graph_graph_nodes = np.concatenate([graph.batch_meta.graph_nodes, np.array([n_node],
+                                                                                           dtype=np.int32)])
+            res_graph_graph_edges = np.concatenate([graph.batch_meta.graph_edges, np.array([n_edge],
+                                                                                           dtype=np.int32)])
+            res_graph.batch_meta = BatchMeta(graph_nodes=res_graph_graph_nodes, graph_edges=res_graph_graph_edges)
+            res_graph.edge_count = n_edge
+            res_graph.node_count = n_node
+            return res_graph
+        # No Need To Pad
+        if graph.edge_count == n_edge:
+            return graph
+        # Determine Pad Graph
+        pad_graph_coo = np.full([2, n_edge - graph.edge_count], n_node - 1, dtype=np.int32)
+        pad_graph = MindHomoGraph()
+        pad_graph.adj_coo = pad_graph_coo
+        pad_graph.node_count = n_node - graph.node_count
+        pad_graph.edge_count = n_edge - graph.edge_count
+        return self.batch_op([graph, pad_graph])
+
 
 class UnPadHomoGraph:
     """Empty placeholder"""
@@ -535,16 +603,22 @@ class PadCsrEdge:
         mode(PadMode, optional): Pad mode for array, if PadMode.CONST, this op will pad array to user-specific size.
             If PadMode.AUTO, this will choose padded result length according to input's length.
             The expected length can be calculated as :math:`length=2^{ceil\left ( \log_{2}{input\_length}  \right ) }`
+            If PadMode.BUCKET, the length is the edge count of the `bucket` of the batch, or the smallest edge
+            bucket of `planner` without it.
             Default: mindspore_gl.graph.PadMode.AUTO.
         use_shared_numpy(bool, optional): If we use SharedNDArray for speeding up inter process communication.
             This is recommended if you do feature collection and feature padding in child process and
             need inter process communication for graph feature. Default: False.
+        planner(BucketPlanner, optional): padded lengths of PadMode.BUCKET. Default: None.
 
     Inputs:
         - **input_array** (numpy.array) - input numpy array for pad.
+        - **bucket** (tuple, optional) - (n_node, n_edge) of the batch with PadMode.BUCKET, from
+          `BucketPlanner.shape`.
 
     Raises:
         ValueError: pad length should be provided when padding mode is PadMode.CONST.
+        ValueError: planner should be provided when padding mode is PadMode.BUCKET.
 
     Supported Platforms:
         ``Ascend`` ``GPU``
@@ -564,7 +638,10 @@ class PadCsrEdge:
     """
 
     def __init__(self, pad_nodes, reset_with_fill_value=True, length=None, mode=PadMode.AUTO,
-                 use_shared_numpy=False):
+                 use_shared_numpy=False, planner=None):
+        if mode == PadMode.BUCKET:
+            assert planner is not None, "planner should be provided when padding mode is PadMode.BUCKET"
+        self.planner = planner
         self.pad_nodes = pad_nodes
         self.pad_mode = mode
         self.homo_batch = BatchHomoGraph()
@@ -577,45 +654,33 @@ class PadCsrEdge:
             self.array_pool = ArrayPool()
 
         if mode == PadMode.CONST:
-            if self.use_shared_numpy:
-                memory_buffer = shared_numpy.SharedNDArray.from_shape(self.size, dtype=np.int32)
-                self.array_pool.put(self.size, memory_buffer)
-            else:
-                memory_buffer = np.zeros(self.size, dtype=np.int32)
-                self.array_pool.put(self.size, memory_buffer)
+            # allocate the buffer of the constant size upfront
+            self.array_pool.get(self.size, np.int32)
 
-    def __call__(self, input_array):
+    def __call__(self, input_array, **kwargs):
         """
         Pad Array
         """
         if self.pad_mode == PadMode.CONST:
             fill_array = generate_fill_array(input_array, self.size, self.pad_nodes)
-            memory_buffer = self.array_pool.pop(self.size)
-            # If Memory Buffer Is None, It's Definitely SharedNDArray
-            if memory_buffer is None:
-                memory_buffer = shared_numpy.SharedNDArray.from_shape(self.size, dtype=np.int32)
-                self.array_pool.put(self.size, memory_buffer)
+            memory_buffer = self.array_pool.get(self.size, np.int32)
 
             memory_buffer[:, :input_array.shape[1]] = input_array
             if self.reset_with_fill_value:
                 memory_buffer[:, input_array.shape[1]:] = fill_array
-            # Put Back To Memory Buffer
-            self.array_pool.put(self.size, memory_buffer)
             return memory_buffer
-        bucket_length = math.ceil(math.log2(input_array.shape[1]))
-        target_size = [2, 1 << bucket_length]
+        if self.pad_mode == PadMode.BUCKET:
+            bucket = kwargs.get("bucket")
+            target_size = [2, bucket[1] if bucket else self.planner.size("edge", input_array.shape[1])]
+        else:
+            target_size = [2, 1 << math.ceil(math.log2(input_array.shape[1]))]
         fill_value = generate_fill_array(input_array, target_size, self.pad_nodes)
 
-        memory_buffer = self.array_pool.pop(target_size)
-        if memory_buffer is None:
-            memory_buffer = shared_numpy.SharedNDArray.from_shape(target_size, np.int32)
-            self.array_pool.put(target_size, memory_buffer)
+        memory_buffer = self.array_pool.get(target_size, np.int32)
 
         memory_buffer[:, :input_array.shape[1]] = input_array
         if self.reset_with_fill_value:
             memory_buffer[:, input_array.shape[1]:] = fill_value
-        # Put Back To Memory Buffer
-        self.array_pool.put(target_size, memory_buffer)
         return memory_buffer
 
 def generate_fill_array(input_array, size, pad_nodes):
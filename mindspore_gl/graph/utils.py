@@ -13,7 +13,10 @@
 # limitations under the License.
 # ============================================================================
 """Graph Utils."""
+from collections import OrderedDict, deque
 from typing import Union, List, Tuple, Iterable
+import threading
+import weakref
 import numpy
 import mindspore_gl.dataloader.shared_numpy as shared_numpy
 import mindspore_gl.memory_kernel as memory_kernel
@@ -22,9 +25,23 @@ import mindspore_gl.memory_kernel as memory_kernel
 class ArrayPool:
     """
     Memory pool for reuse
+
+    `get` hands out the arrays of the main thread to it and arrays of their own to other threads, so DataLoader
+    thread workers padding with the same operator do not write into the same buffer.
     """
     def __init__(self):
         self.array_pool = {}
+        self._thread_pools = weakref.WeakKeyDictionary()
+
+    def __getstate__(self):
+        # arrays of the threads stay in this process
+        state = self.__dict__.copy()
+        del state["_thread_pools"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._thread_pools = weakref.WeakKeyDictionary()
 
     def put(self, size, array: numpy.ndarray):
         """
@@ -57,26 +74,70 @@ class ArrayPool:
 
         return buckets.pop()
 
-
-class SharedArrayPool:
-    """
-    Shared memory pool for reuse, this is recommended for interprocess communication
-    """
-    def __init__(self):
-        self.array_pool = {}
-
-    def put(self, size: Union[List, Tuple, Iterable], shared_array: shared_numpy.SharedNDArray):
+    def get(self, size, dtype) -> numpy.ndarray:
         """
-         put a array into array pool
+        array of the size, created on the first call and handed out again on the next calls of the size from
+        the same thread
 
         Args:
-            size(Union[List, Tuple]): input array size
-            shared_array(shared_numpy.SharedNDArray): input array
+            size(Union[List, Tuple]): request array's size
+            dtype(numpy.dtype): data type of the array created
+
+        Returns:
+            - numpy.array, the array of the size.
         """
         key = "_".join(list(map(str, size)))
-        if self.array_pool.get(key, None) is None:
-            self.array_pool[key] = []
-        self.array_pool[key].append(shared_array)
+        array_pool = self.array_pool
+        thread = threading.current_thread()
+        if thread is not threading.main_thread():
+            array_pool = self._thread_pools.setdefault(thread, {})
+        bucket = array_pool.setdefault(key, [])
+        if not bucket:
+            bucket.append(numpy.empty(size, dtype=dtype))
+        return bucket[-1]
+
+
+class SharedArrayPool:
+    """
+    Shared memory pool for reuse, this is recommended for interprocess communication.
+
+    Blocks are allocated by power of two byte size classes and handed out as SharedNDArray views of the shape
+    and dtype asked, so arrays of different shapes share the blocks of a size class. A block is busy while its
+    view is alive in this process or held by a process it was sent to, then it goes back to the free list of
+    its size class. When allocating would take the pool over `max_bytes`, the least recently used free blocks
+    are dropped and their shared memory unlinked.
+
+    Args:
+        max_bytes(int, optional): bound of the bytes of the blocks of the pool, None is unbounded. Busy
+            blocks are never dropped, the bound is exceeded while they take more. Default: None.
+        min_block_bytes(int, optional): smallest size class. Default: 4096.
+
+    Examples:
+        >>> import numpy as np
+        >>> from mindspore_gl.graph.utils import SharedArrayPool
+        >>> pool = SharedArrayPool(max_bytes=1 << 30)
+        >>> arr = pool.get([1000, 3], np.float32)
+        >>> del arr
+        >>> arr = pool.get([3000], np.int32)
+        >>> print(pool.stats["hits"], pool.stats["resident_bytes"])
+        1 16384
+    """
+    def __init__(self, max_bytes=None, min_block_bytes=4096):
+        self.max_bytes = max_bytes
+        self.min_block_bytes = min_block_bytes
+        # size class -> free blocks, and all free blocks least recently used first, keyed by id
+        self._free = {}
+        self._lru = OrderedDict()
+        # size class -> (block, weakref of its view), oldest first
+        self._busy = {}
+        self._resident_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def size_class(self, nbytes):
+        """bytes of the blocks holding `nbytes`"""
+        return max(self.min_block_bytes, 1 << max(int(nbytes) - 1, 0).bit_length())
 
     def check_avaliable(self, shared_array: shared_numpy.SharedNDArray):
         """
@@ -90,23 +151,100 @@ class SharedArrayPool:
         """
         return memory_kernel.py_ref_count(shared_array.shm.buf) == 1 and not shared_array.shared
 
-    def pop(self, size: Union[List, Tuple, Iterable]) -> shared_numpy.SharedNDArray:
+    def get(self, size: Union[List, Tuple, Iterable], dtype) -> shared_numpy.SharedNDArray:
         """
-        pop a array from array pool
+        get an array from the pool, its content is left from the last use of the block
 
         Args:
             size(Union[List, Tuple]): request array's size
+            dtype(numpy.dtype): request array's data type
 
         Returns:
-            - Union[numpy.array, None], return None is request size has no array left, else return the array.
+            - shared_numpy.SharedNDArray, a view of a free block, or of a new one if none is free.
+        """
+        size = list(size)
+        dtype = numpy.dtype(dtype)
+        size_class = self.size_class(shared_numpy.shared_numpy.prod(size) * dtype.itemsize)
+        block = self._take_free(size_class)
+        if block is None:
+            # blocks of other size classes released since their last get can be dropped to make room
+            for other in list(self._busy):
+                self._reclaim(other, stop_at_busy=False)
+            block = self._take_free(size_class)
+        if block is None:
+            self._misses += 1
+            if self.max_bytes is not None:
+                self._evict(self._resident_bytes + size_class - self.max_bytes)
+            block = shared_numpy.SharedNDArray.from_shape([size_class], numpy.uint8)
+            self._resident_bytes += size_class
+        else:
+            self._hits += 1
+        view = block.view_as(size, dtype)
+        self._busy.setdefault(size_class, deque()).append((block, weakref.ref(view)))
+        return view
+
+    def clear(self):
+        """drop the free blocks"""
+        for busy in list(self._busy):
+            self._reclaim(busy, stop_at_busy=False)
+        self._evict(self._resident_bytes)
+
+    @property
+    def stats(self):
+        """
+        Hits and misses of `get`, dropped blocks and bytes of the pool.
 
+        Returns:
+            dict, `hits`, `misses`, `hit_rate`, `evictions`, `resident_bytes`, `free_bytes` and `blocks`.
         """
-        key = "_".join(list(map(str, size)))
-        bucket = self.array_pool.get(key, None)
-        if bucket is None:
+        requests = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / requests if requests else 0.0,
+            "evictions": self._evictions,
+            "resident_bytes": self._resident_bytes,
+            "free_bytes": sum(block.nbytes for block in self._lru.values()),
+            "blocks": len(self._lru) + sum(len(busy) for busy in self._busy.values()),
+        }
+
+    def _is_free(self, block, view_ref):
+        return view_ref() is None and self.check_avaliable(block)
+
+    def _reclaim(self, size_class, stop_at_busy=True):
+        """move the released blocks of a size class to its free list, oldest first"""
+        busy = self._busy.get(size_class)
+        if not busy:
+            return
+        kept = deque()
+        while busy:
+            block, view_ref = busy[0]
+            if self._is_free(block, view_ref):
+                busy.popleft()
+                self._free.setdefault(size_class, OrderedDict())[id(block)] = block
+                self._lru[id(block)] = block
+            elif stop_at_busy:
+                break
+            else:
+                kept.append(busy.popleft())
+        busy.extendleft(reversed(kept))
+
+    def _take_free(self, size_class):
+        self._reclaim(size_class)
+        free = self._free.get(size_class)
+        if not free:
             return None
-        # pylint: disable=consider-using-enumerate
-        for idx in range(len(bucket)):
-            if self.check_avaliable(bucket[idx]):
-                return bucket.pop(idx)
-        return None
+        key, block = free.popitem()
+        del self._lru[key]
+        return block
+
+    def _evict(self, nbytes):
+        """drop least recently used free blocks until `nbytes` are dropped or none is free"""
+        while nbytes > 0 and self._lru:
+            key, block = self._lru.popitem(last=False)
+            del self._free[block.nbytes][key]
+            self._resident_bytes -= block.nbytes
+            self._evictions += 1
+            nbytes -= block.nbytes
+            # the last reference, SharedNDArray unlinks its shared memory
+            del block
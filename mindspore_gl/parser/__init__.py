@@ -14,8 +14,8 @@
 # ============================================================================
 """Public API for graph operators."""
 __all__ = ["Graph", "BatchedGraph", "HeterGraph", "GraphField",
-           "BatchedGraphField", "HeterGraphField", "translate"]
+           "BatchedGraphField", "HeterGraphField", "BlockGraphField", "translate"]
 
 from .api import Graph, BatchedGraph, HeterGraph, GraphField,\
-     BatchedGraphField, HeterGraphField
+     BatchedGraphField, HeterGraphField, BlockGraphField
 from .vcg import translate
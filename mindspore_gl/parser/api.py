@@ -2107,6 +2107,63 @@ class GraphField:
         return [self.src_idx, self.dst_idx, self.n_nodes, self.n_edges]
 
 
+class BlockGraphField(GraphField):
+    r"""
+    The data container for one block of a message flow graph, see `mindspore_gl.sampling.Block`.
+
+    The edges are stored in COO format over the :math:`N\_SRC\_NODES` source nodes, every destination
+    index is below :math:`N\_DST\_NODES` and the destination nodes are the first source nodes, so a
+    layer applied to the block only has to keep the first `n_dst_nodes` rows of its output.
+
+    Args:
+        src_idx (Tensor): A tensor with shape :math:`(N\_EDGES)`, with int dtype,
+            represents the source node index of COO edge matrix.
+        dst_idx (Tensor): A tensor with shape :math:`(N\_EDGES)`, with int dtype,
+            represents the destination node index of COO edge matrix.
+        n_src_nodes (int): An integer, represent the source nodes count of the block.
+        n_dst_nodes (int): An integer, represent the destination nodes count of the block.
+        n_edges (int): An integer, represent the edges count of the block.
+
+    Supported Platforms:
+        ``Ascend`` ``GPU``
+
+    Examples:
+        >>> import mindspore as ms
+        >>> from mindspore_gl import BlockGraphField
+        >>> src_idx = ms.Tensor([2, 3, 1, 0], ms.int32)
+        >>> dst_idx = ms.Tensor([0, 0, 1, 1], ms.int32)
+        >>> block_field = BlockGraphField(src_idx, dst_idx, 4, 2, 4)
+        >>> print(block_field.get_graph(), block_field.n_dst_nodes)
+        [Tensor(shape=[4], dtype=Int32, value= [2, 3, 1, 0]),
+        Tensor(shape=[4], dtype=Int32, value= [0, 0, 1, 1]), 4, 4] 2
+    """
+
+    def __init__(self, src_idx, dst_idx, n_src_nodes, n_dst_nodes, n_edges):
+        super().__init__(src_idx, dst_idx, n_src_nodes, n_edges)
+        self.n_dst_nodes = n_dst_nodes
+        if isinstance(self.n_dst_nodes, ms.Tensor):
+            if self.n_dst_nodes.dtype == ms.bool_:
+                raise TypeError(f"n_dst_nodes should be an integer, but got {self.n_dst_nodes.dtype}.")
+            self.n_dst_nodes = int(self.n_dst_nodes.asnumpy())
+        if isinstance(self.n_dst_nodes, bool) or not isinstance(self.n_dst_nodes, int):
+            raise TypeError(f"n_dst_nodes should be an integer, but got {type(self.n_dst_nodes)}.")
+        if self.n_dst_nodes > self.n_nodes:
+            raise ValueError(f"n_dst_nodes should not exceed n_src_nodes {self.n_nodes}, but got {self.n_dst_nodes}.")
+
+    @property
+    def n_src_nodes(self):
+        return self.n_nodes
+
+    def get_block_graph(self):
+        """
+        Get the block.
+
+        Returns:
+            List, the list of `get_graph` followed by the destination nodes count.
+        """
+        return self.get_graph() + [self.n_dst_nodes]
+
+
 class BatchedGraphField(GraphField):
     r"""
     The data container for a batched graph.
@@ -2288,6 +2345,27 @@ class HeterGraphField:
         if not isinstance(self.n_edges, list):
             raise TypeError(f"n_edges should be a list, but got {type(self.n_edges)}.")
 
+    @classmethod
+    def from_blocks(cls, blocks, relation_types=None):
+        """
+        Build the field of one layer sampled by `mindspore_gl.sampling.sage_sampler_on_hetero`.
+
+        Args:
+            blocks (Dict[str, Block]): the block of each relation in the layer.
+            relation_types (List[str], optional): relation order expected by the network, every relation
+                needs a block. Default: None, the order of `blocks`.
+
+        Returns:
+            HeterGraphField, the node count of a relation is the destination nodes count of its block.
+        """
+        if relation_types is None:
+            relation_types = list(blocks.keys())
+        src_idx = [ms.Tensor(blocks[r].src_idx, ms.int32) for r in relation_types]
+        dst_idx = [ms.Tensor(blocks[r].dst_idx, ms.int32) for r in relation_types]
+        n_nodes = [blocks[r].n_dst_nodes for r in relation_types]
+        n_edges = [blocks[r].n_edges for r in relation_types]
+        return cls(src_idx, dst_idx, n_nodes, n_edges)
+
     def get_heter_graph(self):
         """
         Get the hetergenous Graph.
@@ -14,13 +14,30 @@
 # ============================================================================
 """Utils function"""
 import importlib.util
+import os
 from pathlib import Path
-import random
 
-DEFAULT_SRC_LOC = Path.cwd().parent / ".mindspore_gl" / str(hash(random.randint(1, 1e30)))
+DEFAULT_SRC_LOC = Path.cwd().parent / ".mindspore_gl"
 counter = 0
 
-def src_to_function(src_code: str, func_name: str, globals_dict: dict, translate_path: None or str):
+
+def src_folder_of(translate_path: None or str):
+    """
+    Folder of the translated files.
+
+    Args:
+        translate_path (None or str): The path for save the construct file.
+
+    Returns:
+        Path, `.mindspore_gl` under `translate_path`, or `DEFAULT_SRC_LOC`.
+    """
+    if translate_path is None:
+        return DEFAULT_SRC_LOC
+    return Path(translate_path) / ".mindspore_gl"
+
+
+def src_to_function(src_code: str, func_name: str, globals_dict: dict, translate_path: None or str,
+                    module_name: None or str = None):
     """
     Transform the source code to function.
 
@@ -29,24 +46,51 @@ def src_to_function(src_code: str, func_name: str, globals_dict: dict, translate
         func_name (str): the function name.
         globals_dict (dict): globals dict.
         translate_path (None or str): The path for save the construct file.
+        module_name (None or str): name of the saved file, `cached_function` finds it again by that name. None
+            numbers the file with a counter. Default: None.
 
     Returns:
         Function, new function.
     """
     global counter
-    module_name = func_name + f"-{counter}"
+    if module_name is None:
+        module_name = func_name + f"-{counter}"
+        counter += 1
     file_name = module_name + ".py"
-    counter += 1
-    if translate_path is None:
-        translate_path = DEFAULT_SRC_LOC
-    else:
-        translate_path = Path(translate_path) / ".mindspore_gl" / str(hash(random.randint(1, 1e30)))
-    Path(translate_path).mkdir(parents=True, exist_ok=True)
-    with open(translate_path / file_name, "w", encoding="UTF-8") as f:
+    translate_path = src_folder_of(translate_path)
+    translate_path.mkdir(parents=True, exist_ok=True)
+    # written aside and renamed, processes translating the same cell never read a partial file
+    tmp_name = translate_path / f"{file_name}.{os.getpid()}.tmp"
+    with open(tmp_name, "w", encoding="UTF-8") as f:
         f.write(src_code)
+    os.replace(tmp_name, translate_path / file_name)
     new_fn = import_func(module_name, func_name, translate_path)
     return add_import_info(new_fn, globals_dict)
 
+
+def cached_function(module_name: str, func_name: str, globals_dict: dict, translate_path: None or str):
+    """
+    Function saved by `src_to_function` under `module_name`.
+
+    Args:
+        module_name (str): name of the saved file.
+        func_name (str): the function name.
+        globals_dict (dict): globals dict.
+        translate_path (None or str): The path for save the construct file.
+
+    Returns:
+        Function, the saved function, None if it is not saved or can not be loaded.
+    """
+    src_folder = src_folder_of(translate_path)
+    if not (src_folder / (module_name + ".py")).is_file():
+        return None
+    try:
+        new_fn = import_func(module_name, func_name, src_folder)
+    except (OSError, SyntaxError, ImportError, KeyError):
+        return None
+    return add_import_info(new_fn, globals_dict)
+
+
 def add_import_info(new_fn, globals_dict):
     """
     Add import information.
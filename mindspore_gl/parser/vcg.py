@@ -14,18 +14,48 @@
 # ============================================================================
 """Translation."""
 import ast
+import hashlib
 import inspect
+import sys
+from pathlib import Path
 from types import MethodType
 from textwrap import dedent
 from ast_decompiler import decompile
 from .infer_expr_type_pass import InferExprTypePass
 from .check_syntax_pass import CheckSyntaxPass
 from .ast_rewriter import AstRewriter
+from .ast_base import BACKEND
+from .backend import Backend
 from .code_comparator import CodeComparator
-from .utils import src_to_function
+from .utils import src_to_function, cached_function
+from ..version import __version__
 
 SCREEN_WIDTH = 200
 DISPLAY = True
+# translated functions of this process, by method, translation flags and path
+_TRANSLATED = {}
+_PARSER_DIGEST = None
+
+
+def _parser_digest():
+    """digest of the parser sources, a changed translator does not load older translations"""
+    global _PARSER_DIGEST
+    if _PARSER_DIGEST is None:
+        digest = hashlib.sha256()
+        for path in sorted(Path(__file__).parent.glob("*.py")):
+            digest.update(path.read_bytes())
+        _PARSER_DIGEST = digest.hexdigest()
+    return _PARSER_DIGEST
+
+
+def _translation_key(fn, src):
+    """content key of a translation, the saved file is reused while it is the same"""
+    digest = hashlib.sha256()
+    for part in (src, fn.__module__, fn.__qualname__, str(Backend.csr), str(Backend.backward),
+                 type(BACKEND).__name__, __version__, "{}.{}".format(*sys.version_info[:2]), _parser_digest()):
+        digest.update(part.encode("UTF-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
 
 
 def set_display_config(screen_width, display):
@@ -48,6 +78,10 @@ def translate(obj, method_name: str, translate_path: None or str = None):
     After translation, a new function will generate in `/.mindspore_gl` .
     The origin method will be replaced with this function.
 
+    Translations are cached. The file is named after a key of the method source, the `csr` and `backward`
+    flags, the backend and the library version, a later process with the same key loads it without translating,
+    and the same method is translated once per process. The code comparison is only displayed when translating.
+
     Args:
         obj (Object): The object.
         method_name (str): The name of the method to be translated.
@@ -79,10 +113,25 @@ def translate(obj, method_name: str, translate_path: None or str = None):
         ...         loss = ops.ReduceMean()(loss * g.graph_mask)
         ...         return loss
     """
-    global SCREEN_WIDTH, DISPLAY
     fn = getattr(obj, method_name)
+    memo_key = (getattr(fn, "__func__", fn), Backend.csr, Backend.backward, translate_path)
+    new_fn = _TRANSLATED.get(memo_key)
+    if new_fn is None:
+        new_fn = _translate_function(fn, method_name, translate_path)
+        _TRANSLATED[memo_key] = new_fn
+    setattr(obj, method_name, MethodType(new_fn, obj))
+
+
+def _translate_function(fn, method_name, translate_path):
+    """translated function of the method `fn`, loaded from the file of an earlier translation if there is one"""
+    global SCREEN_WIDTH, DISPLAY
     src = inspect.getsource(fn)
     src = dedent(src)
+    module_name = "{}_{}".format(method_name, _translation_key(fn, src))
+    new_fn = cached_function(module_name, method_name, fn.__globals__, translate_path)
+    if new_fn is not None:
+        new_fn.__module__ = fn.__module__
+        return new_fn
     py_ast = ast.parse(src)
     syntax_checker = CheckSyntaxPass(fn.__globals__)
     ret = syntax_checker.analyze(py_ast)
@@ -97,6 +146,6 @@ def translate(obj, method_name: str, translate_path: None or str = None):
         comparator.mapping_by_origin_lineno(new_ast)
         comparator.show_diff()
     new_src = decompile(new_ast)
-    new_fn = src_to_function(new_src, method_name, fn.__globals__, translate_path)
+    new_fn = src_to_function(new_src, method_name, fn.__globals__, translate_path, module_name)
     new_fn.__module__ = fn.__module__
-    setattr(obj, method_name, MethodType(new_fn, obj))
+    return new_fn
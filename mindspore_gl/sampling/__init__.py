@@ -14,14 +14,20 @@
 # ============================================================================
 """Sampling APIs for graph data."""
 from .k_hop_sampling import k_hop_subgraph
-from .negative_sample import negative_sample
+from .negative_sample import negative_sample, NegativeSampler
 from .randomwalks import random_walk_unbias_on_homo
 from .neighbor import sage_sampler_on_homo
+from .block import Block, sage_block_sampler_on_homo
+from .hetero import sage_sampler_on_hetero
 
 __all__ = [
     "k_hop_subgraph",
     "negative_sample",
+    "NegativeSampler",
     "random_walk_unbias_on_homo",
-    "sage_sampler_on_homo"
+    "sage_sampler_on_homo",
+    "Block",
+    "sage_block_sampler_on_homo",
+    "sage_sampler_on_hetero"
 ]
 __all__.sort()
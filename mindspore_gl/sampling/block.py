@@ -0,0 +1,142 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Message flow graph (block) sampling"""
+from typing import List
+import numpy as np
+import mindspore_gl
+from mindspore_gl.graph import MindHomoGraph
+from mindspore_gl import sample_kernel
+from .neighbor import _relabel_table
+
+
+class Block:
+    r"""
+    One layer of a message flow graph: a bipartite graph whose messages go from `n_src_nodes` source nodes
+    to `n_dst_nodes` destination nodes. Destination nodes are the first `n_dst_nodes` source nodes, so the
+    output of a layer is its input sliced to `[:n_dst_nodes]`, and the source nodes of a block are the
+    destination nodes of the block before it.
+
+    Args:
+        src_idx(numpy.ndarray): local source node of each edge, in :math:`[0, n\_src\_nodes)`.
+        dst_idx(numpy.ndarray): local destination node of each edge, in :math:`[0, n\_dst\_nodes)`.
+        n_src_nodes(int): number of source nodes.
+        n_dst_nodes(int): number of destination nodes.
+        eids(numpy.ndarray, optional): edge id of each edge. Default: None.
+
+    Examples:
+        >>> import numpy as np
+        >>> from mindspore_gl.sampling import Block
+        >>> block = Block(np.array([2, 3, 1]), np.array([0, 0, 1]), 4, 2)
+        >>> print(block.n_edges, block.edges)
+        3 [[2 3 1]
+         [0 0 1]]
+    """
+
+    def __init__(self, src_idx, dst_idx, n_src_nodes, n_dst_nodes, eids=None):
+        self.src_idx = src_idx
+        self.dst_idx = dst_idx
+        self.n_src_nodes = int(n_src_nodes)
+        self.n_dst_nodes = int(n_dst_nodes)
+        self.eids = eids
+
+    @property
+    def n_edges(self):
+        return self.src_idx.shape[0]
+
+    @property
+    def edges(self):
+        r"""edges as a :math:`(2, N\_EDGES)` array of (src, dst), the layout expected by `PadArray2d`"""
+        return np.stack([self.src_idx, self.dst_idx])
+
+    def __repr__(self):
+        return f"Block(n_src_nodes={self.n_src_nodes}, n_dst_nodes={self.n_dst_nodes}, n_edges={self.n_edges})"
+
+
+def sage_block_sampler_on_homo(homo_graph: mindspore_gl.graph.MindHomoGraph, seeds, neighbor_nums: List[int],
+                               replace=False, prob=None, random_seed=None, num_threads=1):
+    """
+    GraphSage sampling on MindHomoGraph returning one message flow graph block per layer.
+
+    Hop 0 samples `neighbor_nums[0]` neighbors of the seeds, hop h samples `neighbor_nums[h]` neighbors of
+    every node met in hops before h, so the block of each layer holds exactly the nodes its output is
+    needed for. The blocks are returned in forward order: `blocks[0]` is consumed by the first GNN layer
+    and comes from the last hop, `blocks[-1]` has the seeds as destination nodes.
+
+    Args:
+        homo_graph(mindspore_gl.graph.MindHomoGraph): input graph.
+        seeds(numpy.ndarray): start nodes for neighbor sampling.
+        neighbor_nums(List): neighbor nums for each hop.
+        replace(bool, optional): sample with replacement. Default: False.
+        prob(numpy.ndarray, optional): sampling weight of each edge, aligned with
+            `homo_graph.adj_csr.indices`. Default: None.
+        random_seed(int, optional): seed of the sampling. None draws one from numpy's global random state.
+            Default: None.
+        num_threads(int, optional): threads sampling the seeds of a hop in parallel. Default: 1.
+
+    Returns:
+        - **all_nodes** (numpy.ndarray) - global id of the source nodes of `blocks[0]`, every block's
+          nodes are a prefix of it.
+        - **seeds_idx** (numpy.ndarray) - local id of each seed, the seeds are the destination nodes of
+          `blocks[-1]`.
+        - **blocks** (List[Block]) - one block per layer, in forward order.
+
+    Raises:
+        TypeError: If `homo_graph` is not a MindHomoGraph class.
+        TypeError: If `seeds` is not a numpy.ndarray.
+        TypeError: If `neighbor_nums` is not a list.
+        ValueError: If `neighbor_nums` has a negative number or a seed is not a node of `homo_graph`.
+
+    Supported Platforms:
+        ``Ascend`` ``GPU``
+
+    Examples:
+        >>> import numpy as np
+        >>> from mindspore_gl.graph import MindHomoGraph
+        >>> from mindspore_gl.sampling import sage_block_sampler_on_homo
+        >>> graph = MindHomoGraph()
+        >>> graph.set_topo_coo(np.array([[0, 0, 1, 2, 2, 3], [1, 2, 2, 0, 3, 1]], np.int32))
+        >>> graph.node_count = 4
+        >>> all_nodes, seeds_idx, blocks = sage_block_sampler_on_homo(graph, np.array([0], np.int32), [2, 2],
+        ...                                                           random_seed=0)
+        >>> print(all_nodes, seeds_idx, blocks)
+        [0 1 2 3] [0] [Block(n_src_nodes=4, n_dst_nodes=3, n_edges=5), Block(n_src_nodes=3, n_dst_nodes=1, n_edges=2)]
+    """
+    if not isinstance(homo_graph, MindHomoGraph):
+        raise TypeError("For sage_block_sampler_on_homo, the 'homo_graph' must a MindHomoGraph, but got "
+                        f"{type(homo_graph).__name__}.")
+    if not isinstance(seeds, np.ndarray):
+        raise TypeError("For sage_block_sampler_on_homo, the 'seeds' must a numpy array, but got "
+                        f"{type(seeds).__name__}.")
+    if not isinstance(neighbor_nums, list):
+        raise TypeError("For sage_block_sampler_on_homo, the 'neighbor_nums' must a list, but got "
+                        f"{type(neighbor_nums).__name__}.")
+    adj_csr = homo_graph.adj_csr
+    if prob is not None:
+        prob = np.ascontiguousarray(prob, dtype=np.float64)
+    if random_seed is None:
+        random_seed = np.random.randint(np.iinfo(np.int32).max)
+    layer_seeds = np.random.SeedSequence(random_seed).generate_state(len(neighbor_nums), np.uint64)
+    seeds = seeds.astype(adj_csr.indices.dtype, copy=False)
+    relabel = _relabel_table(adj_csr.indptr.shape[0] - 1, adj_csr.indices.dtype)
+    all_nodes, seeds_idx, layered_edges, layered_eids, node_nums = sample_kernel.sample_multi_hop(
+        adj_csr.indptr, adj_csr.indices, seeds, neighbor_nums, relabel, replace, prob, None,
+        layer_seeds, num_threads, True)
+    blocks = []
+    for hop in reversed(range(len(neighbor_nums))):
+        # messages flow from the sampled neighbor to the node it was sampled for
+        edges = layered_edges[hop]
+        blocks.append(Block(edges[1], edges[0], node_nums[hop + 1], node_nums[hop],
+                            homo_graph.csr_edge_ids(layered_eids[hop])))
+    return all_nodes, seeds_idx, blocks
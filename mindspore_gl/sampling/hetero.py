@@ -0,0 +1,143 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Neighbor sampling on heterogeneous graphs"""
+from typing import Dict, List
+import numpy as np
+from mindspore_gl.graph import MindHeteroGraph
+from .block import Block
+
+
+def _relabel(nodes, candidates):
+    """
+    Append the unseen `candidates` to the distinct `nodes` in the order they are first met.
+
+    Returns the extended nodes and the local id of every candidate, the ids of `nodes` are kept.
+    """
+    merged = np.concatenate([nodes, candidates])
+    _, first, inverse = np.unique(merged, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    local = np.empty_like(order)
+    local[order] = np.arange(order.shape[0])
+    return merged[first[order]], local[inverse.reshape(-1)[nodes.shape[0]:]].astype(np.int32)
+
+
+def sage_sampler_on_hetero(hetero_graph: MindHeteroGraph, seeds: Dict[str, np.ndarray],
+                           fanouts: List[Dict[str, int]], replace=False, random_seed=None, num_threads=1):
+    """
+    GraphSage sampling on MindHeteroGraph returning one block per relation and layer.
+
+    Hop h samples, for every relation in `fanouts[h]`, `fanouts[h][relation]` in edges of every node of
+    the relation's destination type met before hop h. Nodes are relabeled per node type in the order they
+    are first met, so the seeds come first and the destination nodes of a block are a prefix of the nodes
+    of their type. The blocks are returned in forward order like `sage_block_sampler_on_homo`.
+
+    Args:
+        hetero_graph(mindspore_gl.graph.MindHeteroGraph): input graph.
+        seeds(Dict[str, numpy.ndarray]): start nodes of each node type.
+        fanouts(List[Dict[str, int]]): for each hop, neighbors to sample per relation type, relations
+            missing from a hop are not sampled in it.
+        replace(bool, optional): sample with replacement. Default: False.
+        random_seed(int, optional): seed of the sampling. None draws one from numpy's global random state.
+            Default: None.
+        num_threads(int, optional): threads sampling the nodes of a relation in parallel. Default: 1.
+
+    Returns:
+        - **all_nodes** (Dict[str, numpy.ndarray]) - global id of the sampled nodes of each node type.
+        - **seeds_idx** (Dict[str, numpy.ndarray]) - local id of each seed.
+        - **blocks** (List[Dict[str, Block]]) - for each layer in forward order, the block of every
+          relation sampled in it, source ids index `all_nodes` of the source type and destination ids
+          `all_nodes` of the destination type.
+
+    Raises:
+        TypeError: If `hetero_graph` is not a MindHeteroGraph class.
+        TypeError: If `seeds` is not a dict.
+        TypeError: If `fanouts` is not a list.
+
+    Supported Platforms:
+        ``Ascend`` ``GPU``
+
+    Examples:
+        >>> import numpy as np
+        >>> from mindspore_gl.graph import MindHeteroGraph, MindRelationGraph, CsrAdj
+        >>> from mindspore_gl.sampling import sage_sampler_on_hetero
+        >>> writes = MindRelationGraph("author", "paper", "writes")
+        >>> writes.set_topo(CsrAdj(np.array([0, 2, 3], np.int32), np.array([0, 1, 1], np.int32)))
+        >>> cites = MindRelationGraph("paper", "paper", "cites")
+        >>> cites.set_topo(CsrAdj(np.array([0, 1, 1], np.int32), np.array([1], np.int32)))
+        >>> graph = MindHeteroGraph()
+        >>> graph.add_graph(writes)
+        >>> graph.add_graph(cites)
+        >>> all_nodes, seeds_idx, blocks = sage_sampler_on_hetero(
+        ...     graph, {"paper": np.array([1], np.int32)},
+        ...     [{"author_writes_paper": 2, "paper_cites_paper": 2}], random_seed=0)
+        >>> print(all_nodes["author"], all_nodes["paper"])
+        [0 1] [1 0]
+        >>> print(blocks[0]["author_writes_paper"])
+        Block(n_src_nodes=2, n_dst_nodes=1, n_edges=2)
+    """
+    if not isinstance(hetero_graph, MindHeteroGraph):
+        raise TypeError("For sage_sampler_on_hetero, the 'hetero_graph' must a MindHeteroGraph, but got "
+                        f"{type(hetero_graph).__name__}.")
+    if not isinstance(seeds, dict):
+        raise TypeError(f"For sage_sampler_on_hetero, the 'seeds' must a dict, but got {type(seeds).__name__}.")
+    if not isinstance(fanouts, list):
+        raise TypeError("For sage_sampler_on_hetero, the 'fanouts' must a list, but got "
+                        f"{type(fanouts).__name__}.")
+    if random_seed is None:
+        random_seed = np.random.randint(np.iinfo(np.int32).max)
+    relation_seeds = np.random.SeedSequence(random_seed).generate_state(
+        max(1, sum(len(fanout) for fanout in fanouts)), np.uint64)
+
+    all_nodes = {}
+    seeds_idx = {}
+    for node_type, type_seeds in seeds.items():
+        type_seeds = np.asarray(type_seeds)
+        all_nodes[node_type], seeds_idx[node_type] = _relabel(type_seeds[:0], type_seeds)
+
+    layers = []
+    seed_pos = 0
+    for fanout in fanouts:
+        dst_nums = {node_type: nodes.shape[0] for node_type, nodes in all_nodes.items()}
+        sampled = {}
+        for relation_type, neighbor_num in fanout.items():
+            rel_graph = hetero_graph.relation_graph(relation_type)
+            dst_nodes = all_nodes.get(rel_graph.dst_node_type)
+            if dst_nodes is not None and dst_nodes.shape[0] > 0:
+                sampled[relation_type] = rel_graph.sample_predecessors(
+                    dst_nodes, neighbor_num, replace, relation_seeds[seed_pos], num_threads)
+            seed_pos += 1
+
+        # relabel the sources of every node type with one call over all relations pointing from it
+        src_ids = {}
+        for node_type in dict.fromkeys(hetero_graph.relation_graph(r).src_node_type for r in sampled):
+            relations = [r for r in sampled if hetero_graph.relation_graph(r).src_node_type == node_type]
+            nodes = all_nodes.get(node_type)
+            if nodes is None:
+                nodes = sampled[relations[0]][0][0][:0]
+            all_nodes[node_type], local = _relabel(nodes, np.concatenate([sampled[r][0][0] for r in relations]))
+            src_ids.update(zip(relations, np.split(local, np.cumsum([sampled[r][1].shape[0]
+                                                                      for r in relations])[:-1])))
+
+        layer = {}
+        for relation_type, (edge_index, eids) in sampled.items():
+            rel_graph = hetero_graph.relation_graph(relation_type)
+            dst_type = rel_graph.dst_node_type
+            _, dst_idx = _relabel(all_nodes[dst_type][:dst_nums[dst_type]], edge_index[1])
+            layer[relation_type] = Block(src_ids[relation_type], dst_idx,
+                                         all_nodes[rel_graph.src_node_type].shape[0], dst_nums[dst_type], eids)
+        layers.append(layer)
+
+    # the last hop feeds the first layer
+    return all_nodes, seeds_idx, layers[::-1]
@@ -13,10 +13,12 @@
 # limitations under the License.
 # ============================================================================
 """ negative_sample """
-import random
 from math import ceil
+from numbers import Integral
 import numpy as np
 import mindspore_gl.bucket_kernel
+from mindspore_gl import sample_kernel
+from mindspore_gl.graph.id_mapping import index_dtype
 
 def negative_sample(positive, node, num_neg_samples, mode='undirected', re='more'):
     r"""
@@ -66,56 +68,216 @@ def negative_sample(positive, node, num_neg_samples, mode='undirected', re='more
             [0 1]]
     """
     check_param(positive, node, num_neg_samples, mode, re)
+    positive = np.asarray(positive)
+    if positive.size == 0:
+        positive = np.zeros([2, 0], dtype=np.int64)
+    elif re == 'more':
+        positive = positive.T
+    if num_neg_samples is None:
+        num_neg_samples = positive.shape[1]
+
+    sampler = NegativeSampler(positive, node, mode=mode, random_seed=np.random.randint(np.iinfo(np.int32).max))
+    if mode == 'undirected':
+        # every negative pair is returned in both directions
+        row, col = sampler.sample(ceil(num_neg_samples / 2))
+        neg = np.stack([np.concatenate([row, col]), np.concatenate([col, row])])[:, :num_neg_samples]
+    else:
+        neg = sampler.sample(num_neg_samples)
+    return neg.T if re == 'more' else neg
+
+
+class NegativeSampler:
+    r"""
+    Negative edge sampler over a fixed positive edge set.
+
+    The positive edges are hashed once into an open addressing table of edge keys
+    :math:`row * node + col`, candidates are then drawn in bulk and rejected with O(1) lookups,
+    so sampling costs are independent of the number of positive edges.
+
+    Args:
+        positive (numpy.ndarray): positive edges, shape :math:`(2, N\_EDGES)`.
+        node (int): number of nodes.
+        mode (str, optional): type of graph, 'undirected', 'bipartite' or 'other'. Default: 'undirected'.
 
-    def sample(population: int, k: int):
+          - undirected: (u, v) and (v, u) are the same edge, negatives are returned with u < v.
+
+          - bipartite: every (u, v) pair is a candidate, including u == v.
+
+          - other: directed graph without self loops.
+
+        random_seed (int, optional): seed of the sampler. Default: None.
+        num_threads (int, optional): threads used for the membership lookups. Default: 1.
+
+    Raises:
+        TypeError: If `node` is not a positive int.
+        ValueError: If `mode` is not in 'bipartite', 'undirected' or 'other'.
+
+    Supported Platforms:
+        ``Ascend`` ``GPU``
+
+    Examples:
+        >>> import numpy as np
+        >>> from mindspore_gl.sampling import NegativeSampler
+        >>> sampler = NegativeSampler(np.array([[1, 2], [2, 3]]), 4, random_seed=0)
+        >>> neg = sampler.sample(3)
+        >>> print(neg.shape, sampler.contains(neg).any())
+        (2, 3) False
+    """
+
+    def __init__(self, positive, node, mode='undirected', random_seed=None, num_threads=1):
+        if not isinstance(node, Integral) or node <= 0:
+            raise TypeError("The node type is {},\
+                            but it should be int.".format(type(node)))
+        if mode not in ['bipartite', 'undirected', 'other']:
+            raise ValueError("The mode is {}, but it should be 'bipartite', 'undirected' or 'other'.".format(mode))
+        # numpy integers would overflow the population
+        node = int(node)
+        self.node = node
+        self.mode = mode
+        self.num_threads = num_threads
+        self._dtype = index_dtype(node)
+        self._rng = np.random.default_rng(random_seed)
+        positive = np.asarray(positive, dtype=np.int64).reshape(2, -1)
+        keys = self._keys(positive[0], positive[1])
+        self._table, self._positive_count = sample_kernel.edge_key_table(keys)
+        if mode != 'bipartite':
+            # self loops are not candidates, they take no negative edge away
+            self._positive_count -= np.unique(positive[0][positive[0] == positive[1]]).shape[0]
+        # per side, number of nodes each node can not be paired with
+        self._blocked = {}
+        if mode == 'undirected':
+            self._population = node * (node - 1) // 2
+        elif mode == 'bipartite':
+            self._population = node * node
+        else:
+            self._population = node * (node - 1)
+
+    def _keys(self, row, col):
+        if self.mode == 'undirected':
+            row, col = np.minimum(row, col), np.maximum(row, col)
+        return np.ascontiguousarray(row * self.node + col, dtype=np.int64)
+
+    def _blocked_count(self, side):
+        """for every node, the nodes it can not be paired with when `side` is replaced"""
+        if side not in self._blocked:
+            keys = self._table[self._table >= 0]
+            row, col = keys // self.node, keys % self.node
+            if self.mode != 'bipartite':
+                not_loop = row != col
+                row, col = row[not_loop], col[not_loop]
+            if self.mode == 'undirected':
+                blocked = np.bincount(row, minlength=self.node) + np.bincount(col, minlength=self.node)
+            else:
+                blocked = np.bincount(row if side == 'tail' else col, minlength=self.node)
+            if self.mode != 'bipartite':
+                blocked += 1
+            self._blocked[side] = blocked
+        return self._blocked[side]
+
+    def _candidates(self, row, col):
+        """keys of the candidate edges that are valid negatives, -1 for the others"""
+        keys = self._keys(row, col)
+        reject = sample_kernel.edge_key_contains(self._table, keys, self.num_threads)
+        if self.mode != 'bipartite':
+            reject |= row == col
+        keys[reject] = -1
+        return keys
+
+    def contains(self, edges):
         """
-        Randomly sample the edge set of length population,
-        if the length is less than k, directly output all edges of length population
+        Whether each edge is a positive edge.
+
+        Args:
+            edges (numpy.ndarray): edges, shape :math:`(2, N\_EDGES)`.
+
+        Returns:
+            numpy.ndarray, bool mask of shape :math:`(N\_EDGES)`.
         """
-        if population <= k:
-            return np.arange(population)
-        return random.sample(range(population), k)
-
-    if re == 'more':
-        positive = np.array([i for i in positive], dtype=np.int32)
-        row = np.array([i[0] for i in positive], dtype=np.int32)
-        col = np.array([i[1] for i in positive], dtype=np.int32)
-        size = positive.shape[0]
-    else:
-        positive = np.array(positive)
-        row = np.array(positive[0], dtype=np.int32)
-        col = np.array(positive[1], dtype=np.int32)
-        size = positive.shape[1]
+        edges = np.asarray(edges, dtype=np.int64)
+        return sample_kernel.edge_key_contains(self._table, self._keys(edges[0], edges[1]), self.num_threads)
 
-    idx, population = edge_index_to_vector(np.array([row, col], dtype=np.int32), (node, node), mode=mode)
+    def sample(self, num, unique=True):
+        r"""
+        Draw negative edges uniformly.
+
+        Args:
+            num (int): number of negative edges.
+            unique (bool, optional): return distinct edges. Default: True.
+
+        Returns:
+            numpy.ndarray, negative edges of shape :math:`(2, num)`.
+
+        Raises:
+            ValueError: If the graph has no negative edge, or `unique` and it has fewer than `num`.
+        """
+        available = self._population - self._positive_count
+        if num > 0 and available <= 0:
+            raise ValueError(f"no negative edge exists, {num} were requested.")
+        if unique and num > available:
+            raise ValueError(f"only {available} negative edges exist, {num} were requested.")
+        accept_rate = max(available / max(self._population, 1), 1e-3)
+        keys = np.zeros([0], dtype=np.int64)
+        while keys.shape[0] < num:
+            draw = int(1.1 * (num - keys.shape[0]) / accept_rate) + 16
+            candidates = self._candidates(self._rng.integers(0, self.node, draw),
+                                          self._rng.integers(0, self.node, draw))
+            keys = np.concatenate([keys, candidates[candidates >= 0]])
+            if unique:
+                keys = keys[sample_kernel.edge_key_first(keys)]
+        keys = keys[:num]
+        return np.stack([keys // self.node, keys % self.node]).astype(self._dtype)
+
+    def corrupt(self, edges, num_per_edge=1, side='tail'):
+        r"""
+        Corrupt positive edges by replacing one endpoint with a random node, the result is never positive.
+
+        Args:
+            edges (numpy.ndarray): edges to corrupt, shape :math:`(2, N\_EDGES)`.
+            num_per_edge (int, optional): negatives drawn for each edge. Default: 1.
+            side (str, optional): endpoint to replace, 'tail' or 'head'. Default: 'tail'.
+
+        Returns:
+            numpy.ndarray, negative edges of shape :math:`(2, N\_EDGES * num\_per\_edge)`,
+            the negatives of edge i are at columns :math:`[i * num\_per\_edge, (i + 1) * num\_per\_edge)`.
+
+        Raises:
+            ValueError: If `side` is not 'tail' or 'head'.
+            ValueError: If the kept endpoint of an edge is paired with every node by positive edges.
+        """
+        if side not in ('tail', 'head'):
+            raise ValueError(f"side should be 'tail' or 'head', but got {side}.")
+        edges = np.asarray(edges, dtype=np.int64)
+        keep = edges[0] if side == 'tail' else edges[1]
+        # the draws below would never end for such a node
+        saturated = keep[self._blocked_count(side)[keep] >= self.node]
+        if saturated.shape[0] > 0:
+            raise ValueError(f"node {saturated[0]} has no negative edge, it can not be corrupted.")
+        keep = np.repeat(keep, num_per_edge)
+        replaced = np.empty_like(keep)
+        pending = np.arange(keep.shape[0])
+        while pending.shape[0] > 0:
+            draw = self._rng.integers(0, self.node, pending.shape[0])
+            row, col = (keep[pending], draw) if side == 'tail' else (draw, keep[pending])
+            valid = self._candidates(row, col) >= 0
+            replaced[pending[valid]] = draw[valid]
+            pending = pending[~valid]
+        neg = np.stack([keep, replaced]) if side == 'tail' else np.stack([replaced, keep])
+        return neg.astype(self._dtype)
+
+    def batches(self, batch_size, unique=True):
+        r"""
+        Generator of negative edge batches, never exhausted.
+
+        Args:
+            batch_size (int): negative edges per batch.
+            unique (bool, optional): edges of a batch are distinct. Default: True.
+
+        Returns:
+            generator, yields negative edges of shape :math:`(2, batch\_size)`.
+        """
+        while True:
+            yield self.sample(batch_size, unique)
 
-    if num_neg_samples is None:
-        num_neg_samples = size
-    num_neg = num_neg_samples
-    if mode == 'undirected':
-        num_neg_samples = ceil(num_neg_samples / 2)
-
-    prob = 1. - size / (node * node - node)
-    sample_size = int(1.1 * num_neg_samples / prob)
-    neg_idx = None
-    for _ in range(3):
-        rnd = np.array(sample(population, sample_size))
-        mask = np.isin(rnd, idx)
-        if neg_idx is not None:
-            mask |= np.isin(rnd, neg_idx)
-        rnd = rnd[~mask]
-        neg_idx = rnd if neg_idx is None else np.concatenate([neg_idx, rnd])
-        if len(neg_idx) >= num_neg_samples:
-            neg_idx = neg_idx[:num_neg_samples]
-            break
-    assert num_neg_samples == neg_idx.shape[0]
-    neg_idx = vector_to_edge_index(neg_idx, (node, node), mode=mode)
-
-    if re == 'more':
-        idx = np.array([[neg_idx[0][i], neg_idx[1][i]] for i in range(num_neg)])
-    else:
-        idx = np.stack([neg_idx[0][:num_neg], neg_idx[1][:num_neg]])
-    return idx
 
 def edge_index_to_vector(edge_index, size, mode='undirected'):
     """
@@ -247,7 +409,7 @@ def check_param(positive, node, num_neg_samples, mode, re):
     if not isinstance(positive, (list, np.ndarray)):
         raise TypeError("The positive data type is {},\
                         but it should be ndarray or list.".format(type(positive)))
-    if not isinstance(node, int) or node <= 0:
+    if not isinstance(node, Integral) or node <= 0:
         raise TypeError("The node type is {},\
                         but it should be int.".format(type(node)))
     if num_neg_samples is not None and (not isinstance(num_neg_samples, int)) or num_neg_samples <= 0:
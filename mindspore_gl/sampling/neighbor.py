@@ -13,20 +13,37 @@
 # limitations under the License.
 # ============================================================================
 """Sampling neighbor"""
+import threading
 from typing import List
 import numpy as np
 import mindspore_gl
-from mindspore_gl.graph import MindHomoGraph
+from mindspore_gl.graph import MindHomoGraph, IdMapping
 from mindspore_gl import sample_kernel
 
+_relabel_tables = threading.local()
 
-def map_edge_index(layered_edges, reindex_dict):
+
+def map_edge_index(layered_edges, reindex):
+    """Map the node ids of each layer of edges, `reindex` is an IdMapping or a global->local dict."""
     for layer_index, layer_edge in enumerate(layered_edges):
-        layered_edges[layer_index] = sample_kernel.map_edges(layer_edge, reindex_dict)
+        if isinstance(reindex, IdMapping):
+            layered_edges[layer_index] = reindex.to_local(layer_edge).astype(np.int32)
+        else:
+            layered_edges[layer_index] = sample_kernel.map_edges(layer_edge, reindex)
     return layered_edges
 
 
-def sage_sampler_on_homo(homo_graph: mindspore_gl.graph.MindHomoGraph, seeds, neighbor_nums: List[int]):
+def _relabel_table(node_count, dtype):
+    """global -> local table filled with -1, one per thread and reused across calls"""
+    table = getattr(_relabel_tables, "table", None)
+    if table is None or table.shape[0] < node_count or table.dtype != dtype:
+        table = np.full([node_count], -1, dtype=dtype)
+        _relabel_tables.table = table
+    return table
+
+
+def sage_sampler_on_homo(homo_graph: mindspore_gl.graph.MindHomoGraph, seeds, neighbor_nums: List[int],
+                         replace=False, prob=None, random_seed=None, num_threads=1, flat=False):
     """
     GraphSage sampling on MindHomoGraph.
 
@@ -34,17 +51,33 @@ def sage_sampler_on_homo(homo_graph: mindspore_gl.graph.MindHomoGraph, seeds, ne
         homo_graph(mindspore_gl.graph.MindHomoGraph): input graph.
         seeds(numpy.ndarray): start nodes for neighbor sampling.
         neighbor_nums(List): neighbor nums for each hop.
+        replace(bool, optional): sample with replacement, every seed with neighbors then gets exactly
+            neighbor_num edges. Default: False.
+        prob(numpy.ndarray, optional): non negative sampling weight of each edge, aligned with
+            `homo_graph.adj_csr.indices`, None means uniform sampling. Default: None.
+        random_seed(int, optional): seed of the sampling, the result does not depend on `num_threads`.
+            None draws one from numpy's global random state. Default: None.
+        num_threads(int, optional): threads sampling the seeds of a hop in parallel. Default: 1.
+        flat(bool, optional): also return the edges of all hops in one array, as the padding ops and the
+            message passing layers take them. Default: False.
 
     Returns:
-        - **layered_edges_{idx}** (numpy.array) - edge reindex array for hop idx.
-        - **layered_eids_{idx}** (numpy.array) - edge reindex id array for hop idx.
-        - **all_nodes** - sampling all nodes' global ids.
+        - **layered_edges_{idx}** (numpy.array) - edge reindex array for hop idx, shape :math:`(2, E_{idx})`.
+        - **layered_eids_{idx}** (numpy.array) - edge id of each edge of hop idx, see
+          `MindHomoGraph.csr_edge_ids`.
+        - **all_nodes** - sampling all nodes' global ids, in the order they are first sampled, so the
+          distinct seeds come first.
         - **seeds_idx** - seeds local reindex ids.
+        - **sample_edges** (numpy.array) - only with `flat`, the edges of every hop one after another as
+          (neighbor, seed) reindex ids, shape :math:`(2, \sum E_{idx})`.
+        - **sample_eids** (numpy.array) - only with `flat`, the edge id of each of them.
+        - **edge_nums** (numpy.array) - only with `flat`, the number of edges of each hop.
 
     Raises:
         TypeError: If `homo_graph` is not a MindHomoGraph class.
         TypeError: If `seeds` is not a numpy.ndarray.
         TypeError: If `neighbor_nums` is not a list.
+        ValueError: If `neighbor_nums` has a negative number or a seed is not a node of `homo_graph`.
 
     Supported Platforms:
         ``Ascend`` ``GPU``
@@ -64,20 +97,16 @@ def sage_sampler_on_homo(homo_graph: mindspore_gl.graph.MindHomoGraph, seeds, ne
         >>> data = np.ones(row.shape)
         >>> csr_mat = csr_matrix((data, (row, col)), shape=(node_count, node_count))
         >>> generated_graph = MindHomoGraph()
-        >>> node_dict = {idx: idx for idx in range(node_count)}
-        >>> edge_count = col.shape[0]
-        >>> edge_ids = np.array(list(range(edge_count))).astype(np.int32)
-        >>> generated_graph.set_topo(CsrAdj(csr_mat.indptr.astype(np.int32), csr_mat.indices.astype(np.int32)),\
-        ... node_dict, edge_ids)
+        >>> generated_graph.set_topo(CsrAdj(csr_mat.indptr.astype(np.int32), csr_mat.indices.astype(np.int32)))
         >>> nodes = np.arange(0, node_count)
         >>> res = sage_sampler_on_homo(homo_graph=generated_graph, seeds=nodes[:3].astype(np.int32),\
-        ... neighbor_nums=[2, 2])
+        ... neighbor_nums=[2, 2], random_seed=0)
         >>> print(res)
         {'seeds_idx': array([0, 1, 2], dtype=int32), 'all_nodes': array([0, 1, 2, 4, 5, 6, 7, 8, 9], dtype=int32),
         'layered_edges_0': array([[0, 0, 1, 1, 2], [1, 3, 4, 5, 4]], dtype=int32),
-        'layered_eids_0': array([[0, 0, 1, 1, 2], [1, 3, 4, 5, 4]], dtype=int32),
-        'layered_edges_1': array([[1, 1, 3, 3, 4, 5, 5], [4, 5, 7, 8, 6, 7, 8]], dtype=int32),
-        'layered_eids_1': array([[1, 1, 3, 3, 4, 5, 5], [4, 5, 7, 8, 6, 7, 8]], dtype=int32)}
+        'layered_eids_0': array([0, 1, 2, 3, 4], dtype=int32),
+        'layered_edges_1': array([[1, 1, 3, 3, 4, 5, 5], [4, 5, 4, 6, 6, 7, 8]], dtype=int32),
+        'layered_eids_1': array([ 2,  3,  7,  9, 12, 13, 14], dtype=int32)}
 
     """
     if not isinstance(homo_graph, MindHomoGraph):
@@ -89,36 +118,37 @@ def sage_sampler_on_homo(homo_graph: mindspore_gl.graph.MindHomoGraph, seeds, ne
     if not isinstance(neighbor_nums, list):
         raise TypeError("For sage_sampler_on_homo, the 'seeds' must a list, but got "
                         f"{type(neighbor_nums).__name__}.")
-    saved_seeds = seeds
-    all_nodes = [seeds]
-    layered_edges = []
-    layered_eids = []
-    for neighbor_num in neighbor_nums:
-        edge_index, edge_ids = sample_kernel.sample_one_hop_unbias(homo_graph.adj_csr.indptr,
-                                                                   homo_graph.adj_csr.indices,
-                                                                   neighbor_num, seeds)
-        layered_edges.append(edge_index)
-        layered_eids.append(edge_ids)
-        seeds = np.unique(edge_index[1])
-
-        all_nodes.append(seeds)
-
-    # get_node_features:
-    all_nodes = np.unique(np.concatenate(all_nodes, axis=0))
-    all_nodes = np.sort(all_nodes)
-
-    # reindex sampled result
-    reindex_dict = {all_nodes[index]: index for index in range(all_nodes.shape[0])}
-    layered_edges = map_edge_index(layered_edges, reindex_dict)
-
-    seeds_idx = np.zeros(saved_seeds.shape, dtype=np.int32)
-    for idx in range(saved_seeds.shape[0]):
-        seeds_idx[idx] = reindex_dict[saved_seeds[idx]]
+    adj_csr = homo_graph.adj_csr
+    if prob is not None:
+        prob = np.ascontiguousarray(prob, dtype=np.float64)
+    prob_prefix = None
+    if prob is not None and replace:
+        prob_prefix = sample_kernel.csr_row_prefix_sum(adj_csr.indptr, prob, num_threads)
+    if random_seed is None:
+        random_seed = np.random.randint(np.iinfo(np.int32).max)
+    layer_seeds = np.random.SeedSequence(random_seed).generate_state(len(neighbor_nums), np.uint64)
+    seeds = seeds.astype(adj_csr.indices.dtype, copy=False)
+    relabel = _relabel_table(adj_csr.indptr.shape[0] - 1, adj_csr.indices.dtype)
+    all_nodes, seeds_idx, layered_edges, layered_eids, _ = sample_kernel.sample_multi_hop(
+        adj_csr.indptr, adj_csr.indices, seeds, neighbor_nums, relabel, replace, prob, prob_prefix,
+        layer_seeds, num_threads)
     res = {
         "seeds_idx": seeds_idx,
         "all_nodes": all_nodes,
     }
     for layer_idx, layer in enumerate(layered_edges):
-        res[f'layered_edges_{layer_idx}'] = np.asarray(layer)
-        res[f'layered_eids_{layer_idx}'] = np.asarray(layer)
+        res[f'layered_edges_{layer_idx}'] = layer
+        res[f'layered_eids_{layer_idx}'] = homo_graph.csr_edge_ids(layered_eids[layer_idx])
+    if flat:
+        edge_nums = np.array([layer.shape[1] for layer in layered_edges], dtype=np.int64)
+        # one copy per hop, the rows swapped on the way
+        sample_edges = np.empty([2, edge_nums.sum()], dtype=all_nodes.dtype)
+        start = 0
+        for layer, edge_num in zip(layered_edges, edge_nums):
+            sample_edges[:, start:start + edge_num] = layer[::-1]
+            start += edge_num
+        res["sample_edges"] = sample_edges
+        layered_eids = [res[f'layered_eids_{layer_idx}'] for layer_idx in range(len(layered_edges))]
+        res["sample_eids"] = np.concatenate(layered_eids) if layered_eids else np.empty([0], np.int64)
+        res["edge_nums"] = edge_nums
     return res
@@ -56,11 +56,7 @@ def random_walk_unbias_on_homo(homo_graph: mindspore_gl.graph.MindHomoGraph,
         >>> data = np.zeros(row.shape)
         >>> csr_mat = csr_matrix((data, (row, col)), shape=(node_count, node_count))
         >>> generated_graph = MindHomoGraph()
-        >>> node_dict = {idx: idx for idx in range(node_count)}
-        >>> edge_count = col.shape[0]
-        >>> edge_ids = np.array(list(range(edge_count))).astype(np.int32)
-        >>> generated_graph.set_topo(CsrAdj(csr_mat.indptr.astype(np.int32), csr_mat.indices.astype(np.int32)),
-        ... node_dict, edge_ids)
+        >>> generated_graph.set_topo(CsrAdj(csr_mat.indptr.astype(np.int32), csr_mat.indices.astype(np.int32)))
         >>> nodes = np.arange(0, node_count)
         >>> out = random_walk_unbias_on_homo(homo_graph=generated_graph, seeds=nodes[:5].astype(np.int32),
         ... walk_length=10)
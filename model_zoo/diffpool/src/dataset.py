@@ -16,7 +16,7 @@
 import numpy as np
 import mindspore as ms
 from mindspore_gl import BatchedGraphField
-from mindspore_gl.graph import BatchHomoGraph, PadArray2d, PadHomoGraph, PadMode, PadDirection
+from mindspore_gl.graph import PadArray2d, PadHomoGraph, PadMode, PadDirection
 from mindspore_gl.dataloader import Dataset
 
 
@@ -25,7 +25,6 @@ class MultiHomoGraphDataset(Dataset):
     def __init__(self, dataset, batch_size, mode=PadMode.CONST, node_size=1100, edge_size=5000, length=None):
         self._dataset = dataset
         self._batch_size = batch_size
-        self.batch_fn = BatchHomoGraph()
         self.batched_edge_feat = None
         self.node_size = node_size
         self.length = length
@@ -42,13 +41,11 @@ class MultiHomoGraphDataset(Dataset):
         self.train_mask[-1] = False
 
     def __getitem__(self, batch_graph_idx):
-        graph_list = []
         feature_list = []
         for idx in range(batch_graph_idx.shape[0]):
-            graph_list.append(self._dataset[batch_graph_idx[idx]])
             feature_list.append(self._dataset.graph_node_feat(batch_graph_idx[idx]))
         # Batch Graph
-        batch_graph = self.batch_fn(graph_list)
+        batch_graph = self._dataset.batch_graphs(batch_graph_idx)
         # Pad Graph
         batch_graph = self.graph_pad_op(batch_graph)
         # Batch Node Feat
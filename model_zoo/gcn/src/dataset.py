@@ -13,17 +13,17 @@
 # limitations under the License.
 # ============================================================================
 """Dataset"""
-from math import floor
 import numpy as np
 from mindspore_gl.sampling.neighbor import sage_sampler_on_homo
 from mindspore_gl.dataloader.dataset import Dataset
 import mindspore_gl.array_kernel as array_kernel
 from mindspore_gl.graph.ops import PadArray2d, PadMode, PadDirection
+from mindspore_gl.graph import BucketPlanner
 
 
 class GCNDataset(Dataset):
     """Do sampling from neighbour nodes"""
-    def __init__(self, graph_dataset, neighbor_nums, batch_size, length, single_size=False):
+    def __init__(self, graph_dataset, neighbor_nums, batch_size, length, single_size=False, scan_batches=16):
         self.graph_dataset = graph_dataset
         self.graph = graph_dataset[0]
         self.neighbor_nums = neighbor_nums
@@ -33,41 +33,36 @@ class GCNDataset(Dataset):
         self.max_sampled_nodes_num = neighbor_nums[0] * neighbor_nums[1] * batch_size
         self.single_size = single_size
         self.length = length
+        self.planner = None
+        if not single_size:
+            # plan the padded sizes from random batches, before the workers get a copy of the dataset, the
+            # largest bucket holds the largest batch
+            self.planner = BucketPlanner(num_buckets=5)
+            rng = np.random.default_rng(0)
+            node_counts, edge_counts = [self.max_sampled_nodes_num - 1], [self.max_sampled_nodes_num - 1]
+            for _ in range(scan_batches):
+                res, sample_edges = self._sample(rng.choice(self.x.shape[0], batch_size, replace=False))
+                node_counts.append(len(res['all_nodes']))
+                edge_counts.append(sample_edges.shape[1])
+            self.planner.fit(node_counts, edge_counts)
 
-    def __getitem__(self, batch_nodes):
+    def _sample(self, batch_nodes):
         batch_nodes = np.array(batch_nodes, np.int32)
         res = sage_sampler_on_homo(self.graph, batch_nodes, self.neighbor_nums)
-        label = array_kernel.int_1d_array_slicing(self.y, batch_nodes)
         layered_edges_0 = res['layered_edges_0']
         layered_edges_1 = res['layered_edges_1']
         sample_edges = np.concatenate((layered_edges_0, layered_edges_1), axis=1)
-        sample_edges = sample_edges[[1, 0], :]
+        return res, sample_edges[[1, 0], :]
+
+    def __getitem__(self, batch_nodes):
+        batch_nodes = np.array(batch_nodes, np.int32)
+        res, sample_edges = self._sample(batch_nodes)
+        label = array_kernel.int_1d_array_slicing(self.y, batch_nodes)
         num_sample_edges = sample_edges.shape[1]
         num_sample_nodes = len(res['all_nodes'])
         max_sampled_nodes_num = self.max_sampled_nodes_num
         if self.single_size is False:
-            if num_sample_nodes < floor(0.2*max_sampled_nodes_num):
-                pad_node_num = floor(0.2*max_sampled_nodes_num)
-            elif num_sample_nodes < floor(0.4*max_sampled_nodes_num):
-                pad_node_num = floor(0.4 * max_sampled_nodes_num)
-            elif num_sample_nodes < floor(0.6*max_sampled_nodes_num):
-                pad_node_num = floor(0.6 * max_sampled_nodes_num)
-            elif num_sample_nodes < floor(0.8*max_sampled_nodes_num):
-                pad_node_num = floor(0.8 * max_sampled_nodes_num)
-            else:
-                pad_node_num = max_sampled_nodes_num
-
-            if num_sample_edges < floor(0.2*max_sampled_nodes_num):
-                pad_edge_num = floor(0.2*max_sampled_nodes_num)
-            elif num_sample_edges < floor(0.4*max_sampled_nodes_num):
-                pad_edge_num = floor(0.4 * max_sampled_nodes_num)
-            elif num_sample_edges < floor(0.6*max_sampled_nodes_num):
-                pad_edge_num = floor(0.6 * max_sampled_nodes_num)
-            elif num_sample_edges < floor(0.8*max_sampled_nodes_num):
-                pad_edge_num = floor(0.8 * max_sampled_nodes_num)
-            else:
-                pad_edge_num = max_sampled_nodes_num
-
+            pad_node_num, pad_edge_num = self.planner.shape(num_sample_nodes, num_sample_edges)
         else:
             pad_node_num = max_sampled_nodes_num
             pad_edge_num = max_sampled_nodes_num
@@ -15,7 +15,7 @@
 """Dataset"""
 import numpy as np
 import mindspore as ms
-from mindspore_gl.graph import BatchHomoGraph, PadArray2d, PadHomoGraph, PadMode, PadDirection
+from mindspore_gl.graph import PadArray2d, PadHomoGraph, PadMode, PadDirection
 from mindspore_gl import BatchedGraphField
 from mindspore_gl.dataloader import Dataset
 
@@ -27,7 +27,6 @@ class MultiHomoGraphDataset(Dataset):
         self.length = length
         node_size = node_size * self._batch_size
         edge_size = edge_size * self._batch_size
-        self.batch_fn = BatchHomoGraph()
         self.node_feat_pad_op = PadArray2d(dtype=np.float32, mode=PadMode.CONST, direction=PadDirection.COL,
                                            size=(node_size, dataset.node_feat_size), fill_value=0)
         self.node_label_pad_op = PadArray2d(dtype=np.float32, mode=PadMode.CONST, direction=PadDirection.COL,
@@ -38,15 +37,13 @@ class MultiHomoGraphDataset(Dataset):
         self.train_mask[-1] = False
 
     def __getitem__(self, batch_graph_idx):
-        graph_list = []
         feature_list = []
         label_list = []
         for idx in range(batch_graph_idx.shape[0]):
-            graph_list.append(self._dataset[batch_graph_idx[idx]])
             feature_list.append(self._dataset.graph_node_feat(batch_graph_idx[idx]))
             label_list.append(self._dataset.graph_node_label(batch_graph_idx[idx]))
 
-        batch_graph = self.batch_fn(graph_list)
+        batch_graph = self._dataset.batch_graphs(batch_graph_idx)
         batch_graph = self.graph_pad_op(batch_graph)
 
         batched_node_feat = np.concatenate(feature_list)
@@ -15,17 +15,18 @@
 """Dataset"""
 import numpy as np
 import mindspore as ms
-from mindspore_gl.graph.ops import BatchHomoGraph, PadArray2d, PadHomoGraph, PadMode, PadDirection
+from mindspore_gl.graph.ops import PadArray2d, PadHomoGraph, PadMode, PadDirection
 from mindspore_gl import BatchedGraphField
 from mindspore_gl.dataloader import Dataset
 
 class MultiHomoGraphDataset(Dataset):
-    """MultiHomoGraph Dataset"""
-    def __init__(self, dataset, batch_size, length, mode=PadMode.CONST, node_size=50, edge_size=350):
+    """MultiHomoGraph Dataset, batches of up to `max_graphs` graphs, `batch_size` without packing"""
+    def __init__(self, dataset, batch_size, length, mode=PadMode.CONST, node_size=50, edge_size=350,
+                 max_graphs=None):
         self._dataset = dataset
         self._batch_size = batch_size
+        self._max_graphs = max_graphs or batch_size
         self._length = length
-        self.batch_fn = BatchHomoGraph()
         self.batched_edge_feat = None
         node_size *= batch_size
         edge_size *= batch_size
@@ -47,14 +48,12 @@ class MultiHomoGraphDataset(Dataset):
         self.train_mask[-1] = False
 
     def __getitem__(self, batch_graph_idx):
-        graph_list = []
         feature_list = []
         for idx in range(batch_graph_idx.shape[0]):
-            graph_list.append(self._dataset[batch_graph_idx[idx]])
             feature_list.append(self._dataset.graph_node_feat(batch_graph_idx[idx]))
 
         # Batch Graph
-        batch_graph = self.batch_fn(graph_list)
+        batch_graph = self._dataset.batch_graphs(batch_graph_idx)
 
         # Pad Graph
         batch_graph = self.graph_pad_op(batch_graph)
@@ -66,8 +65,8 @@ class MultiHomoGraphDataset(Dataset):
         batched_node_feat = self.node_feat_pad_op(batched_node_feat)
         batched_label = self._dataset.graph_label[batch_graph_idx]
 
-        # Pad Label
-        batched_label = np.append(batched_label, batched_label[-1] * 0)
+        # Pad Label, Up To The Padding Graph Of A Full Batch
+        batched_label = np.pad(batched_label, (0, self._max_graphs + 1 - batched_label.shape[0]))
 
         # Get Edge Feat
         if self.batched_edge_feat is None or self.batched_edge_feat.shape[0] < batch_graph.edge_count:
@@ -78,8 +77,7 @@ class MultiHomoGraphDataset(Dataset):
         _ = batch_graph.batch_meta.node_map_idx
         _ = batch_graph.batch_meta.edge_map_idx
 
-        np_graph_mask = [1] * (self._batch_size + 1)
-        np_graph_mask[-1] = 0
+        np_graph_mask = [1] * batch_graph_idx.shape[0] + [0] * (self._max_graphs + 1 - batch_graph_idx.shape[0])
         constant_graph_mask = ms.Tensor(np_graph_mask, dtype=ms.int32)
         batchedgraphfiled = self.get_batched_graph_field(batch_graph, constant_graph_mask)
         row, col, node_count, edge_count, node_map_idx, edge_map_idx, graph_mask = batchedgraphfiled.get_batched_graph()
@@ -23,7 +23,7 @@ import mindspore.ops as ops
 import mindspore.context as context
 import mindspore.dataset as ds
 from mindspore_gl.nn.gnn_cell import GNNCell
-from mindspore_gl.dataloader import RandomBatchSampler
+from mindspore_gl.dataloader import RandomBatchSampler, PackedBatchSampler
 from mindspore_gl.dataset import IMDBBinary
 from mindspore_gl import BatchedGraph, BatchedGraphField
 from src.gin import GinNet
@@ -56,10 +56,23 @@ def main(arguments):
         ms_profiler = Profiler(subgraph="ALL", is_detail=True, is_show_op_path=False, output_path="./prof_result")
 
     dataset = IMDBBinary(arguments.data_path)
-    train_batch_sampler = RandomBatchSampler(dataset.train_graphs, batch_size=arguments.batch_size)
-    train_multi_graph_dataset = MultiHomoGraphDataset(dataset, arguments.batch_size, len(list(train_batch_sampler)))
-    test_batch_sampler = RandomBatchSampler(dataset.val_graphs, batch_size=arguments.batch_size)
-    test_multi_graph_dataset = MultiHomoGraphDataset(dataset, arguments.batch_size, len(list(test_batch_sampler)))
+    if arguments.max_graphs:
+        # pack graphs into the padded node and edge counts of the dataset, up to max_graphs graphs
+        train_batch_sampler = PackedBatchSampler(dataset.train_graphs, dataset.graph_nodes, dataset.graph_edges,
+                                                 50 * arguments.batch_size, 350 * arguments.batch_size,
+                                                 arguments.max_graphs)
+        test_batch_sampler = PackedBatchSampler(dataset.val_graphs, dataset.graph_nodes, dataset.graph_edges,
+                                                50 * arguments.batch_size, 350 * arguments.batch_size,
+                                                arguments.max_graphs)
+        print("train batches {batches}, node fill {node_fill:.3f}, edge fill {edge_fill:.3f}".format(
+            **train_batch_sampler.report()))
+    else:
+        train_batch_sampler = RandomBatchSampler(dataset.train_graphs, batch_size=arguments.batch_size)
+        test_batch_sampler = RandomBatchSampler(dataset.val_graphs, batch_size=arguments.batch_size)
+    train_multi_graph_dataset = MultiHomoGraphDataset(dataset, arguments.batch_size, len(list(train_batch_sampler)),
+                                                      max_graphs=arguments.max_graphs)
+    test_multi_graph_dataset = MultiHomoGraphDataset(dataset, arguments.batch_size, len(list(test_batch_sampler)),
+                                                     max_graphs=arguments.max_graphs)
 
     train_dataloader = ds.GeneratorDataset(train_multi_graph_dataset, ['row', 'col', 'node_count', 'edge_count',
                                                                        'node_map_idx', 'edge_map_idx', 'graph_mask',
@@ -73,9 +86,6 @@ def main(arguments):
                                                                      'batched_edge_feat'],
                                           sampler=test_batch_sampler)
 
-    np_graph_mask = [1] * (arguments.batch_size + 1)
-    np_graph_mask[-1] = 0
-
     net = GinNet(num_layers=arguments.num_layers,
                  num_mlp_layers=arguments.num_mlp_layers,
                  input_dim=dataset.node_feat_size,
@@ -112,24 +122,28 @@ def main(arguments):
         train_loss /= arguments.iters_per_epoch
         net.set_train(False)
         train_count = 0
+        train_graphs = 0
         for data in train_dataloader:
             row, col, node_count, edge_count, node_map_idx, edge_map_idx, graph_mask, label, node_feat, edge_feat = data
             batch_homo = BatchedGraphField(row, col, node_count, edge_count, node_map_idx, edge_map_idx, graph_mask)
             output = net(node_feat, edge_feat, *batch_homo.get_batched_graph()).asnumpy()
             predict = np.argmax(output, axis=1)
-            train_count += np.sum(np.equal(predict, label) * np_graph_mask)
-        train_acc = train_count / len(list(train_batch_sampler)) / arguments.batch_size
+            train_count += np.sum(np.equal(predict, label) * graph_mask.asnumpy())
+            train_graphs += np.sum(graph_mask.asnumpy())
+        train_acc = train_count / train_graphs
         end_time = time.time()
 
         test_count = 0
+        test_graphs = 0
         for data in test_dataloader:
             row, col, node_count, edge_count, node_map_idx, edge_map_idx, graph_mask, label, node_feat, edge_feat = data
             batch_homo = BatchedGraphField(row, col, node_count, edge_count, node_map_idx, edge_map_idx, graph_mask)
             output = net(node_feat, edge_feat, *batch_homo.get_batched_graph()).asnumpy()
             predict = np.argmax(output, axis=1)
-            test_count += np.sum(np.equal(predict, label) * np_graph_mask)
+            test_count += np.sum(np.equal(predict, label) * graph_mask.asnumpy())
+            test_graphs += np.sum(graph_mask.asnumpy())
 
-        test_acc = test_count / len(list(test_batch_sampler)) / arguments.batch_size
+        test_acc = test_count / test_graphs
         print('Epoch {}, Time {:.3f} s, Train loss {}, Train acc {:.5f}, Test acc {:.3f}'.format(epoch,
                                                                                                  end_time - start_time,
                                                                                                  train_loss, train_acc,
@@ -146,6 +160,8 @@ if __name__ == "__main__":
     parser.add_argument("--dataset", type=str, default="IMDBBINARY", help="dataset")
     parser.add_argument('--epochs', type=int, default=350, help='training epoch')
     parser.add_argument('--batch_size', type=int, default=64, help='batch size of input data')
+    parser.add_argument('--max_graphs', type=int, default=None,
+                        help='pack up to max_graphs graphs into the padded size of batch_size graphs')
     parser.add_argument('--iters_per_epoch', type=int, default=50,
                         help='number of iterations during per each epoch')
     parser.add_argument('--num_layers', type=int, default=5,
@@ -16,7 +16,7 @@
 import numpy as np
 import mindspore as ms
 from mindspore_gl import BatchedGraphField
-from mindspore_gl.graph import BatchHomoGraph, PadArray2d, PadHomoGraph, PadMode, PadDirection
+from mindspore_gl.graph import PadArray2d, PadHomoGraph, PadMode, PadDirection
 from mindspore_gl.dataloader import Dataset
 from mindspore_gl.graph import batch_graph_csr_data
 
@@ -26,7 +26,6 @@ class MultiHomoGraphDataset(Dataset):
     def __init__(self, dataset, batch_size, mode=PadMode.CONST, node_size=40, edge_size=1000, length=None, csr=False):
         self._dataset = dataset
         self._batch_size = batch_size
-        self.batch_fn = BatchHomoGraph()
         self.batched_edge_feat = None
         self.length = length
         self.csr = csr
@@ -47,16 +46,14 @@ class MultiHomoGraphDataset(Dataset):
         self.train_mask[-1] = False
 
     def __getitem__(self, batch_graph_idx):
-        graph_list = []
         feature_list = []
         edge_feat_list = []
         for idx in range(batch_graph_idx.shape[0]):
-            graph_list.append(self._dataset[batch_graph_idx[idx]])
             feature_list.append(self._dataset.graph_node_feat(batch_graph_idx[idx]))
             edge_feat_list.append(self._dataset.graph_edge_feat(batch_graph_idx[idx]))
 
         # Batch Graph
-        batch_graph = self.batch_fn(graph_list)
+        batch_graph = self._dataset.batch_graphs(batch_graph_idx)
         # Pad Graph
         batch_graph = self.graph_pad_op(batch_graph)
         # Batch Node Feat
@@ -79,8 +76,8 @@ class MultiHomoGraphDataset(Dataset):
         batchedgraphfiled = self.get_batched_graph_field(batch_graph, constant_graph_mask)
         row, col, node_count, edge_count, node_map_idx, edge_map_idx, graph_mask = batchedgraphfiled.get_batched_graph()
         if self.csr:
-            g, node_map_idx, batched_node_feat = batch_graph_csr_data(row, col, node_count,
-                                                                      edge_count, node_map_idx, batched_node_feat, True)
+            g, node_map_idx, batched_node_feat = batch_graph_csr_data(row, col, node_count, edge_count, node_map_idx,
+                                                                      batched_node_feat, True, as_tensor=False)
             return batched_label, batched_node_feat, batched_edge_feat, g[0], g[1], g[2], g[3], g[4], g[5],\
                    node_map_idx, edge_map_idx, graph_mask
         return batched_label, batched_node_feat, batched_edge_feat, row, col, node_count, edge_count, node_map_idx,\
@@ -127,7 +127,7 @@ class Texas:
                 self.edge_index[0], self.edge_index[1]))).tocsr()
             self._csr_row = tmp_a.indptr
             self._csr_col = tmp_a.indices
-            self._nodes = np.array(list(range(len(self._csr_row) - 1)))
+            self._nodes = np.arange(len(self._csr_row) - 1)
 
     def build_degree(self):
         if self._indegree is None:
@@ -167,10 +167,8 @@ class Texas:
 
     def __getitem__(self, idx):
         graph = MindHomoGraph()
-        node_dict = {idx: idx for idx in range(self.num_nodes)}
-        edge_ids = np.array(list(range(self.num_edges))).astype(np.int32)
         graph.set_topo(CsrAdj(self._csr_row, self._csr_col),
-                       node_dict=node_dict, edge_ids=edge_ids)
+                       node_dict=None, edge_ids=None)
         return graph
 
 
@@ -13,11 +13,21 @@
 # limitations under the License.
 # ============================================================================
 """ Test dataloader api. """
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
 import numpy as np
 import pytest
+import mindspore.dataset as ds
 from mindspore_gl.dataloader.dataset import Dataset
-from mindspore_gl.dataloader.samplers import RandomBatchSampler, DistributeRandomBatchSampler
+from mindspore_gl.dataloader.samplers import RandomBatchSampler, DistributeRandomBatchSampler, PackedBatchSampler
 from mindspore_gl.dataloader.dataloader import DataLoader
+from mindspore_gl.dataloader.profiler import PipelineProfiler
+from mindspore_gl.dataloader.shared_numpy import SharedNDArray, segment_report
+from mindspore_gl.graph import CsrAdj, PadArray2d, PadDirection, PadMode
 
 
 class MyDataset(Dataset):
@@ -34,7 +44,7 @@ class MyDataset(Dataset):
         return self.len
 
     def __getitem__(self, idx):
-        if isinstance(idx, list):
+        if isinstance(idx, (list, np.ndarray)):
             value = []
             for i in idx:
                 value.append(self.data[i])
@@ -102,6 +112,172 @@ def test_distribute_random_batch_sample():
     assert np_ret.shape[1] == 3
 
 
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_random_batch_sample_epochs():
+    """
+    Feature: seeded numpy shuffling, drop_last, resume and batch ids of `RandomBatchSampler`
+    Description: list(dataset) = [0, 1, ..., 9], batch_size = 4, two samplers with the same seed
+    Expectation: int32 batches, identical epochs for the same seed, the tail batch kept with drop_last=False,
+                 a resumed epoch equal to the end of the original one, BatchIndex rebuilt to the same batch.
+    """
+    dataset = list(range(10))
+    sampler = RandomBatchSampler(dataset, 4, drop_last=False, seed=3)
+    other = RandomBatchSampler(dataset, 4, drop_last=False, seed=3)
+    first = list(sampler)
+    assert len(sampler) == 3 and [b.shape[0] for b in first] == [4, 4, 2]
+    assert all(b.dtype == np.int32 for b in first)
+    assert sorted(np.concatenate(first).tolist()) == dataset
+    for expect, res in zip(first, other):
+        assert np.array_equal(expect, res)
+    second = list(sampler)
+    assert not all(np.array_equal(a, b) for a, b in zip(first, second))
+    sampler.resume(1, 1)
+    resumed = list(sampler)
+    assert len(resumed) == 2 and all(np.array_equal(a, b) for a, b in zip(second[1:], resumed))
+    ids = RandomBatchSampler(dataset, 4, seed=3, batch_ids=True)
+    batch_ids = list(ids)
+    assert batch_ids == [(0, 0), (0, 1)]
+    assert np.array_equal(ids.batch(*batch_ids[1]), first[1])
+    ranks = [np.concatenate(list(DistributeRandomBatchSampler(rank, 2, list(range(12)), 3))) for rank in range(2)]
+    assert sorted(np.concatenate(ranks).tolist()) == list(range(12))
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_packed_batch_sample():
+    """
+    Feature: `PackedBatchSampler` packs graphs into node and edge budgets
+    Description: 500 graphs of random sizes, budgets of 400 nodes and 800 edges, at most 32 graphs, two epochs
+    Expectation: every graph once per epoch, batches within the budgets leaving a padding node and edge, filled
+                 over 90%, seeded epochs, BatchIndex rebuilt to the same batch.
+    """
+    rng = np.random.default_rng(0)
+    node_counts = rng.integers(2, 40, 500)
+    edge_counts = node_counts * rng.integers(1, 4, 500)
+    graph_nodes = np.concatenate([[0], np.cumsum(node_counts)])
+    graph_edges = np.concatenate([[0], np.cumsum(edge_counts)])
+    sampler = PackedBatchSampler(list(range(500)), graph_nodes, graph_edges, 400, 800, 32, seed=1)
+    first = list(sampler)
+    assert sorted(np.concatenate(first).tolist()) == list(range(500))
+    for batch in first:
+        assert node_counts[batch].sum() < 400 and edge_counts[batch].sum() < 800 and batch.shape[0] <= 32
+    report = sampler.report(0)
+    assert report["batches"] == len(first) and max(report["node_fill"], report["edge_fill"]) > 0.9
+    second = list(sampler)
+    assert sorted(np.concatenate(second).tolist()) == list(range(500))
+    assert not all(np.array_equal(a, b) for a, b in zip(first, second))
+    other = PackedBatchSampler(list(range(500)), graph_nodes, graph_edges, 400, 800, 32, seed=1, batch_ids=True)
+    batch_ids = list(other)
+    assert len(batch_ids) == len(first) and np.array_equal(other.batch(*batch_ids[3]), first[3])
+    with pytest.raises(ValueError):
+        PackedBatchSampler(list(range(500)), graph_nodes, graph_edges, 30, 800, 32)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_batch_ids():
+    """
+    Feature: `DataLoader` with a sampler yielding `BatchIndex`, workers rebuild the batches
+    Description: list(dataset) = [0, 1, ..., 39], batch_size = 4, single process and two workers, two epochs
+    Expectation: the batches of a sampler yielding the indices, in the same order.
+    """
+    dataset = MyDataset(0, 40)
+    for workers in (0, 2):
+        expect = DataLoader(dataset, RandomBatchSampler(list(range(40)), 4, seed=1), num_workers=workers)
+        res = DataLoader(dataset, RandomBatchSampler(list(range(40)), 4, seed=1, batch_ids=True),
+                         num_workers=workers)
+        for _ in range(2):
+            assert list(expect) == list(res)
+
+
+class EpochSeedSampler(ds.Sampler):
+    """
+    Batches of 4 shuffled by `seed` and the count of iterations, a state without `epoch` and `batch`.
+    """
+
+    def __init__(self, size, seed=0):
+        super().__init__()
+        self.size = size
+        self.seed = seed
+        self.iterations = 0
+
+    def __iter__(self):
+        order = np.random.default_rng(self.seed + self.iterations).permutation(self.size)
+        self.iterations += 1
+        return iter([order[i:i + 4] for i in range(0, self.size, 4)])
+
+    def __len__(self):
+        return (self.size + 3) // 4
+
+    def state_dict(self):
+        return {"seed": self.seed, "iterations": self.iterations}
+
+    def load_state_dict(self, state_dict):
+        self.seed = state_dict["seed"]
+        self.iterations = state_dict["iterations"]
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_state_dict():
+    """
+    Feature: `state_dict` and `load_state_dict` of `RandomBatchSampler` and `DataLoader`
+    Description: list(dataset) = [0, 1, ..., 39], batch_size = 4, stop after 3 batches of the second epoch,
+                 resume a new loader and the same persistent loader from the state
+    Expectation: the resumed loaders return the rest of the interrupted epoch then the next epoch as an
+                 uninterrupted loader does, the persistent workers are kept.
+    """
+    sampler = RandomBatchSampler(list(range(10)), 3, seed=2)
+    it = iter(sampler)
+    next(it)
+    state = sampler.state_dict()
+    assert state == {"seed": 2, "epoch": 0, "batch": 1}
+    rest = list(it)
+    other = RandomBatchSampler(list(range(10)), 3)
+    other.load_state_dict(state)
+    assert all(np.array_equal(a, b) for a, b in zip(rest, other))
+    assert other.state_dict() == {"seed": 2, "epoch": 1, "batch": 0}
+
+    dataset = MyDataset(0, 40)
+    expect_loader = DataLoader(dataset, RandomBatchSampler(list(range(40)), 4, seed=5))
+    expect = [list(expect_loader) for _ in range(3)]
+    for workers in (0, 2):
+        loader = DataLoader(dataset, RandomBatchSampler(list(range(40)), 4, seed=5), num_workers=workers,
+                            persistent_workers=workers > 0)
+        assert list(loader) == expect[0]
+        it = iter(loader)
+        assert [next(it) for _ in range(3)] == expect[1][:3]
+        state = loader.state_dict()
+        assert state == {"sampler": {"seed": 5, "epoch": 1, "batch": 3}}
+        resumed = DataLoader(dataset, RandomBatchSampler(list(range(40)), 4), num_workers=workers)
+        resumed.load_state_dict(state)
+        assert list(resumed) + list(resumed) == expect[1][3:] + expect[2]
+        pids = [w.pid for w in loader.iterator._workers] if workers else None
+        loader.load_state_dict(state)
+        assert list(loader) == expect[1][3:]
+        assert list(loader) == expect[2]
+        if workers:
+            assert [w.pid for w in loader.iterator._workers] == pids
+            loader.iterator._shutdown_workers()
+
+    # a sampler state without the position, the epoch is replayed from its start
+    expect_loader = DataLoader(dataset, EpochSeedSampler(40, seed=3))
+    expect = [list(expect_loader) for _ in range(2)]
+    loader = DataLoader(dataset, EpochSeedSampler(40, seed=3))
+    it = iter(loader)
+    assert [next(it) for _ in range(3)] == expect[0][:3]
+    state = loader.state_dict()
+    assert state == {"sampler": {"seed": 3, "iterations": 0}, "num_yielded": 3}
+    resumed = DataLoader(dataset, EpochSeedSampler(40))
+    resumed.load_state_dict(state)
+    assert list(resumed) + list(resumed) == expect[0][3:] + expect[1]
+
+
 @pytest.mark.level0
 @pytest.mark.platform_x86_gpu_training
 @pytest.mark.env_onecard
@@ -127,3 +303,452 @@ def test_dataloader():
     assert len(ret) == 4
     np_ret = np.array(ret)
     assert (np_ret % 2 == 0).all()
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_out_of_order():
+    """
+    Feature: `DataLoader` with `in_order=False` delivering batches as workers finish them
+    Description: list(dataset) = [0, 1, ..., 39], batch_size = 4, two workers pulling from a shared task queue,
+                 two epochs with persistent workers
+    Expectation: every sample is returned exactly once per epoch and every batch is accounted to a worker, the
+                 tasks the workers took are counted and no index is lost while no worker is left.
+    """
+    dataset = MyDataset(0, 40)
+    sampler = RandomBatchSampler(dataset, 4)
+    loader = DataLoader(dataset, sampler, num_workers=2, in_order=False)
+    for _ in range(2):
+        it = iter(loader)
+        ret = list(it)
+        assert len(ret) == 10
+        assert sorted(np.array(ret).flatten().tolist()) == list(range(40))
+        assert sum(it.worker_completed) == 10
+        assert it.worker_outstanding == [0, 0]
+    slow = DataLoader(SleepDataset(0, 40, 0.2), sampler, num_workers=2, in_order=False, persistent_workers=True)
+    it = iter(slow)
+    ret = [next(it)]
+    time.sleep(0.1)
+    assert all(n > 0 for n in it.worker_outstanding)
+    # room for a task while every worker is gone, the sampler is not advanced
+    _, data = it._receive()
+    status, pos = it._workers_status, it._sampler_pos
+    it._workers_status = [False, False]
+    assert not it._try_put_index()
+    assert it._sampler_pos == pos
+    it._workers_status = status
+    ret += [data] + list(it)
+    assert sorted(np.array(ret).flatten().tolist()) == list(range(40))
+    assert it.worker_outstanding == [0, 0]
+    it._shutdown_workers()
+    ordered = DataLoader(dataset, sampler, num_workers=2)
+    it = iter(ordered)
+    assert len(list(it)) == 10
+    assert it.worker_outstanding == [0, 0]
+
+
+class SlowBatchDataset(MyDataset):
+    """
+    `MyDataset` taking `delay` seconds for the batch holding `slow`.
+    """
+
+    def __init__(self, start, end, slow, delay):
+        super().__init__(start, end)
+        self.slow = slow
+        self.delay = delay
+
+    def __getitem__(self, idx):
+        if self.slow in idx:
+            time.sleep(self.delay)
+        return super().__getitem__(idx)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_out_of_order_state_dict():
+    """
+    Feature: `state_dict` of a `DataLoader` with `in_order=False`
+    Description: list(dataset) = [0, 1, ..., 39], batch_size = 4, two workers, the first batch of the epoch is
+                 slow, stop after 5 batches and resume a new loader from the state
+    Expectation: the state stays at the slow batch and lists the batches returned after it, the resumed loader
+                 returns each of the other samples once, then the next epoch.
+    """
+    first = next(iter(RandomBatchSampler(list(range(40)), 4, seed=5)))
+    dataset = SlowBatchDataset(0, 40, int(first[0]), 1.0)
+    loader = DataLoader(dataset, RandomBatchSampler(list(range(40)), 4, seed=5), num_workers=2,
+                        persistent_workers=True, in_order=False)
+    it = iter(loader)
+    ret = [next(it) for _ in range(5)]
+    state = loader.state_dict()
+    assert state == {"sampler": {"seed": 5, "epoch": 0, "batch": 0}, "returned": [1, 2, 3, 4, 5]}
+    resumed = DataLoader(dataset, RandomBatchSampler(list(range(40)), 4), num_workers=2, in_order=False)
+    resumed.load_state_dict(state)
+    rest = list(resumed)
+    assert len(rest) == 5
+    assert sorted(np.array(ret + rest).flatten().tolist()) == list(range(40))
+    assert len(list(resumed)) == 10
+    loader.iterator._shutdown_workers()
+
+
+class ArrayDataset(Dataset):
+    """
+    Batches of numpy arrays nested in a tuple and a dict.
+    """
+
+    def __init__(self, size):
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, idx):
+        idx = np.asarray(idx, dtype=np.int32)
+        feat = np.repeat(idx[:, None], 16, axis=1).astype(np.float32)
+        return feat, {"edges": np.stack([idx, idx[::-1]]), "label": int(idx.sum())}
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_shared_ring():
+    """
+    Feature: `DataLoader` with `shared_ring=True` sending batches through per worker shared memory rings
+    Description: tuple of a feature array and a dict of edges and a python int, batch_size = 4, two workers,
+                 one epoch consumed batch by batch and one epoch holding every batch so the slots run out
+    Expectation: the same batches as the dataset, whether read from a slot or sent through the queue.
+    """
+    dataset = ArrayDataset(80)
+    sampler = RandomBatchSampler(list(range(80)), 4)
+    loader = DataLoader(dataset, sampler, num_workers=2, shared_ring=True)
+    for epoch in range(2):
+        seen = []
+        held = []
+        for feat, other in loader:
+            idx = feat[:, 0].astype(np.int32)
+            expect_feat, expect_other = dataset[idx.tolist()]
+            assert np.array_equal(feat, expect_feat)
+            assert np.array_equal(other["edges"], expect_other["edges"])
+            assert other["label"] == expect_other["label"]
+            seen.extend(idx.tolist())
+            if epoch == 1:
+                held.append(feat)
+        assert sorted(seen) == list(range(80))
+
+
+class SleepDataset(MyDataset):
+    """
+    `MyDataset` taking `delay` seconds per batch.
+    """
+
+    def __init__(self, start, end, delay):
+        super().__init__(start, end)
+        self.delay = delay
+
+    def __getitem__(self, idx):
+        time.sleep(self.delay)
+        return super().__getitem__(idx)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_adaptive():
+    """
+    Feature: `DataLoader` with `adaptive=True` sizing the active workers and outstanding tasks
+    Description: batches take 2 ms to produce and 20 ms to consume, 4 workers at most, two epochs
+    Expectation: every sample is returned once per epoch, the loader shrinks to one worker.
+    """
+    dataset = SleepDataset(0, 120, 0.002)
+    sampler = RandomBatchSampler(dataset, 4)
+    loader = DataLoader(dataset, sampler, num_workers=4, adaptive=True)
+    for _ in range(2):
+        it = iter(loader)
+        ret = []
+        for batch in it:
+            time.sleep(0.02)
+            ret.append(batch)
+        assert sorted(np.array(ret).flatten().tolist()) == list(range(120))
+    metrics = it.metrics
+    assert metrics["active_workers"] == 1
+    assert 1 <= metrics["target_outstanding"] <= 2
+    assert metrics["step_time"] > metrics["fetch_time"]
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_profile():
+    """
+    Feature: `DataLoader` with `profile=True` recording every stage of every batch
+    Description: batches take 2 ms in `__getitem__`, single process and two workers, one epoch each
+    Expectation: one record per batch and stage, getitem at least 2 ms, a Chrome trace with the worker rows.
+    """
+    dataset = SleepDataset(0, 40, 0.002)
+    sampler = RandomBatchSampler(dataset, 4)
+    for workers in (0, 2):
+        loader = DataLoader(dataset, sampler, num_workers=workers, profile=True)
+        it = iter(loader)
+        assert len(list(it)) == 10
+        summary = it.profiler.summary()
+        for stage in ("sampler", "getitem", "collate", "next"):
+            assert summary[stage]["count"] == 10
+        # the call raising StopIteration ends the last step
+        assert summary["step"]["count"] == 10
+        assert summary["getitem"]["p50_ms"] >= 2
+        assert sum(summary["getitem"]["histogram"]["counts"]) == 10
+        trace = it.profiler.to_chrome_trace()
+        names = {event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"}
+        assert len(names) == workers + 1
+    assert summary["wait"]["count"] == 10
+    assert summary["tasks_outstanding"]["max"] <= 4
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_pipeline_profiler_bounded():
+    """
+    Feature: `PipelineProfiler` aggregating the stages as they are recorded
+    Description: 20000 lognormal getitem durations and 100 depth samples, at most 50 events kept
+    Expectation: the summary covers every record, the percentiles are within 9% of numpy's, the trace holds
+                 the last 50 stages and depth samples.
+    """
+    durations = np.random.default_rng(0).lognormal(0, 2, 20000) / 1000
+    profiler = PipelineProfiler(max_events=50)
+    for batch, duration in enumerate(durations):
+        profiler.record("getitem", 1.0, 1.0 + duration, batch)
+    for depth in range(100):
+        profiler.record_depth(float(depth), depth % 5, 0, 1)
+    summary = profiler.summary()
+    assert summary["getitem"]["count"] == 20000
+    assert sum(summary["getitem"]["histogram"]["counts"]) == 20000
+    assert summary["getitem"]["max_ms"] == pytest.approx(durations.max() * 1000)
+    for q in (50, 90, 99):
+        assert summary["getitem"]["p{}_ms".format(q)] == pytest.approx(np.percentile(durations * 1000, q), rel=0.09)
+    assert summary["tasks_outstanding"] == {"mean": 2.0, "max": 4, "histogram": [20] * 5}
+    events = profiler.to_chrome_trace()["traceEvents"]
+    stages = [event for event in events if event["ph"] == "X"]
+    assert [event["args"]["batch"] for event in stages] == list(range(19950, 20000))
+    assert len([event for event in events if event["ph"] == "C"]) == 50
+
+
+class SharedArrayDataset(ArrayDataset):
+    """
+    `ArrayDataset` returning the features as SharedNDArray.
+    """
+
+    def __getitem__(self, idx):
+        feat, other = super().__getitem__(idx)
+        return SharedNDArray.from_numpy_array(feat), other
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_shared_memory_cleanup():
+    """
+    Feature: shared memory of `DataLoader` workers unlinked when a worker is killed and at shutdown
+    Description: SharedNDArray features, batch_size = 4, two persistent workers, 4 batches held, then one
+                 worker killed with SIGKILL
+    Expectation: the loader raises, no block of the killed worker is left, none at all after shutdown, and the
+                 batches held are still readable.
+    """
+    dataset = SharedArrayDataset(80)
+    loader = DataLoader(dataset, RandomBatchSampler(list(range(80)), 4), num_workers=2, persistent_workers=True)
+    it = iter(loader)
+    held = [next(it)[0] for _ in range(4)]
+    assert it.segments["segments"] >= 4
+    killed = it._workers[0].pid
+    os.kill(killed, signal.SIGKILL)
+    with pytest.raises(RuntimeError):
+        for _ in it:
+            pass
+    assert killed not in it.segments["owners"]
+    it._shutdown_workers()
+    assert it.segments["segments"] == 0
+    assert all(np.array_equal(feat[:, 0], feat[:, -1]) for feat in held)
+
+
+class RecordingDataset(MyDataset):
+    """
+    `MyDataset` recording the threads calling `__getitem__`.
+    """
+
+    def __init__(self, start, end):
+        super().__init__(start, end)
+        self.callers = set()
+
+    def __getitem__(self, idx):
+        self.callers.add(threading.get_ident())
+        return super().__getitem__(idx)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_thread_backend():
+    """
+    Feature: `DataLoader` with `backend="thread"`
+    Description: list(dataset) = [0, 1, ..., 39], batch_size = 4, two workers in order and out of order,
+                 persistent and not, two epochs
+    Expectation: the batches of the process backend, `__getitem__` called on the dataset of the main process
+                 from the worker threads.
+    """
+    dataset = RecordingDataset(0, 40)
+    expect = DataLoader(dataset, RandomBatchSampler(list(range(40)), 4, seed=7), num_workers=2)
+    expect = [list(expect) for _ in range(2)]
+    dataset.callers.clear()
+    for in_order in (True, False):
+        for persistent_workers in (True, False):
+            loader = DataLoader(dataset, RandomBatchSampler(list(range(40)), 4, seed=7), num_workers=2,
+                                in_order=in_order, persistent_workers=persistent_workers, backend="thread")
+            for epoch in range(2):
+                res = list(loader)
+                if in_order:
+                    assert res == expect[epoch]
+                else:
+                    assert sorted(map(sorted, res)) == sorted(map(sorted, expect[epoch]))
+            if persistent_workers:
+                loader.iterator._shutdown_workers()
+    assert dataset.callers and threading.get_ident() not in dataset.callers
+    with pytest.raises(ValueError):
+        DataLoader(dataset, RandomBatchSampler(list(range(40)), 4), num_workers=2, backend="thread",
+                   shared_ring=True)
+
+
+class PaddedDataset(Dataset):
+    """
+    Batches padded by a `PadArray2d` of constant size, which pads every batch into the same buffer.
+    """
+
+    def __init__(self, n):
+        self.len = n
+        self.pad = PadArray2d(np.float32, PadDirection.COL, fill_value=-1, mode=PadMode.CONST, size=(8, 64))
+
+    def __len__(self):
+        return self.len
+
+    def __getitem__(self, batch):
+        feat = np.repeat(np.array(batch, dtype=np.float32)[:, None], 64, axis=1)
+        padded = self.pad(feat)
+        # let the other worker pad while this batch is in the buffer
+        time.sleep(0.001)
+        return padded
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_thread_backend_held_batches():
+    """
+    Feature: `DataLoader` with `backend="thread"` on a dataset padding into a reused buffer
+    Description: batch_size = 4, two workers, every batch of the epoch held until its end
+    Expectation: each held batch is still the padded batch of its indices.
+    """
+    dataset = PaddedDataset(64)
+    loader = DataLoader(dataset, RandomBatchSampler(list(range(64)), 4, seed=3), num_workers=2, backend="thread")
+    batches = list(RandomBatchSampler(list(range(64)), 4, seed=3))
+    held = list(loader)
+    assert len(held) == len(batches)
+    for batch, padded in zip(batches, held):
+        assert np.array_equal(padded[:4, 0], batch)
+        assert np.all(padded[4:] == -1)
+
+
+class GraphFeatureDataset(Dataset):
+    """
+    Node features and a CSR graph declared as shared arrays, a batch gathers the features of the neighbours.
+    """
+
+    shared_arrays = ("feat", "store.feat", "store.csr")
+
+    class Store:
+        pass
+
+    def __init__(self, nodes):
+        indptr = np.arange(nodes + 1, dtype=np.int32) * 2
+        indices = np.stack([np.arange(nodes), np.arange(nodes)[::-1]], axis=1).reshape(-1).astype(np.int32)
+        self.feat = np.arange(nodes * 8, dtype=np.float32).reshape(nodes, 8)
+        self.store = self.Store()
+        self.store.feat = self.feat
+        self.store.csr = CsrAdj(indptr, indices)
+
+    def __len__(self):
+        return self.feat.shape[0]
+
+    def __getitem__(self, idx):
+        csr = self.store.csr
+        neighbors = np.concatenate([csr.indices[csr.indptr[i]:csr.indptr[i + 1]] for i in idx])
+        return self.feat[neighbors]
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_shared_dataset_arrays():
+    """
+    Feature: `Dataset.shared_arrays` moved into shared memory before the `DataLoader` workers start
+    Description: features reached by two paths and a CsrAdj, 100 nodes, batch_size = 4, two workers
+    Expectation: SharedNDArray attributes, the features moved once, a CsrAdj kept, the batches of the
+                 dataset before it was shared.
+    """
+    dataset = GraphFeatureDataset(100)
+    sampler = RandomBatchSampler(list(range(100)), 4)
+    expect = [dataset[idx] for idx in RandomBatchSampler(list(range(100)), 4)]
+    loader = DataLoader(dataset, sampler, num_workers=2)
+    res = list(loader)
+    assert isinstance(dataset.feat, SharedNDArray) and dataset.store.feat is dataset.feat
+    assert isinstance(dataset.store.csr, CsrAdj) and isinstance(dataset.store.csr.indices, SharedNDArray)
+    assert dataset.share_memory() == 0
+    assert all(np.array_equal(a, b) for a, b in zip(expect, res))
+
+
+SPAWN_SCRIPT = """
+import multiprocessing
+import os
+import numpy as np
+from mindspore_gl.dataloader.dataset import Dataset
+from mindspore_gl.dataloader.samplers import RandomBatchSampler
+from mindspore_gl.dataloader.dataloader import DataLoader
+
+
+class FeatDataset(Dataset):
+    shared_arrays = ("feat",)
+
+    def __init__(self, nodes):
+        self.feat = np.arange(nodes * 8, dtype=np.float32).reshape(nodes, 8)
+
+    def __len__(self):
+        return self.feat.shape[0]
+
+    def __getitem__(self, idx):
+        return self.feat[idx]
+
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method("spawn")
+    loader = DataLoader(FeatDataset(100), RandomBatchSampler(list(range(100)), 4), num_workers=2,
+                        persistent_workers=True)
+    assert sum(len(batch) for batch in loader) == 100
+    loader.iterator._shutdown_workers()
+    print(os.getpid())
+"""
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_dataloader_shared_dataset_arrays_spawn(tmp_path):
+    """
+    Feature: shared memory of `Dataset.shared_arrays` with spawned workers
+    Description: a process shares a dataset with two spawned workers and exits
+    Expectation: no dataset block of the process is left.
+    """
+    script = tmp_path / "spawn_dataset.py"
+    script.write_text(SPAWN_SCRIPT)
+    res = subprocess.run([sys.executable, str(script)], stdout=subprocess.PIPE, universal_newlines=True,
+                         check=True, timeout=120)
+    pid = int(res.stdout.split()[-1])
+    assert segment_report("psm_dataset_{}_".format(pid))["segments"] == 0
@@ -18,9 +18,12 @@ import scipy.sparse as sp
 import numpy as np
 import mindspore as ms
 from mindspore_gl.dataset.imdb_binary import IMDBBinary
+from mindspore_gl.graph.graph import coo_to_csr, csr_to_coo
+from mindspore_gl.graph.csr_convert import coo_to_csr_data
 from mindspore_gl.graph import BatchHomoGraph, PadHomoGraph, PadMode, PadArray2d,\
     MindHomoGraph, get_laplacian, PadDirection, norm, UnBatchHomoGraph, remove_self_loop, add_self_loop,\
-    gcn_norm, graph_csr_data, sampling_csr_data, batch_graph_csr_data, PadCsrEdge
+    gcn_norm, graph_csr_data, sampling_csr_data, batch_graph_csr_data, PadCsrEdge, as_id_mapping,\
+    IdentityMapping, SortedIdMapping, DenseIdMapping, BucketPlanner, MindRelationGraph, CsrAdj
 import pytest
 
 dataset = IMDBBinary("/home/workspace/mindspore_dataset/GNN_Dataset/")
@@ -47,6 +50,102 @@ def test_homograph():
     assert np.allclose(adj_coo, expect_output)
 
 
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_coo_csr_convert():
+    """
+    Feature: test coo_to_csr and csr_to_coo
+    Description: convert a random graph both directions, serial and parallel
+    Expectation: same result as a stable sort by row
+    """
+    node_count = 50
+    edges = np.random.randint(0, node_count, size=(2, 2000)).astype(np.int32)
+    order = np.argsort(edges[0], kind='stable')
+    for num_threads in (1, 4):
+        csr, perm = coo_to_csr(edges, node_count, return_perm=True, num_threads=num_threads)
+        assert csr.indptr.dtype == np.int32 and csr.indices.dtype == np.int32
+        assert np.array_equal(np.diff(csr.indptr), np.bincount(edges[0], minlength=node_count))
+        assert np.array_equal(csr.indices, edges[1][order])
+        assert np.array_equal(perm, order)
+        assert np.array_equal(csr_to_coo(csr, num_threads=num_threads), edges[:, order])
+    # node ids out of range are rejected before the kernels index with them
+    for bad in (np.array([[0, 1] * 50 + [1000000] * 100, [0] * 200]), np.array([[0, 1, -1], [1, 0, 0]])):
+        for num_threads in (1, 2):
+            with pytest.raises(ValueError):
+                coo_to_csr(bad, node_count=2, num_threads=num_threads)
+
+    graph = MindHomoGraph()
+    graph.set_topo_coo([src_idx, dst_idx])
+    graph.node_count = num_nodes
+    assert np.array_equal(graph.adj_csr.indptr, [0, 1, 1, 3, 4, 5, 7, 8])
+    assert graph.adj_csr is graph.adj_csr
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_batched_queries():
+    """
+    Feature: test batched neighbor and degree queries of MindHomoGraph
+    Description: query an array of nodes and compare with per node queries
+    Expectation: Output result
+    """
+    graph = MindHomoGraph()
+    graph.set_topo_coo(np.array([src_idx, dst_idx], np.int32))
+    graph.node_count = num_nodes
+    query = np.array([5, 2, 0, 5])
+    res = graph.neighbors(query)
+    for i, node in enumerate(query):
+        assert np.array_equal(res.indices[res.indptr[i]: res.indptr[i + 1]], graph.neighbors(node))
+    assert np.array_equal(graph.out_degrees(query), [2, 2, 1, 2])
+    assert np.array_equal(graph.in_degrees(query), [1, 0, 1, 1])
+    pred = graph.predecessors(np.array([4, 1]))
+    assert np.array_equal(pred.indptr, [0, 2, 4])
+    assert np.array_equal(np.sort(pred.indices[2:]), [0, 2])
+
+    # the last node has no edge, in or out
+    relation = MindRelationGraph("user", "user", "follows")
+    relation.set_topo(CsrAdj(np.array([0, 1, 2, 2], np.int32), np.array([1, 0], np.int32)))
+    assert relation.has_node(2)
+    assert np.array_equal(relation.in_degrees(np.array([2, 0, 1])), [0, 1, 1])
+    assert relation.in_degree(2) == 0
+    assert relation.predecessors(2).shape[0] == 0
+    # sampling in edges shares the reversed CSR of the queries
+    relation = MindRelationGraph("user", "user", "follows")
+    relation.set_topo(CsrAdj(np.array([0, 1, 2, 2], np.int32), np.array([1, 0], np.int32)))
+    edges, eids = relation.sample_predecessors(np.array([0, 1, 2]), 2)
+    assert np.array_equal(edges[:, np.argsort(eids)], [[0, 1], [1, 0]])
+    assert np.array_equal(relation.in_degrees(np.array([0, 1, 2])), [1, 1, 0])
+    assert relation.predecessors(2).shape[0] == 0
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_id_mapping():
+    """
+    Feature: test array backed node id mapping
+    Description: build mappings from dict and arrays, map ids both ways through MindHomoGraph
+    Expectation: Output result
+    """
+    assert isinstance(as_id_mapping(np.arange(num_nodes)), IdentityMapping)
+    assert isinstance(as_id_mapping({idx: idx for idx in nodes}), IdentityMapping)
+    assert isinstance(as_id_mapping(np.array([3, 0, 6, 2])), DenseIdMapping)
+    global_ids = np.array([70, 10, 20, 60, 40, 50, 30]) * 1000
+    mapping = as_id_mapping(global_ids)
+    assert isinstance(mapping, SortedIdMapping)
+    assert np.array_equal(mapping.to_local(global_ids[[4, 0, 6]]), [4, 0, 6])
+    assert np.array_equal(mapping.contains(np.array([10000, 10001])), [True, False])
+
+    graph = MindHomoGraph()
+    graph.set_topo_coo(np.array([src_idx, dst_idx], np.int32), node_dict=global_ids)
+    graph.node_count = num_nodes
+    assert np.array_equal(graph.neighbors(50000), global_ids[[4, 6]])
+    assert np.array_equal(graph.in_degrees(global_ids[[4, 2]]), [2, 0])
+    assert np.array_equal(graph.out_degrees(global_ids[[5, 1]]), [2, 0])
+
+
 @pytest.mark.level0
 @pytest.mark.platform_x86_gpu_training
 @pytest.mark.env_onecard
@@ -83,6 +182,51 @@ def test_unbatch():
     assert unbatch_graph[1].edge_count == graphs[1].edge_count
     assert unbatch_graph[1].node_count == graphs[1].node_count
 
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_batch_gather():
+    """
+    Feature: test BatchHomoGraph.gather
+    Description: batch graphs from the arrays of a multi graph store and unbatch them
+    Expectation: same graph and batch meta as batching MindHomoGraph, unbatching restores the graphs
+    """
+    rng = np.random.default_rng(0)
+    node_counts = rng.integers(1, 20, 50)
+    edge_counts = rng.integers(0, 60, 50)
+    graph_nodes = np.concatenate([[0], np.cumsum(node_counts)])
+    graph_edges = np.concatenate([[0], np.cumsum(edge_counts)])
+    local_coo = rng.integers(0, np.repeat(node_counts, edge_counts), (2, graph_edges[-1]))
+    edge_array = local_coo + np.repeat(graph_nodes[:-1], edge_counts)
+    graph_idx = np.array([7, 3, 3, 42, 0, 19])
+
+    graphs = []
+    for idx in graph_idx:
+        graph = MindHomoGraph()
+        graph.set_topo_coo(local_coo[:, graph_edges[idx]:graph_edges[idx + 1]])
+        graph.node_count = node_counts[idx]
+        graph.edge_count = edge_counts[idx]
+        graphs.append(graph)
+    expected = BatchHomoGraph()(graphs)
+    for batch_graph in (BatchHomoGraph().gather(edge_array, graph_nodes, graph_edges, graph_idx),
+                        BatchHomoGraph().gather(local_coo, graph_nodes, graph_edges, graph_idx, node_base=0)):
+        assert batch_graph.adj_coo.dtype == np.int32
+        assert np.array_equal(batch_graph.adj_coo, expected.adj_coo)
+        assert batch_graph.node_count == expected.node_count
+        assert batch_graph.edge_count == expected.edge_count
+        assert np.array_equal(batch_graph.batch_meta.graph_nodes, expected.batch_meta.graph_nodes)
+        assert np.array_equal(batch_graph.batch_meta.graph_edges, expected.batch_meta.graph_edges)
+        assert np.array_equal(batch_graph.batch_meta.node_map_idx, expected.batch_meta.node_map_idx)
+        assert np.array_equal(batch_graph.batch_meta.edge_map_idx, expected.batch_meta.edge_map_idx)
+
+    batched_coo = expected.adj_coo.copy()
+    for graph, unbatched, indexed in zip(graphs, UnBatchHomoGraph()(expected), [expected[i] for i in range(6)]):
+        assert np.array_equal(unbatched.adj_coo, graph.adj_coo)
+        assert np.array_equal(indexed.adj_coo, graph.adj_coo)
+        assert unbatched.node_count == indexed.node_count == graph.node_count
+    assert np.array_equal(expected.adj_coo, batched_coo)
+
 def test_pad_array2d():
     """
     Feature: test PadArray2d
@@ -156,6 +300,54 @@ def test_pad_auto():
     assert pad_res.adj_coo.shape[1] == pad_res.edge_count
 
 
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_pad_bucket():
+    """
+    Feature: test PadMode.BUCKET
+    Description: pad batches with the sizes of a BucketPlanner, before and after warmup
+    Expectation: the graph, feature and edge pads agree, sizes come from the planned buckets
+    """
+    planner = BucketPlanner(num_buckets=2)
+    planner.fit([10, 12, 30, 31], [40, 50, 100, 120])
+    assert planner.buckets == [(16, 56), (32, 128)]
+    assert planner.shape(15, 55) == (16, 56)
+    assert planner.shape(11, 56) == (32, 128)
+    assert planner.shape(40, 200) == (64, 256)
+    report = planner.report()
+    assert report["shapes"] == 3 and report["overflow"] == 1
+    assert report["edge_waste"] == 1 - (55 + 56 + 200) / (56 + 128 + 256)
+
+    rng = np.random.default_rng(0)
+    planner = BucketPlanner(num_buckets=3, warmup=8)
+    graph_op = PadHomoGraph(mode=PadMode.BUCKET, planner=planner)
+    feat_op = PadArray2d(dtype=np.float32, direction=PadDirection.COL, fill_value=0, mode=PadMode.BUCKET,
+                         planner=planner)
+    edge_op = PadCsrEdge(1000, mode=PadMode.BUCKET, planner=planner)
+    for _ in range(20):
+        graphs = []
+        for _ in range(3):
+            graph = MindHomoGraph()
+            node_count, edge_count = rng.integers(5, 30), rng.integers(10, 80)
+            graph.set_topo_coo(rng.integers(0, node_count, (2, edge_count)).astype(np.int32))
+            graph.node_count = node_count
+            graph.edge_count = edge_count
+            graphs.append(graph)
+        batch_graph = BatchHomoGraph()(graphs)
+        bucket = planner.shape(batch_graph.node_count, batch_graph.edge_count)
+        pad_res = graph_op(batch_graph, bucket=bucket)
+        feat = feat_op(np.ones([batch_graph.node_count, 2], dtype=np.float32), bucket=bucket)
+        edges = edge_op(batch_graph.adj_coo, bucket=bucket)
+        assert pad_res.node_count > batch_graph.node_count and pad_res.edge_count > batch_graph.edge_count
+        assert feat.shape[0] == pad_res.node_count
+        assert edges.shape[1] == pad_res.adj_coo.shape[1] == pad_res.edge_count
+        assert np.array_equal(pad_res[0].adj_coo, graphs[0].adj_coo)
+    report = planner.report()
+    assert len(planner.buckets) <= 3 and report["batches"] == 20
+    assert planner.shape(10, 20) == planner.buckets[0]
+
+
 @pytest.mark.level0
 @pytest.mark.platform_x86_gpu_training
 @pytest.mark.env_onecard
@@ -405,6 +597,32 @@ def test_csr_batched_graph():
     assert np.allclose(expect_node_map_idx, node_map_idx)
     assert np.allclose(expect_node_feat, node_feat)
 
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_coo_to_csr_data():
+    """
+    Feature: test int32 forward and backward csr in numpy
+    Description: random graphs with repeated edges, with and without rerank
+    Expectation: rows sorted without repeated edges, the backward csr is the transpose, degrees count every edge
+    """
+    rng = np.random.default_rng(0)
+    for rerank in (False, True):
+        n_nodes = 50
+        row = rng.integers(0, n_nodes, 400).astype(np.int32)
+        col = rng.integers(0, n_nodes, 400).astype(np.int32)
+        data = coo_to_csr_data(row, col, n_nodes, rerank)
+        if rerank:
+            row, col = data.inv_perm[row], data.inv_perm[col]
+            assert np.all(data.out_deg[:-1] >= data.out_deg[1:])
+        edges = np.unique(row.astype(np.int64) * n_nodes + col)
+        assert data.indices.dtype == np.int32 and data.indptr.dtype == np.int32
+        assert np.array_equal(np.repeat(np.arange(n_nodes), np.diff(data.indptr)) * n_nodes + data.indices, edges)
+        backward = np.repeat(np.arange(n_nodes), np.diff(data.indptr_backward)) * n_nodes + data.indices_backward
+        assert np.array_equal(backward, np.unique(col.astype(np.int64) * n_nodes + row))
+        assert np.array_equal(data.out_deg, np.bincount(row, minlength=n_nodes))
+        assert np.array_equal(data.in_deg, np.bincount(col, minlength=n_nodes))
+
 @pytest.mark.level0
 @pytest.mark.platform_x86_gpu_training
 @pytest.mark.env_onecard
@@ -0,0 +1,50 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+""" test graph store """
+import numpy as np
+from mindspore_gl.dataset import GraphStore, convert_npz
+from mindspore_gl.dataset.graph_store import graph_store_exists, load_graph_store
+import pytest
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_convert_npz(tmp_path):
+    """
+    Feature: convert a dataset npz file into a mmap graph store.
+    Description: save arrays, scalars and masks to npz, convert and read them back.
+    Expectation: success.
+    """
+    npz_path = tmp_path / "toy_with_mask.npz"
+    indptr = np.array([0, 2, 3, 3], np.int32)
+    feat = np.arange(12, dtype=np.float32).reshape(3, 4)
+    np.savez(npz_path, adj_csr_indptr=indptr, feat=feat, train_mask=np.array([True, False, True]), num_classes=7)
+    assert isinstance(load_graph_store(npz_path), np.lib.npyio.NpzFile)
+
+    store_path = convert_npz(npz_path)
+    assert store_path == tmp_path / "toy_with_mask"
+    assert graph_store_exists(npz_path)
+    npz_path.unlink()
+    assert graph_store_exists(npz_path)
+
+    store = load_graph_store(npz_path)
+    assert isinstance(store, GraphStore)
+    assert sorted(store.files) == ["adj_csr_indptr", "feat", "num_classes", "train_mask"]
+    assert isinstance(store["feat"], np.memmap)
+    assert np.array_equal(store["adj_csr_indptr"], indptr)
+    assert np.array_equal(store["feat"], feat)
+    assert int(store["num_classes"]) == 7
+    assert store["adj_csr_indptr"].astype(np.int32, copy=False) is store["adj_csr_indptr"]
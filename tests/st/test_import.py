@@ -0,0 +1,34 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test importing the package."""
+import subprocess
+import sys
+import pytest
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("module", ["mindspore_gl", "mindspore_gl.dataloader", "mindspore_gl.graph",
+                                    "mindspore_gl.sampling", "mindspore_gl.nn"])
+def test_import(module):
+    """
+    Features: import.
+    Description: Import the package and its subpackages first, each in a new interpreter.
+    Expectation: No import cycle fails the import.
+    """
+    res = subprocess.run([sys.executable, "-c", "import {}".format(module)], stderr=subprocess.PIPE,
+                         universal_newlines=True, check=False)
+    assert res.returncode == 0, res.stderr
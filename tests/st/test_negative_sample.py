@@ -14,7 +14,9 @@
 # ============================================================================
 """test sample"""
 import numpy as np
+import pytest
 from mindspore_gl import negative_sample
+from mindspore_gl.sampling import NegativeSampler
 
 
 def test_negative_sample():
@@ -43,3 +45,70 @@ def test_negative_sample():
 
     assert ~ismember(neg, np.array(positive))
     assert neg_len == neg.shape[0]
+
+
+def test_negative_sampler():
+    """
+    Feature: Test hash based negative sampling, corruption and the batch generator.
+
+    Description:
+    random directed graph with 200 nodes and 8000 edges
+
+    Expectation:
+    No negative edge is a positive edge or a self loop, sampled batches are distinct,
+    corrupted edges keep the untouched endpoint.
+    """
+    rng = np.random.default_rng(0)
+    positive = rng.integers(0, 200, size=(2, 8000))
+    positive_keys = set((positive[0] * 200 + positive[1]).tolist())
+    sampler = NegativeSampler(positive, 200, mode='other', random_seed=1)
+
+    neg = sampler.sample(5000)
+    assert neg.shape == (2, 5000)
+    keys = neg[0].astype(np.int64) * 200 + neg[1]
+    assert np.unique(keys).shape[0] == 5000
+    assert not positive_keys.intersection(keys.tolist())
+    assert np.all(neg[0] != neg[1])
+    assert not sampler.contains(neg).any()
+    assert sampler.contains(positive).all()
+
+    neg = sampler.corrupt(positive[:, :100], num_per_edge=3, side='head')
+    np.testing.assert_array_equal(neg[1], np.repeat(positive[1, :100], 3))
+    assert not sampler.contains(neg).any()
+
+    batches = sampler.batches(64)
+    for _ in range(3):
+        assert next(batches).shape == (2, 64)
+
+    undirected = NegativeSampler(positive, 200, random_seed=1)
+    neg = undirected.sample(1000)
+    assert np.all(neg[0] < neg[1])
+    assert not undirected.contains(neg[::-1]).any()
+
+
+def test_negative_sampler_saturated():
+    """
+    Feature: Test negative sampling without negative edges.
+
+    Description:
+    undirected star over 6 nodes plus the edge (1, 2), the complete graph over 4 nodes,
+    node counts given as numpy integers
+
+    Expectation:
+    Corrupting the center of the star and sampling the complete graph raise ValueError instead of
+    drawing forever, the other nodes are corrupted.
+    """
+    positive = np.array([[0, 0, 0, 0, 0, 1], [1, 2, 3, 4, 5, 2]])
+    sampler = NegativeSampler(positive, np.int64(6), random_seed=1)
+    with pytest.raises(ValueError):
+        sampler.corrupt(positive[:, :1], side='tail')
+    neg = sampler.corrupt(positive[:, 5:], num_per_edge=4, side='tail')
+    assert np.all(neg[0] == 1) and np.all(np.isin(neg[1], [3, 4, 5]))
+
+    row, col = np.triu_indices(4, 1)
+    complete = NegativeSampler(np.stack([row, col]), np.int32(4), random_seed=1)
+    for unique in (True, False):
+        with pytest.raises(ValueError):
+            complete.sample(3, unique=unique)
+    # a self loop takes no negative edge away
+    assert NegativeSampler(np.array([[0, 1], [0, 2]]), 3, random_seed=1).sample(2).shape == (2, 2)
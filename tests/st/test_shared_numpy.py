@@ -13,9 +13,12 @@
 # limitations under the License.
 # ============================================================================
 """ test shared numpy """
+import multiprocessing
+import os
 import numpy as np
 import mindspore as ms
 import mindspore_gl.dataloader.shared_numpy as shared_numpy
+from mindspore_gl.graph.utils import SharedArrayPool
 import pytest
 
 
@@ -66,3 +69,95 @@ def test_create_from_shape():
     shared_array[0, 10:30] = 1
     assert all(shared_array[0, 10:30] == 1)
     ms.Tensor.from_numpy(shared_array)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_shared_ring():
+    """
+    Feature: write batches to `SharedRing` and read them in place from a second mapping.
+    Description: two slots of 1 MB, nested tuple and dict batches, a batch larger than a slot.
+    Expectation: arrays read back equal, a slot is free again once its arrays are dropped.
+    """
+    writer = shared_numpy.SharedRing(num_slots=2, slot_bytes=1 << 20)
+    reader = shared_numpy.SharedRing(name=writer.name)
+    reader.unlink()
+    feat = np.arange(600, dtype=np.float32).reshape(100, 6)
+    edges = np.arange(20, dtype=np.int32).reshape(2, 10)
+    first = reader.read(writer.write((feat, {"edges": edges, "n": 10})))
+    second = reader.read(writer.write([edges.T, feat[::2]]))
+    assert writer.free_slots == 0
+    assert writer.write(feat) is None
+    assert np.array_equal(first[0], feat) and np.array_equal(first[1]["edges"], edges) and first[1]["n"] == 10
+    assert np.array_equal(second[0], edges.T) and np.array_equal(second[1], feat[::2])
+    edge_view = first[1]["edges"]
+    del first
+    assert writer.free_slots == 0
+    del edge_view
+    assert writer.free_slots == 1
+    assert writer.write(np.zeros([(1 << 20) + 1], np.uint8)) is None
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_shared_array_pool():
+    """
+    Feature: `SharedArrayPool` size classes, reuse after a block was sent through `Queue`, bounded bytes.
+    Description: arrays of different shapes in one size class, one array sent and received, a pool of 64 KB
+                 asked for growing arrays.
+    Expectation: views of the shapes asked reusing the blocks, a sent block reused once the receiver drops
+                 it, free blocks dropped to stay under the bound.
+    """
+    pool = SharedArrayPool(max_bytes=1 << 16)
+    arr = pool.get([1000, 3], np.float32)
+    assert arr.shape == (1000, 3) and arr.dtype == np.float32
+    del arr
+    arr = pool.get([3000], np.int32)
+    assert pool.stats["hits"] == 1 and pool.stats["resident_bytes"] == 16384
+    arr[:] = 7
+    queue = shared_numpy.Queue()
+    queue.put(arr)
+    del arr
+    other = pool.get([100], np.int64)
+    assert pool.stats["misses"] == 2
+    ret = queue.get()
+    assert ret.shape == (3000,) and np.all(ret == 7)
+    del ret, other
+    pool.get([4000], np.float32)
+    assert pool.stats["hits"] == 2
+    for size in range(1, 17):
+        pool.get([size * 1000], np.float32)
+    stats = pool.stats
+    assert stats["evictions"] > 0 and stats["resident_bytes"] <= 1 << 16
+    pool.clear()
+    assert pool.stats["resident_bytes"] == 0
+
+
+def _leak_shared_arrays(scope, count):
+    shared_numpy.shared_memory.set_name_scope(scope)
+    arrays = [shared_numpy.SharedNDArray.from_numpy_array(np.ones([1000], np.float32)) for _ in range(count)]
+    # killed before the arrays are released
+    os._exit(len(arrays))
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_segment_registry():
+    """
+    Feature: `SegmentRegistry` tracing the shared memory of a run to its owner and unlinking orphans.
+    Description: a process of the run creates 3 SharedNDArray and exits without releasing them.
+    Expectation: the registry reports the 3 blocks of that pid, sweep unlinks them once the process is gone.
+    """
+    registry = shared_numpy.SegmentRegistry()
+    assert registry.report() == {"segments": 0, "bytes": 0, "owners": {}}
+    process = multiprocessing.Process(target=_leak_shared_arrays, args=(registry.run, 3))
+    process.start()
+    process.join()
+    report = registry.report()
+    assert report["segments"] == 3 and report["bytes"] >= 3 * 4000
+    assert list(report["owners"]) == [process.pid]
+    assert registry.sweep() == 3
+    assert registry.report()["segments"] == 0
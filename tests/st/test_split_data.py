@@ -0,0 +1,120 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+""" Test split_data. """
+import time
+from collections import namedtuple
+import numpy as np
+import scipy.sparse as sp
+import pytest
+from mindspore_gl.dataloader import split_data
+
+Graph = namedtuple("Graph", ["adj_coo"])
+
+
+def reference_split_data(x, val_ratio=0.05, test_ratio=0.1, graph_type='undirected'):
+    """list based implementation split_data is checked against"""
+    col = x.adj_coo.col
+    row = x.adj_coo.row
+    adj = [[col[i], row[i]] for i in range(len(col))]
+    adj_c = [i for i in adj if i[0] != i[1]]
+    if graph_type == 'undirected':
+        adj_cc = []
+        for i in adj_c:
+            if [i[1], i[0]] not in adj_cc:
+                adj_cc.append(i)
+    else:
+        adj_cc = adj_c
+    np.random.shuffle(adj_cc)
+    s = len(adj_cc)
+    val_l = int(s*val_ratio)
+    test_l = int(s*test_ratio)
+    idx = np.random.randint(val_l+test_l, s-val_l-test_l)
+    val = adj_cc[idx:idx+val_l]
+    test = adj_cc[idx+val_l:idx+val_l+test_l]
+    for i in val+test:
+        if i in adj:
+            adj.remove([i[1], i[0]])
+            adj.remove([i[0], i[1]])
+    train = np.array(adj)
+    data = np.ones(train.shape[0])
+    adj_train = sp.csr_matrix((data, (train[:, 0], train[:, 1])), shape=x.adj_coo.shape).tocoo(copy=False)
+    return adj_train, (train, np.array(val), np.array(test))
+
+
+def random_undirected_graph(node_count, edge_count, seed):
+    """symmetric COO graph with a few self loops and duplicated edges, in random order"""
+    rng = np.random.default_rng(seed)
+    row = rng.integers(0, node_count, edge_count)
+    col = rng.integers(0, node_count, edge_count)
+    row, col = np.concatenate([row, col, row[:5]]), np.concatenate([col, row, row[:5]])
+    perm = rng.permutation(row.shape[0])
+    return Graph(sp.coo_matrix((np.ones(row.shape[0]), (row[perm], col[perm])), shape=(node_count, node_count)))
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_split_data_equivalence():
+    """
+    Feature: Test the vectorized split_data against the list based implementation.
+    Description: random symmetric graphs with self loops and duplicated edges, same numpy random state.
+    Expectation: identical train, val, test and adj_train.
+    """
+    for seed in range(5):
+        graph = random_undirected_graph(60, 300, seed)
+        np.random.seed(seed)
+        expect_adj, expect = reference_split_data(graph)
+        np.random.seed(seed)
+        adj_train, res = split_data(graph)
+        for expect_split, res_split in zip(expect, res):
+            np.testing.assert_array_equal(expect_split.reshape(-1, 2), res_split)
+        assert (expect_adj != adj_train).nnz == 0
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_split_data_negative():
+    """
+    Feature: Test negative edges of split_data.
+    Description: random symmetric graph, negative=True.
+    Expectation: one negative edge per positive edge, never an edge of the graph, distinct across splits.
+    """
+    graph = random_undirected_graph(200, 1000, 0)
+    _, positives, negatives = split_data(graph, negative=True)
+    edges = set(zip(graph.adj_coo.row.tolist(), graph.adj_coo.col.tolist()))
+    for pos, neg in zip(positives, negatives):
+        assert neg.shape == pos.shape
+        assert not edges.intersection(zip(neg[:, 0].tolist(), neg[:, 1].tolist()))
+    neg = np.concatenate(negatives)
+    assert np.unique(neg, axis=0).shape[0] == neg.shape[0]
+
+
+@pytest.mark.level1
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_split_data_5m_edges():
+    """
+    Feature: Test split_data on a large graph.
+    Description: 5M edge symmetric graph over 500K nodes, without duplicated edges.
+    Expectation: finishes within a minute, every held out edge is removed in both directions.
+    """
+    graph = Graph(random_undirected_graph(500000, 2500000, 0).adj_coo.tocsr().tocoo())
+    start = time.perf_counter()
+    adj_train, (train, val, test) = split_data(graph)
+    assert time.perf_counter() - start < 60
+    assert train.shape[0] + 2 * (val.shape[0] + test.shape[0]) == graph.adj_coo.nnz
+    held_out = np.concatenate([val, test])
+    assert adj_train.tocsr()[held_out[:, 0], held_out[:, 1]].sum() == 0
@@ -0,0 +1,45 @@
+# Copyright 2022 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test the translation cache."""
+import pytest
+from mindspore_gl.nn import GNNCell
+from mindspore_gl.nn import GATConv
+from mindspore_gl.parser import vcg
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_translate_cache(tmp_path):
+    """
+    Features: translation cache.
+    Description: Construct GATConv twice in the process, and again after clearing the in-process cache.
+    Expectation: One translated file, the cells of the process share the translated construct.
+    """
+    GNNCell.specify_path(str(tmp_path))
+    try:
+        first = GATConv(in_feat_size=4, out_size=2, num_attn_head=3)
+        second = GATConv(in_feat_size=4, out_size=2, num_attn_head=3)
+        assert first.construct.__func__ is second.construct.__func__
+        files = list((tmp_path / ".mindspore_gl").glob("*.py"))
+        assert len(files) == 1
+
+        vcg._TRANSLATED.clear()  # pylint: disable=protected-access
+        loaded = GATConv(in_feat_size=4, out_size=2, num_attn_head=3)
+        assert loaded.construct.__func__ is not first.construct.__func__
+        assert loaded.construct.__func__.__code__.co_code == first.construct.__func__.__code__.co_code
+        assert list((tmp_path / ".mindspore_gl").glob("*.py")) == files
+    finally:
+        GNNCell.specify_path(None)
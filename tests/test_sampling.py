@@ -14,11 +14,15 @@
 # ============================================================================
 """Unit Test for sampling """
 import unittest
+from unittest import mock
 import numpy as np
 import networkx
 from scipy.sparse import csr_matrix
-from mindspore_gl.graph import MindHomoGraph, CsrAdj
+from mindspore_gl import sample_kernel
+from mindspore_gl.graph import MindHomoGraph, MindRelationGraph, MindHeteroGraph, CsrAdj
 from mindspore_gl.sampling.neighbor import sage_sampler_on_homo
+from mindspore_gl.sampling.block import sage_block_sampler_on_homo
+from mindspore_gl.sampling.hetero import sage_sampler_on_hetero
 from mindspore_gl.sampling.randomwalks import random_walk_unbias_on_homo
 
 
@@ -39,6 +43,15 @@ def generate_graph(node_count, edge_prob=0.1):
     return generated_graph
 
 
+def generate_relation_graph(src_type, dst_type, edge_type, src_count, dst_count, edge_count):
+    """generate relation graph"""
+    row = np.random.randint(0, src_count, edge_count)
+    col = np.random.randint(0, dst_count, edge_count)
+    csr_mat = csr_matrix((np.zeros(row.shape), (row, col)), shape=(src_count, dst_count))
+    relation_graph = MindRelationGraph(src_type, dst_type, edge_type)
+    relation_graph.set_topo(CsrAdj(csr_mat.indptr.astype(np.int32), csr_mat.indices.astype(np.int32)))
+    return relation_graph
+
 class TestSamplers(unittest.TestCase):
     """Test samplers"""
 
@@ -52,6 +65,147 @@ class TestSamplers(unittest.TestCase):
         nodes = np.arange(0, self.node_count)
         sage_sampler_on_homo(homo_graph=self.graph, seeds=nodes[:10].astype(np.int32), neighbor_nums=[2, 2])
 
+    def test_sage_sampling_seeded(self):
+        nodes = np.arange(0, self.node_count).astype(np.int32)
+        res = sage_sampler_on_homo(homo_graph=self.graph, seeds=nodes[:64], neighbor_nums=[5, 5],
+                                   random_seed=3, num_threads=1)
+        res_parallel = sage_sampler_on_homo(homo_graph=self.graph, seeds=nodes[:64], neighbor_nums=[5, 5],
+                                            random_seed=3, num_threads=4)
+        for key, value in res.items():
+            np.testing.assert_array_equal(value, res_parallel[key])
+        self.assertEqual(res['layered_edges_0'].shape[1], 64 * 5)
+
+    def test_sage_sampling_invalid(self):
+        nodes = np.arange(0, self.node_count).astype(np.int32)
+        expect = sage_sampler_on_homo(homo_graph=self.graph, seeds=nodes[:16], neighbor_nums=[2, 2], random_seed=5)
+        with self.assertRaises(ValueError):
+            sage_sampler_on_homo(homo_graph=self.graph, seeds=nodes[:16], neighbor_nums=[2, -1])
+        with self.assertRaises(ValueError):
+            sage_sampler_on_homo(homo_graph=self.graph, seeds=np.array([0, self.node_count], np.int32),
+                                 neighbor_nums=[2, 2])
+        # a call failing in its second hop leaves the relabel table as it found it
+        adj_csr = self.graph.adj_csr
+        relabel = np.full([self.node_count], -1, np.int32)
+        one_hop = sample_kernel._sample_one_hop  # pylint: disable=protected-access
+        hops = []
+
+        def failing_hop(*args):
+            hops.append(args)
+            if len(hops) > 1:
+                raise MemoryError()
+            return one_hop(*args)
+
+        with mock.patch.object(sample_kernel, "_sample_one_hop", failing_hop), self.assertRaises(MemoryError):
+            sample_kernel.sample_multi_hop(adj_csr.indptr, adj_csr.indices, nodes[:16], [2, 2], relabel)
+        self.assertTrue(np.all(relabel == -1))
+        res = sage_sampler_on_homo(homo_graph=self.graph, seeds=nodes[:16], neighbor_nums=[2, 2], random_seed=5)
+        for key, value in expect.items():
+            np.testing.assert_array_equal(value, res[key])
+
+    def test_sample_neighbors_invalid(self):
+        indptr = np.array([0, 1, 2], np.int32)
+        indices = np.array([1, 0], np.int32)
+        for seeds in ([0, 5], [-1, 0]):
+            with self.assertRaises(ValueError):
+                sample_kernel.sample_neighbors(indptr, indices, np.array(seeds, np.int32), 2)
+        with self.assertRaises(ValueError):
+            sample_kernel.sample_neighbors(indptr, indices, np.array([0], np.int32), -1)
+        relation = MindRelationGraph("user", "user", "follows")
+        relation.set_topo(CsrAdj(indptr, indices))
+        # rows past the last one have no edges, negative ids are not nodes
+        edges, _ = relation.sample_successors(np.array([0, 5]), 2)
+        np.testing.assert_array_equal(edges, [[0], [1]])
+        with self.assertRaises(ValueError):
+            relation.sample_successors(np.array([-1, 0]), 2)
+
+    def test_sage_sampling_weighted(self):
+        nodes = np.arange(0, self.node_count).astype(np.int32)
+        adj_csr = self.graph.adj_csr
+        # only the first neighbor of every node can be drawn
+        prob = np.zeros(adj_csr.indices.shape[0])
+        prob[adj_csr.indptr[:-1][np.diff(adj_csr.indptr) > 0]] = 1
+        for replace in (False, True):
+            res = sage_sampler_on_homo(homo_graph=self.graph, seeds=nodes[:16], neighbor_nums=[3],
+                                       replace=replace, prob=prob, random_seed=0)
+            edges = res['all_nodes'][res['layered_edges_0']]
+            self.assertEqual(edges.shape[1], 16 * (3 if replace else 1))
+            np.testing.assert_array_equal(edges[1], adj_csr.indices[adj_csr.indptr[edges[0]]])
+
+    def test_sage_sampling_relabel(self):
+        nodes = np.arange(0, self.node_count).astype(np.int32)
+        seeds = nodes[[5, 1, 5, 9]]
+        res = sage_sampler_on_homo(homo_graph=self.graph, seeds=seeds, neighbor_nums=[4, 3], random_seed=1)
+        all_nodes = res['all_nodes']
+        self.assertEqual(np.unique(all_nodes).shape[0], all_nodes.shape[0])
+        np.testing.assert_array_equal(all_nodes[res['seeds_idx']], seeds)
+        np.testing.assert_array_equal(all_nodes[:3], [5, 1, 9])
+        adj_csr = self.graph.adj_csr
+        for layer_idx in range(2):
+            edges = all_nodes[res[f'layered_edges_{layer_idx}']]
+            eids = res[f'layered_eids_{layer_idx}']
+            np.testing.assert_array_equal(edges[1], adj_csr.indices[eids])
+            self.assertTrue(np.all(eids >= adj_csr.indptr[edges[0]]))
+            self.assertTrue(np.all(eids < adj_csr.indptr[edges[0] + 1]))
+        # the hops in one array of (neighbor, seed) rows
+        flat = sage_sampler_on_homo(homo_graph=self.graph, seeds=seeds, neighbor_nums=[4, 3], random_seed=1,
+                                    flat=True)
+        np.testing.assert_array_equal(flat['sample_edges'], np.concatenate(
+            [res['layered_edges_0'], res['layered_edges_1']], axis=1)[::-1])
+        np.testing.assert_array_equal(flat['sample_eids'], np.concatenate(
+            [res['layered_eids_0'], res['layered_eids_1']]))
+        np.testing.assert_array_equal(flat['edge_nums'], [res['layered_edges_0'].shape[1],
+                                                          res['layered_edges_1'].shape[1]])
+
+    def test_sage_block_sampling(self):
+        nodes = np.arange(0, self.node_count).astype(np.int32)
+        seeds = nodes[[7, 3, 11]]
+        all_nodes, seeds_idx, blocks = sage_block_sampler_on_homo(self.graph, seeds, [4, 3], random_seed=2)
+        np.testing.assert_array_equal(all_nodes[seeds_idx], seeds)
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(blocks[0].n_src_nodes, all_nodes.shape[0])
+        self.assertEqual(blocks[-1].n_dst_nodes, 3)
+        self.assertEqual(blocks[1].n_src_nodes, blocks[0].n_dst_nodes)
+        adj_csr = self.graph.adj_csr
+        for block in blocks:
+            self.assertTrue(np.all(block.src_idx < block.n_src_nodes))
+            self.assertTrue(np.all(block.dst_idx < block.n_dst_nodes))
+            np.testing.assert_array_equal(all_nodes[block.src_idx], adj_csr.indices[block.eids])
+        # every destination node of the first layer gets at most 3 sampled neighbors
+        self.assertTrue(np.all(np.bincount(blocks[0].dst_idx) <= 3))
+
+    def test_sage_hetero_sampling(self):
+        graph = MindHeteroGraph()
+        graph.add_graph(generate_relation_graph("author", "paper", "writes", 500, 1000, 5000))
+        graph.add_graph(generate_relation_graph("paper", "author", "written_by", 1000, 500, 5000))
+        graph.add_graph(generate_relation_graph("paper", "paper", "cites", 1000, 1000, 8000))
+        seeds = {"paper": np.array([3, 17, 3, 256], np.int32)}
+        fanouts = [{"author_writes_paper": 3, "paper_cites_paper": 4},
+                   {"author_writes_paper": 2, "paper_written_by_author": 2, "paper_cites_paper": 2}]
+        all_nodes, seeds_idx, blocks = sage_sampler_on_hetero(graph, seeds, fanouts, random_seed=5)
+        np.testing.assert_array_equal(all_nodes["paper"][seeds_idx["paper"]], seeds["paper"])
+        self.assertEqual(len(blocks), 2)
+        for node_type, nodes in all_nodes.items():
+            self.assertEqual(np.unique(nodes).shape[0], nodes.shape[0], node_type)
+        for layer in blocks:
+            for relation_type, block in layer.items():
+                rel_graph = graph.relation_graph(relation_type)
+                src = all_nodes[rel_graph.src_node_type][block.src_idx]
+                dst = all_nodes[rel_graph.dst_node_type][block.dst_idx]
+                self.assertTrue(np.all(block.src_idx < block.n_src_nodes))
+                self.assertTrue(np.all(block.dst_idx < block.n_dst_nodes))
+                np.testing.assert_array_equal(rel_graph.adj_csr.indices[block.eids], dst)
+                self.assertTrue(np.all(block.eids >= rel_graph.adj_csr.indptr[src]))
+                self.assertTrue(np.all(block.eids < rel_graph.adj_csr.indptr[src + 1]))
+        # the seeds are the only destination nodes of the last layer
+        self.assertEqual(blocks[-1]["paper_cites_paper"].n_dst_nodes, 3)
+        self.assertTrue(np.all(np.bincount(blocks[-1]["paper_cites_paper"].dst_idx) <= 4))
+        # the relation sampling of the hetero graph takes the threads and does not depend on them
+        nodes = np.arange(0, 1000, 7, dtype=np.int32)
+        for sample in (graph.sample_successors, graph.sample_predecessors):
+            expect = sample("paper_cites_paper", nodes, 3, False, 9)
+            for actual, expected in zip(sample("paper_cites_paper", nodes, 3, False, 9, num_threads=4), expect):
+                np.testing.assert_array_equal(actual, expected)
+
     def test_random_walk(self):
         nodes = np.arange(0, self.node_count)
         random_walk_unbias_on_homo(homo_graph=self.graph, seeds=nodes[:30].astype(np.int32), walk_length=10)